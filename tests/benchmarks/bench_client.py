@@ -0,0 +1,428 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+"""
+End-to-end benchmarks of the clients against the local stand-in server, :mod:`tests.standin`: pagination in the
+shapes of each API, the response cache, key conversion, bulk CRUD, concurrent requests and recorded workloads
+replayed without the network.
+
+The client-side rate limiters are lifted and the stand-in enforces no budget, so that the timings are those of
+the SDK, the local socket and the configured stand-in latency rather than of pacing. Each scenario is timed as
+the best of several runs, after a warm-up run, and compared with the baselines tracked in ``baselines.json``::
+
+    python -m tests.benchmarks.bench_client              # Times every scenario
+    python -m tests.benchmarks.bench_client -k zpa       # Times the scenarios whose name contains "zpa"
+    python -m tests.benchmarks.bench_client --compare    # Fails on scenarios slower than their baseline
+    python -m tests.benchmarks.bench_client --save       # Records the timings as the new baselines
+
+Baselines depend on the machine: record them on the one comparing against them. The same scenarios run under
+pytest-benchmark, when installed, with ``pytest tests/benchmarks``.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from zscaler.cache.no_op_cache import NoOpCache
+from zscaler.cache.zscaler_cache import build_cache
+from zscaler.constants import ZPA_BASE_URLS
+from zscaler.transport.backends import RecordingTransport, ReplayTransport
+from zscaler.utils import convert_keys_to_snake, recursive_snake_to_camel
+
+from tests.benchmarks.payloads import zpa_app_segments_page
+from tests.standin.server import StandInServer
+
+STANDIN_CLOUD = "STANDIN"
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_TOLERANCE = 0.25
+UNLIMITED = 1_000_000
+
+
+def unthrottled(client):
+    """Lifts the client-side budget of a client, so that the scenarios time the SDK rather than its pacing."""
+    client.rate_limiter.get_limit = UNLIMITED
+    client.rate_limiter.post_put_delete_limit = UNLIMITED
+    return client
+
+
+class Environment:
+    """
+    The stand-in server and the clients of the scenarios, built on first use and closed with the environment.
+
+    Args:
+        server (StandInServer): A running stand-in server.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.state = server.state
+        self._clients = {}
+        self._loop = None
+        ZPA_BASE_URLS[STANDIN_CLOUD] = server.url
+
+    def reset(self, latency=0.0, **items):
+        """Sets the latency of the stand-in and the number of records of the given resources."""
+        self.state.latency = latency
+        self.state.limits = {}
+        self.state.items.update(items)
+
+    def _client(self, name, build):
+        if name not in self._clients:
+            self._clients[name] = build()
+        return self._clients[name]
+
+    def zpa(self, cached=False, transport=None):
+        from zscaler.zpa import ZPAClientHelper
+
+        def build():
+            cache = build_cache(ttl=3600, tti=1800) if cached else NoOpCache()
+            return ZPAClientHelper(
+                "client_id", "client_secret", "123456789", STANDIN_CLOUD, cache=cache, transport=transport
+            )
+
+        return unthrottled(self._client(f"zpa cached={cached} transport={id(transport)}", build))
+
+    def zia(self, transport=None):
+        from zscaler.zia import ZIAClientHelper
+
+        def build():
+            return ZIAClientHelper(
+                cloud="zscaler",
+                api_key="1234567890abcdef",
+                username="admin@example.com",
+                password="password",
+                override_url=f"{self.server.url}/api/v1",
+                cache=NoOpCache(),
+                transport=transport,
+            )
+
+        return unthrottled(self._client(f"zia transport={id(transport)}", build))
+
+    def zdx(self):
+        from zscaler.zdx import ZDX
+
+        def build():
+            return ZDX(client_id="client_id", client_secret="client_secret", override_url=f"{self.server.url}/v1")
+
+        zdx = self._client("zdx", build)
+        unthrottled(zdx.client)
+        return zdx
+
+    def zcon(self):
+        from zscaler.zcon import ZCONClientHelper
+
+        def build():
+            return ZCONClientHelper(
+                cloud="zscaler",
+                api_key="1234567890abcdef",
+                username="admin@example.com",
+                password="password",
+                override_url=f"{self.server.url}/zcon/api/v1",
+                cache=NoOpCache(),
+            )
+
+        return unthrottled(self._client("zcon", build))
+
+    def zcc(self):
+        from zscaler.zcc import ZCCClientHelper
+
+        def build():
+            return ZCCClientHelper(apikey="apikey", secret_key="secret_key", override_url=f"{self.server.url}/zcc")
+
+        return unthrottled(self._client("zcc", build))
+
+    def async_zpa(self):
+        """Returns an asyncio ZPA client logged in on the event loop of :meth:`run_async`."""
+        from zscaler.zpa.aio import AsyncZPAClientHelper
+
+        def build():
+            client = AsyncZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD, cache=NoOpCache())
+            return self.run_async(client.__aenter__())
+
+        return unthrottled(self._client("async zpa", build))
+
+    def run_async(self, coroutine):
+        """Runs a coroutine on the event loop of the environment, kept across runs like the pooled sessions."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coroutine)
+
+    def close(self):
+        for name, client in self._clients.items():
+            if name == "async zpa":
+                self.run_async(client.aclose())
+            elif name == "zdx":
+                client.client.session.close()
+            else:
+                client.session.close()
+        self._clients.clear()
+        if self._loop is not None:
+            self._loop.close()
+            self._loop = None
+
+
+# Scenarios set the stand-in up and return the function timed. Their names are the keys of the baselines.
+
+
+def zpa_pagination(env):
+    env.reset(server=2000)
+    zpa = env.zpa()
+    return lambda: zpa.get_paginated_data(path="/server", pagesize=500)
+
+
+def zpa_concurrent_pagination(env):
+    env.reset(latency=0.005, server=2000)
+    zpa = env.zpa()
+    return lambda: zpa.get_paginated_data(path="/server", pagesize=100, max_workers=4)
+
+
+def zia_pagination(env):
+    env.reset(users=2000)
+    zia = env.zia()
+    return lambda: zia.get_paginated_data(path="/users", pagesize=500)
+
+
+def zdx_pagination(env):
+    env.reset(devices=500)
+    zdx = env.zdx()
+    return lambda: zdx.devices.list_devices(limit=100)
+
+
+def zcon_pagination(env):
+    env.reset(ecgroup=1000)
+    zcon = env.zcon()
+    return lambda: zcon.get_paginated_data(path="/ecgroup", data_per_page=250)
+
+
+def zcc_pagination(env):
+    env.reset(device=1000)
+    zcc = env.zcc()
+
+    def run():
+        return [zcc.get("getDevices", params={"page": page, "pageSize": 250}) for page in range(1, 5)]
+
+    return run
+
+
+def zpa_cache_hits(env):
+    env.reset(latency=0.002)
+    zpa = env.zpa(cached=True)
+    zpa.get("/server/1")
+    return lambda: [zpa.get("/server/1") for _ in range(200)]
+
+
+def zpa_cache_misses(env):
+    env.reset(latency=0.002)
+    zpa = env.zpa()
+    return lambda: [zpa.get("/server/1") for _ in range(200)]
+
+
+def key_conversion(env):
+    camel = zpa_app_segments_page()
+    return lambda: recursive_snake_to_camel(convert_keys_to_snake(camel))
+
+
+def zpa_bulk_crud(env):
+    env.reset()
+    zpa = env.zpa()
+
+    def run():
+        for i in range(50):
+            created = zpa.post("/server", json={"name": f"server-{i}", "address": f"10.0.0.{i}", "enabled": True})
+            zpa.put(f"/server/{created.id}", json={"name": f"server-{i}", "description": "updated"})
+            zpa.delete(f"/server/{created.id}")
+
+    return run
+
+
+def zia_bulk_crud(env):
+    env.reset()
+    zia = env.zia()
+
+    def run():
+        for i in range(50):
+            created = zia.post("/users", json={"name": f"user-{i}", "email": f"user{i}@example.com"})
+            zia.put(f"/users/{created.id}", json={"name": f"user-{i}", "comments": "updated"})
+            zia.delete(f"/users/{created.id}")
+
+    return run
+
+
+def zpa_threads(env):
+    env.reset(latency=0.002)
+    zpa = env.zpa()
+    pool = ThreadPoolExecutor(8)
+    return lambda: list(pool.map(lambda i: zpa.get(f"/server/{i}"), range(200)))
+
+
+def zpa_asyncio(env):
+    env.reset(latency=0.002)
+    zpa = env.async_zpa()
+
+    async def gather():
+        return await asyncio.gather(*(zpa.get(f"/server/{i}") for i in range(200)))
+
+    return lambda: env.run_async(gather())
+
+
+def replayed(client, workload):
+    """Records a workload against the stand-in, and returns it run by a client replaying the recording."""
+    recording = RecordingTransport(None)
+    workload(client(transport=recording))
+    replay = client(transport=ReplayTransport(recording.cassette))
+    return lambda: workload(replay)
+
+
+def zpa_replay(env):
+    env.reset(server=2000)
+    return replayed(env.zpa, lambda zpa: zpa.get_paginated_data(path="/server", pagesize=500))
+
+
+def zia_replay(env):
+    env.reset(users=2000)
+    return replayed(env.zia, lambda zia: zia.get_paginated_data(path="/users", pagesize=500))
+
+
+SCENARIOS = {
+    "pagination/zpa 2000 items": zpa_pagination,
+    "pagination/zpa 2000 items, 4 workers, 5ms": zpa_concurrent_pagination,
+    "pagination/zia 2000 items": zia_pagination,
+    "pagination/zdx 500 items": zdx_pagination,
+    "pagination/zcon 1000 items": zcon_pagination,
+    "pagination/zcc 1000 items": zcc_pagination,
+    "cache/200 zpa hits": zpa_cache_hits,
+    "cache/200 zpa misses, 2ms": zpa_cache_misses,
+    "conversion/500 zpa app segments": key_conversion,
+    "crud/50 zpa create, update, delete": zpa_bulk_crud,
+    "crud/50 zia create, update, delete": zia_bulk_crud,
+    "concurrency/200 zpa gets, 8 threads, 2ms": zpa_threads,
+    "concurrency/200 zpa gets, asyncio, 2ms": zpa_asyncio,
+    "replay/zpa 2000 items": zpa_replay,
+    "replay/zia 2000 items": zia_replay,
+}
+
+
+def time_scenario(run, repeat=5):
+    """
+    Times a scenario after a warm-up run.
+
+    Returns:
+        tuple: The best and the median of ``repeat`` runs, in milliseconds.
+    """
+    run()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), statistics.median(timings)
+
+
+def run(names=None, repeat=5):
+    """
+    Times the scenarios against a stand-in server started for them.
+
+    Returns:
+        dict: ``{scenario: {"best_ms": float, "median_ms": float}}``.
+    """
+    results = {}
+    with StandInServer() as server:
+        env = Environment(server)
+        try:
+            for name in names or SCENARIOS:
+                best_ms, median_ms = time_scenario(SCENARIOS[name](env), repeat)
+                results[name] = {"best_ms": round(best_ms, 3), "median_ms": round(median_ms, 3)}
+        finally:
+            env.close()
+    return results
+
+
+def load_baselines(path=BASELINES):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["scenarios"]
+
+
+def save_baselines(results, path=BASELINES):
+    document = {
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "scenarios": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+        f.write("\n")
+
+
+def compare(results, baselines, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares the best timings with the baselines.
+
+    Returns:
+        list: The ``(scenario, baseline_ms, best_ms)`` of the scenarios slower than their baseline by more than
+        ``tolerance``, a fraction.
+    """
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if baseline and result["best_ms"] > baseline["best_ms"] * (1 + tolerance):
+            regressions.append((name, baseline["best_ms"], result["best_ms"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0], formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("-k", dest="keyword", help="only run the scenarios whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per scenario (default: %(default)s)")
+    parser.add_argument("--save", action="store_true", help="record the timings as the baselines")
+    parser.add_argument("--compare", action="store_true", help="exit with 1 on scenarios slower than their baseline")
+    parser.add_argument(
+        "--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown, a fraction (default: %(default)s)"
+    )
+    args = parser.parse_args(argv)
+
+    # Quiets the warning NoOpCache logs on every uncached response
+    logging.getLogger().setLevel(logging.ERROR)
+    names = [name for name in SCENARIOS if not args.keyword or args.keyword in name]
+    results = run(names, args.repeat)
+    baselines = load_baselines() if os.path.exists(BASELINES) else {}
+
+    print(f"{'scenario':<44} {'best (ms)':>10} {'median (ms)':>12} {'baseline (ms)':>14} {'change':>8}")
+    for name, result in results.items():
+        baseline = baselines.get(name, {}).get("best_ms")
+        change = f"{(result['best_ms'] / baseline - 1) * 100:+7.1f}%" if baseline else ""
+        baseline = f"{baseline:.2f}" if baseline else "-"
+        print(f"{name:<44} {result['best_ms']:>10.2f} {result['median_ms']:>12.2f} {baseline:>14} {change:>8}")
+
+    if args.save:
+        save_baselines({**baselines, **results})
+        print(f"Baselines saved to {BASELINES}")
+    if args.compare:
+        regressions = compare(results, baselines, args.tolerance)
+        for name, baseline_ms, best_ms in regressions:
+            print(f"REGRESSION {name}: {best_ms:.2f}ms, baseline {baseline_ms:.2f}ms", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
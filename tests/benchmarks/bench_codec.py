@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+"""
+Micro-benchmark of the JSON handling of a request and its response.
+
+Compares the standard library path the clients used to take, encoding the body for the log and again to
+send it, and decoding the response to check it and again to format it, with a single pass through each
+available codec of :mod:`zscaler.codec`::
+
+    python -m tests.benchmarks.bench_codec
+"""
+
+import json
+
+import requests
+
+from zscaler import codec
+
+from tests.benchmarks.bench_key_case import best_of
+from tests.benchmarks.payloads import PAYLOADS
+
+
+def make_response(content):
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.headers["Content-Type"] = "application/json"
+    resp._content = content
+    return resp
+
+
+def legacy_round_trip(data):
+    json.dumps(data)
+    json.dumps(data).encode("utf-8")
+    resp = make_response(json.dumps(data).encode("utf-8"))
+    resp.json()
+    return resp.json()
+
+
+def codec_round_trip(json_codec):
+    def round_trip(data):
+        return json_codec.loads(make_response(json_codec.dumps(data)).content)
+
+    return round_trip
+
+
+def run(repeat=7):
+    """
+    Times the legacy path and each installed codec on each payload.
+
+    Returns:
+        list: ``(payload, codec, legacy_ms, current_ms)`` tuples.
+    """
+    codecs = []
+    for name in codec.CODECS:
+        try:
+            codecs.append(codec.get_codec(name))
+        except ImportError:
+            continue
+    results = []
+    for name, build in PAYLOADS.items():
+        data = build()
+        legacy_ms = best_of(legacy_round_trip, data, repeat)
+        for json_codec in codecs:
+            round_trip = codec_round_trip(json_codec)
+            assert round_trip(data) == data
+            results.append((name, json_codec.name, legacy_ms, best_of(round_trip, data, repeat)))
+    return results
+
+
+def main():
+    print(f"{'payload':<26} {'codec':<8} {'before (ms)':>12} {'after (ms)':>11} {'speedup':>8}")
+    for name, codec_name, legacy_ms, current_ms in run():
+        print(f"{name:<26} {codec_name:<8} {legacy_ms:>12.2f} {current_ms:>11.2f} {legacy_ms / current_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+"""
+Benchmark of the startup of the SDK: the time to import it, in a fresh interpreter for each run, as the
+short-lived scripts and functions using it do.
+
+Compares importing everything, as ``import zscaler`` used to do with every product package, its API modules
+and their third-party dependencies, with the imports each statement triggers now that the product packages
+and API modules are loaded on first use::
+
+    python -m tests.benchmarks.bench_import
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+PRODUCTS = ("zdx", "zia", "zpa", "zcon", "zcc")
+
+# Everything "import zscaler" used to import
+EAGER = "; ".join(
+    [
+        "import box, dateutil.parser, pytz, restfly",
+        *(f"import zscaler.{product}" for product in PRODUCTS),
+        *(
+            f"import zscaler.{product}.{module}"
+            for product in PRODUCTS
+            for module in sorted(
+                name[:-3]
+                for name in os.listdir(os.path.join(ROOT, "zscaler", product))
+                if name.endswith(".py") and name not in ("__init__.py", "aio.py")
+            )
+        ),
+    ]
+)
+
+STATEMENTS = {
+    "import zscaler": "import zscaler",
+    "import the ZPA client": "from zscaler.zpa import ZPAClientHelper",
+    "import the ZIA client": "from zscaler.zia import ZIAClientHelper",
+    "import the ZDX client": "from zscaler.zdx import ZDX",
+}
+
+TIMER = "import time; start = time.perf_counter(); {}; print(time.perf_counter() - start)"
+
+
+def time_import(statement, repeat=7):
+    """Returns the fastest of ``repeat`` timings of ``statement`` in a fresh interpreter, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement)], cwd=ROOT, check=True, capture_output=True, text=True
+        ).stdout
+        timings.append(float(out.split()[-1]) * 1000)
+    return min(timings)
+
+
+def run(repeat=7):
+    """
+    Times importing everything, then each statement.
+
+    Returns:
+        list: ``(statement, eager_ms, current_ms)`` tuples.
+    """
+    eager_ms = time_import(EAGER, repeat)
+    return [(name, eager_ms, time_import(statement, repeat)) for name, statement in STATEMENTS.items()]
+
+
+def main():
+    print(f"{'statement':<24} {'before (ms)':>12} {'after (ms)':>11} {'speedup':>8}")
+    for name, eager_ms, current_ms in run():
+        print(f"{name:<24} {eager_ms:>12.2f} {current_ms:>11.2f} {eager_ms / current_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
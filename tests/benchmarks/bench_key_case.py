@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+"""
+Micro-benchmark of the key case conversion of response and request payloads.
+
+Compares :func:`zscaler.utils.convert_keys_to_snake` and :func:`zscaler.utils.recursive_snake_to_camel`
+with the recursive, uncached implementation they replaced, on payloads shaped like real API responses::
+
+    python -m tests.benchmarks.bench_key_case
+"""
+
+import re
+import timeit
+
+from zscaler.utils import convert_keys_to_snake, recursive_snake_to_camel
+
+from tests.benchmarks.payloads import PAYLOADS
+
+
+def legacy_camel_to_snake(name):
+    edge_cases = {
+        "routableIP": "routable_ip",
+        "isNameL10nTag": "is_name_l10n_tag",
+        "nameL10nTag": "name_l10n_tag",
+        "surrogateIP": "surrogate_ip",
+        "surrogateIPEnforcedForKnownBrowsers": "surrogate_ip_enforced_for_known_browsers",
+        "startIPAddress": "start_ip_address",
+        "endIPAddress": "end_ip_address",
+        "isIncompleteDRConfig": "is_incomplete_dr_config",
+    }
+    return edge_cases.get(name, re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower())
+
+
+def legacy_snake_to_camel(name):
+    if "_" not in name:
+        return name
+    edge_cases = {
+        "routable_ip": "routableIP",
+        "is_name_l10n_tag": "isNameL10nTag",
+        "name_l10n_tag": "nameL10nTag",
+        "surrogate_ip": "surrogateIP",
+        "surrogate_ip_enforced_for_known_browsers": "surrogateIPEnforcedForKnownBrowsers",
+        "ec_vms": "ecVMs",
+        "is_incomplete_dr_config": "isIncompleteDRConfig",
+        "ipv6_enabled": "ipV6Enabled",
+        "valid_ssl_certificate": "validSSLCertificate",
+        "email_ids": "emailIds",
+        "page_size": "pageSize",
+    }
+    return edge_cases.get(name, name[0].lower() + name.title()[1:].replace("_", ""))
+
+
+def legacy_convert_keys_to_snake(data):
+    if isinstance(data, list):
+        return [legacy_convert_keys_to_snake(inner_dict) for inner_dict in data]
+    elif isinstance(data, dict):
+        new_dict = {}
+        for k in data.keys():
+            v = data[k]
+            new_dict[legacy_camel_to_snake(k)] = legacy_convert_keys_to_snake(v) if isinstance(v, (dict, list)) else v
+        return new_dict
+    return data
+
+
+def legacy_recursive_snake_to_camel(data):
+    if isinstance(data, dict):
+        return {legacy_snake_to_camel(key): legacy_recursive_snake_to_camel(value) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [legacy_recursive_snake_to_camel(item) for item in data]
+    return data
+
+
+CASES = (
+    ("to snake", legacy_convert_keys_to_snake, convert_keys_to_snake),
+    ("to camel", legacy_recursive_snake_to_camel, recursive_snake_to_camel),
+)
+
+
+def best_of(func, data, repeat=7):
+    """Returns the fastest of ``repeat`` timings of ``func(data)``, in milliseconds."""
+    number = 5
+    return min(timeit.repeat(lambda: func(data), number=number, repeat=repeat)) / number * 1000
+
+
+def run(repeat=7):
+    """
+    Times both implementations in both directions on each payload.
+
+    Returns:
+        list: ``(payload, direction, legacy_ms, current_ms)`` tuples.
+    """
+    results = []
+    for name, build in PAYLOADS.items():
+        camel = build()
+        snake = legacy_convert_keys_to_snake(camel)
+        for direction, legacy, current in CASES:
+            data = camel if direction == "to snake" else snake
+            assert current(data) == legacy(data)
+            results.append((name, direction, best_of(legacy, data, repeat), best_of(current, data, repeat)))
+    return results
+
+
+def main():
+    print(f"{'payload':<26} {'direction':<10} {'before (ms)':>12} {'after (ms)':>11} {'speedup':>8}")
+    for name, direction, legacy_ms, current_ms in run():
+        print(f"{name:<26} {direction:<10} {legacy_ms:>12.2f} {current_ms:>11.2f} {legacy_ms / current_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+"""Payloads shaped like real ZPA and ZIA responses, for the micro-benchmarks."""
+
+
+def zpa_server_group(index):
+    return {
+        "id": str(72058304855100000 + index),
+        "name": f"server-group-{index}",
+        "enabled": True,
+        "dynamicDiscovery": False,
+        "configSpace": "DEFAULT",
+        "creationTime": "1700000000",
+        "modifiedTime": "1700000000",
+        "modifiedBy": "72058304855015574",
+        "ipAnchored": False,
+        "servers": [
+            {"id": str(72058304855200000 + index * 4 + i), "name": f"server-{index}-{i}", "address": f"10.0.{index % 250}.{i}"}
+            for i in range(4)
+        ],
+        "appConnectorGroups": [
+            {
+                "id": str(72058304855300000 + index),
+                "name": f"connector-group-{index}",
+                "enabled": True,
+                "cityCountry": "San Jose, US",
+                "countryCode": "US",
+                "latitude": "37.33874",
+                "longitude": "-121.8852525",
+                "location": "San Jose, CA, USA",
+                "upgradeDay": "SUNDAY",
+                "upgradeTimeInSecs": "66600",
+                "overrideVersionProfile": False,
+                "versionProfileId": "0",
+                "dnsQueryType": "IPV4_IPV6",
+                "connectors": [
+                    {
+                        "id": str(72058304855400000 + index * 2 + i),
+                        "name": f"connector-{index}-{i}",
+                        "enabled": True,
+                        "controlChannelStatus": "ZPN_STATUS_AUTHENTICATED",
+                        "currentVersion": "23.349.1",
+                        "expectedVersion": "23.349.1",
+                        "privateIp": f"10.1.{index % 250}.{i}",
+                        "publicIp": "203.0.113.10",
+                        "lastBrokerConnectTime": "1700000000000000",
+                        "upgradeStatus": "COMPLETE",
+                    }
+                    for i in range(2)
+                ],
+            }
+        ],
+    }
+
+
+def zpa_app_segment(index):
+    return {
+        "id": str(72058304855000000 + index),
+        "name": f"app-segment-{index:05d}",
+        "description": f"Application segment {index}",
+        "enabled": True,
+        "bypassType": "NEVER",
+        "configSpace": "DEFAULT",
+        "creationTime": "1700000000",
+        "modifiedTime": "1700000000",
+        "modifiedBy": "72058304855015574",
+        "domainNames": [f"app{index}.example.com", f"app{index}.internal.example.com"],
+        "doubleEncrypt": False,
+        "healthCheckType": "DEFAULT",
+        "healthReporting": "ON_ACCESS",
+        "icmpAccessType": "NONE",
+        "ipAnchored": False,
+        "isCnameEnabled": True,
+        "isIncompleteDRConfig": False,
+        "passiveHealthEnabled": True,
+        "selectConnectorCloseToApp": False,
+        "segmentGroupId": str(72058304855500000 + index % 20),
+        "segmentGroupName": f"segment-group-{index % 20}",
+        "tcpPortRanges": ["443", "443", "8443", "8443"],
+        "tcpPortRange": [{"from": "443", "to": "443"}, {"from": "8443", "to": "8443"}],
+        "udpPortRanges": [],
+        "serverGroups": [zpa_server_group(index * 2 + i) for i in range(2)],
+    }
+
+
+def zpa_app_segments_page(count=500):
+    """A page of ``count`` application segments, each with two server groups, as returned by ZPA."""
+    return {"totalPages": "1", "list": [zpa_app_segment(index) for index in range(count)]}
+
+
+def zia_location(index):
+    return {
+        "id": 1000 + index,
+        "name": f"location-{index:05d}",
+        "country": "UNITED_STATES",
+        "tz": "UNITED_STATES_AMERICA_LOS_ANGELES",
+        "authRequired": True,
+        "sslScanEnabled": True,
+        "zappSSLScanEnabled": False,
+        "xffForwardEnabled": False,
+        "surrogateIP": True,
+        "surrogateIPEnforcedForKnownBrowsers": True,
+        "idleTimeInMinutes": 480,
+        "ofwEnabled": True,
+        "ipsControl": True,
+        "aupEnabled": False,
+        "cautionEnabled": False,
+        "ipv6Enabled": False,
+        "profile": "CORPORATE",
+        "ipAddresses": [f"198.51.100.{index % 250}"],
+        "vpnCredentials": [{"id": 5000 + index, "type": "UFQDN", "fqdn": f"site{index}@example.com"}],
+        "staticLocationGroups": [{"id": 60 + index % 4, "name": f"group-{index % 4}"}],
+        "dynamiclocationGroups": [{"id": 70, "name": "Corporate User Traffic Group"}],
+    }
+
+
+def zia_locations_page(count=500):
+    """A page of ``count`` locations, as returned by ZIA."""
+    return [zia_location(index) for index in range(count)]
+
+
+def zia_url_category(index):
+    return {
+        "id": f"CUSTOM_{index:02d}",
+        "configuredName": f"category-{index}",
+        "superCategory": "USER_DEFINED",
+        "keywords": [],
+        "keywordsRetainingParentCategory": [],
+        "urls": [f"site{index}-{i}.example.com" for i in range(50)],
+        "dbCategorizedUrls": [],
+        "ipRanges": [],
+        "ipRangesRetainingParentCategory": [],
+        "customCategory": True,
+        "scopes": [{"type": "ORGANIZATION", "scopeGroupMemberEntities": [], "scopeEntities": []}],
+        "editable": True,
+        "type": "URL_CATEGORY",
+        "urlKeywordCounts": {
+            "totalUrlCount": 50,
+            "retainParentUrlCount": 0,
+            "totalKeywordCount": 0,
+            "retainParentKeywordCount": 0,
+        },
+        "customUrlsCount": 50,
+        "urlsRetainingParentCategoryCount": 0,
+        "customIpRangesCount": 0,
+        "ipRangesRetainingParentCategoryCount": 0,
+    }
+
+
+def zia_url_categories(count=100):
+    """``count`` custom URL categories, as returned by ZIA."""
+    return [zia_url_category(index) for index in range(count)]
+
+
+PAYLOADS = {
+    "zpa app segments (500)": zpa_app_segments_page,
+    "zia locations (500)": zia_locations_page,
+    "zia url categories (100)": zia_url_categories,
+}
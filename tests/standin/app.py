@@ -0,0 +1,437 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+"""Local stand-in for the Zscaler APIs used by the offline test suite."""
+
+import asyncio
+import base64
+import json
+import math
+import time
+
+from aiohttp import web
+
+ZPA_PREFIX = "/mgmtconfig/v1/admin/customers/{customer_id}"
+ZIA_PREFIX = "/api/v1"
+ZDX_PREFIX = "/v1"
+# ZCON and ZCC live on their own hosts; the stand-in serves them under a prefix, given as their override URL.
+ZCON_PREFIX = "/zcon/api/v1"
+ZCC_PREFIX = "/zcc/papi"
+
+# Products by path prefix, the longest first.
+PRODUCT_PREFIXES = (
+    ("/mgmtconfig", "zpa"),
+    (ZCON_PREFIX, "zcon"),
+    (ZCC_PREFIX, "zcc"),
+    (ZIA_PREFIX, "zia"),
+    (ZDX_PREFIX, "zdx"),
+)
+
+# Request budgets documented for each API, as ``{product: {method_class: (limit, window_seconds)}}``.
+# ZCC counts every method against its GET budget.
+DOCUMENTED_LIMITS = {
+    "zpa": {"GET": (20, 10), "WRITE": (10, 10)},
+    "zia": {"GET": (2, 2), "WRITE": (2, 2)},
+    "zdx": {"GET": (5, 60), "WRITE": (5, 60)},
+    "zcon": {"GET": (2, 2), "WRITE": (2, 2)},
+    "zcc": {"GET": (100, 3600)},
+}
+
+# Windows named by the ``X-RateLimit-Limit-<window>`` headers, by length in seconds.
+HEADER_WINDOWS = {1: "second", 60: "minute", 3600: "hour", 86400: "day"}
+
+# Allowance for the time a request spends between the client's limiter and the stand-in.
+LIMIT_SLACK = 0.05
+
+AUTH_PATHS = (
+    "/signin",
+    ZIA_PREFIX + "/authenticatedSession",
+    ZDX_PREFIX + "/oauth/token",
+    ZCON_PREFIX + "/auth",
+    ZCC_PREFIX + "/auth/",
+)
+
+
+def product_of(path):
+    """Returns the product a request path belongs to, ``None`` for paths outside of the APIs."""
+    for prefix, product in PRODUCT_PREFIXES:
+        if path.startswith(prefix):
+            return product
+    return None
+
+
+def authenticated(request):
+    """Returns whether an API request carries the credentials its product expects: a JWT or a session cookie."""
+    product = product_of(request.path)
+    if product in ("zia", "zcon"):
+        return request.cookies.get("JSESSIONID", "").startswith("standin")
+    if product == "zpa":
+        return request.headers.get("Authorization", "").startswith("Bearer ey")
+    if product == "zcc":
+        return request.headers.get("auth-token", "").startswith("ey")
+    return True
+
+
+def make_jwt(ttl=3600):
+    """Builds an unsigned JWT carrying an ``exp`` claim, as returned by the ZPA and ZCC login endpoints."""
+
+    def encode(part):
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+
+    return ".".join([encode({"alg": "none", "typ": "JWT"}), encode({"exp": int(time.time()) + ttl}), "signature"])
+
+
+def make_zpa_item(resource, index):
+    return {
+        "id": str(72058304855000000 + index),
+        "name": f"{resource}-{index:05d}",
+        "description": f"Stand-in {resource} {index}",
+        "enabled": True,
+        "creationTime": "1700000000",
+        "modifiedTime": "1700000000",
+        "modifiedBy": "72058304855015574",
+        "domainNames": [f"app{index}.example.com"],
+        "tcpPortRanges": ["443", "443"],
+        "serverGroups": [{"id": str(72058304855100000 + index), "name": f"server-group-{index}", "enabled": True}],
+    }
+
+
+def make_zia_item(resource, index):
+    return {
+        "id": index + 1,
+        "name": f"{resource}-{index:05d}",
+        "email": f"user{index}@example.com",
+        "adminUser": False,
+        "isNonEditable": False,
+        "department": {"id": 1000 + (index % 10), "name": f"department-{index % 10}"},
+        "groups": [{"id": 2000 + (index % 5), "name": f"group-{index % 5}"}],
+    }
+
+
+def make_zdx_item(resource, index):
+    return {"id": index + 1, "name": f"{resource}-{index:05d}", "userId": 3000 + index, "geoLocationId": "US"}
+
+
+def make_zcon_item(resource, index):
+    return {
+        "id": index + 1,
+        "name": f"{resource}-{index:05d}",
+        "desc": f"Stand-in {resource} {index}",
+        "deployType": "CLOUD",
+        "status": ["ENABLED"],
+        "ecVMs": [{"id": 4000 + index, "name": f"vm-{index}", "formFactor": "SMALL", "status": ["ACTIVE"]}],
+    }
+
+
+def make_zcc_item(resource, index):
+    return {
+        "udid": f"{index:08X}-0000-4000-8000-000000000000",
+        "machineHostname": f"host-{index:05d}",
+        "user": f"user{index}@example.com",
+        "osVersion": "Microsoft Windows 11 Enterprise",
+        "agentVersion": "4.3.0.151",
+        "registrationState": "Registered",
+        "lastSeenTime": "1700000000",
+    }
+
+
+class StandInState:
+    """
+    Mutable state of the stand-in server.
+
+    Attributes:
+        items (dict): Number of records served per resource name, e.g. ``{"server": 1200}``.
+        requests (list): ``(method, path)`` tuples for every request received.
+        peers (set): Remote ``(host, port)`` pairs, i.e. distinct client connections.
+        latency (float): Seconds added to every API response.
+        max_in_flight (int): Highest number of requests handled at the same time.
+        limits (dict): Request budgets to enforce, in the shape of :data:`DOCUMENTED_LIMITS`. Requests over
+            budget are answered with ``429 Too Many Requests`` and counted in ``throttled``. Nothing is
+            enforced by default.
+        rate_limit_headers (bool): Whether the responses of the products with a budget carry the
+            ``RateLimit-*`` headers, and the ``X-RateLimit-*-<window>`` ones for the windows they name,
+            describing what is left of the budget. Off by default, so that clients run into the 429s.
+        token_ttl (int): Lifetime in seconds of the JWTs issued by the ZPA and ZCC login endpoints.
+        login_latency (float): Seconds added to the responses of the ZPA, ZIA, ZCON and ZCC login endpoints.
+        unauthenticated (int): Number of API requests received without a token or session cookie.
+    """
+
+    def __init__(self, items=None, default_items=25, latency=0.0, limits=None, rate_limit_headers=False):
+        self.items = dict(items or {})
+        self.default_items = default_items
+        self.latency = latency
+        self.limits = limits or {}
+        self.rate_limit_headers = rate_limit_headers
+        self.token_ttl = 3600
+        self.login_latency = 0.0
+        self.throttled = 0
+        self.created = 0
+        self._accepted = {}
+        self.requests = []
+        self.peers = set()
+        self.logins = 0
+        self.unauthenticated = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def count(self, resource):
+        return self.items.get(resource, self.default_items)
+
+    def calls(self, method=None, path_fragment=""):
+        return [r for r in self.requests if (method is None or r[0] == method) and path_fragment in r[1]]
+
+    def _budget(self, method, path):
+        """Returns the ``(product, method_class)`` budget a request counts against, ``None`` if it has none."""
+        if path.startswith(AUTH_PATHS):
+            return None
+        product = product_of(path)
+        method_class = "GET" if method == "GET" or product == "zcc" else "WRITE"
+        if method_class not in self.limits.get(product, {}):
+            return None
+        return product, method_class
+
+    def _accepted_within(self, budget, window, now):
+        accepted = [t for t in self._accepted.get(budget, []) if now - t < window - LIMIT_SLACK]
+        self._accepted[budget] = accepted
+        return accepted
+
+    def retry_after(self, method, path):
+        """
+        Records a request against its budget.
+
+        Returns:
+            float: Seconds until the request would fit in the budget, or ``0`` if it was accepted.
+        """
+        budget = self._budget(method, path)
+        if budget is None:
+            return 0
+        limit, window = self.limits[budget[0]][budget[1]]
+        now = time.monotonic()
+        accepted = self._accepted_within(budget, window, now)
+        if len(accepted) >= limit:
+            self.throttled += 1
+            return window - (now - accepted[0])
+        accepted.append(now)
+        return 0
+
+    def budget_headers(self, method, path):
+        """Returns the rate limit headers describing what is left of the budget of a request after it."""
+        budget = self._budget(method, path)
+        if budget is None or not self.rate_limit_headers:
+            return {}
+        limit, window = self.limits[budget[0]][budget[1]]
+        now = time.monotonic()
+        accepted = self._accepted_within(budget, window, now)
+        remaining = max(limit - len(accepted), 0)
+        # Seconds until the oldest request of the window leaves it, freeing a slot
+        reset = math.ceil(window - (now - accepted[0])) if accepted else 0
+        headers = {"RateLimit-Limit": str(limit), "RateLimit-Remaining": str(remaining), "RateLimit-Reset": str(reset)}
+        if window in HEADER_WINDOWS:
+            headers[f"X-RateLimit-Limit-{HEADER_WINDOWS[window]}"] = str(limit)
+            headers[f"X-RateLimit-Remaining-{HEADER_WINDOWS[window]}"] = str(remaining)
+        return headers
+
+
+def create_app(state):
+    """
+    Creates the :class:`aiohttp.web.Application` emulating the ZPA, ZIA, ZDX, ZCON and ZCC endpoints.
+
+    Args:
+        state (StandInState): The state shared with the test using the server.
+    """
+
+    @web.middleware
+    async def track(request, handler):
+        state.requests.append((request.method, request.path_qs))
+        peer = request.transport.get_extra_info("peername") if request.transport else None
+        if peer:
+            state.peers.add(tuple(peer[:2]))
+        if not request.path.startswith(AUTH_PATHS) and not authenticated(request):
+            state.unauthenticated += 1
+        state.in_flight += 1
+        state.max_in_flight = max(state.max_in_flight, state.in_flight)
+        try:
+            if state.latency:
+                await asyncio.sleep(state.latency)
+            retry_after = state.retry_after(request.method, request.path)
+            if retry_after:
+                resp = web.json_response(
+                    {"code": "TOO_MANY_REQUESTS", "message": "Rate limit exceeded"},
+                    status=429,
+                    headers={"Retry-After": str(math.ceil(retry_after))},
+                )
+            else:
+                resp = await handler(request)
+            resp.headers.update(state.budget_headers(request.method, request.path))
+            return resp
+        finally:
+            state.in_flight -= 1
+
+    async def zpa_signin(request):
+        state.logins += 1
+        await asyncio.sleep(state.login_latency)
+        return web.json_response(
+            {"token_type": "Bearer", "access_token": make_jwt(state.token_ttl), "expires_in": str(state.token_ttl)}
+        )
+
+    async def zpa_list(request):
+        # The rules have their own routes, policySet/rules/policyType/{policy_type} and policySet/{id}/rule
+        resource = request.match_info.get("resource", "rule")
+        page = int(request.query.get("page", 1))
+        pagesize = int(request.query.get("pagesize", 20))
+        total = state.count(resource)
+        total_pages = max(1, math.ceil(total / pagesize))
+        start = (page - 1) * pagesize
+        records = [make_zpa_item(resource, i) for i in range(start, min(start + pagesize, total))]
+        return web.json_response({"totalPages": str(total_pages), "totalCount": str(total), "list": records})
+
+    async def zpa_get(request):
+        resource = request.match_info.get("resource", "rule")
+        return web.json_response(make_zpa_item(resource, 0) | {"id": request.match_info["id"]})
+
+    async def zpa_create(request):
+        state.created += 1
+        body = await request.json()
+        return web.json_response(body | {"id": str(72058304856000000 + state.created)}, status=201)
+
+    async def zpa_write(request):
+        return web.Response(status=204)
+
+    async def zpa_policy_set(request):
+        policy_type = request.match_info["policy_type"]
+        rules = [make_zpa_item("rule", i) | {"policySetId": "72058304855000042"} for i in range(state.count("rule"))]
+        return web.json_response({"id": "72058304855000042", "name": policy_type, "policyType": "1", "rules": rules})
+
+    async def zia_login(request):
+        state.logins += 1
+        session_id = f"standin{state.logins}"
+        await asyncio.sleep(state.login_latency)
+        resp = web.json_response({"authType": "ADMIN_LOGIN", "obfuscateApiKey": False, "passwordExpiryTime": 0})
+        resp.headers["Set-Cookie"] = f"JSESSIONID={session_id}; Path=/; Secure; HttpOnly"
+        return resp
+
+    async def zia_logout(request):
+        return web.Response(status=204)
+
+    async def zia_list(request):
+        resource = request.match_info["resource"]
+        page = int(request.query.get("page", 1))
+        pagesize = int(request.query.get("pagesize", 100))
+        start = (page - 1) * pagesize
+        records = [make_zia_item(resource, i) for i in range(start, min(start + pagesize, state.count(resource)))]
+        return web.json_response(records)
+
+    async def zia_get(request):
+        item_id = request.match_info["id"]
+        return web.json_response(make_zia_item(request.match_info["resource"], 0) | {"id": int(item_id)})
+
+    async def zia_create(request):
+        state.created += 1
+        body = await request.json()
+        return web.json_response(body | {"id": 10000 + state.created})
+
+    async def zia_update(request):
+        body = await request.json()
+        return web.json_response(body | {"id": int(request.match_info["id"])})
+
+    async def zia_delete(request):
+        return web.Response(status=204)
+
+    async def zdx_token(request):
+        state.logins += 1
+        return web.json_response({"token": make_jwt(), "token_type": "Bearer", "expires_in": 3600})
+
+    async def zdx_list(request):
+        resource = request.match_info["resource"]
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query.get("limit", 10))
+        total = state.count(resource)
+        records = [make_zdx_item(resource, i) for i in range(offset, min(offset + limit, total))]
+        next_offset = str(offset + limit) if offset + limit < total else None
+        return web.json_response({resource: records, "next_offset": next_offset})
+
+    async def zcon_login(request):
+        state.logins += 1
+        session_id = f"standin{state.logins}"
+        await asyncio.sleep(state.login_latency)
+        resp = web.json_response({"authType": "ADMIN_LOGIN", "obfuscateApiKey": False, "passwordExpiryTime": 0})
+        resp.headers["Set-Cookie"] = f"JSESSIONID={session_id}; Path=/; Secure; HttpOnly"
+        return resp
+
+    async def zcon_list(request):
+        resource = request.match_info["resource"]
+        page = int(request.query.get("page", 1))
+        pagesize = int(request.query.get("pageSize", 250))
+        start = (page - 1) * pagesize
+        records = [make_zcon_item(resource, i) for i in range(start, min(start + pagesize, state.count(resource)))]
+        return web.json_response(records)
+
+    async def zcon_get(request):
+        item_id = request.match_info["id"]
+        return web.json_response(make_zcon_item(request.match_info["resource"], 0) | {"id": int(item_id)})
+
+    async def zcc_login(request):
+        state.logins += 1
+        await asyncio.sleep(state.login_latency)
+        return web.json_response({"jwtToken": make_jwt(state.token_ttl)})
+
+    async def zcc_devices(request):
+        page = int(request.query.get("page", 1))
+        pagesize = int(request.query.get("pageSize", 30))
+        start = (page - 1) * pagesize
+        records = [make_zcc_item("device", i) for i in range(start, min(start + pagesize, state.count("device")))]
+        return web.json_response(records)
+
+    async def zcc_remove_devices(request):
+        body = await request.json()
+        return web.json_response({"devicesRemoved": len(body.get("udids") or [])})
+
+    app = web.Application(middlewares=[track])
+    zpa = ZPA_PREFIX.replace("{customer_id}", "{customer_id:[^/]+}")
+    app.router.add_post("/signin", zpa_signin)
+    app.router.add_get(zpa + "/policySet/policyType/{policy_type}", zpa_policy_set)
+    app.router.add_get(zpa + "/policySet/rules/policyType/{policy_type}", zpa_list)
+    app.router.add_get(zpa + "/policySet/{policy_id}/rule/{id}", zpa_get)
+    for version in (zpa, zpa.replace("/v1/", "/v2/")):
+        app.router.add_post(version + "/policySet/{policy_id}/rule", zpa_create)
+        app.router.add_put(version + "/policySet/{policy_id}/rule/{id}", zpa_write)
+    app.router.add_get(zpa + "/{resource}", zpa_list)
+    app.router.add_post(zpa + "/{resource}", zpa_create)
+    app.router.add_get(zpa + "/{resource}/{id}", zpa_get)
+    app.router.add_put(zpa + "/{resource}/{id}", zpa_write)
+    app.router.add_delete(zpa + "/{resource}/{id}", zpa_write)
+    app.router.add_post(ZIA_PREFIX + "/authenticatedSession", zia_login)
+    app.router.add_delete(ZIA_PREFIX + "/authenticatedSession", zia_logout)
+    app.router.add_get(ZIA_PREFIX + "/{resource}", zia_list)
+    app.router.add_post(ZIA_PREFIX + "/{resource}", zia_create)
+    app.router.add_get(ZIA_PREFIX + r"/{resource}/{id:\d+}", zia_get)
+    app.router.add_put(ZIA_PREFIX + r"/{resource}/{id:\d+}", zia_update)
+    app.router.add_delete(ZIA_PREFIX + r"/{resource}/{id:\d+}", zia_delete)
+    app.router.add_post(ZDX_PREFIX + "/oauth/token", zdx_token)
+    app.router.add_get(ZDX_PREFIX + "/{resource}", zdx_list)
+    # ZCON follows the conventions of the ZIA API
+    app.router.add_post(ZCON_PREFIX + "/auth", zcon_login)
+    app.router.add_delete(ZCON_PREFIX + "/auth", zia_logout)
+    app.router.add_get(ZCON_PREFIX + "/{resource}", zcon_list)
+    app.router.add_get(ZCON_PREFIX + r"/{resource}/{id:\d+}", zcon_get)
+    app.router.add_post(ZCON_PREFIX + "/{resource}", zia_create)
+    app.router.add_put(ZCON_PREFIX + r"/{resource}/{id:\d+}", zia_update)
+    app.router.add_delete(ZCON_PREFIX + r"/{resource}/{id:\d+}", zia_delete)
+    app.router.add_post(ZCC_PREFIX + "/auth/v1/login", zcc_login)
+    app.router.add_get(ZCC_PREFIX + "/public/v1/getDevices", zcc_devices)
+    app.router.add_post(ZCC_PREFIX + "/public/v1/removeDevices", zcc_remove_devices)
+    app.router.add_post(ZCC_PREFIX + "/public/v1/forceRemoveDevices", zcc_remove_devices)
+    return app
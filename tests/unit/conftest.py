@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import logging
+
+import pytest
+
+from zscaler import tracing
+from zscaler.constants import ZPA_BASE_URLS
+from tests.standin.server import StandInServer
+
+STANDIN_CLOUD = "STANDIN"
+
+
+@pytest.fixture
+def standin():
+    with StandInServer() as server:
+        yield server
+
+
+@pytest.fixture
+def trace_logs(caplog):
+    """Captures the request and response traces, which are disabled unless ZSCALER_SDK_LOG is set."""
+    disabled = logging.root.manager.disable
+    logging.disable(logging.NOTSET)
+    settings = tracing.settings
+    with caplog.at_level(logging.INFO, logger="zscaler-sdk-python"):
+        yield caplog
+    tracing.settings = settings
+    logging.disable(disabled)
+
+
+@pytest.fixture
+def zpa_client(standin, monkeypatch):
+    from zscaler.zpa import ZPAClientHelper
+
+    monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+    monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+    client = ZPAClientHelper(
+        client_id="client_id",
+        client_secret="client_secret",
+        customer_id="123456789",
+        cloud=STANDIN_CLOUD,
+    )
+    yield client
+    client.session.close()
+
+
+@pytest.fixture
+def zia_client(standin, monkeypatch):
+    from zscaler.zia import ZIAClientHelper
+
+    monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+    client = ZIAClientHelper(
+        cloud="zscaler",
+        api_key="1234567890abcdef",
+        username="admin@example.com",
+        password="password",
+        override_url=f"{standin.url}/api/v1",
+    )
+    yield client
+    client.session.close()
+
+
+@pytest.fixture
+def zdx_client(standin, monkeypatch):
+    from zscaler.zdx import ZDX
+
+    monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+    client = ZDX(client_id="client_id", client_secret="client_secret", override_url=f"{standin.url}/v1")
+    yield client
+    client.client.session.close()
+
+
+@pytest.fixture
+def zcon_client(standin, monkeypatch):
+    from zscaler.zcon import ZCONClientHelper
+
+    monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+    client = ZCONClientHelper(
+        cloud="zscaler",
+        api_key="1234567890abcdef",
+        username="admin@example.com",
+        password="password",
+        override_url=f"{standin.url}/zcon/api/v1",
+    )
+    yield client
+    client.session.close()
+
+
+@pytest.fixture
+def zcc_client(standin):
+    from zscaler.zcc import ZCCClientHelper
+
+    client = ZCCClientHelper(apikey="apikey", secret_key="secret_key", cloud="zscaler", override_url=f"{standin.url}/zcc")
+    yield client
+    client.session.close()
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import asyncio
+import time
+
+import pytest
+
+from tests.unit.conftest import STANDIN_CLOUD
+from zscaler.constants import ZPA_BASE_URLS
+from zscaler.ratelimiter.ratelimiter import AsyncRateLimiter
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def async_zpa(standin, monkeypatch):
+    from zscaler.zpa.aio import AsyncZPAClientHelper
+
+    monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+    monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+    return AsyncZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD)
+
+
+@pytest.fixture
+def async_zia(standin, monkeypatch):
+    from zscaler.zia.aio import AsyncZIAClientHelper
+
+    monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+    client = AsyncZIAClientHelper(
+        cloud="zscaler",
+        api_key="1234567890abcdef",
+        username="admin@example.com",
+        password="password",
+        override_url=f"{standin.url}/api/v1",
+    )
+    client.rate_limiter.get_limit = 100
+    return client
+
+
+@pytest.fixture
+def async_zdx(standin, monkeypatch):
+    from zscaler.zdx.aio import AsyncZDX
+
+    monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+    return AsyncZDX(client_id="client_id", client_secret="client_secret", override_url=f"{standin.url}/v1")
+
+
+class TestAsyncZPA:
+    async def test_list_segments_fetches_all_pages(self, standin, async_zpa):
+        standin.state.items["application"] = 45
+        async with async_zpa as zpa:
+            segments = await zpa.app_segments.list_segments(pagesize=20)
+        assert len(segments) == 45
+        assert segments[44].name == "application-00044"
+        assert segments[0].server_groups[0].name == "server-group-0"
+        assert len(standin.state.calls("GET", "/application")) == 3
+        assert standin.state.logins == 1
+        assert len(standin.state.peers) == 1
+
+    async def test_inherited_single_request_methods_are_awaitable(self, async_zpa):
+        async with async_zpa as zpa:
+            segment = await zpa.app_segments.get_segment("42")
+        assert segment.id == "42"
+
+    async def test_concurrent_requests_share_one_login(self, standin, async_zpa):
+        async with async_zpa as zpa:
+            results = await asyncio.gather(*(zpa.app_segments.get_segment(str(i)) for i in range(10)))
+        assert [r.id for r in results] == [str(i) for i in range(10)]
+        assert standin.state.logins == 1
+
+    async def test_iter_paginated_stops_at_max_items(self, standin, async_zpa):
+        standin.state.items["server"] = 100
+        async with async_zpa as zpa:
+            servers = [s async for s in zpa.iter_paginated("server", pagesize=20, max_items=30)]
+        assert len(servers) == 30
+        assert len(standin.state.calls("GET", "/server")) == 2
+
+    async def test_get_paginated_data_reports_empty_results(self, standin, async_zpa):
+        standin.state.items["segmentGroup"] = 0
+        async with async_zpa as zpa:
+            data, error = await zpa.get_paginated_data(path="/segmentGroup")
+        assert len(data) == 0
+        assert error == "No results found for all requested pages."
+
+
+class TestAsyncZIA:
+    async def test_list_users_and_session_lifecycle(self, standin, async_zia):
+        standin.state.items["users"] = 25
+        async with async_zia as zia:
+            users = await zia.users.list_users(pagesize=10)
+            user = await zia.users.get_user(email="user3@example.com")
+        assert len(users) == 25
+        assert user.name == "users-00003"
+        assert user.department.name == "department-3"
+        assert len(standin.state.calls("POST", "authenticatedSession")) == 1
+        assert len(standin.state.calls("DELETE", "authenticatedSession")) == 1
+        assert async_zia.session_id is None
+
+    async def test_get_paginated_data_search_returns_match(self, standin, async_zia):
+        async with async_zia as zia:
+            groups, error = await zia.get_paginated_data(path="/groups", search="groups-00007")
+        assert error is None
+        assert [g.id for g in groups] == [8]
+
+
+class TestAsyncZDX:
+    async def test_list_devices_follows_offsets(self, standin, async_zdx):
+        standin.state.items["devices"] = 25
+        async with async_zdx as zdx:
+            devices = await zdx.devices.list_devices()
+        assert len(devices) == 25
+        assert devices[24].name == "devices-00024"
+        assert len(standin.state.calls("GET", "/v1/devices")) == 3
+        assert standin.state.logins == 1
+
+
+class TestAsyncRateLimiter:
+    async def test_acquire_waits_without_blocking_the_loop(self):
+        limiter = AsyncRateLimiter.from_limits(get_limit=2, post_put_delete_limit=2, get_freq=0.2, post_put_delete_freq=0.2)
+        ticks = []
+
+        async def ticker():
+            for _ in range(4):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.05)
+
+        start = time.monotonic()
+        waits = await asyncio.gather(*(limiter.acquire("GET") for _ in range(3)), ticker())
+        assert time.monotonic() - start >= 0.18
+        assert sum(waits[:3]) > 0
+        assert len(ticks) == 4
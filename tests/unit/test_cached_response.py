@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import pickle
+
+import pytest
+from box import Box, BoxList
+
+from tests.unit.conftest import STANDIN_CLOUD
+from zscaler.cache.cached_response import CachedResponse
+from zscaler.constants import ZPA_BASE_URLS
+from zscaler.transport.response import build_response
+from zscaler.utils import format_json_response
+
+
+@pytest.fixture
+def cached_zpa(standin, monkeypatch):
+    from zscaler.zpa import ZPAClientHelper
+
+    monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "true")
+    monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+    client = ZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD)
+    yield client
+    client.session.close()
+
+
+def make_response(body=b'{"policyType": "1", "rules": [{"id": "1", "serverGroups": [{"name": "a"}]}]}'):
+    return build_response(
+        "GET",
+        "https://example.com/policySet",
+        200,
+        headers={"Content-Type": "application/json", "Set-Cookie": "a=b"},
+        content=body,
+    )
+
+
+class TestCachedResponse:
+    def test_keeps_status_headers_and_body_only(self):
+        cached = CachedResponse.from_response(make_response())
+        assert cached.ok and cached.status_code == 200
+        assert cached.headers["content-type"] == "application/json"
+        assert cached.request is None
+        assert len(cached.cookies) == 0
+        assert cached.json()["rules"][0]["serverGroups"][0]["name"] == "a"
+        assert CachedResponse.from_response(cached) is cached
+
+    def test_formatted_hits_are_independent_copies(self):
+        cached = CachedResponse.from_response(make_response())
+        first = format_json_response(cached, box_attrs=dict())
+        first.rules[0].server_groups.append({"name": "b"})
+        first.rules[0].id = "2"
+        first.policy_type = "2"
+
+        second = format_json_response(cached, box_attrs=dict())
+        assert isinstance(second, Box) and isinstance(second.rules, BoxList)
+        assert second.policy_type == "1"
+        assert second.rules[0].id == "1"
+        assert len(second.rules[0].server_groups) == 1
+
+        plain = format_json_response(cached, box_attrs=dict(), conv_box=False)
+        plain["rules"][0]["server_groups"].clear()
+        assert type(plain) is dict
+        assert len(cached.snake_case()["rules"][0]["server_groups"]) == 1
+
+    def test_view_is_shared_and_read_only(self):
+        cached = CachedResponse.from_response(make_response())
+        view = cached.view()
+        assert view is cached.view()
+        assert view.rules[0].server_groups[0].name == "a"
+        with pytest.raises(Exception):
+            view.rules[0].id = "2"
+
+    def test_pickles_without_the_decoded_payload(self):
+        cached = CachedResponse.from_response(make_response())
+        cached.view()
+        restored = pickle.loads(pickle.dumps(cached))
+        assert restored.content == cached.content
+        assert restored.headers == cached.headers
+        assert restored._view is None
+        assert format_json_response(restored, box_attrs=dict()) == format_json_response(cached, box_attrs=dict())
+
+
+class TestCachedClient:
+    def test_repeated_policy_lookups_hit_the_cache(self, standin, cached_zpa):
+        standin.state.items["rule"] = 300
+        policy = cached_zpa.policies.get_policy("access")
+        policy.rules.clear()
+
+        again = cached_zpa.policies.get_policy("access")
+        assert len(again.rules) == 300
+        assert cached_zpa.policies._get_policy_id("access") == again.id
+        assert cached_zpa.policies._get_policy_id("access") == again.id
+        assert len(standin.state.calls("GET", "/policySet/policyType/ACCESS_POLICY")) == 1
+        assert cached_zpa.cache.stats()["hits"] == 3
+
+    def test_writes_only_invalidate_what_they_make_stale(self, standin, cached_zpa):
+        def reads():
+            cached_zpa.app_segments.get_segment("1")
+            cached_zpa.app_segments.get_segment("2")
+            cached_zpa.segment_groups.get_group("3")
+            cached_zpa.servers.get_server("4")
+            return len(standin.state.calls("GET", "/mgmtconfig"))
+
+        assert reads() == 4
+        assert reads() == 4
+        cached_zpa.put("application/1", json={"name": "renamed"})
+        assert reads() == 6
+        assert len(standin.state.calls("GET", "/application/2")) == 1
+        assert len(standin.state.calls("GET", "/server/4")) == 1
+
+    @pytest.mark.parametrize("add_rule", ["add_access_rule", "add_access_rule_v2"])
+    def test_rule_writes_invalidate_the_cached_rules(self, standin, cached_zpa, add_rule):
+        def reads():
+            cached_zpa.policies.list_rules("access")
+            cached_zpa.policies.get_rule("access", "5")
+            return len(standin.state.calls("GET", "/policySet/rules")), len(standin.state.calls("GET", "/rule/5"))
+
+        assert reads() == (1, 1)
+        assert reads() == (1, 1)
+        getattr(cached_zpa.policies, add_rule)(name="new rule", action="allow")
+        assert reads() == (2, 2)
+
+    @pytest.mark.parametrize("api_version", ["v1", "v2"])
+    def test_rule_updates_invalidate_the_cached_rules(self, standin, cached_zpa, api_version):
+        cached_zpa.policies.list_rules("access")
+        cached_zpa.policies.get_rule("access", "5")
+        policy_id = cached_zpa.policies._get_policy_id("access")
+        # As update_access_rule and update_access_rule_v2 send them
+        cached_zpa.put(f"policySet/{policy_id}/rule/5", json={"name": "renamed"}, api_version=api_version)
+        cached_zpa.policies.list_rules("access")
+        cached_zpa.policies.get_rule("access", "5")
+        assert len(standin.state.calls("GET", "/policySet/rules")) == 2
+        assert len(standin.state.calls("GET", "/rule/5")) == 2
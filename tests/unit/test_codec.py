@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import json
+import logging
+
+import pytest
+import requests
+
+from zscaler import codec
+from zscaler.utils import dump_request, dump_response
+
+PAYLOAD = {"id": "1", "name": "Ünïcode / app", "enabled": True, "ports": [80, 443], "nested": {"ratio": 0.5}}
+
+
+class CountingCodec(codec.JSONCodec):
+    def __init__(self, inner):
+        self.inner = inner
+        self.decoded = 0
+        self.encoded = 0
+
+    def loads(self, data):
+        self.decoded += 1
+        return self.inner.loads(data)
+
+    def dumps(self, obj):
+        self.encoded += 1
+        return self.inner.dumps(obj)
+
+
+@pytest.fixture
+def counting_codec(monkeypatch):
+    counting = CountingCodec(codec.current_codec())
+    monkeypatch.setattr(codec, "_codec", counting)
+    return counting
+
+
+def make_response(content, status_code=200, content_type="application/json"):
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp.headers["Content-Type"] = content_type
+    resp._content = content
+    return resp
+
+
+class TestCodecs:
+    @pytest.mark.parametrize("name", codec.CODECS)
+    def test_round_trips_like_the_standard_library(self, name):
+        try:
+            json_codec = codec.get_codec(name)
+        except ImportError:
+            pytest.skip(f"{name} is not installed")
+        encoded = json_codec.dumps(PAYLOAD)
+        assert isinstance(encoded, bytes)
+        assert json.loads(encoded) == PAYLOAD
+        assert json_codec.loads(json.dumps(PAYLOAD).encode()) == PAYLOAD
+
+    @pytest.mark.parametrize("name", codec.CODECS)
+    def test_falls_back_on_documents_it_refuses(self, name):
+        try:
+            json_codec = codec.get_codec(name)
+        except ImportError:
+            pytest.skip(f"{name} is not installed")
+        assert json_codec.loads(b'{"id": 9223372036854775807}') == {"id": 9223372036854775807}
+        assert json_codec.loads(b'{"ratio": NaN}')["ratio"] != 0
+        assert json.loads(json_codec.dumps({"id": 2**70})) == {"id": 2**70}
+        assert json.loads(json_codec.dumps({1: "a"})) == {"1": "a"}
+
+    def test_selection(self, monkeypatch):
+        assert codec.get_codec("json").name == "json"
+        monkeypatch.setenv("ZSCALER_JSON_CODEC", "json")
+        assert codec.get_codec().name == "json"
+        with pytest.raises(ValueError):
+            codec.get_codec("simplejson")
+
+    def test_set_codec(self, monkeypatch):
+        monkeypatch.setattr(codec, "_codec", codec.current_codec())
+        assert codec.set_codec("json") is codec.current_codec()
+        assert codec.dumps(PAYLOAD) == json.dumps(PAYLOAD, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class TestRequestsAndResponses:
+    def test_encode_request(self):
+        body, headers = codec.encode_request(PAYLOAD, {"Accept": "*/*"})
+        assert json.loads(body) == PAYLOAD
+        assert headers == {"Accept": "*/*", "Content-Type": "application/json"}
+
+        original = {"content-type": "application/json; charset=utf-8"}
+        assert codec.encode_request(PAYLOAD, original)[1] is original
+        assert codec.encode_request(None, original) == (None, original)
+
+    def test_decode_response(self):
+        assert codec.decode_response(make_response(json.dumps(PAYLOAD).encode())) == PAYLOAD
+        assert codec.decode_response(make_response(json.dumps(PAYLOAD).encode("utf-16"))) == PAYLOAD
+        with pytest.raises(ValueError):
+            codec.decode_response(make_response(b"<html></html>", content_type="text/html"))
+
+    def test_logs_the_bytes_sent_and_received(self, trace_logs, counting_codec):
+        body, headers = codec.encode_request(PAYLOAD, {})
+        dump_request(logging.getLogger("zscaler-sdk-python"), "https://x/y", "POST", body, None, headers, "1")
+        dump_response(logging.getLogger("zscaler-sdk-python"), "https://x/y", "POST", make_response(body), None, "1", 0)
+        assert trace_logs.text.count(body.decode()) == 2
+        assert counting_codec.encoded == 1
+        assert counting_codec.decoded == 0
+
+
+class TestClients:
+    def test_decodes_each_response_once(self, zpa_client, counting_codec):
+        zpa_client.get("application/72058304855000001")
+        assert counting_codec.decoded == 1
+
+    def test_decodes_each_page_once(self, standin, zpa_client, counting_codec):
+        standin.state.items["server"] = 1200
+        servers, error = zpa_client.get_paginated_data(path="/server")
+        assert error is None
+        assert len(servers) == 1200
+        assert counting_codec.decoded == 3
+
+    def test_sends_the_encoded_body(self, zpa_client, counting_codec):
+        resp = zpa_client.send("PUT", "application/72058304855000001", json=PAYLOAD)
+        assert resp.status_code == 204
+        assert json.loads(resp.request.body) == PAYLOAD
+        assert resp.request.headers["Content-Type"] == "application/json"
+        assert counting_codec.encoded == 1
+        assert counting_codec.decoded == 0
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import logging
+
+import pytest
+
+from zscaler import hooks
+from zscaler.cache.zscaler_cache import ZscalerCache
+from zscaler.constants import ZPA_BASE_URLS
+from zscaler.hooks import Event, Hooks, endpoint_template
+from zscaler.metrics import MetricsRegistry, build_metrics
+from tests.unit.conftest import STANDIN_CLOUD
+
+
+def record(client_hooks, event=hooks.ALL_EVENTS):
+    events = []
+    client_hooks.on(event, events.append)
+    return events
+
+
+def names(events):
+    return [event.name for event in events]
+
+
+def zpa_endpoint(path):
+    return "/mgmtconfig/v1/admin/customers/{id}" + path
+
+
+class TestEndpointTemplate:
+    @pytest.mark.parametrize(
+        "url, expected",
+        [
+            ("https://x/mgmtconfig/v1/admin/customers/123456789/server", "/mgmtconfig/v1/admin/customers/{id}/server"),
+            ("https://x/mgmtconfig/v1/admin/customers/1/server/72058304855000001/", zpa_endpoint("/server/{id}")),
+            ("https://x/v1/devices/6b1c2e8a-04d4-4e53-9e8a-0f4f1b2c3d4e/apps", "/v1/devices/{id}/apps"),
+            ("https://x/zcc/papi/public/v1/getDevices?page=2", "/zcc/papi/public/v1/getDevices"),
+            ("https://x/api/v1/users", "/api/v1/users"),
+        ],
+    )
+    def test_ids_are_replaced(self, url, expected):
+        assert endpoint_template(url) == expected
+
+
+class TestHooks:
+    def test_on_and_off(self):
+        client_hooks = Hooks("zpa")
+        events = record(client_hooks, hooks.RETRY)
+        client_hooks.emit(hooks.RETRY, method="GET", url="https://x/api/v1/users/1", attempt=2)
+        client_hooks.emit(hooks.REQUEST_START, method="GET", url="https://x/api/v1/users/1")
+        client_hooks.off(hooks.RETRY, events.append)
+        client_hooks.emit(hooks.RETRY, method="GET", url="https://x/api/v1/users/1", attempt=3)
+        assert len(events) == 1
+        assert events[0].as_dict() | {"time": None} == {
+            "name": "retry",
+            "product": "zpa",
+            "method": "GET",
+            "url": "https://x/api/v1/users/1",
+            "duration": None,
+            "status_code": None,
+            "attempt": 2,
+            "from_cache": False,
+            "error": None,
+            "time": None,
+            "endpoint": "/api/v1/users/{id}",
+        }
+        assert not client_hooks.listening(hooks.RETRY)
+
+    def test_decorator_and_bound_views(self):
+        shared = Hooks()
+        events = []
+
+        @shared.on("*")
+        def listener(event):
+            events.append((event.product, event.name))
+
+        shared.bind("zia").emit(hooks.CACHE_HIT)
+        shared.bind("zdx").emit(hooks.CACHE_MISS)
+        assert events == [("zia", "cache_hit"), ("zdx", "cache_miss")]
+        assert listener is not None
+
+    def test_unknown_events_are_rejected(self):
+        with pytest.raises(ValueError, match="Invalid event"):
+            Hooks().on("request_started", print)
+
+    def test_duration_from_start(self):
+        assert Event(hooks.REQUEST_END, start=0).duration > 0
+        assert Event(hooks.REQUEST_END, duration=1.5, start=0).duration == 1.5
+
+    def test_failing_callbacks_are_logged(self, caplog):
+        client_hooks = Hooks()
+        events = record(client_hooks)
+        client_hooks.on(hooks.TOKEN_REFRESH, lambda event: 1 / 0)
+        with caplog.at_level(logging.WARNING, logger="zscaler-sdk-python"):
+            client_hooks.emit(hooks.TOKEN_REFRESH)
+        assert names(events) == ["token_refresh"]
+        assert "division by zero" in caplog.text
+
+
+class TestClientEvents:
+    def test_request_lifecycle(self, standin, zpa_client):
+        events = record(zpa_client.hooks)
+        zpa_client.access_token = None
+        zpa_client.get("/server/72058304855000001")
+        assert names(events) == ["request_start", "token_refresh", "request_end"]
+        start, refresh, end = events
+        assert {event.product for event in events} == {"zpa"}
+        assert start.endpoint == end.endpoint == "/mgmtconfig/v1/admin/customers/{id}/server/{id}"
+        assert refresh.status_code == 200 and refresh.duration > 0
+        assert end.status_code == 200 and not end.from_cache and end.duration >= refresh.duration
+
+    def test_callback_errors_do_not_fail_requests(self, standin, zpa_client):
+        zpa_client.hooks.on("*", lambda event: 1 / 0)
+        assert zpa_client.get("/server/72058304855000001").id == "72058304855000001"
+
+    def test_cache_hits_and_misses(self, standin, monkeypatch):
+        from zscaler.zpa import ZPAClientHelper
+
+        monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+        cache = ZscalerCache(ttl=60, tti=60)
+        client = ZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD, cache=cache)
+        events = record(client.hooks)
+        client.get("/server/1")
+        client.get("/server/1")
+        client.session.close()
+        assert names(events) == [
+            "request_start",
+            "cache_miss",
+            "request_end",
+            "request_start",
+            "cache_hit",
+            "request_end",
+        ]
+        assert events[-1].from_cache
+
+    def test_no_misses_without_a_cache(self, standin, zpa_client):
+        events = record(zpa_client.hooks, hooks.CACHE_MISS)
+        zpa_client.get("/server/1")
+        assert events == []
+
+    def test_rate_limited_requests_are_retried(self, standin, zia_client):
+        standin.state.limits = {"zia": {"GET": (1, 1)}}
+        zia_client.rate_limiter.get_limit = 100
+        events = record(zia_client.hooks)
+        zia_client.get("/users")
+        zia_client.get("/users")
+        assert names(events)[2:] == ["request_start", "rate_limited", "retry", "rate_limit_wait", "request_end"]
+        limited, retry, wait, end = events[3:]
+        assert limited.status_code == 429 and limited.attempt == 1
+        assert retry.attempt == 2
+        assert wait.duration > 0.5
+        assert end.status_code == 200 and end.duration > wait.duration
+
+    def test_failed_logins_end_the_request(self, standin, zpa_client, monkeypatch):
+        monkeypatch.setattr(zpa_client, "login", lambda: None)
+        zpa_client.access_token = None
+        events = record(zpa_client.hooks)
+        with pytest.raises(Exception, match="Failed to login"):
+            zpa_client.get("/server/1")
+        assert names(events) == ["request_start", "token_refresh", "request_end"]
+        assert events[-1].status_code is None and "Failed to login" in str(events[-1].error)
+
+
+class TestMetrics:
+    def test_render(self, standin, zpa_client, zia_client):
+        registry = MetricsRegistry(buckets=(0.5, 60))
+        registry.attach(zpa_client.hooks).attach(zia_client.hooks)
+        zpa_client.get("/server/72058304855000001")
+        zpa_client.get("/server/72058304855000002")
+        zia_client.get("/users")
+        text = registry.render()
+        endpoint = 'endpoint="/mgmtconfig/v1/admin/customers/{id}/server/{id}"'
+        assert "# HELP zscaler_requests_total Requests sent, cache hits included.\n" in text
+        assert "# TYPE zscaler_requests_total counter\n" in text
+        assert f'zscaler_requests_total{{product="zpa",method="GET",{endpoint},status="200"}} 2\n' in text
+        assert 'zscaler_requests_total{product="zia",method="GET",endpoint="/api/v1/users",status="200"} 1\n' in text
+        assert "# TYPE zscaler_request_duration_seconds histogram\n" in text
+        assert f'zscaler_request_duration_seconds_bucket{{product="zpa",method="GET",{endpoint},le="+Inf"}} 2\n' in text
+        assert f'zscaler_request_duration_seconds_count{{product="zpa",method="GET",{endpoint}}} 2\n' in text
+        assert 'zscaler_requests_in_flight{product="zpa"} 0\n' in text
+        assert text.endswith("\n")
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry(buckets=(1, 5))
+        for duration in (0.5, 2, 2, 10):
+            registry.observe(Event(hooks.REQUEST_END, "zcc", "GET", "https://x/a", duration, status_code=200))
+        lines = [line for line in registry.render().splitlines() if line.startswith("zscaler_request_duration_seconds")]
+        labels = 'product="zcc",method="GET",endpoint="/a"'
+        assert lines == [
+            f'zscaler_request_duration_seconds_bucket{{{labels},le="1"}} 1',
+            f'zscaler_request_duration_seconds_bucket{{{labels},le="5"}} 3',
+            f'zscaler_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4',
+            f"zscaler_request_duration_seconds_sum{{{labels}}} 14.5",
+            f"zscaler_request_duration_seconds_count{{{labels}}} 4",
+        ]
+
+    def test_errors_and_label_escaping(self):
+        registry = MetricsRegistry()
+        registry.observe(Event(hooks.REQUEST_END, "zpa", "GET", 'https://x/a"b\\c', 1.0, error=OSError()))
+        assert registry.requests.value(product="zpa", method="GET", endpoint='/a"b\\c', status="error") == 1
+        assert 'endpoint="/a\\"b\\\\c",status="error"} 1' in registry.render()
+
+    def test_labels_are_checked(self):
+        with pytest.raises(ValueError, match="takes the labels"):
+            MetricsRegistry().retries.inc(product="zpa")
+
+    def test_build_metrics(self, monkeypatch):
+        client_hooks = Hooks("zpa")
+        monkeypatch.delenv("ZSCALER_CLIENT_METRICS_ENABLED", raising=False)
+        assert build_metrics(None, client_hooks) is None
+        monkeypatch.setenv("ZSCALER_CLIENT_METRICS_ENABLED", "true")
+        registry = build_metrics(None, client_hooks)
+        client_hooks.emit(hooks.TOKEN_REFRESH, duration=0.1)
+        assert registry.token_refreshes.value(product="zpa") == 1
+        shared = MetricsRegistry()
+        assert build_metrics(shared, Hooks("zia")) is shared
+        assert build_metrics(False, client_hooks) is None
+
+    def test_logins_are_counted(self, standin, zia_client):
+        registry = MetricsRegistry().attach(zia_client.hooks)
+        zia_client.auth_details = None
+        zia_client.get("/users")
+        assert registry.token_refreshes.value(product="zia") == 1
+        assert registry.token_refresh_duration.count(product="zia") == 1
+
+    def test_clients_share_a_registry(self, standin, monkeypatch):
+        from zscaler.zia import ZIAClientHelper
+        from zscaler.zpa import ZPAClientHelper
+
+        monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+        monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+        registry = MetricsRegistry()
+        zpa = ZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD, metrics=registry)
+        zia = ZIAClientHelper(
+            cloud="zscaler",
+            api_key="1234567890abcdef",
+            username="admin@example.com",
+            password="password",
+            override_url=f"{standin.url}/api/v1",
+            metrics=registry,
+        )
+        zpa.get("/server/1")
+        zia.get("/users")
+        zpa.session.close()
+        zia.session.close()
+        assert zpa.metrics is zia.metrics is registry
+        assert registry.request_duration.count(product="zpa", method="GET", endpoint=zpa_endpoint("/server/{id}")) == 1
+        assert registry.request_duration.count(product="zia", method="GET", endpoint="/api/v1/users") == 1
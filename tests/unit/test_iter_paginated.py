@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import itertools
+import types
+
+import pytest
+from box import Box
+
+
+class TestZPAIterPaginated:
+    def test_iter_servers_is_lazy(self, standin, zpa_client):
+        standin.state.items["server"] = 100
+        servers = zpa_client.servers.iter_servers(pagesize=10)
+        assert isinstance(servers, types.GeneratorType)
+        assert standin.state.calls("GET", "/server") == []
+
+        first = list(itertools.islice(servers, 15))
+        assert [s.name for s in first] == [f"server-{i:05d}" for i in range(15)]
+        assert isinstance(first[0], Box)
+        assert first[0].server_groups[0].name == "server-group-0"
+        assert len(standin.state.calls("GET", "/server")) == 2
+
+    def test_iter_paginated_honours_max_items_and_max_pages(self, standin, zpa_client):
+        standin.state.items["serverGroup"] = 100
+        assert len(list(zpa_client.server_groups.iter_groups(pagesize=10, max_items=25))) == 25
+        assert len(list(zpa_client.server_groups.iter_groups(pagesize=10, max_pages=2))) == 20
+        assert len(standin.state.calls("GET", "/serverGroup")) == 5
+
+    def test_get_by_name_stops_at_the_match(self, standin, zpa_client):
+        standin.state.items["server"] = 100
+        server = zpa_client.servers.get_server_by_name("server-00012", pagesize=10)
+        assert server.id == "72058304855000012"
+        assert len(standin.state.calls("GET", "/server")) == 2
+
+    def test_unexpected_status_raises(self, standin, zpa_client):
+        with pytest.raises(ValueError, match="Unexpected status code 200"):
+            list(zpa_client.iter_paginated("/server", expected_status_code=204))
+
+
+class TestZIAIterPaginated:
+    def test_iter_users_stops_requesting_after_break(self, standin, zia_client):
+        standin.state.items["users"] = 50
+        zia_client.rate_limiter.get_limit = 100
+        for count, user in enumerate(zia_client.users.iter_users(pagesize=10), start=1):
+            if user.email == "user14@example.com":
+                break
+        assert count == 15
+        assert user.department.name == "department-4"
+        assert len(standin.state.calls("GET", "/api/v1/users")) == 2
+
+    def test_get_group_by_name_iterates_lazily(self, standin, zia_client):
+        group = zia_client.users.get_group_by_name("groups-00003")
+        assert group.id == 4
+        assert len(standin.state.calls("GET", "/api/v1/groups")) == 1
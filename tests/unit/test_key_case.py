@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import sys
+
+from box import Box, BoxList
+
+from tests.benchmarks.bench_key_case import legacy_convert_keys_to_snake, legacy_recursive_snake_to_camel
+from tests.benchmarks.payloads import PAYLOADS
+from zscaler.utils import (
+    camel_to_snake,
+    convert_keys,
+    convert_keys_to_snake,
+    recursive_snake_to_camel,
+    snake_to_camel,
+)
+
+
+class TestKeyNames:
+    def test_edge_cases(self):
+        assert camel_to_snake("surrogateIPEnforcedForKnownBrowsers") == "surrogate_ip_enforced_for_known_browsers"
+        assert camel_to_snake("isIncompleteDRConfig") == "is_incomplete_dr_config"
+        assert snake_to_camel("ipv6_enabled") == "ipV6Enabled"
+        assert snake_to_camel("ec_vms") == "ecVMs"
+
+    def test_regular_names(self):
+        assert camel_to_snake("appConnectorGroups") == "app_connector_groups"
+        assert camel_to_snake("id") == "id"
+        assert snake_to_camel("app_connector_groups") == "appConnectorGroups"
+        assert snake_to_camel("name") == "name"
+
+    def test_memo_is_bounded(self):
+        camel_to_snake.cache_clear()
+        for index in range(camel_to_snake.cache_info().maxsize + 100):
+            camel_to_snake(f"key{index}Name")
+        assert camel_to_snake.cache_info().currsize == camel_to_snake.cache_info().maxsize
+        assert camel_to_snake("key0Name") == "key0_name"
+
+
+class TestConvertKeys:
+    def test_matches_recursive_conversion(self):
+        for build in PAYLOADS.values():
+            camel = build()
+            snake = convert_keys_to_snake(camel)
+            assert snake == legacy_convert_keys_to_snake(camel)
+            assert recursive_snake_to_camel(snake) == legacy_recursive_snake_to_camel(snake)
+
+    def test_copies_containers(self):
+        data = {"serverGroups": [{"appConnectorGroups": []}], "domainNames": ["a.example.com"]}
+        converted = convert_keys_to_snake(data)
+        converted["server_groups"][0]["app_connector_groups"].append(1)
+        converted["domain_names"].append("b.example.com")
+        assert data == {"serverGroups": [{"appConnectorGroups": []}], "domainNames": ["a.example.com"]}
+
+    def test_box_and_scalars(self):
+        assert convert_keys_to_snake(BoxList([Box({"segmentGroupId": "1"})])) == [{"segment_group_id": "1"}]
+        assert type(convert_keys_to_snake(Box({"a": {"bC": 1}}))["a"]) is dict
+        assert convert_keys_to_snake("segmentGroupId") == "segmentGroupId"
+        assert convert_keys_to_snake(None) is None
+
+    def test_direction(self):
+        assert convert_keys({"segment_group_id": 1}) == {"segmentGroupId": 1}
+        assert convert_keys({"segmentGroupId": 1}, direction="to_snake") == {"segment_group_id": 1}
+
+    def test_deep_nesting(self):
+        data = leaf = {}
+        for _ in range(sys.getrecursionlimit() * 2):
+            leaf["childNode"] = {}
+            leaf = leaf["childNode"]
+        converted = convert_keys_to_snake(data)
+        depth = 0
+        while converted:
+            converted = converted["child_node"]
+            depth += 1
+        assert depth == sys.getrecursionlimit() * 2
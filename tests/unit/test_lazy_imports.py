@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+import zscaler
+import zscaler.zpa
+
+PRODUCTS = ("zcc", "zcon", "zdx", "zia", "zpa")
+HEAVY = ("asyncio", "box", "dateutil", "pytz", "restfly")
+
+
+def imported_after(statement):
+    """Returns the modules imported by ``statement`` in a fresh interpreter."""
+    code = f"import sys, json; {statement}; print(json.dumps(sorted(sys.modules)))"
+    return set(json.loads(subprocess.run([sys.executable, "-c", code], check=True, capture_output=True).stdout))
+
+
+def test_importing_the_sdk_imports_no_product():
+    modules = imported_after("import zscaler")
+    assert not {f"zscaler.{product}" for product in PRODUCTS} & modules
+    assert not {"requests", *HEAVY} & modules
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "from zscaler.zpa import ZPAClientHelper",
+        "from zscaler.zia import ZIAClientHelper",
+        "from zscaler.zdx import ZDX",
+        "from zscaler.zcon import ZCONClientHelper",
+        "from zscaler.zcc import ZCCClientHelper",
+    ],
+)
+def test_importing_a_client_imports_none_of_its_apis(statement):
+    modules = imported_after(statement)
+    package = statement.split()[1]
+    assert {m for m in modules if m.startswith(f"{package}.")} <= {f"{package}.client", f"{package}.zdx_client"}
+    assert not set(HEAVY) & modules
+
+
+def test_importing_does_not_configure_logging():
+    code = "import logging, zscaler.zpa; print(logging.root.manager.disable)"
+    assert subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout == "0\n"
+
+
+def test_clients_are_resolved_on_first_use():
+    assert zscaler.ZPAClientHelper is zscaler.zpa.ZPAClientHelper
+    assert "ZIAClientHelper" in dir(zscaler)
+    with pytest.raises(AttributeError, match="has no attribute 'ZXYClientHelper'"):
+        zscaler.ZXYClientHelper
+
+
+def test_apis_are_resolved_on_first_use():
+    from zscaler.zpa import PolicySetsAPI
+    from zscaler.zpa.policies import PolicySetsAPI as DefinedAPI
+
+    assert PolicySetsAPI is DefinedAPI
+    assert "PolicySetsAPI" in dir(zscaler.zpa)
+
+
+def test_iterator_is_still_in_utils():
+    from zscaler.iterators import Iterator
+    from zscaler.utils import Iterator as UtilsIterator
+
+    assert UtilsIterator is Iterator
+
+
+def test_api_accessors_are_memoized(zpa_client):
+    assert zpa_client.app_segments is zpa_client.app_segments
+    assert zpa_client.app_segments.rest is zpa_client
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import pytest
+from box import Box, BoxList
+
+from tests.unit.conftest import STANDIN_CLOUD
+from zscaler.cache.cached_response import CachedResponse
+from zscaler.constants import ZPA_BASE_URLS
+from zscaler.utils import (
+    SnakeCaseListView,
+    SnakeCaseView,
+    convert_keys_to_snake,
+    format_payload,
+    get_field,
+    output_mode,
+    resolve_output,
+)
+
+SEGMENT = {
+    "id": "1",
+    "segmentGroupId": "2",
+    "isIncompleteDRConfig": False,
+    "domainNames": ["a.example.com"],
+    "serverGroups": [{"id": "3", "appConnectorGroups": [{"id": "4"}]}],
+}
+
+
+class TestSnakeCaseView:
+    def test_translates_keys_on_access(self):
+        view = format_payload(SEGMENT, "lazy")
+        assert isinstance(view, SnakeCaseView)
+        assert view["segment_group_id"] == "2"
+        assert view.is_incomplete_dr_config is False
+        assert view.server_groups[0].app_connector_groups[0].id == "4"
+        assert list(view) == ["id", "segment_group_id", "is_incomplete_dr_config", "domain_names", "server_groups"]
+        assert "domainNames" not in view
+
+    def test_wraps_without_copying(self):
+        view = format_payload(SEGMENT, "lazy")
+        assert view._data is SEGMENT
+        assert view.server_groups._data is SEGMENT["serverGroups"]
+
+    def test_is_read_only(self):
+        view = format_payload(SEGMENT, "lazy")
+        with pytest.raises(TypeError):
+            view["id"] = "5"
+        with pytest.raises(TypeError):
+            view.server_groups[0] = {}
+        with pytest.raises(AttributeError):
+            view.missing_field
+
+    def test_compares_and_copies_like_the_converted_payload(self):
+        view = format_payload([SEGMENT], "lazy")
+        assert isinstance(view, SnakeCaseListView)
+        assert view == convert_keys_to_snake([SEGMENT])
+        assert view.to_list() == convert_keys_to_snake([SEGMENT])
+        assert view[0].to_dict() == convert_keys_to_snake(SEGMENT)
+        assert convert_keys_to_snake(view) == convert_keys_to_snake([SEGMENT])
+
+
+class TestOutputModes:
+    def test_format_payload(self):
+        assert format_payload(SEGMENT, "raw") is SEGMENT
+        assert type(format_payload(SEGMENT, "dict")) is dict
+        assert format_payload(SEGMENT, "dict") == convert_keys_to_snake(SEGMENT)
+        assert isinstance(format_payload([SEGMENT], "box"), BoxList)
+        assert isinstance(format_payload(SEGMENT, "box"), Box)
+
+    def test_resolution_order(self):
+        assert resolve_output() == "box"
+        assert resolve_output(default="dict") == "dict"
+        with output_mode("lazy"):
+            assert resolve_output(default="dict") == "lazy"
+            assert resolve_output("raw", default="dict") == "raw"
+        assert resolve_output(default="dict") == "dict"
+        with pytest.raises(ValueError):
+            resolve_output("json")
+
+    def test_cached_responses_are_copied_except_in_lazy_mode(self):
+        resp = CachedResponse(200, {"Content-Type": "application/json"}, b'{"segmentGroupId": "2", "tags": []}')
+        raw = resp.format("raw")
+        raw["tags"].append("changed")
+        assert resp.format("raw") == {"segmentGroupId": "2", "tags": []}
+        assert resp.format("dict") == {"segment_group_id": "2", "tags": []}
+        assert resp.format("lazy")._data is resp.payload()
+
+    def test_get_field(self):
+        assert get_field(format_payload({"whitelistUrls": ["a"]}, "raw"), "whitelist_urls") == ["a"]
+        assert get_field(format_payload({"whitelistUrls": ["a"]}, "box"), "whitelist_urls") == ["a"]
+        assert get_field(format_payload({}, "lazy"), "whitelist_urls", []) == []
+
+
+class TestClients:
+    def test_client_output_mode(self, standin, monkeypatch):
+        from zscaler.zpa import ZPAClientHelper
+
+        monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+        monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+        standin.state.items["server"] = 30
+        client = ZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD, output="raw")
+        try:
+            servers = client.servers.list_servers()
+            server = client.servers.get_server("72058304855000000")
+        finally:
+            client.session.close()
+        assert type(servers) is list and len(servers) == 30
+        assert "serverGroups" in servers[0]
+        assert type(server) is dict and "domainNames" in server
+
+    def test_invalid_client_output_mode(self, standin, monkeypatch):
+        from zscaler.zpa import ZPAClientHelper
+
+        monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+        with pytest.raises(ValueError):
+            ZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD, output="json")
+
+    def test_per_call_output_mode(self, standin, zpa_client):
+        standin.state.items["server"] = 30
+        servers, _ = zpa_client.get_paginated_data(path="/server", pagesize=20, output="lazy")
+        assert isinstance(servers, SnakeCaseListView) and len(servers) == 30
+        assert servers[29].server_groups[0].name == "server-group-29"
+        assert all(isinstance(server, SnakeCaseView) for server in zpa_client.iter_paginated("/server", output="lazy"))
+        assert isinstance(zpa_client.servers.list_servers(), BoxList)
+
+    def test_output_mode_block(self, standin, zia_client):
+        standin.state.items["greTunnels"] = 5
+        with output_mode("dict"):
+            tunnels = zia_client.traffic.list_gre_tunnels()
+        assert type(tunnels) is list and type(tunnels[0]) is dict
+        assert tunnels[0]["admin_user"] is False
+        assert isinstance(zia_client.traffic.list_gre_tunnels(), BoxList)
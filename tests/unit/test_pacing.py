@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import time
+
+import pytest
+
+from tests.standin.app import DOCUMENTED_LIMITS
+from tests.standin.server import StandInServer
+
+
+@pytest.fixture
+def standin():
+    with StandInServer(limits=DOCUMENTED_LIMITS) as server:
+        yield server
+
+
+@pytest.fixture
+def zdx(standin, monkeypatch):
+    from zscaler.zdx import ZDX
+
+    monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+    client = ZDX(client_id="client_id", client_secret="client_secret", override_url=f"{standin.url}/v1")
+    yield client
+    client.client.session.close()
+
+
+def timed(func, *args, **kwargs):
+    start = time.monotonic()
+    result = func(*args, **kwargs)
+    return result, time.monotonic() - start
+
+
+class TestWithinBudget:
+    """Listings that fit in the documented budget no longer pay for fixed sleeps."""
+
+    def test_zdx_three_page_listing(self, standin, zdx):
+        standin.state.items["devices"] = 25
+        devices, elapsed = timed(zdx.devices.list_devices)
+        assert len(devices) == 25
+        assert len(standin.state.calls("GET", "/v1/devices")) == 3
+        # Previously at least 5s per request, i.e. 15s for this listing.
+        assert elapsed < 2
+        assert standin.state.throttled == 0
+
+    def test_zpa_get_paginated_data(self, standin, zpa_client):
+        standin.state.items["server"] = 100
+        (servers, error), elapsed = timed(zpa_client.get_paginated_data, path="/server", pagesize=20)
+        assert error is None
+        assert len(servers) == 100
+        # Previously followed by an unconditional 2s sleep.
+        assert elapsed < 1.5
+        assert standin.state.throttled == 0
+
+    def test_zia_iterator_listing(self, standin, zia_client):
+        standin.state.items["greTunnels"] = 25
+        tunnels, elapsed = timed(zia_client.traffic.list_gre_tunnels)
+        assert len(tunnels) == 25
+        # Previously slept 1s after every page.
+        assert elapsed < 1.5
+        assert standin.state.throttled == 0
+
+
+class TestBudgetExhausted:
+    """Once the budget is spent, the client's rate limiter paces requests instead of the API rejecting them."""
+
+    def test_zpa_pages_are_paced_by_the_limiter(self, standin, zpa_client):
+        standin.state.items["server"] = 100
+        standin.state.limits = {"zpa": {"GET": (4, 0.5)}}
+        zpa_client.rate_limiter.get_limit = 4
+        zpa_client.rate_limiter.get_freq = 0.5
+        (servers, error), elapsed = timed(zpa_client.get_paginated_data, path="/server", pagesize=10)
+        assert len(servers) == 100
+        # 10 requests in windows of 4: two full waits, each request counted once.
+        assert 0.9 < elapsed < 2
+        assert standin.state.throttled == 0
+
+    def test_zia_pages_are_paced_by_the_limiter(self, standin, zia_client):
+        standin.state.items["users"] = 50
+        standin.state.limits = {"zia": {"GET": (2, 0.3)}}
+        zia_client.rate_limiter.get_freq = 0.3
+        (users, error), elapsed = timed(zia_client.get_paginated_data, path="/users", pagesize=10)
+        assert len(users) == 50
+        # 6 requests in windows of 2.
+        assert 0.55 < elapsed < 1.5
+        assert standin.state.throttled == 0
+
+    def test_stand_in_rejects_requests_over_budget(self, standin, zia_client):
+        standin.state.limits = {"zia": {"GET": (2, 60)}}
+        zia_client.rate_limiter.get_limit = 100
+        responses = [zia_client.session.get(f"{standin.url}/api/v1/users") for _ in range(3)]
+        assert [r.status_code for r in responses] == [200, 200, 429]
+        assert int(responses[2].headers["Retry-After"]) > 0
+        assert standin.state.throttled == 1
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+from zscaler.ratelimiter.ratelimiter import RateLimiter
+
+
+class TestParallelPagination:
+    def test_pages_are_fetched_concurrently_and_kept_in_order(self, standin, zpa_client):
+        standin.state.items["server"] = 95
+        standin.state.latency = 0.05
+        servers = zpa_client.servers.list_servers(pagesize=10, max_workers=4)
+        assert [s.name for s in servers] == [f"server-{i:05d}" for i in range(95)]
+        assert len(standin.state.calls("GET", "/server")) == 10
+        assert 1 < standin.state.max_in_flight <= 4
+
+    def test_max_items_and_max_pages_limit_the_scheduled_pages(self, standin, zpa_client):
+        standin.state.items["server"] = 200
+        servers, error = zpa_client.get_paginated_data(path="/server", pagesize=10, max_items=35, max_workers=8)
+        assert error is None
+        assert [s.name for s in servers] == [f"server-{i:05d}" for i in range(35)]
+        assert len(standin.state.calls("GET", "/server")) == 4
+
+        servers, _ = zpa_client.get_paginated_data(path="/server", pagesize=10, max_pages=3, max_workers=8)
+        assert len(servers) == 30
+        assert len(standin.state.calls("GET", "/server")) == 7
+
+    def test_workers_stay_within_the_rate_limit(self, standin, zpa_client):
+        standin.state.items["server"] = 60
+        zpa_client.rate_limiter = RateLimiter(get_limit=3, post_put_delete_limit=3, get_freq=0.2, post_put_delete_freq=0.2)
+        zpa_client.pagination_workers = 8
+        servers, _ = zpa_client.get_paginated_data(path="/server", pagesize=10)
+        assert len(servers) == 60
+        assert standin.state.max_in_flight <= 3
+
+
+class TestRateLimiterAcquire:
+    def test_acquire_waits_until_the_window_frees_up(self):
+        limiter = RateLimiter(get_limit=2, post_put_delete_limit=2, get_freq=0.1, post_put_delete_freq=0.1)
+        assert limiter.acquire("GET") == 0
+        assert limiter.acquire("GET") == 0
+        assert limiter.acquire("GET") > 0
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import asyncio
+import json
+import pstats
+
+import pytest
+
+from tests.unit.conftest import STANDIN_CLOUD
+from zscaler import profiling
+from zscaler.cache.cached_response import CachedResponse
+from zscaler.constants import ZPA_BASE_URLS
+from zscaler.profiling import Profiler
+from zscaler.utils import format_json_response
+
+SERVERS = "/mgmtconfig/v1/admin/customers/{id}/server"
+
+
+def check_speedscope(document):
+    """Checks that the events of every profile open and close their frames as a stack."""
+    assert document["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+    for profile in document["profiles"]:
+        stack = []
+        last = 0
+        for event in profile["events"]:
+            assert event["at"] >= last
+            last = event["at"]
+            if event["type"] == "O":
+                stack.append(event["frame"])
+            else:
+                assert stack.pop() == event["frame"]
+        assert stack == []
+
+
+class TestInactive:
+    def test_nothing_is_recorded_outside_of_a_block(self, standin, zpa_client):
+        prof = Profiler()
+        zpa_client.get("/server/1")
+        assert not profiling.active()
+        assert profiling.phase(profiling.NETWORK) is profiling.phase(profiling.DECODE)
+        assert prof.stats() == {}
+
+    def test_the_block_is_not_reentrant(self):
+        with Profiler() as prof:
+            with pytest.raises(RuntimeError, match="already running"):
+                prof.__enter__()
+        assert not profiling.active()
+
+
+class TestPhases:
+    def test_phases_per_endpoint(self, standin, zpa_client):
+        standin.state.items["server"] = 30
+        zpa_client.access_token = None
+        with zpa_client.profile() as prof:
+            servers, error = zpa_client.get_paginated_data(path="/server", pagesize=10)
+            zpa_client.get("/server/72058304855000001")
+        assert error is None and len(servers) == 30
+        stats = prof.stats()
+        assert set(stats) == {SERVERS, SERVERS + "/{id}"}
+        assert set(stats[SERVERS]) == {"auth", "network", "decode", "convert", "box"}
+        assert stats[SERVERS]["auth"][0] == 1
+        assert stats[SERVERS]["network"][0] == 3
+        assert stats[SERVERS]["decode"][0] == 3
+        assert stats[SERVERS + "/{id}"]["network"][0] == 1
+        assert all(seconds > 0 for phases in stats.values() for _, seconds in phases.values())
+        assert sum(seconds for phases in stats.values() for _, seconds in phases.values()) < prof.wall_time
+
+    def test_rate_limiter_waits(self, standin, zpa_client):
+        zpa_client.rate_limiter.get_limit = 1
+        zpa_client.rate_limiter.get_freq = 0.2
+        with zpa_client.profile() as prof:
+            zpa_client.get("/server/1")
+            zpa_client.get("/server/2")
+        count, seconds = prof.stats()[SERVERS + "/{id}"]["throttle"]
+        assert count == 1
+        assert 0.1 < seconds < 0.3
+
+    def test_pagination_workers_are_profiled(self, standin, zpa_client):
+        standin.state.items["server"] = 50
+        with zpa_client.profile() as prof:
+            zpa_client.get_paginated_data(path="/server", pagesize=10, max_workers=4)
+        assert prof.stats()[SERVERS]["network"][0] == 5
+
+    def test_cached_responses(self):
+        resp = CachedResponse(200, {"Content-Type": "application/json"}, b'{"fooBar": 1}', url="https://x/api/v1/users/1")
+        with Profiler() as prof:
+            assert format_json_response(resp).foo_bar == 1
+            assert format_json_response(resp).foo_bar == 1
+        stats = prof.stats()["/api/v1/users/{id}"]
+        assert {name: count for name, (count, _) in stats.items()} == {"decode": 1, "convert": 1, "box": 2}
+
+    @pytest.mark.asyncio
+    async def test_asyncio_tasks(self, standin, monkeypatch):
+        from zscaler.zpa.aio import AsyncZPAClientHelper
+
+        monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+        monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+        async with AsyncZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD) as zpa:
+            zpa.access_token = None
+            with zpa.profile() as prof:
+                await asyncio.gather(*(zpa.get(f"/server/{i}") for i in range(5)))
+        stats = prof.stats()[SERVERS + "/{id}"]
+        assert stats["network"][0] == 5 and stats["auth"][0] == 1
+        check_speedscope(prof._speedscope())
+
+
+class TestOutput:
+    @pytest.fixture
+    def prof(self, standin, zpa_client):
+        standin.state.items["server"] = 20
+        with zpa_client.profile() as prof:
+            zpa_client.get_paginated_data(path="/server", pagesize=10)
+            zpa_client.get("/server/1")
+        return prof
+
+    def test_report(self, prof):
+        lines = prof.report().splitlines()
+        assert lines[0].split() == ["endpoint", "requests", "auth", "throttle", "network", "decode", "convert", "box", "total"]
+        assert lines[2].split()[:2] == [SERVERS, "2"]
+        assert lines[3].split()[:2] == [SERVERS + "/{id}", "1"]
+        assert lines[4].split()[:2] == ["total", "3"]
+        assert lines[5].startswith("wall time ")
+
+    def test_speedscope(self, prof, tmp_path):
+        path = tmp_path / "profile.json"
+        prof.dump(str(path))
+        document = json.loads(path.read_text())
+        check_speedscope(document)
+        frames = [frame["name"] for frame in document["shared"]["frames"]]
+        assert f"network {SERVERS}" in frames and f"box {SERVERS}" in frames
+
+    def test_pstats(self, prof, tmp_path):
+        path = tmp_path / "profile.prof"
+        prof.dump(str(path), format="pstats")
+        stats = pstats.Stats(str(path)).stats
+        assert stats[(SERVERS, 0, "network")][:2] == (2, 2)
+
+    def test_cprofile(self, standin, zpa_client, tmp_path):
+        path = tmp_path / "profile.prof"
+        with zpa_client.profile(cprofile=True) as prof:
+            zpa_client.get("/server/1")
+        prof.dump(str(path), format="pstats")
+        functions = {function for _, _, function in pstats.Stats(str(path)).stats}
+        assert "format_json_response" in functions
+
+    def test_invalid_format(self, prof):
+        with pytest.raises(ValueError, match="Invalid dump format"):
+            prof.dump("profile.txt", format="text")
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import threading
+import time
+
+import pytest
+
+from zscaler.ratelimiter.ratelimiter import RateLimiter
+
+
+def limiter(limit=3, freq=1.0):
+    return RateLimiter(get_limit=limit, post_put_delete_limit=limit, get_freq=freq, post_put_delete_freq=freq)
+
+
+class TestReservations:
+    def test_slots_never_exceed_the_window(self):
+        rl = limiter(limit=3, freq=1.0)
+        delays = [rl.reserve("GET") for _ in range(7)]
+        assert delays[:3] == pytest.approx([0, 0, 0], abs=0.01)
+        assert delays[3:6] == pytest.approx([1, 1, 1], abs=0.01)
+        assert delays[6] == pytest.approx(2, abs=0.01)
+
+    def test_methods_are_budgeted_per_class(self):
+        rl = limiter(limit=1)
+        assert rl.reserve("GET") == pytest.approx(0, abs=0.01)
+        assert rl.reserve("post") == pytest.approx(0, abs=0.01)
+        assert rl.reserve("PATCH") == pytest.approx(1, abs=0.01)
+        assert rl.reserve("OPTIONS") == 0
+
+    def test_wait_only_records_allowed_requests(self):
+        rl = limiter(limit=1)
+        assert rl.wait("GET") == (False, 0)
+        should_wait, delay = rl.wait("GET")
+        assert should_wait and delay == pytest.approx(1, abs=0.01)
+        assert rl.reserve("GET") == pytest.approx(1, abs=0.01)
+
+    def test_concurrent_callers_are_served_in_order(self):
+        rl = limiter(limit=2, freq=0.1)
+        started = []
+        lock = threading.Lock()
+
+        def worker(index):
+            rl.acquire("GET")
+            with lock:
+                started.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        begin = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        started.sort()
+        assert started[-1] - begin == pytest.approx(0.3, abs=0.08)
+        # No more than two requests start within any window.
+        assert all(started[i + 2] - started[i] >= 0.09 for i in range(len(started) - 2))
+
+    def test_resizing_keeps_the_recent_history(self):
+        rl = limiter(limit=3)
+        for _ in range(3):
+            rl.reserve("GET")
+        rl.get_limit = 1
+        assert rl.get_limit == 1
+        assert rl.reserve("GET") == pytest.approx(1, abs=0.01)
+        rl.get_freq = 5
+        assert rl.reserve("GET") == pytest.approx(6, abs=0.01)
+
+
+class TestHeaders:
+    def test_limit_headers_add_enforced_windows(self):
+        rl = limiter(limit=100)
+        rl.update_limits({"X-RateLimit-Limit-Minute": "3", "X-RateLimit-Remaining-Minute": "2"}, "GET")
+        delays = [rl.reserve("GET") for _ in range(4)]
+        assert delays[3] == pytest.approx(60, abs=0.01)
+        assert rl.reserve("DELETE") == pytest.approx(0, abs=0.01)
+
+    def test_exhausted_window_blocks_until_reset(self):
+        rl = limiter(limit=100)
+        rl.update_limits({"X-RateLimit-Limit-Hour": "1000", "X-RateLimit-Remaining-Hour": "0", "X-RateLimit-Reset": "30"})
+        assert rl.reserve("GET") == pytest.approx(30, abs=0.01)
+        assert rl.reserve("PUT") == pytest.approx(30, abs=0.01)
+
+    def test_draft_headers_with_epoch_reset(self):
+        rl = limiter(limit=100)
+        reset = str(int(time.time()) + 10)
+        rl.update_limits({"RateLimit-Limit": "5", "RateLimit-Remaining": "0", "RateLimit-Reset": reset}, "GET")
+        assert rl.reserve("GET") == pytest.approx(10, abs=1)
+
+    def test_block_after_too_many_requests(self):
+        rl = limiter(limit=100)
+        rl.block("GET", 2)
+        assert rl.reserve("GET") == pytest.approx(2, abs=0.01)
+        assert rl.reserve("POST") == pytest.approx(0, abs=0.01)
+
+
+class TestClientIntegration:
+    def test_zpa_retries_after_the_retry_after_delay(self, standin, zpa_client):
+        standin.state.limits = {"zpa": {"GET": (2, 1)}}
+        zpa_client.rate_limiter.get_limit = 100
+        start = time.monotonic()
+        servers = [zpa_client.servers.get_server(str(i)) for i in range(3)]
+        assert [s.id for s in servers] == ["0", "1", "2"]
+        assert standin.state.throttled == 1
+        assert 0.9 < time.monotonic() - start < 2
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from tests.unit.conftest import STANDIN_CLOUD
+from zscaler.cache.refresh import BackgroundRefresher
+from zscaler.cache.zscaler_cache import ZscalerCache
+from zscaler.constants import ZPA_BASE_URLS
+
+
+@pytest.fixture
+def swr_cache():
+    return ZscalerCache(ttl=0.3, tti=60, stale_while_revalidate=60)
+
+
+class TestBackgroundRefresher:
+    def test_refreshes_a_key_once_at_a_time(self):
+        refresher = BackgroundRefresher()
+        release = threading.Event()
+        calls = []
+
+        def refresh():
+            calls.append(1)
+            release.wait(1)
+
+        assert refresher.schedule("a", refresh)
+        assert not refresher.schedule("a", refresh)
+        assert refresher.refreshing("a")
+        release.set()
+        refresher.join()
+        assert not refresher.refreshing("a")
+        assert refresher.schedule("a", refresh)
+        refresher.join()
+        assert len(calls) == 2
+        assert refresher.stats() == {"refreshed": 2, "failed": 0, "pending": 0}
+
+    def test_failures_are_counted(self):
+        refresher = BackgroundRefresher()
+        refresher.schedule("a", lambda: 1 / 0)
+        refresher.join()
+        assert refresher.stats()["failed"] == 1
+
+    def test_refresh_stale_sends_the_params_the_entry_was_cached_under(self):
+        cache, refresher, sent = ZscalerCache(ttl=60, tti=60, stale_while_revalidate=60), BackgroundRefresher(), []
+        now = [1000.0]
+        cache._get_current_time = lambda: now[0]
+        cache.add("a", 1)
+        params = {"page": 1}
+        assert not refresher.refresh_stale(cache, "a", sent.append, params)
+
+        now[0] += 61
+        assert refresher.refresh_stale(cache, "a", sent.append, params)
+        params["page"] = 2
+        refresher.join()
+        assert sent == [{"page": 1}]
+
+
+class TestStaleWhileRevalidate:
+    def test_stale_hits_do_not_wait_for_the_network(self, standin, swr_cache, monkeypatch):
+        from zscaler.zpa import ZPAClientHelper
+
+        monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+        client = ZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD, cache=swr_cache)
+        standin.state.latency = 0.3
+        client.app_segments.get_segment("1")
+        time.sleep(0.35)
+        key = next(iter(swr_cache._store))
+        assert swr_cache.freshness(key)["stale"]
+
+        start = time.monotonic()
+        assert client.app_segments.get_segment("1").id == "1"
+        assert time.monotonic() - start < 0.2
+        client.refresher.join()
+        assert not swr_cache.freshness(key)["stale"]
+        assert len(standin.state.calls("GET", "/application/1")) == 2
+        client.app_segments.get_segment("1")
+        assert len(standin.state.calls("GET", "/application/1")) == 2
+        client.session.close()
+
+    @pytest.mark.parametrize("product", ["zpa", "zia"])
+    def test_stale_pages_of_a_pagination_refresh_themselves(self, standin, swr_cache, product, monkeypatch):
+        from zscaler.zia import ZIAClientHelper
+        from zscaler.zpa import ZPAClientHelper
+
+        monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+        if product == "zpa":
+            client = ZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD, cache=swr_cache)
+            path, resource = "/server", "server"
+        else:
+            client = ZIAClientHelper(
+                cloud="zscaler",
+                api_key="1234567890abcdef",
+                username="admin@example.com",
+                password="password",
+                override_url=f"{standin.url}/api/v1",
+                cache=swr_cache,
+            )
+            path, resource = "/users", "users"
+        client.rate_limiter.get_limit = 1000
+        standin.state.items[resource] = 50
+        client.get_paginated_data(path=path, pagesize=20)
+        pages = [parse_qs(urlsplit(url).query)["page"] for _, url in standin.state.calls("GET", path)]
+        time.sleep(0.35)
+        assert all(swr_cache.freshness(key)["stale"] for key in swr_cache._store)
+
+        # The refreshes run while the pagination moves on to the next pages
+        standin.state.latency = 0.05
+        items, _ = client.get_paginated_data(path=path, pagesize=20)
+        assert len(items) == 50
+        client.refresher.join()
+
+        assert not any(swr_cache.freshness(key)["stale"] for key in swr_cache._store)
+        # Each stale page was fetched again, rather than the page the pagination had moved on to
+        refreshed = [parse_qs(urlsplit(url).query)["page"] for _, url in standin.state.calls("GET", path)]
+        assert sorted(refreshed) == sorted(pages * 2)
+        client.session.close()
+
+    @pytest.mark.asyncio
+    async def test_async_clients_refresh_in_tasks(self, standin, swr_cache, monkeypatch):
+        from zscaler.zpa.aio import AsyncZPAClientHelper
+
+        monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+        async with AsyncZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD, cache=swr_cache) as zpa:
+            await zpa.app_segments.get_segment("1")
+            time.sleep(0.35)
+            standin.state.latency = 0.3
+            start = time.monotonic()
+            await zpa.app_segments.get_segment("1")
+            assert time.monotonic() - start < 0.2
+            assert zpa.refresher.stats()["pending"] == 1
+            await zpa.refresher.join()
+            assert zpa.refresher.stats() == {"refreshed": 1, "failed": 0, "pending": 0}
+        assert len(standin.state.calls("GET", "/application/1")) == 2
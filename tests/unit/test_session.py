@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import socket
+
+import requests
+
+from zscaler.transport.session import PooledHTTPAdapter, build_session
+
+
+class TestBuildSession:
+    def test_pool_configuration(self):
+        session = build_session(pool_connections=4, pool_maxsize=32)
+        adapter = session.get_adapter("https://config.private.zscaler.com")
+        assert isinstance(adapter, PooledHTTPAdapter)
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 32
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in adapter.socket_options
+
+    def test_pool_configuration_from_environment(self, monkeypatch):
+        monkeypatch.setenv("ZSCALER_CLIENT_POOL_MAXSIZE", "64")
+        adapter = build_session().get_adapter("https://zsapi.zscaler.net")
+        assert adapter._pool_maxsize == 64
+
+    def test_keep_alive_disabled(self):
+        session = build_session(keep_alive=False)
+        assert session.headers["Connection"] == "close"
+        assert session.get_adapter("https://zsapi.zscaler.net").socket_options is None
+
+
+class TestClientSessions:
+    def test_zpa_reuses_connection_for_login_and_calls(self, standin, zpa_client):
+        for _ in range(3):
+            assert zpa_client.get("server/1").id == "1"
+        assert standin.state.logins == 1
+        assert len(standin.state.requests) == 4
+        assert len(standin.state.peers) == 1
+
+    def test_zia_reuses_connection_for_authentication_and_calls(self, standin, zia_client):
+        zia_client.get("users")
+        zia_client.get("groups")
+        assert standin.state.calls("POST", "authenticatedSession")
+        assert len(standin.state.peers) == 1
+
+    def test_custom_session_is_used(self, standin, monkeypatch):
+        from zscaler.constants import ZPA_BASE_URLS
+        from zscaler.zpa import ZPAClientHelper
+
+        session = requests.Session()
+        monkeypatch.setitem(ZPA_BASE_URLS, "STANDIN", standin.url)
+        client = ZPAClientHelper("id", "secret", "123", "STANDIN", cache=None, session=session)
+        assert client.session is session
+        client.get("server/1")
+        assert len(standin.state.peers) == 1
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import multiprocessing
+import os
+import stat
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from zscaler.transport.session import build_session_store
+from zscaler.transport.session_store import SessionStore
+
+
+class Logins:
+    def __init__(self, duration=0):
+        self.count = 0
+        self.duration = duration
+        self.started = threading.Event()
+
+    def __call__(self):
+        self.count += 1
+        self.started.set()
+        time.sleep(self.duration)
+        return f"session{self.count}", {"passwordExpiryTime": 0}
+
+
+def zia(standin, store, **kw):
+    from zscaler.zia import ZIAClientHelper
+
+    return ZIAClientHelper(
+        cloud="zscaler",
+        api_key="1234567890abcdef",
+        username="admin@example.com",
+        password="password",
+        override_url=f"{standin.url}/api/v1",
+        session_store=store,
+        **kw,
+    )
+
+
+def hold_zia_session(url, store):
+    from zscaler.zia import ZIAClientHelper
+
+    client = ZIAClientHelper(
+        cloud="zscaler",
+        api_key="1234567890abcdef",
+        username="admin@example.com",
+        password="password",
+        override_url=f"{url}/api/v1",
+        session_store=store,
+    )
+    return client.session_id
+
+
+class TestSessionStore:
+    def test_holders_share_one_login(self, tmp_path):
+        store, login = SessionStore(str(tmp_path / "sessions.sqlite3")), Logins()
+        first = store.acquire("zia/tenant", "a", login)
+        second = SessionStore(store.path).acquire("zia/tenant", "b", login)
+        assert login.count == 1
+        assert first == second
+        assert second.auth_details == {"passwordExpiryTime": 0}
+
+    def test_file_is_private_to_its_owner(self, tmp_path):
+        store = SessionStore(str(tmp_path / "sessions" / "sessions.sqlite3"))
+        store.acquire("zia/tenant", "a", Logins())
+        for path in (store.path, f"{store.path}-wal"):
+            assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    def test_keys_have_separate_sessions(self, tmp_path):
+        store, login = SessionStore(str(tmp_path / "sessions.sqlite3")), Logins()
+        assert store.acquire("zia/tenant", "a", login).session_id == "session1"
+        assert store.acquire("zcon/tenant", "a", login).session_id == "session2"
+
+    def test_stale_sessions_are_replaced_once(self, tmp_path):
+        store, login = SessionStore(str(tmp_path / "sessions.sqlite3")), Logins()
+        store.acquire("zia/tenant", "a", login)
+        # Both holders found session1 expired: the second one gets the session of the first instead of logging in
+        assert store.acquire("zia/tenant", "a", login, stale="session1").session_id == "session2"
+        assert store.acquire("zia/tenant", "b", login, stale="session1").session_id == "session2"
+        assert login.count == 2
+
+    def test_sessions_older_than_max_age_are_replaced(self, tmp_path):
+        store, login = SessionStore(str(tmp_path / "sessions.sqlite3"), max_age=0), Logins()
+        store.acquire("zia/tenant", "a", login)
+        assert store.acquire("zia/tenant", "b", login).session_id == "session2"
+
+    def test_failed_logins_store_nothing(self, tmp_path):
+        store = SessionStore(str(tmp_path / "sessions.sqlite3"))
+
+        def login():
+            raise RuntimeError("login failed")
+
+        with pytest.raises(RuntimeError):
+            store.acquire("zia/tenant", "a", login)
+        assert store.get("zia/tenant") is None
+        assert store.acquire("zia/tenant", "a", Logins()).session_id == "session1"
+
+    def test_holders_wait_for_a_slow_login(self, tmp_path):
+        path, login = str(tmp_path / "sessions.sqlite3"), Logins(duration=1.5)
+        # Each store has its own connection: the second one waits on the SQLite lock held during the login
+        store, other = SessionStore(path), SessionStore(path, timeout=5)
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(store.acquire("zia/tenant", "a", login)))
+        thread.start()
+        login.started.wait()
+        sessions.append(other.acquire("zia/tenant", "b", login))
+        thread.join()
+        assert login.count == 1
+        assert sessions[0] == sessions[1]
+
+    def test_waiting_longer_than_the_timeout_raises(self, tmp_path):
+        path, login = str(tmp_path / "sessions.sqlite3"), Logins(duration=1)
+        store, other = SessionStore(path), SessionStore(path, timeout=0.1)
+        thread = threading.Thread(target=store.acquire, args=("zia/tenant", "a", login))
+        thread.start()
+        login.started.wait()
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            other.acquire("zia/tenant", "b", login)
+        thread.join()
+        assert login.count == 1
+
+    def test_the_last_holder_ends_the_session(self, tmp_path):
+        store, login, logouts = SessionStore(str(tmp_path / "sessions.sqlite3")), Logins(), []
+        store.acquire("zia/tenant", "a", login)
+        store.acquire("zia/tenant", "b", login)
+        assert store.release("zia/tenant", "a", logouts.append) is False
+        assert logouts == []
+        store.release("zia/tenant", "b", lambda session_id: logouts.append(session_id) or True)
+        assert logouts == ["session1"]
+        assert store.get("zia/tenant") is None
+
+    def test_holders_of_exited_processes_are_dropped(self, tmp_path):
+        store, login, logouts = SessionStore(str(tmp_path / "sessions.sqlite3")), Logins(), []
+        exited = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+        store.acquire("zia/tenant", "a", login)
+        store._connection().execute(
+            "INSERT INTO holders (key, holder, pid) VALUES (?, ?, ?)", ("zia/tenant", "b", int(exited.stdout))
+        )
+        store.release("zia/tenant", "a", lambda session_id: logouts.append(session_id) or True)
+        assert logouts == ["session1"]
+
+
+class TestBuildSessionStore:
+    def test_none_by_default(self, monkeypatch):
+        monkeypatch.delenv("ZSCALER_SESSION_STORE", raising=False)
+        assert build_session_store() is None
+
+    def test_store_from_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("ZSCALER_SESSION_STORE", str(tmp_path / "sessions.sqlite3"))
+        assert isinstance(build_session_store(), SessionStore)
+
+
+class TestClients:
+    def test_zia_clients_share_a_session(self, standin, tmp_path, monkeypatch):
+        monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+        store = str(tmp_path / "sessions.sqlite3")
+        first, second = zia(standin, store), zia(standin, store)
+        assert standin.state.logins == 1
+        assert first.session_id == second.session_id == "standin1"
+        second.users.list_users()
+        assert standin.state.calls("GET", "/users")
+
+        assert first.deauthenticate() is False
+        assert not standin.state.calls("DELETE", "/authenticatedSession")
+        # The session is still used by the second client
+        assert not second.is_session_expired()
+        assert second.deauthenticate() is True
+        assert len(standin.state.calls("DELETE", "/authenticatedSession")) == 1
+
+    def test_zia_clients_refresh_an_expired_session_once(self, standin, tmp_path, monkeypatch):
+        monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+        store = str(tmp_path / "sessions.sqlite3")
+        first, second = zia(standin, store), zia(standin, store)
+        first.authenticate()
+        second.authenticate()
+        assert standin.state.logins == 2
+        assert first.session_id == second.session_id == "standin2"
+
+    def test_zia_clients_without_a_store_log_in_each(self, standin, monkeypatch):
+        monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+        monkeypatch.delenv("ZSCALER_SESSION_STORE", raising=False)
+        zia(standin, None), zia(standin, None)
+        assert standin.state.logins == 2
+
+    def test_zcon_clients_share_a_session(self, standin, tmp_path, monkeypatch):
+        from zscaler.zcon import ZCONClientHelper
+
+        monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+        store = str(tmp_path / "sessions.sqlite3")
+        clients = [
+            ZCONClientHelper(
+                cloud="zscaler",
+                api_key="1234567890abcdef",
+                username="admin@example.com",
+                password="password",
+                override_url=f"{standin.url}/zcon/api/v1",
+                session_store=store,
+            )
+            for _ in range(3)
+        ]
+        assert standin.state.logins == 1
+        assert [client.deauthenticate() for client in clients] == [False, False, True]
+        assert len(standin.state.calls("DELETE", "/auth")) == 1
+
+    def test_processes_log_in_once(self, standin, tmp_path, monkeypatch):
+        monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+        store = str(tmp_path / "sessions.sqlite3")
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(4) as pool:
+            session_ids = pool.starmap(hold_zia_session, [(standin.url, store)] * 8)
+        assert standin.state.logins == 1
+        assert set(session_ids) == {"standin1"}
+        # The workers exited without deauthenticating: the last client left ends the session
+        assert zia(standin, store).deauthenticate() is True
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import multiprocessing
+import os
+import sqlite3
+import stat
+import threading
+
+import pytest
+
+from zscaler.ratelimiter.ratelimiter import RateLimiter, build_rate_limiter, rate_limit_key
+from zscaler.ratelimiter.shared import SharedRateLimiter
+
+
+def shared(path, key="zpa/tenant", limit=3, freq=1.0):
+    return SharedRateLimiter(limit, limit, freq, freq, key=key, path=str(path))
+
+
+def reserve_slots(path, count):
+    limiter = shared(path, limit=5)
+    return [limiter.reserve("GET") for _ in range(count)]
+
+
+class TestSharedRateLimiter:
+    def test_limiters_on_the_same_key_split_the_budget(self, tmp_path):
+        store = tmp_path / "ratelimit.sqlite3"
+        first, second = shared(store), shared(store)
+        assert first.reserve("GET") == pytest.approx(0, abs=0.05)
+        assert second.reserve("GET") == pytest.approx(0, abs=0.05)
+        assert first.reserve("GET") == pytest.approx(0, abs=0.05)
+        assert second.reserve("GET") == pytest.approx(1, abs=0.05)
+        assert second.reserve("POST") == pytest.approx(0, abs=0.05)
+
+    def test_file_is_private_to_its_owner(self, tmp_path):
+        limiter = shared(tmp_path / "ratelimit" / "ratelimit.sqlite3")
+        limiter.reserve("GET")
+        assert stat.S_IMODE(os.stat(limiter.path).st_mode) == 0o600
+
+    def test_keys_have_separate_budgets(self, tmp_path):
+        store = tmp_path / "ratelimit.sqlite3"
+        first, other = shared(store, limit=1), shared(store, key="zpa/other", limit=1)
+        assert first.reserve("GET") == pytest.approx(0, abs=0.05)
+        assert other.reserve("GET") == pytest.approx(0, abs=0.05)
+
+    def test_blocks_from_one_process_apply_to_all(self, tmp_path):
+        store = tmp_path / "ratelimit.sqlite3"
+        first, second = shared(store, limit=100), shared(store, limit=100)
+        headers = {"X-RateLimit-Limit-Hour": "1000", "X-RateLimit-Remaining-Hour": "0", "X-RateLimit-Reset": "5"}
+        first.update_limits(headers, "GET")
+        assert second.reserve("GET") == pytest.approx(5, abs=0.05)
+        first.block("PUT", 2)
+        assert second.reserve("PUT") == pytest.approx(2, abs=0.05)
+
+    def test_threads_share_one_connection_per_thread(self, tmp_path):
+        limiter = shared(tmp_path / "ratelimit.sqlite3", limit=4, freq=0.2)
+        delays = []
+        threads = [threading.Thread(target=lambda: delays.append(limiter.reserve("GET"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(round(d, 1) for d in delays) == [0.0] * 4 + [0.2] * 4
+
+    def test_processes_never_exceed_the_budget_together(self, tmp_path):
+        store = tmp_path / "ratelimit.sqlite3"
+        shared(store)  # creates the schema
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(4) as pool:
+            pool.starmap(reserve_slots, [(str(store), 5)] * 4)
+        with sqlite3.connect(store) as conn:
+            slots = [at for at, in conn.execute("SELECT at FROM spends WHERE window_name = 'primary' ORDER BY at")]
+        assert len(slots) == 20
+        # 5 requests per second in total, not per process.
+        assert all(slots[i + 5] - slots[i] >= 0.99 for i in range(len(slots) - 5))
+        assert slots[-1] - slots[0] == pytest.approx(3, abs=0.2)
+
+
+class TestBuildRateLimiter:
+    def test_local_by_default(self, monkeypatch):
+        monkeypatch.delenv("ZSCALER_RATE_LIMIT_STORE", raising=False)
+        limiter = build_rate_limiter(20, 10, 10, 10, key=rate_limit_key("zpa", "PRODUCTION", "123"))
+        assert type(limiter) is RateLimiter
+
+    def test_store_from_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("ZSCALER_RATE_LIMIT_STORE", str(tmp_path / "ratelimit.sqlite3"))
+        limiter = build_rate_limiter(20, 10, 10, 10, key=rate_limit_key("zpa", "PRODUCTION", "123"))
+        assert isinstance(limiter, SharedRateLimiter)
+        assert limiter.key.startswith("zpa/")
+        assert "123" not in limiter.key
+
+    def test_clients_of_one_tenant_stay_within_its_budget(self, standin, zpa_client, tmp_path):
+        from zscaler.zpa import ZPAClientHelper
+
+        store = str(tmp_path / "ratelimit.sqlite3")
+        standin.state.items["server"] = 60
+        standin.state.limits = {"zpa": {"GET": (4, 0.5)}}
+        clients = [
+            ZPAClientHelper("client_id", "client_secret", "123456789", zpa_client.cloud, rate_limit_store=store)
+            for _ in range(2)
+        ]
+        for client in clients:
+            client.rate_limiter.get_limit = 4
+            client.rate_limiter.get_freq = 0.5
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda c=c: results.append(c.get_paginated_data(path="/server", pagesize=10)))
+            for c in clients
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [len(servers) for servers, _ in results] == [60, 60]
+        assert standin.state.throttled == 0
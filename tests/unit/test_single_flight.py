@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tests.unit.conftest import STANDIN_CLOUD
+from zscaler.constants import ZPA_BASE_URLS
+from zscaler.transport.single_flight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_run(self):
+        flight = SingleFlight()
+        runs = []
+        barrier = threading.Barrier(8)
+
+        def call():
+            runs.append(1)
+            time.sleep(0.2)
+            return object()
+
+        def worker(_):
+            barrier.wait()
+            return flight.do("key", call)
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(worker, range(8)))
+        assert len(runs) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.stats() == {"requests": 1, "coalesced": 7, "in_flight": 0}
+
+    def test_errors_reach_every_caller_and_later_calls_run_again(self):
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def failing():
+            started.set()
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        errors = []
+
+        def waiter():
+            started.wait()
+            try:
+                flight.do("key", lambda: "not run")
+            except ValueError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        with pytest.raises(ValueError):
+            flight.do("key", failing)
+        thread.join()
+        assert len(errors) == 1
+        assert flight.do("key", lambda: "ran") == "ran"
+        assert flight.do("other", lambda: "ran") == "ran"
+        assert flight.stats()["requests"] == 3
+
+    @pytest.mark.asyncio
+    async def test_async_calls_share_one_run(self):
+        flight = AsyncSingleFlight()
+        runs = []
+
+        async def call(value):
+            runs.append(value)
+            await asyncio.sleep(0.05)
+            return value
+
+        results = await asyncio.gather(*(flight.do("key", lambda i=i: call(i)) for i in range(5)))
+        assert results == [0] * 5
+        assert runs == [0]
+        assert flight.stats() == {"requests": 1, "coalesced": 4, "in_flight": 0}
+
+
+class TestCoalescedClients:
+    def test_threads_share_one_request_without_cache(self, standin, zpa_client):
+        standin.state.latency = 0.2
+        barrier = threading.Barrier(6)
+
+        def get(segment_id):
+            barrier.wait()
+            return zpa_client.app_segments.get_segment(segment_id)
+
+        with ThreadPoolExecutor(6) as pool:
+            segments = list(pool.map(get, ["1", "1", "1", "1", "2", "2"]))
+        assert [s.id for s in segments] == ["1", "1", "1", "1", "2", "2"]
+        assert segments[0] is not segments[1]
+        assert len(standin.state.calls("GET", "/application/1")) == 1
+        assert len(standin.state.calls("GET", "/application/2")) == 1
+        assert zpa_client.single_flight.stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_coroutines_share_one_request(self, standin, monkeypatch):
+        from zscaler.zpa.aio import AsyncZPAClientHelper
+
+        monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+        monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+        standin.state.latency = 0.1
+        async with AsyncZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD) as zpa:
+            segments = await asyncio.gather(*(zpa.app_segments.get_segment("7") for _ in range(5)))
+            assert zpa.single_flight.stats()["coalesced"] == 4
+        assert [s.id for s in segments] == ["7"] * 5
+        assert len(standin.state.calls("GET", "/application/7")) == 1
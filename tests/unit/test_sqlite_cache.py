@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import multiprocessing
+import os
+import stat
+
+from tests.unit.conftest import STANDIN_CLOUD
+from zscaler.cache.cached_response import CachedResponse
+from zscaler.cache.sqlite_cache import SQLiteCache
+from zscaler.cache.zscaler_cache import build_cache
+from zscaler.constants import ZPA_BASE_URLS, ZPA_CACHE_DEPENDENCIES
+from zscaler.transport.response import build_response
+
+BASE = "config.private.zscaler.com/mgmtconfig/v1/admin/customers/1"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(path, clock=None, ttl=60, tti=30, **kwargs):
+    cache = SQLiteCache(ttl=ttl, tti=tti, path=str(path), **kwargs)
+    if clock is not None:
+        cache._get_current_time = clock
+    return cache
+
+
+def make_response(body='{"id": "1", "name": "idp"}'):
+    return build_response("GET", "https://example.com/idp", 200, {"Content-Type": "application/json"}, body)
+
+
+def read_key(path, key):
+    value = SQLiteCache(ttl=60, tti=30, path=path).get(key)
+    return value.json() if value is not None else None
+
+
+class TestSQLiteCache:
+    def test_entries_survive_the_cache_object(self, tmp_path):
+        path = tmp_path / "cache" / "responses.sqlite3"
+        make_cache(path).add("a", make_response())
+        cache = make_cache(path)
+        assert cache.contains("a")
+        value = cache.get("a")
+        assert isinstance(value, CachedResponse)
+        assert value.json() == {"id": "1", "name": "idp"}
+        assert value.headers["content-type"] == "application/json"
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    def test_ttl_and_tti(self, tmp_path):
+        clock = Clock()
+        cache = make_cache(tmp_path / "c.sqlite3", clock, ttl=100, tti=30)
+        cache.add("a", make_response())
+        cache.add("b", make_response())
+        for _ in range(3):
+            clock.now += 25
+            assert cache.get("a") is not None
+        assert not cache.contains("b")
+        clock.now += 25
+        assert cache.get("a") is None
+        cache.add("c", make_response())
+        assert len(cache) == 1
+
+    def test_only_responses_are_cached(self, tmp_path):
+        cache = make_cache(tmp_path / "c.sqlite3")
+        cache.add("a", {"not": "a response"})
+        assert not cache.contains("a")
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        clock = Clock()
+        cache = make_cache(tmp_path / "c.sqlite3", clock, max_entries=2)
+        for key in "abc":
+            clock.now += 1
+            cache.add(key, make_response())
+            if key == "b":
+                clock.now += 1
+                cache.get("a")
+        assert sorted(key for key in "abc" if cache.contains(key)) == ["a", "c"]
+
+    def test_invalidate_matches_the_in_memory_cache(self, tmp_path):
+        cache = make_cache(tmp_path / "c.sqlite3")
+        for path in (
+            "application?page=1",
+            "application/123",
+            "application/123/mappings",
+            "application/456",
+            "segmentGroup",
+            "segmentGroup/7",
+            "server",
+        ):
+            cache.add(f"{BASE}/{path}", make_response())
+        cache.invalidate(f"{BASE}/application/123", {"application": ("segmentGroup",)})
+        assert [path for path in ("application/456", "server") if cache.contains(f"{BASE}/{path}")] == [
+            "application/456",
+            "server",
+        ]
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["invalidations"] == 5
+
+    def test_invalidate_ignores_the_api_version_and_keeps_unrelated_entries(self, tmp_path):
+        cache = make_cache(tmp_path / "c.sqlite3")
+        for path in ("policySet/9/rule/5", "policySet/rules/policyType/ACCESS_POLICY?page=1", "server"):
+            cache.add(f"{BASE}/{path}", make_response())
+        cache.invalidate(BASE.replace("/v1/", "/v2/") + "/policySet/9/rule", ZPA_CACHE_DEPENDENCIES)
+        assert cache.stats()["entries"] == 1
+
+        unrelated = ("idp", "samlAttribute", "application/5", "segmentGroup")
+        for path in unrelated:
+            cache.add(f"{BASE}/{path}", make_response())
+        cache.invalidate(f"{BASE}/server/9", ZPA_CACHE_DEPENDENCIES)
+        assert all(cache.contains(f"{BASE}/{path}") for path in unrelated)
+        assert cache.stats()["invalidations"] == 3
+
+    def test_paths_stored_with_their_api_version_are_migrated(self, tmp_path):
+        cache = make_cache(tmp_path / "c.sqlite3")
+        cache.add(f"{BASE}/policySet/9/rule/5", make_response())
+        cache._connection().execute("UPDATE responses SET path = key")
+        cache = make_cache(tmp_path / "c.sqlite3")
+        cache.invalidate(BASE.replace("/v1/", "/v2/") + "/policySet/9/rule/5")
+        assert cache.stats()["entries"] == 0
+        assert cache.stats()["invalidations"] == 1
+
+    def test_snapshots_skip_expired_entries(self, tmp_path):
+        clock = Clock()
+        cache = make_cache(tmp_path / "c.sqlite3", clock, ttl=100, tti=100)
+        cache.add("old", make_response())
+        clock.now += 50
+        cache.add("new", make_response())
+        cache.export_snapshot(tmp_path / "snapshot.sqlite3")
+
+        clock.now += 60
+        other = make_cache(tmp_path / "other.sqlite3", clock)
+        assert other.import_snapshot(tmp_path / "snapshot.sqlite3") == 1
+        assert other.contains("new") and not other.contains("old")
+
+    def test_processes_read_concurrently(self, tmp_path):
+        path = str(tmp_path / "c.sqlite3")
+        make_cache(path).add("a", make_response())
+        with multiprocessing.get_context("spawn").Pool(3) as pool:
+            values = pool.starmap(read_key, [(path, "a")] * 6)
+        assert values == [{"id": "1", "name": "idp"}] * 6
+
+    def test_build_cache_uses_the_configured_path(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("ZSCALER_CLIENT_CACHE_PATH", str(tmp_path / "env.sqlite3"))
+        cache = build_cache(ttl=60, tti=30)
+        assert isinstance(cache, SQLiteCache)
+        assert cache.path == str(tmp_path / "env.sqlite3")
+
+
+def test_client_processes_start_warm(standin, tmp_path, monkeypatch):
+    from zscaler.zpa import ZPAClientHelper
+
+    monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "true")
+    monkeypatch.setenv("ZSCALER_CLIENT_CACHE_PATH", str(tmp_path / "zpa.sqlite3"))
+    monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+    for _ in range(2):
+        client = ZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD)
+        assert client.app_segments.get_segment("42").server_groups[0].name == "server-group-0"
+        client.session.close()
+    assert len(standin.state.calls("GET", "/application/42")) == 1
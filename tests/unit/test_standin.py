@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+"""Tests of the stand-in server, and of the clients of the products it emulates against it."""
+
+import pytest
+import requests
+
+from tests.standin.app import DOCUMENTED_LIMITS, product_of
+from tests.standin.server import StandInServer
+
+
+@pytest.mark.parametrize(
+    "path, product",
+    [
+        ("/mgmtconfig/v1/admin/customers/1/server", "zpa"),
+        ("/api/v1/users", "zia"),
+        ("/v1/devices", "zdx"),
+        ("/zcon/api/v1/ecgroup", "zcon"),
+        ("/zcc/papi/public/v1/getDevices", "zcc"),
+        ("/favicon.ico", None),
+    ],
+)
+def test_product_of(path, product):
+    assert product_of(path) == product
+
+
+class TestProducts:
+    def test_zpa_crud(self, standin, zpa_client):
+        created = zpa_client.post("/server", json={"name": "server-1", "address": "10.0.0.1"})
+        assert created.name == "server-1" and created.id
+        assert zpa_client.put("/server/1", json={"name": "server-1"}).status_code == 204
+        assert zpa_client.delete("/server/1").status_code == 204
+        assert standin.state.created == 1
+
+    def test_zia_crud(self, standin, zia_client):
+        zia_client.rate_limiter.post_put_delete_limit = 100
+        assert zia_client.get("/users/7").id == 7
+        created = zia_client.post("/users", json={"name": "user-1", "email": "user1@example.com"})
+        assert created.name == "user-1" and created.id == 10001
+        assert zia_client.put("/users/10001", json={"name": "user-2"}).name == "user-2"
+        assert zia_client.delete("/users/10001").status_code == 204
+
+    def test_zdx_offsets(self, standin, zdx_client):
+        standin.state.items["devices"] = 25
+        assert len(zdx_client.devices.list_devices()) == 25
+        assert len(standin.state.calls("GET", "/v1/devices")) == 3
+
+    def test_zcon_session(self, standin, zcon_client):
+        zcon_client.rate_limiter.get_limit = 100
+        assert zcon_client.session_id == "standin1"
+        standin.state.items["ecgroup"] = 25
+        groups, error = zcon_client.get_paginated_data(path="/ecgroup", data_per_page=10)
+        assert error is None
+        assert [group.name for group in groups][-1] == "ecgroup-00024"
+        assert len(standin.state.calls("GET", "/zcon/api/v1/ecgroup")) == 4
+        assert zcon_client.ecgroups.get_ec_group("12").id == 12
+        assert zcon_client.deauthenticate()
+
+    def test_zcc_devices(self, standin, zcc_client):
+        standin.state.items["device"] = 40
+        devices = zcc_client.get("getDevices", params={"page": 2, "pageSize": 30})
+        assert [device.machine_hostname for device in devices] == [f"host-{i:05d}" for i in range(30, 40)]
+        removed = zcc_client.devices.remove_devices(udids=["a", "b"])
+        assert removed.devices_removed == 2
+        assert standin.state.logins == 1
+
+
+class TestRateLimits:
+    def test_budget_headers(self):
+        limits = {"zia": {"GET": (2, 60)}}
+        with StandInServer(limits=limits, rate_limit_headers=True) as server:
+            first, second, third = [requests.get(f"{server.url}/api/v1/users") for _ in range(3)]
+        assert first.headers["RateLimit-Limit"] == first.headers["X-RateLimit-Limit-minute"] == "2"
+        assert first.headers["X-RateLimit-Remaining-minute"] == "1"
+        assert second.headers["RateLimit-Remaining"] == "0"
+        assert 58 <= int(second.headers["RateLimit-Reset"]) <= 60
+        assert third.status_code == 429 and "Retry-After" in third.headers
+
+    def test_no_headers_by_default(self, standin):
+        standin.state.limits = {"zia": {"GET": (2, 60)}}
+        assert "RateLimit-Limit" not in requests.get(f"{standin.url}/api/v1/users").headers
+
+    def test_zcc_counts_all_methods_against_one_budget(self, standin):
+        standin.state.limits = {"zcc": DOCUMENTED_LIMITS["zcc"]}
+        standin.state.rate_limit_headers = True
+        resp = requests.post(f"{standin.url}/zcc/papi/public/v1/removeDevices", json={"udids": []})
+        assert resp.headers["X-RateLimit-Remaining-hour"] == "99"
+
+    def test_clients_follow_the_headers(self, standin, zpa_client):
+        standin.state.limits = {"zpa": {"GET": (3, 1)}}
+        standin.state.rate_limit_headers = True
+        zpa_client.rate_limiter.get_limit = 100
+        servers = [zpa_client.servers.get_server(str(i)) for i in range(4)]
+        assert len(servers) == 4
+        assert standin.state.throttled == 0
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tests.standin.app import make_jwt
+from tests.unit.conftest import STANDIN_CLOUD
+from zscaler.cache.zscaler_cache import ZscalerCache, _path_segments
+from zscaler.constants import ZPA_BASE_URLS
+
+THREADS = 32
+
+
+def run_concurrently(fn, count, threads=THREADS):
+    """Calls ``fn`` with ``0..count-1`` from a pool of threads, re-raising the first error."""
+    with ThreadPoolExecutor(threads) as pool:
+        return list(pool.map(fn, range(count)))
+
+
+def keep_doing(fn, stop, interval=0.005):
+    """Starts a thread calling ``fn`` until ``stop`` is set, e.g. to replace credentials during a workload."""
+
+    def loop():
+        while not stop.is_set():
+            fn()
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop)
+    thread.start()
+    return thread
+
+
+def session_client(product, standin):
+    """A ZIA or ZCON client with a connection for each thread, sending to the stand-in."""
+    if product == "zia":
+        from zscaler.zia import ZIAClientHelper as Client
+
+        url = f"{standin.url}/api/v1"
+    else:
+        from zscaler.zcon import ZCONClientHelper as Client
+
+        url = f"{standin.url}/zcon/api/v1"
+    client = Client(
+        cloud="zscaler",
+        api_key="1234567890abcdef",
+        username="admin@example.com",
+        password="password",
+        override_url=url,
+        pool_maxsize=THREADS,
+    )
+    client.rate_limiter.get_limit = 100000
+    return client
+
+
+def trie_keys(cache):
+    return set().union(*(node.keys for node in cache._paths.walk()))
+
+
+class TestZscalerCache:
+    def test_concurrent_access_keeps_the_cache_consistent(self):
+        cache = ZscalerCache(ttl=0.01, tti=0.01, max_entries=50, stale_while_revalidate=0.01)
+
+        def work(worker):
+            rng = random.Random(worker)
+            for _ in range(300):
+                key = f"zsapi.zscaler.net/api/v1/resource{rng.randrange(5)}/{rng.randrange(30)}"
+                op = rng.random()
+                if op < 0.4:
+                    cache.add(key, f"value of {key}")
+                elif op < 0.7:
+                    value = cache.get(key)
+                    assert value is None or value == f"value of {key}"
+                elif op < 0.8:
+                    cache.contains(key)
+                    cache.is_stale(key)
+                    cache.freshness(key)
+                elif op < 0.9:
+                    cache.delete(key)
+                elif op < 0.97:
+                    cache.invalidate(key)
+                else:
+                    cache.stats()
+
+        run_concurrently(work, THREADS)
+        stats = cache.stats()
+        assert stats["entries"] == len(cache) <= 50
+        assert stats["bytes"] == sum(entry.size for entry in cache._store.values())
+        assert trie_keys(cache) == set(cache._store)
+        assert all(_path_segments(key) for key in cache._store)
+
+
+class TestSharedClients:
+    """One client instance shared by a pool of threads, as ThreadPoolExecutor workloads do."""
+
+    def test_zpa_client(self, standin, monkeypatch):
+        from zscaler.zpa import ZPAClientHelper
+
+        monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+        cache = ZscalerCache(ttl=0.05, tti=0.05, max_entries=8)
+        client = ZPAClientHelper(
+            "client_id", "client_secret", "123456789", STANDIN_CLOUD, cache=cache, pool_maxsize=THREADS
+        )
+        client.rate_limiter.get_limit = client.rate_limiter.post_put_delete_limit = 100000
+
+        def work(i):
+            if i % 5 == 0:
+                client.put(f"/server/{i % 10}", json={"name": f"server {i}"})
+                return None
+            return client.get(f"/server/{i % 10}").id
+
+        stop, expired = threading.Event(), []
+
+        def expire():
+            expired.append(True)
+            client.access_token = make_jwt(-60)
+
+        # Tokens expire while the threads send requests
+        expiring = keep_doing(expire, stop, interval=0.05)
+        try:
+            ids = run_concurrently(work, 640)
+        finally:
+            stop.set()
+            expiring.join()
+        client.tokens.join()
+
+        assert [server_id for server_id in ids if server_id is not None] == [
+            str(i % 10) for i in range(640) if i % 5
+        ]
+        assert standin.state.unauthenticated == 0
+        # One login per expired token, not one per thread finding it expired
+        assert standin.state.logins <= 1 + len(expired)
+        assert cache.stats()["entries"] <= 8
+        client.session.close()
+
+    @pytest.mark.parametrize("product", ["zia", "zcon"])
+    def test_session_clients_log_in_once_when_the_session_expires(self, standin, product, monkeypatch):
+        monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+        client = session_client(product, standin)
+        standin.state.login_latency = 0.2
+        client.auth_details = None
+
+        items = run_concurrently(lambda i: client.get(f"/users/{i}"), 64)
+
+        assert standin.state.logins == 2
+        assert [item.id for item in items] == list(range(64))
+        assert standin.state.unauthenticated == 0
+        client.session.close()
+
+    @pytest.mark.parametrize("product", ["zia", "zcon"])
+    def test_session_clients_survive_sessions_replaced_mid_flight(self, standin, product, monkeypatch):
+        monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+        client = session_client(product, standin)
+
+        stop = threading.Event()
+        replacing = keep_doing(client.authenticate, stop)
+        try:
+            items = run_concurrently(lambda i: client.get(f"/users/{i}"), 320)
+        finally:
+            stop.set()
+            replacing.join()
+
+        assert [item.id for item in items] == list(range(320))
+        assert standin.state.logins > 2
+        assert standin.state.unauthenticated == 0
+        client.session.close()
+
+    def test_zcc_client(self, standin):
+        from zscaler.zcc import ZCCClientHelper
+
+        zcc_client = ZCCClientHelper(
+            apikey="apikey", secret_key="secret_key", cloud="zscaler", override_url=f"{standin.url}/zcc", pool_maxsize=THREADS
+        )
+        zcc_client.rate_limiter.get_limit = 100000
+        standin.state.login_latency = 0.1
+        standin.state.items["device"] = 30 * THREADS
+
+        stop = threading.Event()
+        expiring = keep_doing(lambda: setattr(zcc_client, "auth_token", None), stop, interval=0.05)
+        try:
+            pages = run_concurrently(lambda page: zcc_client.get("getDevices", params={"page": page + 1}), THREADS * 4)
+        finally:
+            stop.set()
+            expiring.join()
+
+        assert [len(devices) for devices in pages] == [30] * THREADS + [0] * THREADS * 3
+        assert standin.state.unauthenticated == 0
+        zcc_client.session.close()
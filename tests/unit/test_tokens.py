@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tests.standin.app import make_jwt
+from tests.unit.conftest import STANDIN_CLOUD
+from zscaler.constants import ZPA_BASE_URLS
+from zscaler.transport import tokens
+from zscaler.transport.tokens import EXPIRY_MARGIN, AsyncTokenRefresher, TokenRefresher, token_expiry
+
+
+def test_token_expiry():
+    now = time.time()
+    assert now + 3600 - EXPIRY_MARGIN - 2 < token_expiry(make_jwt(3600)) <= now + 3600 - EXPIRY_MARGIN
+    assert token_expiry("eyJhbGciOiJub25lIn0.e30.signature") == math.inf
+    assert token_expiry("not-a-jwt") == 0
+    assert token_expiry("a.!!!.c") == 0
+    assert token_expiry(None) == 0
+
+
+class Login:
+    """Issues a new token on each call, optionally after waiting for ``gate``."""
+
+    def __init__(self, ttl=3600, delay=0.0, gate=None, error=None):
+        self.ttl = ttl
+        self.delay = delay
+        self.gate = gate
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait()
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        # Distinct tokens even within the same second
+        return make_jwt(self.ttl + self.calls)
+
+
+class TestTokenRefresher:
+    def test_expiry_is_read_once_per_token(self, monkeypatch):
+        reads = []
+        monkeypatch.setattr(tokens, "token_expiry", lambda token: reads.append(token) or time.time() + 3600)
+        refresher = TokenRefresher(Login())
+        token = refresher.get()
+        assert all(refresher.get() == token for _ in range(100))
+        assert reads == [token]
+
+    def test_concurrent_callers_share_one_login(self):
+        login = Login(delay=0.2)
+        refresher = TokenRefresher(login)
+        with ThreadPoolExecutor(16) as pool:
+            issued = set(pool.map(lambda _: refresher.get(), range(16)))
+        assert login.calls == 1
+        assert issued == {refresher.token}
+
+    def test_expired_tokens_are_replaced_once(self):
+        login = Login(delay=0.2)
+        refresher = TokenRefresher(login)
+        refresher.set(make_jwt(-60))
+        with ThreadPoolExecutor(16) as pool:
+            issued = set(pool.map(lambda _: refresher.get(), range(16)))
+        assert login.calls == 1 and len(issued) == 1
+
+    def test_next_token_is_obtained_in_the_background(self):
+        gate = threading.Event()
+        login = Login(gate=gate)
+        refresher = TokenRefresher(login)
+        refresher.set(current := make_jwt(3600))
+        refresher.refresh_at = 0
+
+        start = time.monotonic()
+        assert [refresher.get() for _ in range(10)] == [current] * 10
+        assert time.monotonic() - start < 0.1
+        gate.set()
+        refresher.join()
+        assert login.calls == 1 and refresher.refreshed == 1
+        assert refresher.get() != current and refresher.refresh_at > time.time()
+
+    def test_short_lived_tokens_are_refreshed_half_way(self):
+        refresher = TokenRefresher(Login(), refresh_before=60)
+        refresher.set(make_jwt(EXPIRY_MARGIN + 20))
+        assert refresher.expires_at - 11 <= refresher.refresh_at <= refresher.expires_at - 9
+
+    def test_failed_background_refreshes_keep_the_token(self):
+        login = Login(error=RuntimeError("signin failed"))
+        refresher = TokenRefresher(login)
+        refresher.set(current := make_jwt(3600))
+        refresher.refresh_at = 0
+        assert refresher.get() == current
+        refresher.join()
+        # Tried again after a pause, not by every request
+        assert [refresher.get() for _ in range(10)] == [current] * 10
+        refresher.join()
+        assert login.calls == 1 and refresher.failed == 1
+
+    def test_failed_logins_are_raised(self):
+        refresher = TokenRefresher(Login(error=RuntimeError("signin failed")))
+        with pytest.raises(RuntimeError, match="signin failed"):
+            refresher.get()
+
+
+class TestAsyncTokenRefresher:
+    pytestmark = pytest.mark.asyncio
+
+    async def test_concurrent_coroutines_share_one_login(self):
+        calls = []
+
+        async def login():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return make_jwt(3600)
+
+        refresher = AsyncTokenRefresher(login)
+        issued = await asyncio.gather(*(refresher.get() for _ in range(16)))
+        assert len(calls) == 1 and set(issued) == {refresher.token}
+
+    async def test_next_token_is_obtained_in_a_task(self):
+        release = asyncio.Event()
+
+        async def login():
+            await release.wait()
+            return make_jwt(7200)
+
+        refresher = AsyncTokenRefresher(login)
+        refresher.set(current := make_jwt(3600))
+        refresher.refresh_at = 0
+        assert await refresher.get() == current
+        release.set()
+        await refresher.join()
+        assert refresher.token != current and refresher.refreshed == 1
+
+
+class TestClients:
+    def test_zpa_requests_do_not_wait_for_the_next_token(self, standin, zpa_client):
+        zpa_client.rate_limiter.get_limit = 1000
+        standin.state.login_latency = 0.5
+        standin.state.token_ttl = 7200
+        logins, expires_at = standin.state.logins, zpa_client.tokens.expires_at
+        zpa_client.tokens.refresh_at = 0
+
+        start = time.monotonic()
+        for i in range(5):
+            zpa_client.get(f"/server/{i}")
+        assert time.monotonic() - start < 0.4
+        zpa_client.tokens.join()
+        assert standin.state.logins == logins + 1
+        assert zpa_client.tokens.expires_at > expires_at + 3000
+
+    def test_zpa_threads_do_not_stampede_the_login(self, standin, zpa_client):
+        zpa_client.rate_limiter.get_limit = 1000
+        standin.state.login_latency = 0.2
+        zpa_client.access_token = make_jwt(-60)
+        logins = standin.state.logins
+        with ThreadPoolExecutor(8) as pool:
+            servers = list(pool.map(lambda i: zpa_client.get(f"/server/{i}"), range(16)))
+        assert standin.state.logins == logins + 1
+        assert [server.id for server in servers] == [str(i) for i in range(16)]
+
+    def test_zcc_threads_do_not_stampede_the_login(self, standin, zcc_client):
+        zcc_client.rate_limiter.get_limit = 1000
+        standin.state.login_latency = 0.2
+        zcc_client.auth_token = None
+        logins = standin.state.logins
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda page: zcc_client.get("getDevices", params={"page": page}), range(1, 9)))
+        assert standin.state.logins == logins + 1
+
+    @pytest.mark.asyncio
+    async def test_async_zpa_coroutines_do_not_stampede_the_login(self, standin, monkeypatch):
+        from zscaler.zpa.aio import AsyncZPAClientHelper
+
+        monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+        async with AsyncZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD) as zpa:
+            zpa.rate_limiter.get_limit = 1000
+            zpa.access_token = None
+            logins = standin.state.logins
+            await asyncio.gather(*(zpa.get(f"/server/{i}") for i in range(16)))
+            assert standin.state.logins == logins + 1
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import logging
+import time
+import uuid
+
+import pytest
+import requests
+
+from zscaler import tracing
+from zscaler.utils import dump_request, dump_response
+
+LOGGER = logging.getLogger("zscaler-sdk-python")
+
+
+class UnreadableResponse(requests.Response):
+    @property
+    def content(self):
+        raise AssertionError("the body was read")
+
+
+def make_response(content=b'{"id": "1"}', headers=None):
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.headers.update(headers or {"Content-Type": "application/json"})
+    resp._content = content
+    return resp
+
+
+class TestDisabled:
+    def test_does_no_work_when_info_is_disabled(self, trace_logs, monkeypatch):
+        monkeypatch.setattr(tracing, "_render_request", pytest.fail)
+        logging.disable(logging.INFO)
+        dump_request(LOGGER, "https://x/y", "POST", {"a": 1}, None, {"Authorization": "Bearer x"}, uuid.uuid4())
+        dump_response(LOGGER, "https://x/y", "GET", UnreadableResponse(), None, uuid.uuid4(), time.time())
+        assert trace_logs.records == []
+
+    def test_renders_only_what_a_handler_emits(self, trace_logs, monkeypatch):
+        rendered = []
+        monkeypatch.setattr(tracing, "_render_request", lambda *args: rendered.append(args) or "request")
+        logger = logging.getLogger("zscaler-sdk-python.test-tracing")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        handler = logging.StreamHandler()
+        handler.setLevel(logging.WARNING)
+        logger.addHandler(handler)
+        try:
+            dump_request(logger, "https://x/y", "POST", b"{}", None, {}, uuid.uuid4())
+        finally:
+            logger.removeHandler(handler)
+        assert rendered == []
+
+        dump_request(LOGGER, "https://x/y", "POST", b"{}", None, {}, uuid.uuid4())
+        assert trace_logs.records[0].getMessage() == "request"
+        assert trace_logs.records[0].getMessage() == "request"
+        assert len(rendered) == 1
+
+
+class TestTraces:
+    def test_structured_fields(self, trace_logs):
+        request_uuid = uuid.uuid4()
+        dump_request(LOGGER, "https://x/y", "POST", b"{}", None, {}, request_uuid)
+        dump_response(LOGGER, "https://x/y", "POST", make_response(), {"page": 2}, request_uuid, time.time(), True)
+        request, response = (record.zscaler_trace for record in trace_logs.records)
+        assert request == {"event": "request", "uuid": str(request_uuid), "method": "POST", "url": "https://x/y"}
+        assert response["event"] == "response"
+        assert response["url"] == "https://x/y?page=2"
+        assert response["status_code"] == 200
+        assert response["from_cache"] is True
+        assert response["size"] == 11
+        assert "FROM CACHE" in trace_logs.records[1].getMessage()
+
+    def test_redacts_credentials(self, trace_logs):
+        headers = {"Authorization": "Bearer secret-1", "Cookie": "JSESSIONID=secret-2", "Accept": "*/*"}
+        body = b'{"username": "admin", "password": "secret-3", "apiKey": "secret-4"}'
+        dump_request(LOGGER, "https://x/zscsb/submit?api_token=secret-5&force=1", "POST", body, None, headers, "1")
+        resp = make_response(b'{"token": "secret-6", "expires": 3600}', {"Set-Cookie": "JSESSIONID=secret-7"})
+        dump_response(LOGGER, "https://x/zscsb/discan", "POST", resp, {"api_token": "secret-8"}, "1", time.time())
+        assert "secret" not in trace_logs.text
+        assert "Accept: */*" in trace_logs.text
+        assert '"username": "admin"' in trace_logs.text
+        assert '"expires": 3600' in trace_logs.text
+        assert "force=1" in trace_logs.text
+        assert trace_logs.text.count(tracing.REDACTED) == 8
+
+    def test_truncates_bodies(self, trace_logs):
+        tracing.configure(body_limit=16)
+        resp = make_response(b'{"password": "secret-value-cut", "id": 1}')
+        dump_response(LOGGER, "https://x/y", "GET", resp, None, "1", time.time())
+        assert '{"password": "<redacted>"... [25 more bytes]' in trace_logs.text
+        assert "secret" not in trace_logs.text
+
+        tracing.configure(body_limit=0)
+        assert tracing.render_body(b"x" * 10000) == "x" * 10000
+
+    def test_samples_requests_with_their_responses(self, trace_logs):
+        tracing.configure(sample_rate=0)
+        dump_request(LOGGER, "https://x/y", "GET", None, None, {}, uuid.uuid4())
+        assert trace_logs.records == []
+
+        tracing.configure(sample_rate=0.25)
+        for _ in range(400):
+            request_uuid = uuid.uuid4()
+            dump_request(LOGGER, "https://x/y", "GET", None, None, {}, request_uuid)
+            dump_response(LOGGER, "https://x/y", "GET", make_response(), None, request_uuid, time.time())
+        traces = [record.zscaler_trace for record in trace_logs.records]
+        requests_traced = {trace["uuid"] for trace in traces if trace["event"] == "request"}
+        assert requests_traced == {trace["uuid"] for trace in traces if trace["event"] == "response"}
+        assert 50 < len(requests_traced) < 150
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError):
+            tracing.TraceSettings(body_limit=-1)
+        with pytest.raises(ValueError):
+            tracing.TraceSettings(sample_rate=2)
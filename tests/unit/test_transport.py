@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import gzip
+
+import pytest
+import requests
+
+from tests.unit.conftest import STANDIN_CLOUD
+from zscaler import tracing
+from zscaler.constants import ZPA_BASE_URLS
+from zscaler.exceptions.exceptions import CassetteMissError
+from zscaler.transport import backends
+from zscaler.transport.backends import HTTPTransport, RecordingTransport, ReplayTransport, build_transport
+from zscaler.transport.cassette import REDACTED_JWT, Cassette, redact_header, redact_payload, request_key
+from zscaler.utils import is_token_expired
+
+# Nothing listens there: replayed clients never connect
+UNREACHABLE = "http://127.0.0.1:9"
+
+
+def zpa(transport):
+    from zscaler.zpa import ZPAClientHelper
+
+    client = ZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD, transport=transport)
+    client.rate_limiter.get_limit = 100
+    return client
+
+
+def zia(url, transport):
+    from zscaler.zia import ZIAClientHelper
+
+    return ZIAClientHelper(
+        cloud="zscaler",
+        api_key="1234567890abcdef",
+        username="admin@example.com",
+        password="password",
+        override_url=f"{url}/api/v1",
+        transport=transport,
+    )
+
+
+@pytest.fixture
+def cassette_path(tmp_path):
+    return str(tmp_path / "workload.json.gz")
+
+
+@pytest.fixture
+def recorded_zpa(standin, monkeypatch, cassette_path):
+    """Records a ZPA workload against the stand-in, then points the ZPA clients at an unreachable host."""
+    monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+    monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, standin.url)
+    standin.state.items["application"] = 45
+    with RecordingTransport(cassette_path) as transport:
+        client = zpa(transport)
+        segments = client.app_segments.list_segments(pagesize=20)
+        client.post("/server", json={"name": "server-1"})
+    monkeypatch.setitem(ZPA_BASE_URLS, STANDIN_CLOUD, UNREACHABLE)
+    return segments
+
+
+class TestRedaction:
+    def test_payload(self):
+        payload = {"token_type": "Bearer", "access_token": "a.b.c", "nested": [{"password": "secret", "name": "n"}]}
+        assert redact_payload(payload) == {
+            "token_type": "Bearer",
+            "access_token": REDACTED_JWT,
+            "nested": [{"password": tracing.REDACTED, "name": "n"}],
+        }
+
+    def test_redacted_jwts_never_expire(self):
+        assert not is_token_expired(REDACTED_JWT)
+
+    def test_headers(self):
+        assert redact_header("Set-Cookie", "JSESSIONID=abc; Path=/; Secure") == "JSESSIONID=<redacted>; Path=/; Secure"
+        assert redact_header("Authorization", "Bearer abc") == tracing.REDACTED
+        assert redact_header("Content-Type", "application/json") == "application/json"
+
+    def test_request_key(self):
+        assert request_key("get", "https://zsapi.zscaler.net/api/v1/users?page=2&api_token=x") == (
+            "GET",
+            "/api/v1/users?page=2&api_token=<redacted>",
+        )
+
+
+class TestRecordReplay:
+    def test_cassette_is_compact_and_redacted(self, recorded_zpa, cassette_path):
+        with gzip.open(cassette_path, "rb") as f:
+            content = f.read().decode()
+        cassette = Cassette.load(cassette_path)
+        assert [(i["method"], i["url"].split("?")[0].rsplit("/", 1)[1]) for i in cassette.interactions] == [
+            ("POST", "signin"),
+            ("GET", "application"),
+            ("GET", "application"),
+            ("GET", "application"),
+            ("POST", "server"),
+        ]
+        assert REDACTED_JWT in content
+        assert "client_secret" not in content and "127.0.0.1" not in content
+
+    def test_replay(self, recorded_zpa, cassette_path):
+        client = zpa(ReplayTransport(cassette_path))
+        assert client.app_segments.list_segments(pagesize=20) == recorded_zpa
+        assert client.post("/server", json={"name": "server-1"}).name == "server-1"
+
+    def test_workloads_can_be_replayed_again(self, recorded_zpa, cassette_path):
+        client = zpa(ReplayTransport(cassette_path))
+        for _ in range(3):
+            assert len(client.app_segments.list_segments(pagesize=20)) == 45
+
+    def test_unrecorded_requests_raise(self, recorded_zpa, cassette_path):
+        client = zpa(ReplayTransport(cassette_path))
+        with pytest.raises(CassetteMissError, match="GET /mgmtconfig/v1/admin/customers/123456789/server/1"):
+            client.get("/server/1")
+
+    def test_zia_session_cookies(self, standin, cassette_path):
+        with RecordingTransport(cassette_path) as transport:
+            assert zia(standin.url, transport).get("/users", params={"page": 1}) is not None
+        client = zia(UNREACHABLE, ReplayTransport(cassette_path))
+        assert client.session_id == tracing.REDACTED
+        assert client.get("/users", params={"page": 1})[0].name == "users-00000"
+
+    @pytest.mark.asyncio
+    async def test_asyncio_clients_replay_recordings(self, recorded_zpa, cassette_path):
+        from zscaler.zpa.aio import AsyncZPAClientHelper
+
+        transport = ReplayTransport(cassette_path)
+        client = AsyncZPAClientHelper("client_id", "client_secret", "123456789", STANDIN_CLOUD, transport=transport)
+        async with client:
+            assert await client.app_segments.list_segments(pagesize=20) == recorded_zpa
+
+    @pytest.mark.asyncio
+    async def test_asyncio_clients_record(self, standin, cassette_path):
+        from zscaler.zdx.aio import AsyncZDX
+
+        standin.state.items["devices"] = 25
+        with RecordingTransport(cassette_path) as transport:
+            zdx = AsyncZDX(client_id="id", client_secret="secret", override_url=f"{standin.url}/v1", transport=transport)
+            async with zdx:
+                devices = await zdx.devices.list_devices()
+        replayed = [i for i in Cassette.load(cassette_path).interactions if i["url"].startswith("/v1/devices")]
+        assert len(replayed) == 3 and len(devices) == 25
+
+    def test_zdx_iterator(self, standin, cassette_path, monkeypatch):
+        from zscaler.zdx import ZDX
+
+        monkeypatch.setenv("ZSCALER_CLIENT_CACHE_ENABLED", "false")
+        standin.state.items["devices"] = 25
+        with RecordingTransport(cassette_path) as transport:
+            recorded = ZDX(client_id="id", client_secret="secret", override_url=f"{standin.url}/v1", transport=transport)
+            devices = recorded.devices.list_devices()
+        calls = len(standin.state.requests)
+        replayed = ZDX(
+            client_id="id", client_secret="secret", override_url=f"{UNREACHABLE}/v1", transport=ReplayTransport(cassette_path)
+        )
+        assert replayed.devices.list_devices() == devices
+        assert len(standin.state.requests) == calls
+
+
+class TestBuildTransport:
+    @pytest.fixture(autouse=True)
+    def transports(self, monkeypatch):
+        monkeypatch.setattr(backends, "_transports", {})
+
+    def test_default(self, monkeypatch):
+        monkeypatch.delenv("ZSCALER_CLIENT_TRANSPORT", raising=False)
+        assert type(build_transport()) is HTTPTransport
+
+    def test_given(self):
+        transport = ReplayTransport(Cassette())
+        assert build_transport(transport) is transport
+
+    def test_replay_from_the_environment(self, monkeypatch, tmp_path):
+        path = str(tmp_path / "cassette.json")
+        Cassette().save(path)
+        monkeypatch.setenv("ZSCALER_CLIENT_TRANSPORT", f"replay:{path}")
+        transport = build_transport()
+        assert isinstance(transport, ReplayTransport)
+        assert build_transport() is transport
+
+    @pytest.mark.parametrize("setting", ["replay", "record:", "http:x", "ftp:x"])
+    def test_invalid(self, monkeypatch, setting):
+        monkeypatch.setenv("ZSCALER_CLIENT_TRANSPORT", setting)
+        with pytest.raises(ValueError, match="Invalid transport"):
+            build_transport()
+
+    def test_unsupported_cassettes(self, tmp_path):
+        path = tmp_path / "cassette.json"
+        path.write_text('{"version": 0, "interactions": []}')
+        with pytest.raises(ValueError, match="Unsupported cassette"):
+            Cassette.load(str(path))
+
+
+def test_replayed_sessions_stay_offline():
+    session = ReplayTransport(Cassette()).install(requests.Session())
+    with pytest.raises(CassetteMissError):
+        session.get(f"{UNREACHABLE}/anything")
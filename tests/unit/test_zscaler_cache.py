@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import threading
+
+import pytest
+
+from zscaler.cache.zscaler_cache import ZscalerCache
+from zscaler.constants import ZPA_CACHE_DEPENDENCIES
+from zscaler.transport.response import build_response
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def make_cache(clock, ttl=60, tti=30, **kwargs):
+    cache = ZscalerCache(ttl=ttl, tti=tti, **kwargs)
+    cache._get_current_time = clock
+    return cache
+
+
+class TestExpiry:
+    def test_entries_expire_after_ttl_even_when_used(self, clock):
+        cache = make_cache(clock, ttl=100)
+        cache.add("a", "value")
+        for _ in range(3):
+            clock.now += 25
+            assert cache.get("a") == "value"
+        clock.now += 25
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_idle_entries_expire_after_tti(self, clock):
+        cache = make_cache(clock)
+        cache.add("a", 1)
+        cache.add("b", 2)
+        clock.now += 20
+        assert cache.get("a") == 1
+        clock.now += 20
+        assert cache.contains("a")
+        assert not cache.contains("b")
+        cache.add("c", 3)
+        assert len(cache) == 2
+
+    def test_replaced_and_deleted_entries_leave_no_stale_heap_items(self, clock):
+        cache = make_cache(clock)
+        for i in range(1000):
+            cache.add("key", i)
+            clock.now += 0.01
+        assert len(cache._expiry) < 100
+        cache.delete("key")
+        assert not cache.contains("key")
+        clock.now += 60
+        cache.add("other", 1)
+        assert list(cache._store) == ["other"]
+
+
+class TestBounds:
+    def test_max_entries_evicts_least_recently_used(self, clock):
+        cache = make_cache(clock, max_entries=3)
+        for key in "abc":
+            cache.add(key, key)
+        cache.get("a")
+        cache.add("d", "d")
+        assert list(cache._store) == ["c", "a", "d"]
+        assert cache.stats()["evictions"] == 1
+
+    def test_max_bytes_counts_response_bodies(self, clock):
+        cache = make_cache(clock, max_bytes=20000)
+        for i in range(5):
+            cache.add(f"url{i}", build_response("GET", f"https://example.com/{i}", 200, {}, b"x" * 6000))
+        stats = cache.stats()
+        assert stats["entries"] == 3
+        assert stats["evictions"] == 2
+        assert 18000 < stats["bytes"] <= 20000
+        cache.clear()
+        assert cache.stats()["bytes"] == 0
+
+
+class TestInvalidation:
+    BASE = "config.private.zscaler.com/mgmtconfig/v1/admin/customers/1"
+
+    def fill(self, cache, *paths):
+        for path in paths:
+            cache.add(f"{self.BASE}/{path}", path)
+
+    def cached(self, cache):
+        return sorted(key[len(self.BASE) + 1 :] for key in cache._store)
+
+    def test_write_invalidates_resource_and_its_listings_only(self, clock):
+        cache = make_cache(clock)
+        self.fill(
+            cache,
+            "application?page=1&pagesize=20",
+            "application?page=2&pagesize=20",
+            "application/123",
+            "application/123/mappings",
+            "application/456",
+            "segmentGroup",
+            "server",
+        )
+        cache.invalidate(f"{self.BASE}/application/123")
+        assert self.cached(cache) == ["application/456", "segmentGroup", "server"]
+        assert cache.stats()["invalidations"] == 4
+
+    def test_write_invalidates_dependent_collections(self, clock):
+        cache = make_cache(clock)
+        self.fill(cache, "application/456", "segmentGroup", "segmentGroup/7", "server", "policySet/policyType/ACCESS_POLICY")
+        cache.invalidate(f"{self.BASE}/application/123", {"application": ("segmentGroup",)})
+        assert self.cached(cache) == ["application/456", "policySet/policyType/ACCESS_POLICY", "server"]
+
+        cache.invalidate(f"{self.BASE}/policySet/9/rule/5", {"rule": ("policyType",)})
+        assert self.cached(cache) == ["application/456", "server"]
+
+    def test_writes_invalidate_the_reads_of_every_api_version(self, clock):
+        cache = make_cache(clock)
+        self.fill(
+            cache,
+            "policySet/9/rule/5",
+            "policySet/policyType/ACCESS_POLICY",
+            "policySet/rules/policyType/ACCESS_POLICY?page=1&pagesize=20",
+            "server",
+        )
+        cache.invalidate(self.BASE.replace("/v1/", "/v2/") + "/policySet/9/rule", ZPA_CACHE_DEPENDENCIES)
+        assert self.cached(cache) == ["server"]
+
+    def test_writes_keep_the_unrelated_entries(self, clock):
+        cache = make_cache(clock)
+        self.fill(cache, "idp", "samlAttribute", "application/5", "segmentGroup")
+        cache.invalidate(f"{self.BASE}/server/9", ZPA_CACHE_DEPENDENCIES)
+        cache.invalidate(f"{self.BASE}/provisioningKey/associationType/CONNECTOR_GRP/7", ZPA_CACHE_DEPENDENCIES)
+        assert self.cached(cache) == ["application/5", "idp", "samlAttribute", "segmentGroup"]
+        assert cache.stats()["invalidations"] == 0
+
+        cache.invalidate(f"{self.BASE}/idp/3", ZPA_CACHE_DEPENDENCIES)
+        assert self.cached(cache) == ["application/5", "segmentGroup"]
+
+    def test_trie_is_pruned_as_entries_go(self, clock):
+        cache = make_cache(clock, max_entries=2)
+        self.fill(cache, "application/1", "application/2", "server/3")
+        cache.delete(f"{self.BASE}/server/3")
+        cache.invalidate(f"{self.BASE}/application/2")
+        assert cache._paths.children == {}
+        cache.add("host/a?x=1", 1)
+        cache.clear()
+        assert cache._paths.children == {}
+
+
+class TestStaleWhileRevalidate:
+    def test_expired_entries_are_served_stale_during_grace(self, clock):
+        cache = make_cache(clock, ttl=60, tti=60, stale_while_revalidate=30)
+        cache.add("a", 1)
+        clock.now += 50
+        assert not cache.is_stale("a")
+        assert cache.freshness("a") == {"age": 50, "expires_in": 10, "removed_in": 40, "stale": False, "hits": 0}
+        clock.now += 20
+        assert cache.contains("a") and cache.get("a") == 1
+        assert cache.is_stale("a")
+        assert cache.freshness("a")["stale"] and cache.freshness("a")["hits"] == 1
+        clock.now += 15
+        assert cache.get("a") == 1 and cache.is_stale("a")
+        clock.now += 10
+        assert cache.get("a") is None and cache.freshness("a") is None
+        assert cache.stats()["stale_hits"] == 2
+
+    def test_replacing_an_entry_makes_it_fresh(self, clock):
+        cache = make_cache(clock, ttl=60, tti=60, stale_while_revalidate=30)
+        cache.add("a", 1)
+        clock.now += 70
+        cache.add("a", 2)
+        assert not cache.is_stale("a") and cache.get("a") == 2
+
+    def test_no_grace_by_default(self, clock):
+        cache = make_cache(clock, ttl=60, tti=60)
+        cache.add("a", 1)
+        clock.now += 60
+        assert not cache.contains("a") and not cache.is_stale("a")
+
+
+class TestCounters:
+    def test_hits_and_misses(self, clock):
+        cache = make_cache(clock)
+        cache.add("a", 1)
+        assert cache.contains("a") and cache.get("a") == 1
+        assert not cache.contains("b")
+        assert cache.get("b") is None
+        assert cache.stats() | {"bytes": 0} == {
+            "hits": 1,
+            "misses": 2,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+            "stale_hits": 0,
+            "entries": 1,
+            "bytes": 0,
+        }
+
+    def test_shared_between_threads(self):
+        cache = ZscalerCache(ttl=60, tti=30, max_entries=50)
+
+        def worker(n):
+            for i in range(2000):
+                key = f"k{(i * n) % 80}"
+                if cache.get(key) is None:
+                    cache.add(key, i)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(1, 9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.stats()
+        assert stats["hits"] + stats["misses"] == 16000
+        assert stats["entries"] == len(cache._store) <= 50
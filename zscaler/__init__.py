@@ -31,8 +31,16 @@ __contributors__ = [
 ]
 __version__ = "0.10.0"
 
-from zscaler.zdx import ZDXClientHelper  # noqa
-from zscaler.zia import ZIAClientHelper  # noqa
-from zscaler.zpa import ZPAClientHelper  # noqa
-from zscaler.zcon import ZCONClientHelper  # noqa
-from zscaler.zcc import ZCCClientHelper  # noqa
+from zscaler.lazy import lazy_attributes
+
+# The product packages are imported on first use, so that scripts only pay for the products they use
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "ZDXClientHelper": "zscaler.zdx",
+        "ZIAClientHelper": "zscaler.zia",
+        "ZPAClientHelper": "zscaler.zpa",
+        "ZCONClientHelper": "zscaler.zcon",
+        "ZCCClientHelper": "zscaler.zcc",
+    },
+)
@@ -6,6 +6,9 @@ class Cache:
     This is the ABSTRACT class that defines a Cache object for the ZPA Client
     """
 
+    # Whether the cache stores anything, so that lookups can count as hits and misses
+    enabled = True
+
     def __init__(self):
         pass
 
@@ -72,6 +75,33 @@ class Cache:
         """
         raise NotImplementedError
 
+    def is_stale(self, key):
+        """
+        A method which checks if the value of the key has expired and is
+        only served until it is refreshed. Caches that do not serve
+        expired values never have stale entries.
+
+        Arguments:
+            key {str} -- The key used to check the desired value
+
+        Returns:
+            bool -- Whether the value is stale
+        """
+        return False
+
+    def invalidate(self, key, dependencies=None):
+        """
+        A method which removes the entries made stale by a write to the
+        resource identified by key. Caches that cannot tell which entries
+        depend on the resource are emptied.
+
+        Arguments:
+            key {str} -- The key of the written resource, as built by create_key
+            dependencies {dict} -- Collections to invalidate along with a
+            resource, by resource collection name
+        """
+        self.clear()
+
     def create_key(self, request, params):
         """
         A method used to create a unique key for an entry in the cache.
@@ -0,0 +1,153 @@
+import datetime
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from zscaler import codec, profiling
+from zscaler.profiling import BOX
+
+
+def _thaw(data):
+    """Returns a mutable copy of decoded JSON data, lists and dicts included."""
+    if isinstance(data, dict):
+        return {key: _thaw(value) if isinstance(value, (dict, list, tuple)) else value for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_thaw(value) if isinstance(value, (dict, list, tuple)) else value for value in data]
+    return data
+
+
+class CachedResponse(requests.Response):
+    """
+    A successful GET response as kept in the cache.
+
+    Only the status, headers, URL and body of the original response are kept: the connection, the request,
+    which carries the credentials, and the cookie jar are dropped. The body is decoded and converted to
+    snake_case once, the first time the response is formatted, and that payload is then shared by every hit
+    on the cache entry. It is never handed out as is: :func:`zscaler.utils.format_json_response` returns a
+    fresh :class:`Box` built from it on each call, and :meth:`view` a read-only frozen one, so callers cannot
+    change what the next hit gets.
+
+    It is a :class:`requests.Response`, so cached and live responses can be used interchangeably.
+    """
+
+    def __init__(self, status_code, headers=None, content=b"", url=None, reason=None, encoding=None, elapsed=None):
+        # Response.__init__ is skipped on purpose: it sets up the cookie jar and connection state that a
+        # cached response has no use for.
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self._content = content
+        self._content_consumed = True
+        self._next = None
+        self.raw = None
+        self.url = url
+        self.reason = reason
+        self.encoding = encoding
+        self.history = []
+        self.cookies = requests.cookies.RequestsCookieJar()
+        self.elapsed = elapsed if elapsed is not None else datetime.timedelta(0)
+        self.request = None
+        self._payload = None
+        self._snake_case = None
+        self._view = None
+
+    @classmethod
+    def from_response(cls, resp):
+        """Builds the cached form of a :class:`requests.Response`, returning cached responses unchanged."""
+        if isinstance(resp, cls):
+            return resp
+        return cls(
+            resp.status_code,
+            headers=resp.headers,
+            content=resp.content,
+            url=resp.url,
+            reason=resp.reason,
+            encoding=resp.encoding,
+            elapsed=getattr(resp, "elapsed", None),
+        )
+
+    def __getstate__(self):
+        names = ("status_code", "headers", "_content", "url", "reason", "encoding")
+        return {name: getattr(self, name, None) for name in names}
+
+    def __setstate__(self, state):
+        self.__init__(
+            state["status_code"],
+            headers=state["headers"],
+            content=state["_content"],
+            url=state["url"],
+            reason=state["reason"],
+            encoding=state["encoding"],
+        )
+
+    def payload(self):
+        """
+        Returns the body decoded, with the keys as sent by the API. The payload is shared by all the hits on
+        the cache entry and must not be modified.
+        """
+        if self._payload is None:
+            self._payload = codec.decode_response(self)
+        return self._payload
+
+    def snake_case(self):
+        """
+        Returns the body decoded and converted to snake_case. The payload is shared by all the hits on the
+        cache entry and must not be modified; use :meth:`copy_payload`, :meth:`view` or format the response.
+        """
+        if self._snake_case is None:
+            from zscaler.utils import convert_keys_to_snake
+
+            self._snake_case = convert_keys_to_snake(self.payload())
+        return self._snake_case
+
+    def format(self, output="box", box_attrs=None):
+        """
+        Returns the payload in one of the output modes of :func:`zscaler.utils.format_payload`. The ``box``,
+        ``dict`` and ``raw`` modes return a copy; the ``lazy`` mode a read-only view of the shared payload.
+        """
+        if output == "raw":
+            return _thaw(self.payload())
+        if output == "lazy":
+            from zscaler.utils import format_payload
+
+            return format_payload(self.payload(), "lazy")
+        return self.copy_payload(box_attrs, conv_box=output == "box")
+
+    def copy_payload(self, box_attrs=None, conv_box=True):
+        """
+        Returns a mutable copy of the snake_case payload.
+
+        Args:
+            box_attrs (dict): The attributes the :class:`Box` is created with.
+            conv_box (bool): Whether to return a :class:`Box`/:class:`BoxList` or plain dicts and lists.
+        """
+        data = self.snake_case()
+        if not conv_box:
+            return _thaw(data)
+        from box import Box, BoxList
+
+        # Box and BoxList copy the containers they are built from.
+        with profiling.phase(BOX):
+            if isinstance(data, list):
+                return BoxList(data, **(box_attrs or {}))
+            if isinstance(data, dict):
+                return Box(data, **(box_attrs or {}))
+        return data
+
+    def view(self):
+        """
+        Returns a read-only view of the snake_case payload, built once and shared by every caller: a frozen
+        :class:`Box`, or a tuple of them, in which nested lists are tuples. Use it to read a few fields of a
+        large response without copying it.
+        """
+        if self._view is None:
+            from box import Box
+
+            data = self.snake_case()
+            with profiling.phase(BOX):
+                if isinstance(data, list):
+                    self._view = tuple(Box(item, frozen_box=True) if isinstance(item, dict) else item for item in data)
+                elif isinstance(data, dict):
+                    self._view = Box(data, frozen_box=True)
+                else:
+                    self._view = data
+        return self._view
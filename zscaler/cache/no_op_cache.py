@@ -13,6 +13,8 @@ class NoOpCache(Cache):
     Implementing the zscaler.cache.cache.Cache abstract class.
     """
 
+    enabled = False
+
     def __init__(self):
         super()
 
@@ -59,6 +61,12 @@ class NoOpCache(Cache):
         """
         pass
 
+    def invalidate(self, key, dependencies=None):
+        """
+        This is a void method. Nothing is cached, so nothing can be stale.
+        """
+        pass
+
     def clear(self):
         """
         This is a void method. No need to clear when nothing's stored.
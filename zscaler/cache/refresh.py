@@ -0,0 +1,174 @@
+import logging
+import queue
+import threading
+
+logger = logging.getLogger("zscaler-sdk-python")
+
+
+class BackgroundRefresher:
+    """
+    Refreshes stale cache entries in background threads, so that the callers reading them are served the
+    stale value right away instead of waiting for the network.
+
+    A key is refreshed once at a time: scheduling it again while its refresh is queued or running does
+    nothing. Refreshes run the client's own request path, so they go through its rate limiter and store
+    the fresh response in the cache like any other GET request.
+
+    Args:
+        workers (int): Number of refresh threads. They are started on first use and exit with the process.
+    """
+
+    def __init__(self, workers=1):
+        self.workers = workers
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._threads = []
+        self._lock = threading.Lock()
+        self.refreshed = 0
+        self.failed = 0
+
+    def schedule(self, key, fn):
+        """
+        Queues ``fn()`` to refresh ``key``, unless a refresh of ``key`` is already queued or running.
+
+        Returns:
+            bool: Whether the refresh was queued.
+        """
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+            if len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name="zscaler-cache-refresh", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        self._queue.put((key, fn))
+        logger.info(f'Scheduled background refresh of stale cache entry "{key}".')
+        return True
+
+    def refresh_stale(self, cache, key, send, params=None):
+        """
+        Queues ``send(params)`` to refresh ``key`` if its entry in ``cache`` is stale, see :meth:`schedule`.
+
+        Args:
+            cache: The cache holding the entry.
+            key (str): The cache key of the entry.
+            send (callable): Sends the request of the entry again, bypassing the cache, with the params it is given.
+            params (dict): The query parameters the entry was cached under. ``send`` is given a copy of them: the
+                caller may change them, e.g. the page of a pagination, before the refresh runs.
+
+        Returns:
+            bool: Whether the refresh was queued.
+        """
+        if not cache.is_stale(key):
+            return False
+        stale_params = dict(params) if params else params
+        return self.schedule(key, lambda: send(stale_params))
+
+    def refreshing(self, key):
+        """Returns whether a refresh of ``key`` is queued or running."""
+        with self._lock:
+            return key in self._pending
+
+    def join(self):
+        """Blocks until the refreshes queued so far are done."""
+        self._queue.join()
+
+    def stats(self):
+        """
+        Returns the counters of the refresher.
+
+        Returns:
+            dict -- The number of refreshes done and failed so far, and the number pending
+        """
+        with self._lock:
+            return {"refreshed": self.refreshed, "failed": self.failed, "pending": len(self._pending)}
+
+    def _work(self):
+        while True:
+            key, fn = self._queue.get()
+            try:
+                fn()
+            except Exception as e:
+                # The stale entry is served until the end of its grace period, or a later refresh succeeds
+                with self._lock:
+                    self.failed += 1
+                logger.warning(f'Background refresh of cache entry "{key}" failed: {e}')
+            else:
+                with self._lock:
+                    self.refreshed += 1
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+                self._queue.task_done()
+
+
+class AsyncBackgroundRefresher:
+    """
+    asyncio counterpart of :class:`BackgroundRefresher`: stale entries are refreshed in tasks of the running
+    event loop, one at a time per key.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self.refreshed = 0
+        self.failed = 0
+
+    def schedule(self, key, fn):
+        """
+        Starts a task awaiting ``fn()`` to refresh ``key``, unless a refresh of ``key`` is already running.
+
+        Returns:
+            bool: Whether the refresh was started.
+        """
+        import asyncio
+
+        if key in self._tasks:
+            return False
+        self._tasks[key] = asyncio.get_running_loop().create_task(self._refresh(key, fn))
+        logger.info(f'Scheduled background refresh of stale cache entry "{key}".')
+        return True
+
+    def refresh_stale(self, cache, key, send, params=None):
+        """
+        Starts a task awaiting ``send(params)`` to refresh ``key`` if its entry in ``cache`` is stale, see
+        :meth:`BackgroundRefresher.refresh_stale`.
+
+        Returns:
+            bool: Whether the refresh was started.
+        """
+        if not cache.is_stale(key):
+            return False
+        stale_params = dict(params) if params else params
+        return self.schedule(key, lambda: send(stale_params))
+
+    def refreshing(self, key):
+        """Returns whether a refresh of ``key`` is running."""
+        return key in self._tasks
+
+    async def join(self):
+        """Waits until the refreshes started so far are done."""
+        import asyncio
+
+        while self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def stats(self):
+        """
+        Returns the counters of the refresher.
+
+        Returns:
+            dict -- The number of refreshes done and failed so far, and the number pending
+        """
+        return {"refreshed": self.refreshed, "failed": self.failed, "pending": len(self._tasks)}
+
+    async def _refresh(self, key, fn):
+        try:
+            await fn()
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f'Background refresh of cache entry "{key}" failed: {e}')
+        else:
+            self.refreshed += 1
+        finally:
+            del self._tasks[key]
@@ -0,0 +1,331 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from zscaler.cache.cache import Cache
+from zscaler.cache.cached_response import CachedResponse
+from zscaler.cache.zscaler_cache import _path_segments
+
+logger = logging.getLogger("zscaler-sdk-python")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    url TEXT,
+    reason TEXT,
+    encoding TEXT,
+    content BLOB NOT NULL,
+    ttl REAL NOT NULL,
+    tti REAL NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_by_path ON responses (path);
+CREATE INDEX IF NOT EXISTS responses_by_use ON responses (used);
+CREATE INDEX IF NOT EXISTS responses_by_expiry ON responses (min(ttl, tti));
+"""
+
+COLUMNS = "key, path, status_code, headers, url, reason, encoding, content, ttl, tti, used"
+
+
+def _path(key):
+    """Returns the path of a cache key, ``host/path?query``, without its query, API version and trailing slash."""
+    return "/".join(_path_segments(key))
+
+
+class SQLiteCache(Cache):
+    """
+    A Cache persisted in a local SQLite file, so that short-lived processes, e.g. CLI tools and cron jobs,
+    start with the responses cached by the previous runs instead of an empty cache.
+    Implementing the zscaler.cache.cache.Cache abstract class.
+
+    Entries follow the TTL and TTI semantics of :class:`~zscaler.cache.zscaler_cache.ZscalerCache`, using
+    wall-clock time so that all processes agree on them. The file is opened in WAL mode, so any number of
+    processes can read it while one of them writes. Only responses are cached, stored as their status,
+    headers and body, never as pickles, so a cache file cannot carry code. The file is created readable by
+    its owner only, as the responses hold tenant configuration.
+
+    Examples:
+        >>> cache = SQLiteCache(ttl=3600, tti=1800, path="~/.cache/zscaler/responses.sqlite3")
+        >>> zpa = ZPAClientHelper(client_id, client_secret, customer_id, cloud, cache=cache)
+
+        Snapshots can be exported, e.g. to seed the cache of a CI runner:
+
+        >>> cache.export_snapshot("responses-snapshot.sqlite3")
+        >>> SQLiteCache(ttl=3600, tti=1800, path="/tmp/cache.sqlite3").import_snapshot("responses-snapshot.sqlite3")
+    """
+
+    def __init__(self, ttl, tti, path, max_entries=None):
+        """
+        Constructor.
+
+        Arguments:
+            ttl {float} -- Time to Live: for cache entries
+            tti {float} -- Time to Idle: for cache entries
+            path {str} -- Path of the SQLite file. It is created, with its directory, if missing
+            max_entries {int} -- Maximum number of entries, unbounded if None
+        """
+        super().__init__()
+        self._time_to_live = ttl
+        self._time_to_idle = tti
+        self.max_entries = max_entries
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        # Files written by earlier versions stored the paths with their API version
+        stored = conn.execute("SELECT key, path FROM responses").fetchall()
+        conn.executemany(
+            "UPDATE responses SET path = ? WHERE key = ?", [(_path(key), key) for key, path in stored if path != _path(key)]
+        )
+
+    def _connection(self):
+        # One connection per thread and process: SQLite connections must not cross a fork.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        """
+        Retrieves value from cache using key
+
+        Arguments:
+            key {str} -- Desired key
+
+        Returns:
+            CachedResponse -- Corresponding value to given key
+            None -- Unable to find value for this key
+        """
+        now = self._get_current_time()
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT status_code, headers, url, reason, encoding, content FROM responses "
+            "WHERE key = ? AND ttl > ? AND tti > ?",
+            (key, now, now),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        # Reset TTI
+        conn.execute("UPDATE responses SET tti = ?, used = ? WHERE key = ?", (now + self._time_to_idle, now, key))
+        self.hits += 1
+        status_code, headers, url, reason, encoding, content = row
+        logger.info(f'Got value from cache for key "{key}".')
+        return CachedResponse(
+            status_code, headers=json.loads(headers), content=content, url=url, reason=reason, encoding=encoding
+        )
+
+    def contains(self, key):
+        """
+        Returns existence of key in cache, as boolean
+
+        Arguments:
+            key {str} -- Desired key
+
+        Returns:
+            bool -- Existence of key in cache
+        """
+        now = self._get_current_time()
+        row = self._connection().execute(
+            "SELECT 1 FROM responses WHERE key = ? AND ttl > ? AND tti > ?", (key, now, now)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return False
+        return True
+
+    def add(self, key: str, value):
+        """
+        Adds a key-value pair to the cache.
+
+        Arguments:
+            key {str} -- Key in pair
+            value {requests.Response} -- The response to cache. Other values are not cached.
+        """
+        if type(key) != str or not hasattr(value, "status_code"):
+            logger.debug(f'Not caching value of type {type(value).__name__} for key "{key}".')
+            return
+        value = CachedResponse.from_response(value)
+        now = self._get_current_time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                f"INSERT OR REPLACE INTO responses ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    _path(key),
+                    value.status_code,
+                    json.dumps(dict(value.headers)),
+                    value.url,
+                    value.reason,
+                    value.encoding,
+                    value.content,
+                    now + self._time_to_live,
+                    now + self._time_to_idle,
+                    now,
+                ),
+            )
+            self._expire(conn, now)
+            if self.max_entries is not None:
+                # Evict the least recently used entries
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        logger.info(f'Added to cache value for key "{key}".')
+
+    def delete(self, key):
+        """
+        Delete a key-value pair from the cache.
+
+        Arguments:
+            key {str} -- Desired key
+        """
+        logger.info(f'Removing value from cache for key "{key}".')
+        self._connection().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        """
+        Clear the cache.
+        """
+        logger.info("Clearing the entire cache.")
+        self._connection().execute("DELETE FROM responses")
+
+    def invalidate(self, key, dependencies=None):
+        """
+        Removes the entries made stale by a write to the resource identified by ``key``: the resource and
+        everything under it, the listings of its collection and the collections declared as depending on
+        it, whatever the API version, as
+        :meth:`ZscalerCache.invalidate <zscaler.cache.zscaler_cache.ZscalerCache.invalidate>` does.
+
+        Arguments:
+            key {str} -- The key of the written resource, as built by create_key
+            dependencies {dict} -- Names of the collections embedding a resource, by the collection name of
+            the resource
+        """
+        path = _path(key)
+        segments = path.split("/")
+        # Paths the stale entries are at, and paths the stale entries are under
+        at = [path, "/".join(segments[:-1])]
+        under = [path]
+        conn = self._connection()
+        for name in segments:
+            for dependent in (dependencies or {}).get(name, ()):
+                for depth in range(len(segments) - 1, 0, -1):
+                    collection = "/".join(segments[:depth] + [dependent])
+                    if self._has_path(conn, collection):
+                        at.append(collection)
+                        under.append(collection)
+                        break
+        conditions = ["path = ?"] * len(at) + ["substr(path, 1, ?) = ?"] * len(under)
+        params = at + [value for prefix in under for value in (len(prefix) + 1, prefix + "/")]
+        removed = conn.execute(f"DELETE FROM responses WHERE {' OR '.join(conditions)}", params).rowcount
+        self.invalidations += removed
+        if removed:
+            logger.info(f'Invalidated {removed} cached values for write to "{key}".')
+
+    def _has_path(self, conn, path):
+        row = conn.execute(
+            "SELECT 1 FROM responses WHERE path = ? OR substr(path, 1, ?) = ? LIMIT 1", (path, len(path) + 1, path + "/")
+        ).fetchone()
+        return row is not None
+
+    def export_snapshot(self, path):
+        """
+        Writes a consistent copy of the cache to a new SQLite file, e.g. to seed the cache of another host.
+
+        Arguments:
+            path {str} -- Path of the snapshot file. It is replaced if it exists.
+        """
+        path = os.path.abspath(os.path.expanduser(path))
+        if os.path.exists(path):
+            os.remove(path)
+        os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+        target = sqlite3.connect(path)
+        try:
+            self._connection().backup(target)
+        finally:
+            target.close()
+        logger.info(f'Exported cache snapshot to "{path}".')
+
+    def import_snapshot(self, path):
+        """
+        Adds the unexpired entries of a snapshot made by :meth:`export_snapshot` to the cache, replacing the
+        entries with the same keys.
+
+        Arguments:
+            path {str} -- Path of the snapshot file
+
+        Returns:
+            int -- The number of entries imported
+        """
+        now = self._get_current_time()
+        source = sqlite3.connect(f"file:{os.path.abspath(os.path.expanduser(path))}?mode=ro", uri=True)
+        try:
+            rows = source.execute(f"SELECT {COLUMNS} FROM responses WHERE ttl > ? AND tti > ?", (now, now)).fetchall()
+        finally:
+            source.close()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(f"INSERT OR REPLACE INTO responses ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        logger.info(f'Imported {len(rows)} cached values from snapshot "{path}".')
+        return len(rows)
+
+    def stats(self):
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            dict -- Hits, misses and invalidations of this process so far, and the current number of entries
+            and size of the bodies in the file
+        """
+        entries, size = (
+            self._connection().execute("SELECT count(*), coalesce(sum(length(content)), 0) FROM responses").fetchone()
+        )
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def __len__(self):
+        return self._connection().execute("SELECT count(*) FROM responses").fetchone()[0]
+
+    def _expire(self, conn, now):
+        """Removes the entries that expired at time of call."""
+        conn.execute("DELETE FROM responses WHERE min(ttl, tti) <= ?", (now,))
+
+    def _get_current_time(self):
+        """
+        Helper function to get current time
+
+        Returns:
+            float: value representing the number of seconds since the epoch
+        """
+        return time.time()
@@ -1,30 +1,120 @@
+import heapq
 import logging
+import os
+import re
+import sys
+import threading
 import time
-from urllib.parse import urlparse
+from collections import OrderedDict
 
 from zscaler.cache.cache import Cache
 
 logger = logging.getLogger("zscaler-sdk-python")
 
 
+def _sizeof(value):
+    """Estimates the memory held by a cached value, counting the body of cached responses."""
+    content = getattr(value, "_content", None)
+    if isinstance(content, (bytes, bytearray)):
+        return sys.getsizeof(value) + len(content)
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ("value", "ttl", "tti", "size", "grace", "created", "hits", "scheduled")
+
+    def __init__(self, value, ttl, tti, size, grace=0, created=None):
+        self.value = value
+        self.ttl = ttl
+        self.tti = tti
+        self.size = size
+        self.grace = grace
+        self.created = created
+        self.hits = 0
+        self.scheduled = self.removed  # removal time of the entry's item in the heap
+
+    @property
+    def expires(self):
+        return min(self.ttl, self.tti)
+
+    @property
+    def removed(self):
+        """Time at which the entry is dropped: when it expires, or at the end of its stale grace period."""
+        return self.expires + self.grace
+
+
+# API version segments, e.g. the v1 of mgmtconfig/v1/...: a write through one version of an API makes the
+# reads cached through the others stale too
+_API_VERSION = re.compile(r"v\d+")
+
+
+def _path_segments(key):
+    """Splits a cache key, ``host/path?query``, into the segments of its path, less its API version."""
+    return [segment for segment in key.split("?", 1)[0].split("/") if segment and not _API_VERSION.fullmatch(segment)]
+
+
+class _PathNode:
+    """A node of the trie of cached paths: the keys cached for the path, whatever their query, and its children."""
+
+    __slots__ = ("children", "keys")
+
+    def __init__(self):
+        self.children = {}
+        self.keys = set()
+
+    def walk(self):
+        yield self
+        for child in self.children.values():
+            yield from child.walk()
+
+
 class ZscalerCache(Cache):
     """
     This is a base class implementing a Cache using TTL and TTI.
     Implementing the zscaler.cache.cache.Cache abstract class.
+
+    Entries are kept in least recently used order, and their expiry times in a heap, so that expired
+    entries are dropped in amortized O(log n) instead of scanning the whole store on every access.
+    The cache can be bounded by number of entries and by size, in which case the least recently used
+    entries are evicted first. All operations are thread-safe, so one cache can be shared by clients
+    used from several threads.
+
+    Keys are also indexed in a trie of their path segments, so that a write only invalidates the entries
+    it can make stale, see :meth:`invalidate`.
+
+    With ``stale_while_revalidate`` set, expired entries are still served for that many seconds, flagged
+    by :meth:`is_stale`, so that clients can refresh them in the background instead of making the caller
+    wait for the network.
     """
 
-    def __init__(self, ttl, tti):
+    def __init__(self, ttl, tti, max_entries=None, max_bytes=None, stale_while_revalidate=0):
         """
         Constructor.
 
         Arguments:
             ttl {float} -- Time to Live: for cache entries
             tti {float} -- Time to Idle: for cache entries
+            max_entries {int} -- Maximum number of entries, unbounded if None
+            max_bytes {int} -- Maximum estimated size of the cached values, unbounded if None
+            stale_while_revalidate {float} -- Grace period during which expired entries are still served
         """
-        super()  # Inherit from parent class
-        self._store = {}  # key -> {value, TTI, TTL}
+        super().__init__()
+        self._store = OrderedDict()  # key -> _Entry, least recently used first
+        self._expiry = []  # heap of (expiry time, key)
         self._time_to_live = ttl
         self._time_to_idle = tti
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_while_revalidate = stale_while_revalidate
+        self._bytes = 0
+        self._paths = _PathNode()  # trie of the cached keys, by path segment
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale_hits = 0
 
     def get(self, key):
         """
@@ -37,22 +127,25 @@ class ZscalerCache(Cache):
             str -- Corresponding value to given key
             None -- Unable to find value for this key
         """
-        # Get current time
-        now = self._get_current_time()
-        # Check if key is in cache and valid
-        if self.contains(key):
-            entry = self._store[key]
-            # Reset TTI
-            entry["tti"] = now + self._time_to_idle
-            # Return desired value and update cache
-            self._clean_cache()
-            logger.info(f'Got value from cache for key "{key}".')
-            logger.debug(f'Cached value for key {key}: {entry["value"]}')
-            return entry["value"]
-
-        # Return None if key isn't in cache and update cache
-        self._clean_cache()
-        return None
+        with self._lock:
+            now = self._get_current_time()
+            self._expire(now)
+            entry = self._store.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires <= now:
+                # Stale entries stay stale until they are replaced
+                self.stale_hits += 1
+            else:
+                # Reset TTI; the heap entry is rescheduled lazily once it comes due
+                entry.tti = now + self._time_to_idle
+            entry.hits += 1
+            self._store.move_to_end(key)
+            self.hits += 1
+        logger.info(f'Got value from cache for key "{key}".')
+        logger.debug(f"Cached value for key {key}: {entry.value}")
+        return entry.value
 
     def contains(self, key):
         """
@@ -64,7 +157,12 @@ class ZscalerCache(Cache):
         Returns:
             bool -- Existence of key in cache
         """
-        return key in self._store and self._is_valid_entry(self._store[key])
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is not None and self._is_valid_entry(entry):
+                return True
+            self.misses += 1
+            return False
 
     def add(self, key: str, value: tuple):
         """
@@ -74,20 +172,27 @@ class ZscalerCache(Cache):
             key {str} -- Key in pair
             value {tuple} -- Tuple of response and response body
         """
-        if type(key) == str and (type(value) != list or type(value[1]) != list):
-            # Get current time
+        if type(key) != str or (type(value) == list and type(value[1]) == list):
+            return
+        with self._lock:
             now = self._get_current_time()
-
-            # Add new entry to cache with timers
-            self._store[key] = {
-                "value": value,
-                "tti": now + self._time_to_idle,
-                "ttl": now + self._time_to_live,
-            }
-            logger.info(f'Added to cache value for key "{key}".')
-            logger.debug(f"Cached value for key {key}: {value}.")
-        # Update cache
-        self._clean_cache()
+            self._expire(now)
+            self._remove(key)
+            entry = _Entry(
+                value,
+                now + self._time_to_live,
+                now + self._time_to_idle,
+                _sizeof(value),
+                grace=self.stale_while_revalidate,
+                created=now,
+            )
+            self._store[key] = entry
+            self._index(key)
+            self._bytes += entry.size
+            heapq.heappush(self._expiry, (entry.scheduled, key))
+            self._evict()
+        logger.info(f'Added to cache value for key "{key}".')
+        logger.debug(f"Cached value for key {key}: {value}.")
 
     def delete(self, key):
         """
@@ -97,57 +202,204 @@ class ZscalerCache(Cache):
             key {str} -- Desired key
         """
         logger.info(f'Removing value from cache for key "{key}".')
-        # Make sure key is in cache
-        if key in self._store:
-            # Delete entry
-            del self._store[key]
-            logger.info(f'Removed value from cache for key "{key}".')
-        url_object = urlparse(key)
-        base_url = f"{url_object.netloc}{url_object.path}"
-        for other_key in self._store.keys():
-            other_url_object = urlparse(other_key)
-            other_base_url = f"{other_url_object.netloc}{other_url_object.path}"
-            if not self._is_valid_entry(self._store[other_key]) and other_base_url.startswith(base_url):
-                del self._store[other_key]
-                logger.info(f'Removed also value from cache for key "{other_key}".')
+        with self._lock:
+            if self._remove(key):
+                logger.info(f'Removed value from cache for key "{key}".')
+            self._expire(self._get_current_time())
 
     def clear(self):
         """
         Clear the cache.
         """
         logger.info("Clearing the entire cache.")
-        self._store.clear()
+        with self._lock:
+            self._store.clear()
+            self._expiry.clear()
+            self._paths = _PathNode()
+            self._bytes = 0
+
+    def is_stale(self, key):
+        """
+        Returns whether the entry of the key has expired and is only served during its grace period.
+
+        Arguments:
+            key {str} -- Desired key
+
+        Returns:
+            bool -- True if the entry is stale, False if it is fresh or missing
+        """
+        with self._lock:
+            entry = self._store.get(key)
+            return entry is not None and entry.expires <= self._get_current_time() < entry.removed
+
+    def freshness(self, key):
+        """
+        Returns the freshness metadata of the entry of the key.
+
+        Arguments:
+            key {str} -- Desired key
 
-    def _clean_cache(self):
+        Returns:
+            dict -- The age of the entry, the seconds until it expires (negative once stale) and until it
+            is dropped, whether it is stale and its number of hits, all in seconds. None if the key is missing.
         """
-        Updates cache by removing expired entries at time of call
+        with self._lock:
+            entry = self._store.get(key)
+            now = self._get_current_time()
+            if entry is None or entry.removed <= now:
+                return None
+            return {
+                "age": now - entry.created,
+                "expires_in": entry.expires - now,
+                "removed_in": entry.removed - now,
+                "stale": entry.expires <= now,
+                "hits": entry.hits,
+            }
+
+    def invalidate(self, key, dependencies=None):
         """
-        expired = []
-        # Check every entry
-        for key in self._store.keys():
-            # If not valid, delete
-            if not self._is_valid_entry(self._store[key]):
-                expired.append(key)
-        # Delete keys
-        for expired_key in expired:
-            self.delete(expired_key)
+        Removes the entries made stale by a write to the resource identified by ``key``: the resource and
+        everything under it, e.g. ``application/123`` and ``application/123/...``, the listings of the
+        collection it belongs to, e.g. ``application`` with any query, and the collections declared as
+        depending on it. Other entries are kept.
+
+        Arguments:
+            key {str} -- The key of the written resource, as built by create_key
+            dependencies {dict} -- Names of the collections embedding a resource, by the collection name of
+            the resource, e.g. ``{"application": ("segmentGroup",)}``. Each of them is looked up next to
+            the path of the resource, starting from its closest ancestor.
+
+        The API version is not part of the paths compared, e.g. a write to ``v2/.../rule`` invalidates the
+        reads of ``v1/.../rule``.
+        """
+        segments = _path_segments(key)
+        with self._lock:
+            nodes = [self._paths]  # the trie nodes along the written path, as far as anything is cached
+            for segment in segments:
+                node = nodes[-1].children.get(segment)
+                if node is None:
+                    break
+                nodes.append(node)
+
+            stale = []
+            if len(nodes) == len(segments) + 1:
+                stale.extend(nodes[-1].walk())
+                nodes.pop()
+            if len(nodes) == len(segments):
+                stale.append(nodes[-1])
+            for name in segments:
+                for dependent in (dependencies or {}).get(name, ()):
+                    for ancestor in reversed(nodes):
+                        if dependent in ancestor.children:
+                            stale.extend(ancestor.children[dependent].walk())
+                            break
+
+            keys = set().union(*(node.keys for node in stale))
+            for stale_key in keys:
+                self._remove(stale_key)
+            self.invalidations += len(keys)
+        if keys:
+            logger.info(f'Invalidated {len(keys)} cached values for write to "{key}".')
+
+    def stats(self):
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            dict -- Hits, misses, evictions, expirations and invalidations so far, and the current number of
+            entries and size
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_hits": self.stale_hits,
+                "entries": len(self._store),
+                "bytes": self._bytes,
+            }
+
+    def __len__(self):
+        return len(self._store)
+
+    def _remove(self, key):
+        entry = self._store.pop(key, None)
+        if entry is None:
+            return False
+        self._unindex(key)
+        self._bytes -= entry.size
+        return True
+
+    def _index(self, key):
+        node = self._paths
+        for segment in _path_segments(key):
+            node = node.children.setdefault(segment, _PathNode())
+        node.keys.add(key)
+
+    def _unindex(self, key):
+        """Removes a key from the trie, pruning the nodes left without keys or children."""
+        nodes = [self._paths]
+        segments = _path_segments(key)
+        for segment in segments:
+            node = nodes[-1].children.get(segment)
+            if node is None:
+                return
+            nodes.append(node)
+        nodes[-1].keys.discard(key)
+        for segment, parent, node in zip(reversed(segments), reversed(nodes[:-1]), reversed(nodes[1:])):
+            if node.keys or node.children:
+                break
+            del parent.children[segment]
+
+    def _expire(self, now):
+        """
+        Removes the entries that expired at time of call. Heap items left behind by deleted, replaced or
+        idle-refreshed entries are dropped or rescheduled as they come due.
+        """
+        while self._expiry and self._expiry[0][0] <= now:
+            scheduled, key = heapq.heappop(self._expiry)
+            entry = self._store.get(key)
+            if entry is None or entry.scheduled != scheduled:
+                # Deleted, or replaced by a newer entry with its own heap item
+                continue
+            if entry.removed > now:
+                entry.scheduled = entry.removed
+                heapq.heappush(self._expiry, (entry.scheduled, key))
+                continue
+            self._remove(key)
+            self.expirations += 1
+            logger.info(f'Removed expired value from cache for key "{key}".')
+        # Keep stale heap items from piling up when entries are replaced often
+        if len(self._expiry) > 2 * len(self._store) + 64:
+            self._expiry = [(entry.scheduled, key) for key, entry in self._store.items()]
+            heapq.heapify(self._expiry)
+
+    def _evict(self):
+        """Evicts the least recently used entries until the cache fits in its bounds."""
+        while self._store and (
+            (self.max_entries is not None and len(self._store) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key, entry = self._store.popitem(last=False)
+            self._unindex(key)
+            self._bytes -= entry.size
+            self.evictions += 1
+            logger.info(f'Evicted value from cache for key "{key}".')
 
     def _is_valid_entry(self, entry):
         """
         Determines if a given cache entry is not expired.
 
         Args:
-            entry (dict): An entry from the cache composed of value,
+            entry (_Entry): An entry from the cache composed of value,
             TTI, and TTL
 
         Returns:
             bool: Boolean value representing if entry is expired
         """
-        # Get Current time
-        now = self._get_current_time()
-        # Check timers and compare against current time
-        timers = [entry["tti"], entry["ttl"]]
-        return not any(timer <= now for timer in timers)
+        return entry.removed > self._get_current_time()
 
     def _get_current_time(self):
         """
@@ -157,3 +409,30 @@ class ZscalerCache(Cache):
             float: value representing the number of seconds since the epoch
         """
         return time.time()
+
+
+def build_cache(ttl, tti, path=None, stale_while_revalidate=None):
+    """
+    Builds the cache of a client.
+
+    Args:
+        ttl (float): Time to Live of the cache entries.
+        tti (float): Time to Idle of the cache entries.
+        path (str): Path of the SQLite file in which responses are kept across processes and runs. Defaults to
+            the ``ZSCALER_CLIENT_CACHE_PATH`` environment variable. The cache is kept in memory when unset.
+        stale_while_revalidate (float): Grace period during which expired entries of the in-memory cache are
+            served while they are refreshed in the background. Defaults to the
+            ``ZSCALER_CLIENT_CACHE_STALE_WHILE_REVALIDATE`` environment variable, or 0.
+
+    Returns:
+        :obj:`Cache`: A :class:`~zscaler.cache.sqlite_cache.SQLiteCache` when a path is configured, an in-memory
+        :class:`ZscalerCache` otherwise.
+    """
+    path = path or os.getenv("ZSCALER_CLIENT_CACHE_PATH")
+    if path:
+        from zscaler.cache.sqlite_cache import SQLiteCache
+
+        return SQLiteCache(ttl=ttl, tti=tti, path=path)
+    if stale_while_revalidate is None:
+        stale_while_revalidate = float(os.getenv("ZSCALER_CLIENT_CACHE_STALE_WHILE_REVALIDATE", 0))
+    return ZscalerCache(ttl=ttl, tti=tti, stale_while_revalidate=stale_while_revalidate)
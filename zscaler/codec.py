@@ -0,0 +1,178 @@
+import json
+import logging
+import os
+
+from zscaler import profiling
+from zscaler.profiling import DECODE
+
+logger = logging.getLogger("zscaler-sdk-python")
+
+CODECS = ("orjson", "ujson", "json")
+
+
+class JSONCodec:
+    """
+    Encodes and decodes JSON with the standard library. It is the reference the faster codecs fall back to
+    when they refuse a document the standard library accepts, e.g. ``NaN`` or integers wider than 64 bits.
+    """
+
+    name = "json"
+
+    def loads(self, data):
+        """Decodes a JSON document given as ``bytes`` or ``str``."""
+        return json.loads(data)
+
+    def dumps(self, obj):
+        """Encodes ``obj`` to compact UTF-8 JSON ``bytes``."""
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Encodes and decodes JSON with ``orjson``, falling back to the standard library on what it refuses.
+    Depending on its version, ``orjson`` either raises on integers wider than 64 bits, the document then being
+    decoded exactly by the standard library, or decodes them as floats; the identifiers of the Zscaler APIs all
+    fit in 64 bits.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def loads(self, data):
+        try:
+            return self._orjson.loads(data)
+        except ValueError:
+            return super().loads(data)
+
+    def dumps(self, obj):
+        try:
+            return self._orjson.dumps(obj, option=self._options)
+        except TypeError:
+            return super().dumps(obj)
+
+
+class UjsonCodec(JSONCodec):
+    """Encodes and decodes JSON with ``ujson``, falling back to the standard library on what it refuses."""
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._ujson = ujson
+
+    def loads(self, data):
+        try:
+            return self._ujson.loads(data)
+        except ValueError:
+            return super().loads(data)
+
+    def dumps(self, obj):
+        try:
+            return self._ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+        except (TypeError, OverflowError):
+            return super().dumps(obj)
+
+
+_CODEC_CLASSES = {"orjson": OrjsonCodec, "ujson": UjsonCodec, "json": JSONCodec}
+
+
+def get_codec(name=None):
+    """
+    Returns a JSON codec by name.
+
+    Args:
+        name (str): One of :data:`CODECS`, or ``auto`` for the fastest one installed. Defaults to the
+            ``ZSCALER_JSON_CODEC`` environment variable, or ``auto``.
+
+    Returns:
+        :obj:`JSONCodec`: The codec.
+
+    Raises:
+        ValueError: If ``name`` is not a known codec.
+        ImportError: If ``name`` is a codec whose package is not installed.
+    """
+    name = (name or os.getenv("ZSCALER_JSON_CODEC") or "auto").lower()
+    if name == "auto":
+        for candidate in CODECS:
+            try:
+                return _CODEC_CLASSES[candidate]()
+            except ImportError:
+                continue
+    if name not in _CODEC_CLASSES:
+        raise ValueError(f"Invalid JSON codec {name!r}, expected 'auto' or one of: {', '.join(CODECS)}")
+    return _CODEC_CLASSES[name]()
+
+
+_codec = get_codec()
+
+
+def current_codec():
+    """Returns the codec the clients encode and decode JSON with."""
+    return _codec
+
+
+def set_codec(name=None):
+    """
+    Selects the codec the clients encode and decode JSON with, for the whole process.
+
+    Args:
+        name (str): As accepted by :func:`get_codec`.
+
+    Returns:
+        :obj:`JSONCodec`: The codec now in use.
+    """
+    global _codec
+    _codec = get_codec(name)
+    logger.debug(f"Using the {_codec.name} JSON codec.")
+    return _codec
+
+
+def loads(data):
+    """Decodes a JSON document with the current codec."""
+    return _codec.loads(data)
+
+
+def dumps(obj):
+    """Encodes ``obj`` to JSON ``bytes`` with the current codec."""
+    return _codec.dumps(obj)
+
+
+def decode_response(resp):
+    """
+    Decodes the JSON body of a response from its raw bytes with the current codec, skipping the charset
+    detection ``resp.json()`` goes through. Bodies that are not UTF-8 are left to ``resp.json()``.
+
+    Raises:
+        ValueError: If the body is not JSON.
+    """
+    with profiling.phase(DECODE):
+        try:
+            return _codec.loads(resp.content)
+        except ValueError:
+            return resp.json()
+
+
+def encode_request(json, headers):
+    """
+    Encodes a request body once with the current codec, so that the same bytes are sent and logged. Replaces
+    the ``json`` argument of ``requests`` and ``aiohttp``, which encode the body with the standard library.
+
+    Args:
+        json: The request body, or ``None``.
+        headers (dict): The request headers.
+
+    Returns:
+        tuple: The encoded body, or ``None`` when ``json`` is ``None``, and the headers, with a JSON
+        ``Content-Type`` added to a copy if they have none.
+    """
+    if json is None:
+        return None, headers
+    if not any(key.lower() == "content-type" for key in headers):
+        headers = {**headers, "Content-Type": "application/json"}
+    return _codec.dumps(json), headers
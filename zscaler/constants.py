@@ -14,6 +14,38 @@ ZPA_BASE_URLS = {
 
 DEV_AUTH_URL = "https://authn1.dev.zpath.net/authn/v1/oauth/token"
 
+# Collections whose records embed records of another collection, by the name of that collection: a write to a
+# record also invalidates the cached reads of its dependent collections. See ZscalerCache.invalidate.
+ZPA_CACHE_DEPENDENCIES = {
+    # The conditions of the policy rules embed the names of the applications and segment groups
+    "application": ("segmentGroup", "serverGroup", "policySet"),
+    "segmentGroup": ("application", "policySet"),
+    "serverGroup": ("application", "appConnectorGroup", "server"),
+    "server": ("serverGroup",),
+    # Provisioning keys embed the name of the group they enroll in
+    "appConnectorGroup": ("serverGroup", "connector", "provisioningKey"),
+    "connector": ("appConnectorGroup",),
+    "serviceEdgeGroup": ("serviceEdge", "provisioningKey"),
+    # SAML attributes embed the name of their identity provider
+    "idp": ("samlAttribute",),
+    "serviceEdge": ("serviceEdgeGroup",),
+    # Policies embed their rules, and so do the listings of policySet/rules/policyType/{type}
+    "rule": ("policyType", "rules"),
+}
+ZIA_CACHE_DEPENDENCIES = {
+    "groups": ("users",),
+    "departments": ("users",),
+    "urlCategories": ("urlFilteringRules",),
+    "ipDestinationGroups": ("firewallFilteringRules",),
+    "ipSourceGroups": ("firewallFilteringRules",),
+    "networkServices": ("firewallFilteringRules",),
+    "networkApplicationGroups": ("firewallFilteringRules",),
+}
+ZCON_CACHE_DEPENDENCIES = {
+    "ecVm": ("ecgroup",),
+    "locationTemplate": ("provUrl",),
+}
+
 RETRYABLE_STATUS_CODES = {409, 412, 429, 500, 502, 503, 504}
 MAX_RETRIES = 5
 BACKOFF_FACTOR = 1
@@ -99,3 +99,12 @@ class HeaderUpdateError(Exception):
     """Raised if there's a problem updating the session headers."""
 
     pass
+
+
+class CassetteMissError(LookupError):
+    """Raised when a replayed request was not recorded in the cassette."""
+
+    def __init__(self, method: str, url: str):
+        self.method = method
+        self.url = url
+        super().__init__(f"No response recorded for {method} {url}")
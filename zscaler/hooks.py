@@ -0,0 +1,175 @@
+import functools
+import logging
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+logger = logging.getLogger("zscaler-sdk-python")
+
+REQUEST_START = "request_start"
+REQUEST_END = "request_end"
+RETRY = "retry"
+RATE_LIMIT_WAIT = "rate_limit_wait"
+RATE_LIMITED = "rate_limited"
+CACHE_HIT = "cache_hit"
+CACHE_MISS = "cache_miss"
+TOKEN_REFRESH = "token_refresh"
+
+EVENTS = (REQUEST_START, REQUEST_END, RETRY, RATE_LIMIT_WAIT, RATE_LIMITED, CACHE_HIT, CACHE_MISS, TOKEN_REFRESH)
+ALL_EVENTS = "*"
+
+ENDPOINT_TEMPLATE_CACHE_SIZE = 2048
+
+# Path segments identifying a resource: numbers, UUIDs and long hexadecimal or base64 ids
+_ID_SEGMENT = re.compile(
+    r"\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|(?=[^/]*\d)[0-9a-zA-Z_=-]{20,}"
+)
+
+_registration_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=ENDPOINT_TEMPLATE_CACHE_SIZE)
+def endpoint_template(url):
+    """
+    Returns the path of ``url`` with its resource identifiers replaced by ``{id}``, so that the requests for
+    different resources of a collection are grouped, e.g. ``/mgmtconfig/v1/admin/customers/{id}/server/{id}``.
+    """
+    path = urlsplit(url).path.rstrip("/") or "/"
+    return "/".join("{id}" if _ID_SEGMENT.fullmatch(segment) else segment for segment in path.split("/"))
+
+
+class Event:
+    """
+    An event of the lifecycle of a request, as passed to the callbacks registered with :meth:`Hooks.on`.
+
+    Attributes:
+        name (str): One of :data:`EVENTS`.
+        product (str): The client sending the request, e.g. ``zpa``.
+        method (str): The HTTP method of the request, ``None`` for token refreshes.
+        url (str): The request URL.
+        duration (float): Seconds taken: by the request on ``request_end``, spent waiting for the rate limiter
+            on ``rate_limit_wait``, by the login on ``token_refresh``. ``None`` otherwise.
+        status_code (int): The status of the response, when there is one.
+        attempt (int): The number of the attempt, from 1, on ``retry`` and ``rate_limited``.
+        from_cache (bool): Whether the response was served by the cache, on ``request_end``.
+        error (Exception): The error a request failed with, on ``request_end``.
+        time (float): When the event happened, as a Unix timestamp.
+
+    The ``duration`` can be given as the ``start`` timestamp of what the event ends, so that the clients
+    only read the clock when the event is listened to.
+    """
+
+    __slots__ = ("name", "product", "method", "url", "duration", "status_code", "attempt", "from_cache", "error", "time")
+
+    def __init__(
+        self,
+        name,
+        product=None,
+        method=None,
+        url=None,
+        duration=None,
+        status_code=None,
+        attempt=None,
+        from_cache=False,
+        error=None,
+        start=None,
+    ):
+        if duration is None and start is not None:
+            duration = time.time() - start
+        self.name = name
+        self.product = product
+        self.method = method
+        self.url = url
+        self.duration = duration
+        self.status_code = status_code
+        self.attempt = attempt
+        self.from_cache = from_cache
+        self.error = error
+        self.time = time.time()
+
+    @property
+    def endpoint(self):
+        """The endpoint template of the request URL, see :func:`endpoint_template`."""
+        return endpoint_template(self.url) if self.url else None
+
+    def as_dict(self):
+        """Returns the fields of the event, and its endpoint template."""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields["endpoint"] = self.endpoint
+        return fields
+
+    def __repr__(self):
+        return f"Event({self.name!r}, product={self.product!r}, method={self.method!r}, endpoint={self.endpoint!r})"
+
+
+class Hooks:
+    """
+    Lifecycle events of the requests sent by a client: callbacks are registered for an event name, or for
+    all of them with ``"*"``, and called synchronously with an :class:`Event` by the thread, or the event
+    loop, sending the request. They must be quick and must not send requests through the client. A callback
+    raising an exception is logged and does not affect the request.
+
+    Emitting an event nobody listens to costs a dictionary lookup, so clients emit them unconditionally.
+
+    A set of hooks can be shared by several clients: :meth:`bind` returns a view of the same callbacks that
+    tags the events it emits with a product name. Every client exposes its view as ``client.hooks``.
+
+    Examples:
+        >>> @zpa.hooks.on("rate_limit_wait")
+        ... def throttled(event):
+        ...     print(f"Waited {event.duration:.1f}s before {event.method} {event.endpoint}")
+    """
+
+    def __init__(self, product=None, _listeners=None):
+        self.product = product
+        self._listeners = {} if _listeners is None else _listeners
+
+    def bind(self, product):
+        """Returns a view of these hooks emitting events tagged with ``product``."""
+        return Hooks(product, self._listeners)
+
+    def on(self, event, callback=None):
+        """
+        Registers ``callback(event)`` for an event name, or ``"*"`` for all events. Can be used as a decorator.
+
+        Raises:
+            ValueError: If ``event`` is not one of :data:`EVENTS` or ``"*"``.
+        """
+        if event != ALL_EVENTS and event not in EVENTS:
+            raise ValueError(f"Invalid event {event!r}, expected '*' or one of: {', '.join(EVENTS)}")
+        if callback is None:
+            return functools.partial(self.on, event)
+        with _registration_lock:
+            # Replaced rather than appended to, so that emit reads them without locking
+            self._listeners[event] = self._listeners.get(event, ()) + (callback,)
+        return callback
+
+    def off(self, event, callback):
+        """Unregisters a callback registered with :meth:`on`."""
+        with _registration_lock:
+            listeners = tuple(listener for listener in self._listeners.get(event, ()) if listener != callback)
+            if listeners:
+                self._listeners[event] = listeners
+            else:
+                self._listeners.pop(event, None)
+
+    def listening(self, event):
+        """Returns whether a callback is registered for ``event``."""
+        listeners = self._listeners
+        return bool(listeners) and (event in listeners or ALL_EVENTS in listeners)
+
+    def emit(self, event, **fields):
+        """Calls the callbacks registered for ``event`` with an :class:`Event` built from ``fields``."""
+        listeners = self._listeners
+        if not listeners:
+            return
+        callbacks = listeners.get(event, ()) + listeners.get(ALL_EVENTS, ())
+        if not callbacks:
+            return
+        payload = Event(event, self.product, **fields)
+        for callback in callbacks:
+            try:
+                callback(payload)
+            except Exception as e:
+                logger.warning(f"Hook {callback!r} failed on {event} event: {e}")
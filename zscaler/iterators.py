@@ -0,0 +1,35 @@
+from restfly import APIIterator
+
+from zscaler.utils import snake_to_camel
+
+
+class Iterator(APIIterator):
+    """Iterator class."""
+
+    page_size = 100
+
+    def __init__(self, api, path: str = "", **kw):
+        """Initialize Iterator class."""
+        super().__init__(api, **kw)
+
+        self.path = path
+        self.max_items = kw.pop("max_items", 0)
+        self.max_pages = kw.pop("max_pages", 0)
+        self.payload = {}
+        if kw:
+            self.payload = {snake_to_camel(key): value for key, value in kw.items()}
+
+    def _get_page(self) -> None:
+        """Iterator function to get the page. Requests are paced by the client's rate limiter."""
+        resp = self._api.get(
+            self.path,
+            params={**self.payload, "page": self.num_pages + 1},
+        )
+        try:
+            # If we are using ZPA then the API will return records under the
+            # 'list' key.
+            self.page = resp.get("list") or []
+        except AttributeError:
+            # If the list key doesn't exist then we're likely using ZIA so just
+            # return the full response.
+            self.page = resp
@@ -0,0 +1,33 @@
+import importlib
+import sys
+
+
+def lazy_attributes(module_name, attributes):
+    """
+    Builds the PEP 562 ``__getattr__`` and ``__dir__`` of a module whose attributes are imported from other
+    modules on first access, so that importing the module does not import them all, e.g. the API modules of a
+    product package.
+
+    Args:
+        module_name (str): The name of the module, ``__name__``.
+        attributes (dict): The modules of the lazy attributes, by attribute name.
+
+    Returns:
+        tuple: The ``__getattr__`` and ``__dir__`` functions of the module.
+
+    Examples:
+        >>> __getattr__, __dir__ = lazy_attributes(__name__, {"UsersAPI": "zscaler.zdx.users"})
+    """
+
+    def __getattr__(name):
+        if name not in attributes:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(attributes[name]), name)
+        # Found by the regular lookup from now on
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[module_name])) | set(attributes))
+
+    return __getattr__, __dir__
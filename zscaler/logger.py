@@ -1,9 +1,13 @@
 import logging
 import os
+import threading
 from http.client import HTTPConnection
 
 LOG_FORMAT = "%(asctime)s - %(name)s - %(module)s - %(levelname)s - %(message)s"
 
+_setup_lock = threading.Lock()
+_setup_done = False
+
 
 def setup_logging(logger_name="zscaler-sdk-python"):
     """
@@ -55,3 +59,17 @@ def setup_logging(logger_name="zscaler-sdk-python"):
         file_handler.setLevel(log_level)
         file_handler.setFormatter(log_formatter)
         logger.addHandler(file_handler)
+
+
+def ensure_logging():
+    """
+    Calls :func:`setup_logging` once per process, when the first client is built rather than when the SDK is
+    imported, so that importing it has no side effects on the logging configuration.
+    """
+    global _setup_done
+    if _setup_done:
+        return
+    with _setup_lock:
+        if not _setup_done:
+            setup_logging(logger_name="zscaler-sdk-python")
+            _setup_done = True
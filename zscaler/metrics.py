@@ -0,0 +1,236 @@
+import bisect
+import os
+import threading
+
+from zscaler import hooks
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=(), lock=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = lock or threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name} takes the labels {', '.join(self.labelnames)}, got {', '.join(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for values, sample in sorted(self._values.items()):
+                lines.extend(self._render_sample(values, sample))
+        return lines
+
+
+class Counter(_Metric):
+    """A value that only goes up, e.g. a number of requests."""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """Returns the value of the counter for the given labels, ``0`` if it was never incremented."""
+        return self._values.get(self._key(labels), 0)
+
+    def _render_sample(self, values, value):
+        yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """A value that goes up and down, e.g. a number of requests in flight."""
+
+    kind = "gauge"
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """A distribution of observed values, e.g. durations, counted in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, lock=None):
+        super().__init__(name, documentation, labelnames, lock)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            sample = self._values.get(key)
+            if sample is None:
+                # Count per bucket, the last one being +Inf, and sum
+                sample = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            sample[0][index] += 1
+            sample[1] += value
+
+    def count(self, **labels):
+        """Returns the number of values observed for the given labels."""
+        sample = self._values.get(self._key(labels))
+        return sum(sample[0]) if sample else 0
+
+    def sum(self, **labels):
+        """Returns the sum of the values observed for the given labels."""
+        sample = self._values.get(self._key(labels))
+        return sample[1] if sample else 0.0
+
+    def _render_sample(self, values, sample):
+        counts, total = sample
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = 'le="' + _format_value(bound) + '"'
+            yield f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}"
+        yield f"{self.name}_sum{_format_labels(self.labelnames, values)} {_format_value(total)}"
+        yield f"{self.name}_count{_format_labels(self.labelnames, values)} {cumulative}"
+
+
+class MetricsRegistry:
+    """
+    In-process metrics of the requests sent by the clients, aggregated from their :mod:`zscaler.hooks`
+    events and rendered in the Prometheus text exposition format, without any dependency.
+
+    A registry can be shared by several clients; the samples are labelled with the product of each client.
+
+    Examples:
+        >>> registry = MetricsRegistry()
+        >>> zpa = ZPAClientHelper(client_id, client_secret, customer_id, cloud, metrics=registry)
+        >>> zia = ZIAClientHelper(username, password, api_key, cloud, metrics=registry)
+        >>> print(registry.render())
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self._lock = threading.Lock()
+        self._metrics = {}
+        endpoint = ("product", "method", "endpoint")
+        self.requests = self.counter("zscaler_requests_total", "Requests sent, cache hits included.", endpoint + ("status",))
+        self.request_duration = self.histogram(
+            "zscaler_request_duration_seconds", "Duration of the requests, retries included.", endpoint, buckets
+        )
+        self.in_flight = self.gauge("zscaler_requests_in_flight", "Requests being sent.", ("product",))
+        self.retries = self.counter("zscaler_retries_total", "Requests sent again after a 429 or an error.", endpoint)
+        self.rate_limited = self.counter("zscaler_rate_limited_total", "Responses with a 429 status.", endpoint)
+        self.rate_limit_wait = self.histogram(
+            "zscaler_rate_limit_wait_seconds", "Time waited for the rate limiter.", ("product", "method"), buckets
+        )
+        self.cache_hits = self.counter("zscaler_cache_hits_total", "GET requests served by the cache.", endpoint)
+        self.cache_misses = self.counter("zscaler_cache_misses_total", "GET requests not found in the cache.", endpoint)
+        self.token_refreshes = self.counter("zscaler_token_refreshes_total", "Logins and token refreshes.", ("product",))
+        self.token_refresh_duration = self.histogram(
+            "zscaler_token_refresh_duration_seconds", "Duration of the logins and token refreshes.", ("product",), buckets
+        )
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Registers and returns a :class:`Counter`."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        """Registers and returns a :class:`Gauge`."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Registers and returns a :class:`Histogram`."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def __getitem__(self, name):
+        return self._metrics[name]
+
+    def attach(self, client_hooks):
+        """Aggregates the events of the given :class:`~zscaler.hooks.Hooks` from now on."""
+        client_hooks.on(hooks.ALL_EVENTS, self.observe)
+        return self
+
+    def observe(self, event):
+        """Updates the metrics with an :class:`~zscaler.hooks.Event`."""
+        product = event.product or ""
+        if event.name == hooks.REQUEST_START:
+            self.in_flight.inc(product=product)
+            return
+        if event.name == hooks.TOKEN_REFRESH:
+            self.token_refreshes.inc(product=product)
+            if event.duration is not None:
+                self.token_refresh_duration.observe(event.duration, product=product)
+            return
+        if event.name == hooks.RATE_LIMIT_WAIT:
+            self.rate_limit_wait.observe(event.duration, product=product, method=event.method)
+            return
+        labels = {"product": product, "method": event.method, "endpoint": event.endpoint}
+        if event.name == hooks.REQUEST_END:
+            self.in_flight.dec(product=product)
+            status = event.status_code if event.status_code is not None else "error"
+            self.requests.inc(status=status, **labels)
+            self.request_duration.observe(event.duration, **labels)
+        elif event.name == hooks.RETRY:
+            self.retries.inc(**labels)
+        elif event.name == hooks.RATE_LIMITED:
+            self.rate_limited.inc(**labels)
+        elif event.name == hooks.CACHE_HIT:
+            self.cache_hits.inc(**labels)
+        elif event.name == hooks.CACHE_MISS:
+            self.cache_misses.inc(**labels)
+
+    def render(self):
+        """Returns the metrics in the Prometheus text exposition format, version 0.0.4."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def build_metrics(metrics, client_hooks):
+    """
+    Returns the metrics registry of a client, attached to its hooks.
+
+    Args:
+        metrics: A :class:`MetricsRegistry` to share, ``True`` for a registry of the client, ``False`` for
+            none. Defaults to the ``ZSCALER_CLIENT_METRICS_ENABLED`` environment variable, or ``False``.
+        client_hooks (Hooks): The hooks of the client.
+
+    Returns:
+        :obj:`MetricsRegistry`: The registry, or ``None``.
+    """
+    if metrics is None:
+        metrics = os.getenv("ZSCALER_CLIENT_METRICS_ENABLED", "false").lower() == "true"
+    if metrics is False:
+        return None
+    registry = MetricsRegistry() if metrics is True else metrics
+    return registry.attach(client_hooks)
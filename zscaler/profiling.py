@@ -0,0 +1,273 @@
+import contextvars
+import json
+import marshal
+import sys
+import threading
+import time
+
+from zscaler.hooks import endpoint_template
+
+AUTH = "auth"
+THROTTLE = "throttle"
+NETWORK = "network"
+DECODE = "decode"
+CONVERT = "convert"
+BOX = "box"
+
+PHASES = (AUTH, THROTTLE, NETWORK, DECODE, CONVERT, BOX)
+DUMP_FORMATS = ("speedscope", "pstats")
+
+# Time spent outside of a request, e.g. converting the items collected by a listing
+NO_ENDPOINT = "-"
+
+_profiler = contextvars.ContextVar("zscaler_profiler", default=None)
+_endpoint = contextvars.ContextVar("zscaler_profiled_endpoint", default=NO_ENDPOINT)
+
+
+class _NoPhase:
+    """The context manager returned when nothing is profiled, doing nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+class _Phase:
+    __slots__ = ("_profiler", "_name", "_endpoint", "_start")
+
+    def __init__(self, profiler, name, endpoint):
+        self._profiler = profiler
+        self._name = name
+        self._endpoint = endpoint
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._profiler.record(self._endpoint, self._name, self._start, time.perf_counter())
+        return False
+
+
+def phase(name):
+    """
+    Returns a context manager timing a phase of the current request, one of :data:`PHASES`, when the code
+    runs in a :class:`Profiler` block. Costs a context variable lookup otherwise.
+    """
+    profiler = _profiler.get()
+    if profiler is None:
+        return _NO_PHASE
+    return _Phase(profiler, name, _endpoint.get())
+
+
+def set_endpoint(url):
+    """
+    Attributes the phases timed from now on in the current context to the endpoint template of ``url``, when
+    the code runs in a :class:`Profiler` block. Called as a request starts and as its response is formatted,
+    so that the phases of a call are attributed to the endpoint it requested.
+    """
+    if url and _profiler.get() is not None:
+        _endpoint.set(endpoint_template(url))
+
+
+def active():
+    """Returns whether the code runs in a :class:`Profiler` block."""
+    return _profiler.get() is not None
+
+
+def _lane():
+    """Identifies the thread, or the asyncio task, a phase runs in: its phases are sequential."""
+    # No task can be running before asyncio is imported, which the synchronous clients never do
+    asyncio = sys.modules.get("asyncio")
+    try:
+        task = asyncio.current_task() if asyncio is not None else None
+    except RuntimeError:
+        task = None
+    return (threading.get_ident(), id(task) if task is not None else None)
+
+
+class Profiler:
+    """
+    Times the phases of the SDK calls made in a ``with`` block: logins, rate limiter waits, requests, JSON
+    decoding, snake_case conversion and :class:`Box` construction, per endpoint template. Returned by the
+    ``profile()`` method of the clients.
+
+    The block is profiled through a context variable, so the calls of every client made in it are included,
+    as are those made by the asyncio tasks and pagination workers it starts, but not the calls of other
+    threads or of the background cache refreshes. Outside of a block, the instrumented code only checks the
+    context variable.
+
+    Args:
+        cprofile (bool): Whether to also run :mod:`cProfile` during the block, in the calling thread, for a
+            function level profile. See :meth:`dump`.
+
+    Examples:
+        >>> with zpa.profile() as prof:
+        ...     segments = zpa.app_segments.list_segments()
+        >>> print(prof.report())
+        >>> prof.dump("segments.speedscope.json")
+    """
+
+    def __init__(self, cprofile=False):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._spans = []
+        self._token = None
+        self._endpoint_token = None
+        self._cprofile = None
+        self.cprofile = cprofile
+        self.start = None
+        self.end = None
+
+    def __enter__(self):
+        if self._token is not None:
+            raise RuntimeError("The profiler is already running")
+        self.start = time.perf_counter()
+        self._token = _profiler.set(self)
+        self._endpoint_token = _endpoint.set(NO_ENDPOINT)
+        if self.cprofile:
+            import cProfile
+
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        _endpoint.reset(self._endpoint_token)
+        _profiler.reset(self._token)
+        self._token = None
+        self.end = time.perf_counter()
+        return False
+
+    @property
+    def wall_time(self):
+        """Seconds spent in the block so far."""
+        if self.start is None:
+            return 0.0
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def record(self, endpoint, name, start, end):
+        """Records a phase of an endpoint, timed with :func:`time.perf_counter`."""
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, {})
+            count, total = stats.get(name, (0, 0.0))
+            stats[name] = (count + 1, total + end - start)
+            self._spans.append((start, end, endpoint, name, _lane()))
+
+    def stats(self):
+        """
+        Returns the time spent per endpoint and phase.
+
+        Returns:
+            dict: ``{endpoint: {phase: (count, seconds)}}``, the phases nothing was spent in left out.
+        """
+        with self._lock:
+            return {endpoint: dict(phases) for endpoint, phases in self._stats.items()}
+
+    def report(self):
+        """
+        Returns the breakdown of the time spent per endpoint and phase as a text table, the slowest endpoints
+        first. ``requests`` counts the requests sent, retries included.
+        """
+        stats = self.stats()
+        header = ["endpoint", "requests", *PHASES, "total"]
+        rows = []
+        totals = dict.fromkeys(PHASES, 0.0)
+        for endpoint, phases in stats.items():
+            seconds = {name: phases.get(name, (0, 0.0))[1] for name in PHASES}
+            for name in PHASES:
+                totals[name] += seconds[name]
+            requests = phases.get(NETWORK, (0, 0.0))[0]
+            rows.append((sum(seconds.values()), [endpoint, str(requests)] + [f"{seconds[name]:.3f}" for name in PHASES]))
+        rows.sort(key=lambda row: row[0], reverse=True)
+        lines = [cells + [f"{total:.3f}"] for total, cells in rows]
+        requests = sum(phases.get(NETWORK, (0, 0.0))[0] for phases in stats.values())
+        lines.append(["total", str(requests)] + [f"{totals[name]:.3f}" for name in PHASES] + [f"{sum(totals.values()):.3f}"])
+        widths = [max(len(line[i]) for line in [header] + lines) for i in range(len(header))]
+
+        def render(cells):
+            return "  ".join([cells[0].ljust(widths[0])] + [cell.rjust(width) for cell, width in zip(cells[1:], widths[1:])])
+
+        table = [render(header), render(["-" * width for width in widths])]
+        table.extend(render(line) for line in lines)
+        table.append(f"wall time {self.wall_time:.3f}s, phases in seconds")
+        return "\n".join(table)
+
+    def dump(self, path, format="speedscope"):
+        """
+        Writes the profile to a file.
+
+        Args:
+            path (str): The path of the file.
+            format (str): ``speedscope`` for an evented profile of the phases per thread and asyncio task,
+                opened by https://www.speedscope.app; ``pstats`` for a file read by :class:`pstats.Stats`
+                and the tools built on it: the :mod:`cProfile` profile of the block when profiled with
+                ``cprofile=True``, the phases per endpoint otherwise.
+
+        Raises:
+            ValueError: If ``format`` is not one of :data:`DUMP_FORMATS`.
+        """
+        if format not in DUMP_FORMATS:
+            raise ValueError(f"Invalid dump format {format!r}, expected one of: {', '.join(DUMP_FORMATS)}")
+        if format == "pstats":
+            if self._cprofile is not None:
+                self._cprofile.dump_stats(path)
+                return
+            with open(path, "wb") as f:
+                marshal.dump(self._pstats(), f)
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self._speedscope(), f)
+
+    def _pstats(self):
+        # Each phase of an endpoint is a "function" of the file named after the endpoint
+        stats = {}
+        for endpoint, phases in self.stats().items():
+            for name, (count, seconds) in phases.items():
+                stats[(endpoint, 0, name)] = (count, count, seconds, seconds, {})
+        return stats
+
+    def _speedscope(self):
+        with self._lock:
+            spans = list(self._spans)
+        frames = {}
+        lanes = {}
+        for start, end, endpoint, name, lane in spans:
+            frame = frames.setdefault(f"{name} {endpoint}", len(frames))
+            lanes.setdefault(lane, []).append((start - self.start, end - self.start, frame))
+        profiles = []
+        for lane, lane_spans in lanes.items():
+            events = []
+            # Spans of a lane are sequential or nested: open the longest first, close the shortest first
+            for start, end, frame in sorted(lane_spans, key=lambda span: (span[0], -span[1])):
+                events.append((start, 1, -end, {"type": "O", "frame": frame, "at": start}))
+                events.append((end, 0, -start, {"type": "C", "frame": frame, "at": end}))
+            events.sort(key=lambda event: event[:3])
+            task = "" if lane[1] is None else f" task {lane[1]:x}"
+            profiles.append(
+                {
+                    "type": "evented",
+                    "name": f"thread {lane[0]}{task}",
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": self.wall_time,
+                    "events": [event[3] for event in events],
+                }
+            )
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "exporter": "zscaler-sdk-python",
+            "name": "zscaler-sdk-python profile",
+            "activeProfileIndex": 0,
+            "shared": {"frames": [{"name": name} for name in frames]},
+            "profiles": profiles,
+        }
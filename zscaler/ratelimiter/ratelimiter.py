@@ -1,60 +1,333 @@
+import hashlib
+import os
 import threading
 import time
+from collections import deque
+
+from zscaler import profiling
+from zscaler.profiling import THROTTLE
+
+# Periods of the windows reported through the ``X-RateLimit-Limit-<name>`` response headers.
+HEADER_WINDOWS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+
+def _header_number(headers, name):
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(str(value).split(",")[0].strip())
+    except ValueError:
+        return None
+
+
+def _seconds_until(reset):
+    """Converts a reset header, sent either as a delay or as an epoch timestamp, to a delay in seconds."""
+    if reset > 1e9:
+        reset -= time.time()
+    return max(reset, 0.0)
+
+
+class Window:
+    """
+    A token bucket of ``limit`` tokens in which every token returns to the bucket ``period`` seconds after
+    it was spent. Unlike a bucket refilled at a constant rate, it never lets more than ``limit`` requests
+    start within any ``period``, which is how the Zscaler APIs count them.
+
+    Only the times at which the last ``limit`` tokens were spent are kept, so reserving a token is O(1).
+    """
+
+    def __init__(self, limit, period):
+        self.period = period
+        self.blocked_until = 0.0
+        self._spent = deque(maxlen=max(int(limit), 1))
+
+    @property
+    def limit(self):
+        return self._spent.maxlen
+
+    def resize(self, limit=None, period=None):
+        if limit is not None and max(int(limit), 1) != self._spent.maxlen:
+            self._spent = deque(self._spent, maxlen=max(int(limit), 1))
+        if period is not None:
+            self.period = period
+
+    def available_at(self, now):
+        """Returns the earliest time, not before ``now``, at which a token can be spent."""
+        at = max(now, self.blocked_until)
+        if len(self._spent) == self._spent.maxlen:
+            at = max(at, self._spent[0] + self.period)
+        return at
+
+    def spend(self, at):
+        self._spent.append(at)
+
+    def block(self, until):
+        self.blocked_until = max(self.blocked_until, until)
 
 
 class RateLimiter:
+    """
+    Keeps the requests sent to an API within its rate limits.
+
+    Requests are budgeted in two classes, ``GET`` and writes (``POST``, ``PUT``, ``PATCH`` and ``DELETE``).
+    Each class is governed by a primary :class:`Window` of ``*_limit`` requests per ``*_freq`` seconds, plus
+    the per second, minute, hour and day windows the API reports in its ``X-RateLimit-Limit-*`` headers.
+
+    :meth:`acquire` reserves the earliest slot that fits in every window of the class at once, then sleeps
+    until that slot. Slots are handed out under a lock and never move backwards, so concurrent callers are
+    served in the order they arrived rather than all waking up at the same time.
+
+    Args:
+        get_limit (int): Number of GET requests allowed per ``get_freq`` seconds.
+        post_put_delete_limit (int): Number of write requests allowed per ``post_put_delete_freq`` seconds.
+        get_freq (float): Length of the primary GET window, in seconds.
+        post_put_delete_freq (float): Length of the primary write window, in seconds.
+
+    Examples:
+        >>> limiter = RateLimiter(get_limit=20, post_put_delete_limit=10, get_freq=10, post_put_delete_freq=10)
+        >>> limiter.acquire("GET")
+        0.0
+    """
+
     def __init__(self, get_limit, post_put_delete_limit, get_freq, post_put_delete_freq):
         self.lock = threading.Lock()
-        self.get_requests = []
-        self.post_put_delete_requests = []
-        self.get_limit = get_limit
-        self.post_put_delete_limit = post_put_delete_limit
-        self.get_freq = get_freq
-        self.post_put_delete_freq = post_put_delete_freq
+        self._windows = {
+            "GET": {"primary": Window(get_limit, get_freq)},
+            "WRITE": {"primary": Window(post_put_delete_limit, post_put_delete_freq)},
+        }
+        self._last = {"GET": 0.0, "WRITE": 0.0}
 
-    def wait(self, method):
+    @staticmethod
+    def _method_class(method):
+        method = (method or "").upper()
+        if method == "GET":
+            return "GET"
+        if method in WRITE_METHODS:
+            return "WRITE"
+        return None
+
+    def _primary(self, method_class):
+        return self._windows[method_class]["primary"]
+
+    def _now(self):
+        return time.monotonic()
+
+    def _transaction(self):
+        """Returns the context manager that makes a reservation atomic."""
+        return self.lock
+
+    def _block_window(self, method_class, name, until):
+        self._windows[method_class][name].block(until)
+
+    @property
+    def get_limit(self):
+        return self._primary("GET").limit
+
+    @get_limit.setter
+    def get_limit(self, value):
+        with self.lock:
+            self._primary("GET").resize(limit=value)
+
+    @property
+    def get_freq(self):
+        return self._primary("GET").period
+
+    @get_freq.setter
+    def get_freq(self, value):
+        with self.lock:
+            self._primary("GET").resize(period=value)
+
+    @property
+    def post_put_delete_limit(self):
+        return self._primary("WRITE").limit
+
+    @post_put_delete_limit.setter
+    def post_put_delete_limit(self, value):
         with self.lock:
-            now = time.time()
-
-            if method == "GET":
-                if len(self.get_requests) >= self.get_limit:
-                    oldest_request = self.get_requests[0]
-                    if now - oldest_request < self.get_freq:
-                        d = self.get_freq - (now - oldest_request)
-                        return True, d
-                    self.get_requests.pop(0)
-                self.get_requests.append(now)
-
-            elif method in ["POST", "PUT", "DELETE"]:
-                if len(self.post_put_delete_requests) >= self.post_put_delete_limit:
-                    oldest_request = self.post_put_delete_requests[0]
-                    if now - oldest_request < self.post_put_delete_freq:
-                        d = self.post_put_delete_freq - (now - oldest_request)
-                        return True, d
-                    self.post_put_delete_requests.pop(0)
-                self.post_put_delete_requests.append(now)
+            self._primary("WRITE").resize(limit=value)
+
+    @property
+    def post_put_delete_freq(self):
+        return self._primary("WRITE").period
+
+    @post_put_delete_freq.setter
+    def post_put_delete_freq(self, value):
+        with self.lock:
+            self._primary("WRITE").resize(period=value)
+
+    def _next_slot(self, method_class, now):
+        at = max(now, self._last[method_class])
+        for window in self._windows[method_class].values():
+            at = max(at, window.available_at(now))
+        return at
+
+    def _spend(self, method_class, at):
+        self._last[method_class] = at
+        for window in self._windows[method_class].values():
+            window.spend(at)
+
+    def reserve(self, method):
+        """
+        Reserves the next slot for a request of the given method, without waiting for it.
+
+        Returns:
+            float: The number of seconds to wait before sending the request.
+        """
+        method_class = self._method_class(method)
+        if method_class is None:
+            return 0.0
+        with self._transaction():
+            now = self._now()
+            at = self._next_slot(method_class, now)
+            self._spend(method_class, at)
+        return at - now
+
+    def acquire(self, method):
+        """
+        Blocks until a request of the given method is allowed and records it.
 
+        Returns:
+            float: The total time spent waiting, in seconds.
+        """
+        delay = self.reserve(method)
+        if delay > 0:
+            with profiling.phase(THROTTLE):
+                time.sleep(delay)
+        return delay
+
+    def wait(self, method):
+        """
+        Records a request of the given method if it is allowed right away.
+
+        Returns:
+            tuple: ``(False, 0)`` if the request was recorded, ``(True, delay)`` with the number of seconds
+            after which to try again otherwise.
+        """
+        method_class = self._method_class(method)
+        if method_class is None:
             return False, 0
+        with self._transaction():
+            now = self._now()
+            at = self._next_slot(method_class, now)
+            if at > now:
+                return True, at - now
+            self._spend(method_class, at)
+        return False, 0
+
+    def block(self, method, seconds):
+        """
+        Holds back requests of the given method for ``seconds``, e.g. after a ``429`` with ``Retry-After``.
+        """
+        method_class = self._method_class(method)
+        if method_class is None:
+            return
+        with self._transaction():
+            self._block_window(method_class, "primary", self._now() + seconds)
+
+    def update_limits(self, headers, method=None):
+        """
+        Updates the windows from the rate limit headers of a response.
+
+        ``X-RateLimit-Limit-<window>`` headers, for the second, minute, hour and day windows, add or resize
+        the corresponding window. A ``X-RateLimit-Remaining-<window>`` or ``RateLimit-Remaining`` header of
+        ``0`` holds requests back until ``X-RateLimit-Reset``/``RateLimit-Reset``, or for the whole window.
+
+        Args:
+            headers (dict): The response headers.
+            method (str): The method of the request that got the response. Applies to both classes if omitted.
+        """
+        headers = {key.lower(): value for key, value in headers.items()}
+        reset = _header_number(headers, "x-ratelimit-reset")
+        if reset is None:
+            reset = _header_number(headers, "ratelimit-reset")
+        classes = [self._method_class(method)] if method else list(self._windows)
+
+        with self._transaction():
+            now = self._now()
+            for method_class in filter(None, classes):
+                windows = self._windows[method_class]
+                for name, period in HEADER_WINDOWS.items():
+                    limit = _header_number(headers, f"x-ratelimit-limit-{name}")
+                    if limit:
+                        if name in windows:
+                            windows[name].resize(limit=limit)
+                        else:
+                            windows[name] = Window(limit, period)
+                    remaining = _header_number(headers, f"x-ratelimit-remaining-{name}")
+                    if remaining is not None and remaining <= 0 and name in windows:
+                        wait = _seconds_until(reset) if reset is not None else period
+                        self._block_window(method_class, name, now + wait)
+
+                remaining = _header_number(headers, "ratelimit-remaining")
+                if remaining is not None and remaining <= 0 and reset is not None:
+                    self._block_window(method_class, "primary", now + _seconds_until(reset))
+
+
+def rate_limit_key(product, *parts):
+    """
+    Builds the key under which a :class:`~zscaler.ratelimiter.shared.SharedRateLimiter` stores the budget of a
+    tenant, e.g. ``rate_limit_key("zpa", cloud, customer_id)``. The parts are hashed, so credentials can be used
+    to tell tenants apart without being written to disk.
+    """
+    digest = hashlib.sha256("/".join(str(part) for part in parts).encode()).hexdigest()[:16]
+    return f"{product}/{digest}"
+
+
+def build_rate_limiter(get_limit, post_put_delete_limit, get_freq, post_put_delete_freq, key=None, store=None):
+    """
+    Builds the rate limiter of a client.
+
+    Args:
+        key (str): The tenant the budget belongs to, see :func:`rate_limit_key`.
+        store (str): Path of the SQLite file in which processes on this host share their budgets. Defaults to
+            the ``ZSCALER_RATE_LIMIT_STORE`` environment variable. Each client keeps its own budget when unset.
+
+    Returns:
+        :obj:`RateLimiter`: A :class:`~zscaler.ratelimiter.shared.SharedRateLimiter` when a store is configured,
+        a process-local :class:`RateLimiter` otherwise.
+    """
+    store = store or os.getenv("ZSCALER_RATE_LIMIT_STORE")
+    if store and key:
+        from zscaler.ratelimiter.shared import SharedRateLimiter
+
+        return SharedRateLimiter(get_limit, post_put_delete_limit, get_freq, post_put_delete_freq, key=key, path=store)
+    return RateLimiter(get_limit, post_put_delete_limit, get_freq, post_put_delete_freq)
+
+
+class AsyncRateLimiter:
+    """
+    asyncio-aware wrapper around :class:`RateLimiter`. Instead of blocking the thread, :meth:`acquire`
+    suspends the calling coroutine until its reserved slot, without blocking the event loop. Coroutines
+    are served in the order they reserved their slots.
+    """
+
+    def __init__(self, limiter: RateLimiter):
+        self.limiter = limiter
+
+    @classmethod
+    def from_limits(cls, get_limit, post_put_delete_limit, get_freq, post_put_delete_freq):
+        return cls(RateLimiter(get_limit, post_put_delete_limit, get_freq, post_put_delete_freq))
+
+    async def acquire(self, method):
+        """
+        Waits until a request of the given method is allowed and records it.
+
+        Returns:
+            float: The total time spent waiting, in seconds.
+        """
+        delay = self.limiter.reserve(method)
+        if delay > 0:
+            import asyncio
+
+            with profiling.phase(THROTTLE):
+                await asyncio.sleep(delay)
+        return delay
+
+    def block(self, method, seconds):
+        self.limiter.block(method, seconds)
 
-    def update_limits(self, headers):
-        if "X-Ratelimit-Limit-Second" in headers:
-            self.get_limit = int(headers["X-Ratelimit-Limit-Second"])
-            self.post_put_delete_limit = int(headers["X-Ratelimit-Limit-Second"])
-        if "X-Ratelimit-Reset" in headers:
-            self.get_freq = int(headers["X-Ratelimit-Reset"])
-            self.post_put_delete_freq = int(headers["X-Ratelimit-Reset"])
-
-        # Handle minute, hour, and day limits
-        if "X-RateLimit-Limit-Minute" in headers:
-            self.minute_limit = int(headers["X-RateLimit-Limit-Minute"])
-        if "X-RateLimit-Limit-Hour" in headers:
-            self.hour_limit = int(headers["X-RateLimit-Limit-Hour"])
-        if "X-RateLimit-Limit-Day" in headers:
-            self.day_limit = int(headers["X-RateLimit-Limit-Day"])
-
-        if "X-RateLimit-Remaining-Minute" in headers:
-            self.remaining_minute = int(headers["X-RateLimit-Remaining-Minute"])
-        if "X-RateLimit-Remaining-Hour" in headers:
-            self.remaining_hour = int(headers["X-RateLimit-Remaining-Hour"])
-        if "X-RateLimit-Remaining-Day" in headers:
-            self.remaining_day = int(headers["X-RateLimit-Remaining-Day"])
+    def update_limits(self, headers, method=None):
+        self.limiter.update_limits(headers, method)
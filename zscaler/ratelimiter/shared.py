@@ -0,0 +1,113 @@
+import contextlib
+import os
+import sqlite3
+import threading
+import time
+
+from zscaler.ratelimiter.ratelimiter import RateLimiter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spends (key TEXT NOT NULL, method_class TEXT NOT NULL, window_name TEXT NOT NULL, at REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS spends_by_window ON spends (key, method_class, window_name, at);
+CREATE TABLE IF NOT EXISTS blocks (
+    key TEXT NOT NULL, method_class TEXT NOT NULL, window_name TEXT NOT NULL, until REAL NOT NULL,
+    PRIMARY KEY (key, method_class, window_name)
+);
+"""
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    A :class:`~zscaler.ratelimiter.ratelimiter.RateLimiter` whose budget is shared by every process on the host
+    that uses the same ``path`` and ``key``, e.g. a pool of workers talking to one tenant.
+
+    Reservations are stored in a SQLite file and made inside ``BEGIN IMMEDIATE`` transactions, so processes
+    take turns and split the budget instead of each assuming the whole quota. The windows themselves (limits
+    and periods) are configured per process, as for :class:`RateLimiter`; the times at which their tokens
+    were spent and the blocks set from response headers are shared. Wall-clock time is used so that all
+    processes agree on it.
+
+    Args:
+        key (str): The tenant and cloud the budget belongs to, see :func:`~zscaler.ratelimiter.ratelimiter.rate_limit_key`.
+        path (str): Path of the SQLite file holding the shared state. It is created if missing, readable by its
+            owner only.
+
+    Examples:
+        >>> limiter = SharedRateLimiter(20, 10, 10, 10, key=rate_limit_key("zpa", cloud, customer_id),
+        ...                             path="/var/tmp/zscaler-ratelimit.sqlite3")
+    """
+
+    def __init__(self, get_limit, post_put_delete_limit, get_freq, post_put_delete_freq, key, path):
+        super().__init__(get_limit, post_put_delete_limit, get_freq, post_put_delete_freq)
+        self.key = key
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self._local = threading.local()
+        # Owner-only, like the other SQLite files of the SDK
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self):
+        # One connection per thread and process: SQLite connections must not cross a fork.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _now(self):
+        return time.time()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        with self.lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _block_window(self, method_class, name, until):
+        self._connection().execute(
+            "INSERT INTO blocks (key, method_class, window_name, until) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (key, method_class, window_name) DO UPDATE SET until = max(until, excluded.until)",
+            (self.key, method_class, name, until),
+        )
+
+    def _next_slot(self, method_class, now):
+        conn = self._connection()
+        at = now
+        for name, window in self._windows[method_class].items():
+            row = conn.execute(
+                "SELECT at FROM spends WHERE key = ? AND method_class = ? AND window_name = ? "
+                "ORDER BY at DESC LIMIT 1 OFFSET ?",
+                (self.key, method_class, name, window.limit - 1),
+            ).fetchone()
+            if row is not None:
+                at = max(at, row[0] + window.period)
+        # Slots never move backwards, whichever process booked the last one.
+        last, blocked = conn.execute(
+            "SELECT (SELECT max(at) FROM spends WHERE key = ? AND method_class = ?), "
+            "(SELECT max(until) FROM blocks WHERE key = ? AND method_class = ?)",
+            (self.key, method_class, self.key, method_class),
+        ).fetchone()
+        return max(at, last or 0, blocked or 0)
+
+    def _spend(self, method_class, at):
+        conn = self._connection()
+        now = self._now()
+        for name, window in self._windows[method_class].items():
+            conn.execute(
+                "INSERT INTO spends (key, method_class, window_name, at) VALUES (?, ?, ?, ?)",
+                (self.key, method_class, name, at),
+            )
+            conn.execute(
+                "DELETE FROM spends WHERE key = ? AND method_class = ? AND window_name = ? AND at < ?",
+                (self.key, method_class, name, now - window.period),
+            )
@@ -0,0 +1,216 @@
+import logging
+import os
+import re
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from zscaler import codec
+
+REDACTED = "<redacted>"
+
+# Compared in lowercase
+REDACTED_HEADERS = frozenset(("authorization", "proxy-authorization", "cookie", "set-cookie", "x-api-key"))
+REDACTED_PARAMS = frozenset(("api_token", "apikey", "password", "client_secret", "key_secret", "token"))
+REDACTED_FIELDS = (
+    "password",
+    "apiKey",
+    "api_key",
+    "client_secret",
+    "clientSecret",
+    "key_secret",
+    "api_token",
+    "access_token",
+    "jwtToken",
+    "token",
+)
+
+DEFAULT_BODY_LIMIT = 4096
+
+# A string field holding a secret, also matched when the body is truncated in the middle of its value
+_SECRET_FIELD = re.compile(r'("(?:%s)"\s*:\s*)"(?:[^"\\]|\\.)*(?:"|\\?$)' % "|".join(REDACTED_FIELDS))
+
+
+class TraceSettings:
+    """
+    Settings of the request and response traces, read from the environment by default.
+
+    Args:
+        body_limit (int): Number of bytes of a body logged, the rest being cut. ``0`` logs whole bodies.
+            Defaults to the ``ZSCALER_SDK_LOG_BODY_LIMIT`` environment variable, or 4096.
+        sample_rate (float): Fraction of the requests traced, from ``0`` to ``1``. A request and its response
+            are traced, or not, together. Defaults to the ``ZSCALER_SDK_LOG_SAMPLE_RATE`` environment
+            variable, or ``1``.
+    """
+
+    def __init__(self, body_limit=None, sample_rate=None):
+        if body_limit is None:
+            body_limit = int(os.getenv("ZSCALER_SDK_LOG_BODY_LIMIT", DEFAULT_BODY_LIMIT))
+        if sample_rate is None:
+            sample_rate = float(os.getenv("ZSCALER_SDK_LOG_SAMPLE_RATE", 1))
+        if body_limit < 0:
+            raise ValueError(f"Invalid body limit {body_limit}, expected 0 or more bytes")
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"Invalid sample rate {sample_rate}, expected a fraction between 0 and 1")
+        self.body_limit = body_limit
+        self.sample_rate = sample_rate
+
+
+settings = TraceSettings()
+
+
+def configure(body_limit=None, sample_rate=None):
+    """
+    Replaces the trace settings of the process. The arguments left out are read from the environment.
+
+    Returns:
+        :obj:`TraceSettings`: The settings now in use.
+    """
+    global settings
+    settings = TraceSettings(body_limit, sample_rate)
+    return settings
+
+
+def sampled(request_uuid):
+    """Returns whether the request is traced. The outcome is the same for all the traces of a request."""
+    rate = settings.sample_rate
+    if rate >= 1:
+        return True
+    if rate <= 0:
+        return False
+    return zlib.crc32(str(request_uuid).encode()) < rate * 2**32
+
+
+def tracing(logger, request_uuid):
+    """
+    Returns whether a trace of the request would be logged, which is all a request costs when it is not:
+    INFO disabled for ``logger``, e.g. by :func:`zscaler.logger.setup_logging`, or the request not sampled.
+    """
+    return logger.isEnabledFor(logging.INFO) and sampled(request_uuid)
+
+
+def redact_headers(headers):
+    """Returns the ``(name, value)`` pairs of ``headers``, with the credentials and cookies replaced."""
+    return [(name, REDACTED if name.lower() in REDACTED_HEADERS else value) for name, value in headers.items()]
+
+
+def redact_url(url):
+    """Returns ``url`` with the values of its credential query parameters, e.g. sandbox tokens, replaced."""
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = [(name, REDACTED if name.lower() in REDACTED_PARAMS else value) for name, value in parse_qsl(parts.query, True)]
+    return urlunsplit(parts._replace(query=urlencode(query, safe="<>")))
+
+
+def render_body(body, limit=None):
+    """
+    Returns a body as logged: decoded as UTF-8, cut after ``limit`` bytes and with the values of its secret
+    fields replaced. Only the bytes logged are decoded.
+
+    Args:
+        body (bytes): The body, or the data to encode as JSON.
+        limit (int): Number of bytes kept, ``0`` for all. Defaults to the current settings.
+    """
+    if not body:
+        return ""
+    if limit is None:
+        limit = settings.body_limit
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    elif not isinstance(body, (bytes, bytearray)):
+        body = codec.dumps(body)
+    size = len(body)
+    text = (body[:limit] if limit else body).decode("utf-8", "replace")
+    text = _SECRET_FIELD.sub(rf'\1"{REDACTED}"', text)
+    if limit and size > limit:
+        text += f"... [{size - limit} more bytes]"
+    return text
+
+
+class LazyMessage:
+    """
+    A log message rendered by ``render(*args)`` the first time it is formatted. Records that no handler
+    emits, e.g. because of its level or filters, are never rendered.
+    """
+
+    __slots__ = ("_render", "_args", "_message")
+
+    def __init__(self, render, *args):
+        self._render = render
+        self._args = args
+        self._message = None
+
+    def __str__(self):
+        if self._message is None:
+            self._message = self._render(*self._args)
+        return self._message
+
+
+def _render_request(url, method, headers, body, request_uuid):
+    log_lines = [
+        f"\n---[ ZSCALER SDK REQUEST | ID:{request_uuid} ]-------------------------------",
+        f"{method} {redact_url(url)}",
+    ]
+    log_lines.extend(f"{key}: {value}" for key, value in redact_headers(headers))
+    request_body = render_body(body)
+    if request_body and request_body != "null":
+        log_lines.append(f"\n{request_body}")
+    log_lines.append("--------------------------------------------------------------------")
+    return "\n".join(log_lines)
+
+
+def _render_response(full_url, method, resp, request_uuid, duration_ms, from_cache):
+    if from_cache:
+        log_lines = [f"\n---[ ZSCALER SDK RESPONSE | ID:{request_uuid} | FROM CACHE | DURATION:{duration_ms}ms ]" + "-" * 31]
+    else:
+        log_lines = [f"\n---[ ZSCALER SDK RESPONSE | ID:{request_uuid} | DURATION:{duration_ms}ms ]" + "-" * 46]
+    log_lines.append(f"{method} {redact_url(full_url)}")
+    log_lines.extend(f"{key}: {value}" for key, value in redact_headers(resp.headers))
+    response_body = render_body(resp.content)
+    if response_body and response_body != "null":
+        log_lines.append(f"\n{response_body}")
+    log_lines.append("-" * 68)
+    return "\n".join(log_lines)
+
+
+def trace_request(logger, url, method, body, headers, request_uuid, log_body=True):
+    """
+    Logs a request at INFO level, when :func:`tracing`. The message is rendered lazily, and the record
+    carries the fields of the trace in its ``zscaler_trace`` attribute for structured handlers.
+
+    Args:
+        body (bytes): The body as sent, or ``None``.
+        log_body (bool): Whether the body is logged.
+    """
+    if not tracing(logger, request_uuid):
+        return
+    # Copied, as the clients add the session cookie to the headers after the request is traced
+    message = LazyMessage(_render_request, url, method, dict(headers), body if log_body else None, request_uuid)
+    trace = {"event": "request", "uuid": str(request_uuid), "method": method, "url": redact_url(url)}
+    logger.info(message, extra={"zscaler_trace": trace})
+
+
+def trace_response(logger, url, method, resp, params, request_uuid, start_time, from_cache=False):
+    """
+    Logs a response at INFO level, when :func:`tracing`. The message is rendered lazily, and the record
+    carries the fields of the trace in its ``zscaler_trace`` attribute for structured handlers.
+    """
+    if not tracing(logger, request_uuid):
+        return
+    duration_ms = (time.time() - start_time) * 1000
+    full_url = url
+    if params:
+        full_url += "?" + urlencode(params)
+    message = LazyMessage(_render_response, full_url, method, resp, request_uuid, duration_ms, from_cache)
+    trace = {
+        "event": "response",
+        "uuid": str(request_uuid),
+        "method": method,
+        "url": redact_url(full_url),
+        "status_code": resp.status_code,
+        "duration_ms": duration_ms,
+        "from_cache": bool(from_cache),
+        "size": len(resp.content or b""),
+    }
+    logger.info(message, extra={"zscaler_trace": trace})
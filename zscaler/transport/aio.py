@@ -0,0 +1,68 @@
+import os
+import time
+import urllib.parse
+
+import aiohttp
+
+from zscaler.transport.response import build_response
+from zscaler.transport.session import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE
+
+
+def build_async_session(pool_maxsize=None, pool_connections=None, keep_alive=True, headers=None, timeout=None):
+    """
+    Builds an :class:`aiohttp.ClientSession` backed by a pooled keep-alive connector, mirroring
+    :func:`zscaler.transport.session.build_session` for the asyncio clients.
+
+    Must be called from within a running event loop.
+
+    Args:
+        pool_maxsize (int): Maximum number of open connections per host. Defaults to the
+            ``ZSCALER_CLIENT_POOL_MAXSIZE`` environment variable, or 10.
+        pool_connections (int): Maximum number of hosts with open connections. Defaults to the
+            ``ZSCALER_CLIENT_POOL_CONNECTIONS`` environment variable, or 10.
+        keep_alive (bool): Whether connections are kept open between requests. Defaults to ``True``.
+        headers (dict): Default headers sent with every request.
+        timeout (int): Total timeout of a request, in seconds.
+
+    Returns:
+        :obj:`aiohttp.ClientSession`: The configured session.
+    """
+    if pool_maxsize is None:
+        pool_maxsize = int(os.getenv("ZSCALER_CLIENT_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE))
+    if pool_connections is None:
+        pool_connections = int(os.getenv("ZSCALER_CLIENT_POOL_CONNECTIONS", DEFAULT_POOL_CONNECTIONS))
+
+    connector = aiohttp.TCPConnector(
+        limit=pool_maxsize * pool_connections,
+        limit_per_host=pool_maxsize,
+        force_close=not keep_alive,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=headers,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        cookie_jar=aiohttp.DummyCookieJar(),
+    )
+
+
+async def request(session, method, url, **kwargs):
+    """
+    Sends a request through an :class:`aiohttp.ClientSession` and returns it as a :class:`requests.Response`,
+    so that it can be handled by the same formatting, error and caching code as the synchronous clients.
+    """
+    if kwargs.get("params"):
+        # Encode like requests does: skip None values and render booleans as "True"/"False", which aiohttp rejects
+        params = {k: v for k, v in kwargs["params"].items() if v is not None}
+        kwargs["params"] = urllib.parse.urlencode(params, doseq=True)
+    start = time.monotonic()
+    async with session.request(method, url, **kwargs) as resp:
+        content = await resp.read()
+        return build_response(
+            method,
+            str(resp.url),
+            resp.status,
+            headers=list(resp.headers.items()),
+            content=content,
+            reason=resp.reason,
+            elapsed=time.monotonic() - start,
+        )
@@ -0,0 +1,189 @@
+import atexit
+import os
+import threading
+import urllib.parse
+
+from requests.adapters import BaseAdapter
+
+from zscaler.transport.cassette import Cassette
+
+TRANSPORT_MODES = ("http", "record", "replay")
+
+_PREFIXES = ("https://", "http://")
+
+
+class HTTPTransport:
+    """
+    Sends the requests of the clients over the network, through their pooled :class:`requests.Session`, or
+    :class:`aiohttp.ClientSession` for the asyncio clients. The default transport.
+
+    A transport is given to a client with its ``transport`` argument. It is installed on the session of the
+    synchronous clients, whose requests all go through the adapters of their session, and sends the requests of
+    the asyncio clients with :meth:`request`.
+    """
+
+    def install(self, session):
+        """Sets the transport up on a :class:`requests.Session`, returning the session."""
+        return session
+
+    async def request(self, session, method, url, **kwargs):
+        """Sends a request of an asyncio client, see :func:`zscaler.transport.aio.request`."""
+        from zscaler.transport import aio
+
+        return await aio.request(session, method, url, **kwargs)
+
+
+class RecordingAdapter(BaseAdapter):
+    """A :class:`requests.adapters.BaseAdapter` recording the exchanges of another adapter in a cassette."""
+
+    def __init__(self, adapter, cassette):
+        super().__init__()
+        self.adapter = adapter
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        resp = self.adapter.send(request, **kwargs)
+        self.cassette.record(request.method, request.url, resp)
+        return resp
+
+    def close(self):
+        self.adapter.close()
+
+
+class RecordingTransport(HTTPTransport):
+    """
+    Sends the requests over the network like :class:`HTTPTransport`, recording the exchanges in a
+    :class:`~zscaler.transport.cassette.Cassette` written to ``path`` by :meth:`save`, or when used as a context
+    manager, on exit.
+
+    Args:
+        path (str): The file of the cassette.
+
+    Examples:
+        >>> with RecordingTransport("segments.json.gz") as transport:
+        ...     zpa = ZPAClientHelper(client_id, client_secret, customer_id, cloud, transport=transport)
+        ...     zpa.app_segments.list_segments()
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.cassette = Cassette()
+
+    def install(self, session):
+        for prefix in _PREFIXES:
+            session.mount(prefix, RecordingAdapter(session.get_adapter(prefix), self.cassette))
+        return session
+
+    async def request(self, session, method, url, **kwargs):
+        resp = await super().request(session, method, url, **kwargs)
+        self.cassette.record(method, resp.url, resp)
+        return resp
+
+    def save(self):
+        """Writes the exchanges recorded so far to the cassette file."""
+        self.cassette.save(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.save()
+
+
+class ReplayAdapter(BaseAdapter):
+    """A :class:`requests.adapters.BaseAdapter` answering requests from a cassette, without any network access."""
+
+    def __init__(self, cassette):
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        resp = self.cassette.play(request.method, request.url)
+        resp.request = request
+        resp.connection = self
+        return resp
+
+    def close(self):
+        pass
+
+
+class ReplayTransport(HTTPTransport):
+    """
+    Answers the requests of the clients with the responses of a cassette recorded by
+    :class:`RecordingTransport`, in memory: recorded workloads run at full CPU speed, so that conversion,
+    pagination and caching code can be timed and tested without a tenant.
+
+    Requests that were not recorded raise :class:`~zscaler.exceptions.exceptions.CassetteMissError`.
+
+    Args:
+        cassette: A :class:`~zscaler.transport.cassette.Cassette`, or the path of one.
+
+    Examples:
+        >>> transport = ReplayTransport("segments.json.gz")
+        >>> zpa = ZPAClientHelper(client_id, client_secret, customer_id, cloud, transport=transport)
+        >>> zpa.app_segments.list_segments()
+    """
+
+    def __init__(self, cassette):
+        self.cassette = cassette if isinstance(cassette, Cassette) else Cassette.load(cassette)
+
+    def install(self, session):
+        adapter = ReplayAdapter(self.cassette)
+        for prefix in _PREFIXES:
+            session.mount(prefix, adapter)
+        return session
+
+    async def request(self, session, method, url, **kwargs):
+        params = kwargs.get("params")
+        if params:
+            # Encoded like aio.request and requests do
+            query = urllib.parse.urlencode({k: v for k, v in params.items() if v is not None}, doseq=True)
+            url = f"{url}{'&' if '?' in url else '?'}{query}"
+        return self.cassette.play(method, url)
+
+
+def build_transport(transport=None):
+    """
+    Returns the transport of a client.
+
+    Args:
+        transport: A transport, e.g. a :class:`ReplayTransport`. Defaults to the ``ZSCALER_CLIENT_TRANSPORT``
+            environment variable: ``record:<path>`` records the exchanges of the process in the cassette
+            ``path``, written at exit, ``replay:<path>`` replays them, ``http`` or unset sends the requests
+            over the network.
+
+    Returns:
+        :obj:`HTTPTransport`: The transport.
+
+    Raises:
+        ValueError: If the environment variable is not a valid transport.
+    """
+    if transport is not None:
+        return transport
+    setting = os.getenv("ZSCALER_CLIENT_TRANSPORT", "http")
+    mode, _, path = setting.partition(":")
+    if mode not in TRANSPORT_MODES or (mode != "http") != bool(path):
+        raise ValueError(f"Invalid transport {setting!r}, expected 'http', 'record:<path>' or 'replay:<path>'")
+    if mode == "http":
+        return HTTPTransport()
+    if mode == "replay":
+        return _shared(("replay", path), lambda: ReplayTransport(path))
+    return _shared(("record", path), lambda: _recording_at_exit(path))
+
+
+_transports = {}
+_transports_lock = threading.Lock()
+
+
+def _shared(key, build):
+    # The clients of a process share the transport of a path, so that their exchanges go to one cassette
+    with _transports_lock:
+        if key not in _transports:
+            _transports[key] = build()
+        return _transports[key]
+
+
+def _recording_at_exit(path):
+    transport = RecordingTransport(path)
+    atexit.register(transport.save)
+    return transport
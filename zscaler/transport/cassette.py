@@ -0,0 +1,171 @@
+import base64
+import gzip
+import json
+import threading
+from urllib.parse import urlsplit, urlunsplit
+
+from zscaler import codec, tracing
+from zscaler.exceptions.exceptions import CassetteMissError
+from zscaler.transport.response import build_response
+
+CASSETTE_VERSION = 1
+
+# Describe the body as received, not as replayed: requests and aiohttp have already decoded it
+DROPPED_HEADERS = frozenset(("content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"))
+
+SECRET_FIELDS = frozenset(tracing.REDACTED_FIELDS)
+
+
+def _encode_part(part):
+    return base64.urlsafe_b64encode(json.dumps(part, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+# Replaces the tokens of the login responses: an unsigned JWT without expiry, which the clients never refresh
+REDACTED_JWT = ".".join([_encode_part({"alg": "none", "typ": "JWT"}), _encode_part({"sub": tracing.REDACTED}), "redacted"])
+
+
+def redact_secret(value):
+    """Returns the replacement of a secret, a JWT for the JWTs so that the clients can still read them."""
+    return REDACTED_JWT if isinstance(value, str) and value.count(".") == 2 else tracing.REDACTED
+
+
+def redact_payload(data):
+    """Returns a decoded JSON body with the values of its secret fields, at any depth, replaced."""
+    if isinstance(data, dict):
+        return {
+            key: redact_secret(value) if key in SECRET_FIELDS and isinstance(value, str) else redact_payload(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [redact_payload(item) for item in data]
+    return data
+
+
+def redact_header(name, value):
+    """Returns the recorded value of a response header: cookies keep their name, so that sessions can be read."""
+    lowered = name.lower()
+    if lowered == "set-cookie":
+        cookie, _, attributes = value.partition(";")
+        return f"{cookie.partition('=')[0]}={tracing.REDACTED}" + (f";{attributes}" if attributes else "")
+    if lowered in tracing.REDACTED_HEADERS:
+        return tracing.REDACTED
+    return value
+
+
+def request_key(method, url):
+    """
+    Returns the key a request is recorded and replayed under: its method, and its URL without the scheme and
+    host and with its credential query parameters redacted. Cassettes can thus be replayed against any cloud.
+    """
+    parts = urlsplit(tracing.redact_url(url))
+    return method.upper(), urlunsplit(("", "", parts.path, parts.query, ""))
+
+
+class Cassette:
+    """
+    Recorded request and response exchanges, replayed in memory by
+    :class:`~zscaler.transport.backends.ReplayTransport`.
+
+    Only what the clients read is kept, compactly: the method and the path and query of the requests, the
+    status, headers and body of their responses. JSON bodies are stored decoded, with the values of their
+    secret fields replaced, and re-encoded once when the cassette is loaded. Credentials in query strings,
+    cookie values and authentication headers are redacted.
+
+    The responses recorded for a request are replayed in the order they were recorded, starting over when
+    they are exhausted, so that a recorded workload can be replayed any number of times.
+
+    Files whose name ends with ``.gz`` are compressed.
+    """
+
+    def __init__(self, interactions=None):
+        self._lock = threading.Lock()
+        self.interactions = []
+        self._responses = {}
+        self._cursors = {}
+        for interaction in interactions or ():
+            self._add(interaction)
+
+    def __len__(self):
+        return len(self.interactions)
+
+    def _add(self, interaction):
+        self.interactions.append(interaction)
+        if "json" in interaction:
+            content = codec.dumps(interaction["json"])
+        elif "text" in interaction:
+            content = interaction["text"].encode("utf-8")
+        elif "base64" in interaction:
+            content = base64.b64decode(interaction["base64"])
+        else:
+            content = b""
+        headers = [tuple(header) for header in interaction.get("headers", ())]
+        response = (interaction["status"], interaction.get("reason"), headers, content)
+        self._responses.setdefault((interaction["method"], interaction["url"]), []).append(response)
+
+    def record(self, method, url, resp):
+        """Records the :class:`requests.Response` received for a request."""
+        method, path = request_key(method, url)
+        headers = resp.headers.items()
+        interaction = {
+            "method": method,
+            "url": path,
+            "status": resp.status_code,
+            "reason": resp.reason,
+            "headers": [[name, redact_header(name, value)] for name, value in headers if name.lower() not in DROPPED_HEADERS],
+        }
+        content = resp.content
+        if content:
+            try:
+                interaction["json"] = redact_payload(codec.loads(content))
+            except ValueError:
+                try:
+                    interaction["text"] = content.decode("utf-8")
+                except UnicodeDecodeError:
+                    interaction["base64"] = base64.b64encode(content).decode("ascii")
+        with self._lock:
+            self._add(interaction)
+
+    def play(self, method, url):
+        """
+        Returns the next response recorded for a request, as a :class:`requests.Response`.
+
+        Raises:
+            CassetteMissError: If no response was recorded for the request.
+        """
+        key = request_key(method, url)
+        responses = self._responses.get(key)
+        if not responses:
+            raise CassetteMissError(*key)
+        with self._lock:
+            index = self._cursors.get(key, 0)
+            self._cursors[key] = (index + 1) % len(responses)
+        status, reason, headers, content = responses[index]
+        return build_response(method, url, status, headers=headers, content=content, reason=reason)
+
+    def rewind(self):
+        """Replays the responses from the first one again."""
+        with self._lock:
+            self._cursors.clear()
+
+    def save(self, path):
+        """Writes the cassette to a file."""
+        with self._lock:
+            data = codec.dumps({"version": CASSETTE_VERSION, "interactions": self.interactions})
+        opener = gzip.open if str(path).endswith(".gz") else open
+        with opener(path, "wb") as f:
+            f.write(data)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a cassette written by :meth:`save`.
+
+        Raises:
+            ValueError: If the file is not a cassette of a supported version.
+        """
+        opener = gzip.open if str(path).endswith(".gz") else open
+        with opener(path, "rb") as f:
+            document = codec.loads(f.read())
+        if not isinstance(document, dict) or document.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette {path}, expected version {CASSETTE_VERSION}")
+        return cls(document["interactions"])
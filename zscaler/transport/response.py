@@ -0,0 +1,61 @@
+import datetime
+
+import requests
+from requests.cookies import extract_cookies_to_jar
+from requests.structures import CaseInsensitiveDict
+
+
+class _HeaderMessage:
+    """Minimal ``http.client.HTTPMessage`` stand-in, used to feed ``Set-Cookie`` headers to a cookie jar."""
+
+    def __init__(self, headers):
+        self._headers = headers
+
+    def get_all(self, name, default=None):
+        values = [v for k, v in self._headers if k.lower() == name.lower()]
+        return values or default
+
+
+class _HeaderResponse:
+    def __init__(self, headers):
+        self._original_response = self
+        self.msg = _HeaderMessage(headers)
+
+    def info(self):
+        return self.msg
+
+
+def build_response(method, url, status_code, headers=None, content=b"", reason=None, elapsed=None):
+    """
+    Builds a :class:`requests.Response` from the parts of a response received by another transport,
+    so that response formatting, error handling and caching work regardless of how the request was sent.
+
+    Args:
+        method (str): The HTTP method of the request.
+        url (str): The request URL.
+        status_code (int): The HTTP status code.
+        headers (list): The response headers, as ``(name, value)`` pairs or a mapping.
+        content (bytes): The raw response body.
+        reason (str): The HTTP reason phrase.
+        elapsed (float): Time taken by the request, in seconds.
+
+    Returns:
+        :obj:`requests.Response`: The response object.
+    """
+    if headers is None:
+        headers = []
+    elif hasattr(headers, "items"):
+        headers = list(headers.items())
+
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp.reason = reason
+    resp.url = url
+    resp.headers = CaseInsensitiveDict(headers)
+    resp._content = content if isinstance(content, bytes) else (content or "").encode("utf-8")
+    resp._content_consumed = True
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers) or "utf-8"
+    resp.elapsed = datetime.timedelta(seconds=elapsed or 0)
+    resp.request = requests.Request(method, url).prepare()
+    extract_cookies_to_jar(resp.cookies, resp.request, _HeaderResponse(headers))
+    return resp
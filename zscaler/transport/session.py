@@ -0,0 +1,122 @@
+import os
+import socket
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    A :class:`requests.adapters.HTTPAdapter` that forwards custom socket options
+    to the underlying urllib3 connection pools.
+    """
+
+    def __init__(self, socket_options=None, **kwargs):
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        if self.socket_options is not None:
+            proxy_kwargs["socket_options"] = self.socket_options
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+
+def keep_alive_socket_options():
+    """
+    Returns the default urllib3 socket options extended with TCP keep-alive probes.
+
+    Returns:
+        list: A list of ``(level, option, value)`` tuples.
+    """
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # Linux exposes the probe timings, macOS only TCP_KEEPALIVE (idle time).
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+    elif hasattr(socket, "TCP_KEEPALIVE"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, 60))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 30))
+    if hasattr(socket, "TCP_KEEPCNT"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 4))
+    return options
+
+
+def build_session(
+    pool_connections=None,
+    pool_maxsize=None,
+    keep_alive=True,
+    socket_options=None,
+    pool_block=False,
+    headers=None,
+):
+    """
+    Creates a pooled :class:`requests.Session` shared by every call of a product client.
+
+    The pool sizes can also be set via the ``ZSCALER_CLIENT_POOL_CONNECTIONS`` and
+    ``ZSCALER_CLIENT_POOL_MAXSIZE`` environment variables.
+
+    Args:
+        pool_connections (int): Number of per-host connection pools to cache. Defaults to 10.
+        pool_maxsize (int): Maximum number of connections kept open per host. Defaults to 10.
+        keep_alive (bool): Re-use connections between requests and enable TCP keep-alive probes.
+            When ``False`` every request is sent with ``Connection: close``.
+        socket_options (list): Custom ``(level, option, value)`` socket options. Overrides the
+            keep-alive defaults when supplied.
+        pool_block (bool): Block when no free connection is available instead of opening a
+            throw-away connection beyond ``pool_maxsize``.
+        headers (dict): Default headers for every request made with the session.
+
+    Returns:
+        :obj:`requests.Session`: The configured session.
+    """
+    if pool_connections is None:
+        pool_connections = int(os.environ.get("ZSCALER_CLIENT_POOL_CONNECTIONS", DEFAULT_POOL_CONNECTIONS))
+    if pool_maxsize is None:
+        pool_maxsize = int(os.environ.get("ZSCALER_CLIENT_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE))
+    if socket_options is None and keep_alive:
+        socket_options = keep_alive_socket_options()
+
+    adapter = PooledHTTPAdapter(
+        socket_options=socket_options,
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def build_session_store(store=None):
+    """
+    Builds the store through which ZIA and ZCON clients share their login sessions.
+
+    Args:
+        store (str): Path of the SQLite file in which processes on this host share the session of a tenant.
+            Defaults to the ``ZSCALER_SESSION_STORE`` environment variable. Each client logs in on its own when
+            unset.
+
+    Returns:
+        :obj:`zscaler.transport.session_store.SessionStore`: The store, ``None`` when none is configured.
+    """
+    store = store or os.getenv("ZSCALER_SESSION_STORE")
+    if not store:
+        return None
+    from zscaler.transport.session_store import SessionStore
+
+    return SessionStore(store)
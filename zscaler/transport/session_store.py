@@ -0,0 +1,174 @@
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import NamedTuple
+
+logger = logging.getLogger("zscaler-sdk-python")
+
+# Seconds a stored session is handed out for: ZIA and ZCON end the API sessions idle for 30 minutes
+SESSION_MAX_AGE = 25 * 60
+# Seconds a client waits for the store while another one logs in: longer than a login and its retries, which
+# take up to four requests of 240 seconds with the default timeout of the clients
+LOCK_TIMEOUT = 20 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY, session_id TEXT NOT NULL, auth_details TEXT NOT NULL, refreshed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS holders (
+    key TEXT NOT NULL, holder TEXT NOT NULL, pid INTEGER NOT NULL, PRIMARY KEY (key, holder)
+);
+"""
+
+
+class StoredSession(NamedTuple):
+    """A session shared through a :class:`SessionStore`."""
+
+    session_id: str
+    auth_details: dict
+    refreshed_at: float
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SessionStore:
+    """
+    Shares the ``JSESSIONID`` of a ZIA or ZCON tenant between the clients of all the processes on a host, so that
+    a pool of workers logs in once rather than once per process, within the login rate limits.
+
+    The sessions are stored in a SQLite file, by tenant and user, and read and replaced inside ``BEGIN IMMEDIATE``
+    transactions: the clients needing a session while there is none, or when it expires, wait for the one which
+    logs in and then use its session. Each client holds the session it uses until it releases it, and the session
+    is only ended when the last holder releases it. The holders of processes that exited without releasing are
+    dropped at the next release.
+
+    Args:
+        path (str): Path of the SQLite file holding the sessions. It is created if missing, readable by its owner
+            only.
+        max_age (float): Seconds after its login from which a stored session is replaced rather than handed out.
+        timeout (float): Seconds to wait for the store while another client holds it, e.g. to log in, before
+            raising :exc:`sqlite3.OperationalError`.
+
+    Examples:
+        >>> store = SessionStore("/var/tmp/zscaler-sessions.sqlite3")
+        >>> session = store.acquire(key, holder, login)
+        >>> store.release(key, holder, logout)
+    """
+
+    def __init__(self, path, max_age=SESSION_MAX_AGE, timeout=LOCK_TIMEOUT):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_age = max_age
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self._local = threading.local()
+        # Owner-only: the sessions are bearer credentials
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        os.close(os.open(self.path, os.O_CREAT | os.O_RDWR, 0o600))
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connection(self):
+        # One connection per thread and process: SQLite connections must not cross a fork.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        with self.lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def get(self, key):
+        """Returns the stored session of ``key``, ``None`` if there is none."""
+        row = (
+            self._connection()
+            .execute("SELECT session_id, auth_details, refreshed_at FROM sessions WHERE key = ?", (key,))
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return StoredSession(row[0], json.loads(row[1]), row[2])
+
+    def acquire(self, key, holder, login, stale=None):
+        """
+        Returns the session of ``key``, logging in when there is no valid one, and records ``holder`` as using it.
+
+        Args:
+            key (str): The tenant and user the session belongs to, see
+                :func:`~zscaler.ratelimiter.ratelimiter.rate_limit_key`.
+            holder (str): Identifies the client using the session.
+            login (callable): Logs in and returns the ``(session_id, auth_details)`` of a new session, or raises.
+            stale (str): A session the caller found expired, replaced even if it is still within ``max_age``.
+
+        Returns:
+            :obj:`StoredSession`: The session to use.
+        """
+        with self._transaction() as conn:
+            session = self.get(key)
+            if session is None or session.session_id == stale or time.time() >= session.refreshed_at + self.max_age:
+                session_id, auth_details = login()
+                session = StoredSession(session_id, auth_details, time.time())
+                conn.execute(
+                    "INSERT INTO sessions (key, session_id, auth_details, refreshed_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET session_id = excluded.session_id, "
+                    "auth_details = excluded.auth_details, refreshed_at = excluded.refreshed_at",
+                    (key, session.session_id, json.dumps(session.auth_details), session.refreshed_at),
+                )
+            else:
+                logger.debug("Using the stored session.")
+            conn.execute(
+                "INSERT OR REPLACE INTO holders (key, holder, pid) VALUES (?, ?, ?)", (key, holder, os.getpid())
+            )
+        return session
+
+    def release(self, key, holder, logout):
+        """
+        Records that ``holder`` no longer uses the session of ``key``, and ends the session if it was the last
+        holder.
+
+        Args:
+            key (str): The tenant and user the session belongs to.
+            holder (str): Identifies the client which used the session.
+            logout (callable): Ends the session whose id it is given.
+
+        Returns:
+            bool: Whether the session was ended.
+        """
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM holders WHERE key = ? AND holder = ?", (key, holder))
+            # os.kill(pid, 0) only probes the process on POSIX systems
+            if os.name == "posix":
+                for pid in [pid for pid, in conn.execute("SELECT DISTINCT pid FROM holders WHERE key = ?", (key,))]:
+                    if not _pid_alive(pid):
+                        conn.execute("DELETE FROM holders WHERE key = ? AND pid = ?", (key, pid))
+            if conn.execute("SELECT 1 FROM holders WHERE key = ? LIMIT 1", (key,)).fetchone():
+                return False
+            session = self.get(key)
+            conn.execute("DELETE FROM sessions WHERE key = ?", (key,))
+        if session is None:
+            return False
+        # Outside the transaction: the clients arriving meanwhile log in again rather than wait for the logout
+        return logout(session.session_id)
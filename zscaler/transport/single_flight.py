@@ -0,0 +1,139 @@
+import logging
+import threading
+
+logger = logging.getLogger("zscaler-sdk-python")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls made with the same key: the first caller runs the call, the callers arriving
+    while it is in flight wait for it and get its result, or its exception, instead of making their own.
+
+    Clients key their GET requests on :meth:`Cache.create_key <zscaler.cache.cache.Cache.create_key>`, so that
+    threads asking for the same resource at the same time share a single HTTP request and a single slot of
+    the rate limit budget, whether the response cache is enabled or not. Calls made after the first one
+    completed are not coalesced with it.
+
+    Attributes:
+        requests (int): Number of calls that were run.
+        coalesced (int): Number of calls that waited for the result of a call in flight instead.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.requests = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """
+        Runs ``fn()``, unless a call with the same key is in flight, in which case its outcome is returned.
+
+        Returns:
+            The return value of ``fn``, shared by all the callers coalesced with it.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.requests += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            logger.debug(f'Waiting for the request in flight for key "{key}".')
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            if call.waiters:
+                logger.info(f'Shared the response for key "{key}" with {call.waiters} concurrent requests.')
+        return call.result
+
+    def stats(self):
+        """
+        Returns the counters of the coalescer.
+
+        Returns:
+            dict -- The number of calls run and coalesced so far, and the number in flight
+        """
+        with self._lock:
+            return {"requests": self.requests, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of :class:`SingleFlight`: coroutines awaiting a call with the same key as one in
+    flight are suspended until it completes and get its outcome.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.requests = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn):
+        """
+        Awaits ``fn()``, unless a call with the same key is in flight, in which case its outcome is returned.
+
+        Returns:
+            The return value of ``fn``, shared by all the coroutines coalesced with it.
+        """
+        import asyncio
+
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            logger.debug(f'Waiting for the request in flight for key "{key}".')
+            # Shielded, so that a cancelled waiter does not cancel the call for the others
+            return await asyncio.shield(future)
+
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        self.requests += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved here, so that asyncio does not report it as never retrieved when nobody waited
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def stats(self):
+        """
+        Returns the counters of the coalescer.
+
+        Returns:
+            dict -- The number of calls run and coalesced so far, and the number in flight
+        """
+        return {"requests": self.requests, "coalesced": self.coalesced, "in_flight": len(self._calls)}
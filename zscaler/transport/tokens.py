@@ -0,0 +1,223 @@
+import base64
+import json
+import logging
+import math
+import threading
+import time
+
+from zscaler.transport.single_flight import AsyncSingleFlight, SingleFlight
+
+logger = logging.getLogger("zscaler-sdk-python")
+
+# Seconds taken off the expiry of the tokens, to account for latency and clock skew
+EXPIRY_MARGIN = 10
+# Seconds before the expiry of a token from which a new one is obtained in the background
+REFRESH_BEFORE = 60
+# Seconds to wait before trying again a background refresh that failed
+RETRY_AFTER = 10
+
+_TOKEN = "token"
+
+
+def token_expiry(token):
+    """
+    Returns the time at which a JWT expires, less :data:`EXPIRY_MARGIN`, like
+    :func:`~zscaler.utils.is_token_expired`: ``inf`` for a JWT without an ``exp`` claim, and ``0`` for no token or
+    a token that is not a readable JWT.
+    """
+    if not token:
+        return 0.0
+    parts = token.split(".")
+    if len(parts) != 3:
+        return 0.0
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(parts[1] + "=="))
+    except ValueError as e:
+        logger.error(f"Error checking token expiration: {str(e)}")
+        return 0.0
+    if not isinstance(payload, dict) or "exp" not in payload:
+        return math.inf
+    return payload["exp"] - EXPIRY_MARGIN
+
+
+class _Tokens:
+    """The current token of a client and its expiry, read once when it is set."""
+
+    def __init__(self, login, refresh_before=REFRESH_BEFORE):
+        self._login = login
+        self.refresh_before = refresh_before
+        self._retry_at = 0.0
+        # Replaced as a whole, so that readers never see the expiry of another token
+        self._state = (None, 0.0, 0.0)
+        self.refreshed = 0
+        self.failed = 0
+
+    @property
+    def token(self):
+        return self._state[0]
+
+    @property
+    def expires_at(self):
+        return self._state[1]
+
+    @property
+    def refresh_at(self):
+        return self._state[2]
+
+    @refresh_at.setter
+    def refresh_at(self, refresh_at):
+        token, expires_at, _ = self._state
+        self._state = (token, expires_at, refresh_at)
+
+    def set(self, token):
+        """Sets the current token, e.g. ``None`` to have the next request log in again."""
+        expires_at = token_expiry(token)
+        # From refresh_before the expiry, or half way through the lifetime of short-lived tokens
+        refresh_at = expires_at - min(self.refresh_before, max(expires_at - time.time(), 0) / 2)
+        self._state = (token, expires_at, refresh_at)
+
+    def valid(self):
+        """Returns whether the current token can be used."""
+        token, expires_at, _ = self._state
+        return bool(token) and time.time() < expires_at
+
+
+class TokenRefresher(_Tokens):
+    """
+    Keeps the bearer token of a client valid without stalling its requests.
+
+    The expiry of a token is read once, when it is set, rather than decoded on every request. From
+    ``refresh_before`` seconds before it, or half the lifetime of short-lived tokens, requests go on with the
+    current token while a background thread obtains the next one. A login is only made inline when there is no
+    valid token, e.g. on the first request, and then by a single thread: the threads arriving meanwhile wait
+    for it instead of logging in too. Background and inline logins share a :class:`SingleFlight`, so that there
+    is never more than one at a time.
+
+    Args:
+        login (callable): Logs in and returns a new token, or raises.
+        refresh_before (float): Seconds before the expiry of a token from which a new one is obtained.
+
+    Attributes:
+        token (str): The current token.
+        expires_at (float): When the current token expires, as a timestamp.
+        refresh_at (float): When a new token starts being obtained in the background, as a timestamp.
+        refreshed (int): Number of tokens obtained in the background.
+        failed (int): Number of background refreshes that failed.
+    """
+
+    def __init__(self, login, refresh_before=REFRESH_BEFORE):
+        super().__init__(login, refresh_before)
+        self._single_flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def get(self):
+        """Returns a valid token, scheduling the next one ahead of the expiry of the current one."""
+        token, expires_at, refresh_at = self._state
+        now = time.time()
+        if token and now < expires_at:
+            if now >= refresh_at:
+                self._schedule(token)
+            return token
+        return self._single_flight.do(_TOKEN, lambda: self._refresh(token))
+
+    def _refresh(self, stale):
+        current, expires_at, _ = self._state
+        # Already replaced by the login this call waited for in the single flight, or which just completed
+        if current and current is not stale and time.time() < expires_at:
+            return current
+        token = self._login()
+        self.set(token)
+        return token
+
+    def _schedule(self, stale):
+        with self._lock:
+            if self._thread is not None or time.time() < self._retry_at:
+                return
+            logger.info("Obtaining a new token ahead of the expiry of the current one.")
+            self._thread = threading.Thread(
+                target=self._refresh_in_background, args=(stale,), name="zscaler-token-refresh", daemon=True
+            )
+            self._thread.start()
+
+    def _refresh_in_background(self, stale):
+        try:
+            self._single_flight.do(_TOKEN, lambda: self._refresh(stale))
+        except Exception as e:
+            # Requests go on with the current token until it expires, when they log in inline
+            with self._lock:
+                self.failed += 1
+                self._retry_at = time.time() + RETRY_AFTER
+            logger.warning(f"Background token refresh failed: {e}")
+        else:
+            with self._lock:
+                self.refreshed += 1
+        finally:
+            with self._lock:
+                self._thread = None
+
+    def join(self):
+        """Blocks until the background refresh in progress, if any, is done."""
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+
+
+class AsyncTokenRefresher(_Tokens):
+    """
+    asyncio counterpart of :class:`TokenRefresher`: the next token is obtained in a task of the running event
+    loop, and the coroutines needing a token while there is none wait for a single login.
+
+    Args:
+        login (callable): Coroutine function logging in and returning a new token, or raising.
+        refresh_before (float): Seconds before the expiry of a token from which a new one is obtained.
+    """
+
+    def __init__(self, login, refresh_before=REFRESH_BEFORE):
+        super().__init__(login, refresh_before)
+        self._single_flight = AsyncSingleFlight()
+        self._task = None
+
+    async def get(self):
+        """Returns a valid token, scheduling the next one ahead of the expiry of the current one."""
+        token, expires_at, refresh_at = self._state
+        now = time.time()
+        if token and now < expires_at:
+            if now >= refresh_at:
+                self._schedule(token)
+            return token
+        return await self._single_flight.do(_TOKEN, lambda: self._refresh(token))
+
+    async def _refresh(self, stale):
+        current, expires_at, _ = self._state
+        if current and current is not stale and time.time() < expires_at:
+            return current
+        token = await self._login()
+        self.set(token)
+        return token
+
+    def _schedule(self, stale):
+        import asyncio
+
+        if self._task is not None or time.time() < self._retry_at:
+            return
+        logger.info("Obtaining a new token ahead of the expiry of the current one.")
+        self._task = asyncio.get_running_loop().create_task(self._refresh_in_background(stale))
+
+    async def _refresh_in_background(self, stale):
+        try:
+            await self._single_flight.do(_TOKEN, lambda: self._refresh(stale))
+        except Exception as e:
+            self.failed += 1
+            self._retry_at = time.time() + RETRY_AFTER
+            logger.warning(f"Background token refresh failed: {e}")
+        else:
+            self.refreshed += 1
+        finally:
+            self._task = None
+
+    async def join(self):
+        """Waits until the background refresh in progress, if any, is done."""
+        task = self._task
+        if task is not None:
+            await task
@@ -14,8 +14,9 @@
 # ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
-import argparse
 import base64
+import contextlib
+import contextvars
 import datetime
 import functools
 import json as jsonp
@@ -23,97 +24,130 @@ import logging
 import random
 import re
 import time
+from collections.abc import Mapping, Sequence
 from typing import Dict, Optional
-from urllib.parse import urlencode
 
-import pytz
-from box import Box, BoxList
-from dateutil import parser
 from requests import Response
-from restfly import APIIterator
 
+from zscaler import codec, profiling, tracing
+from zscaler.cache.cached_response import CachedResponse
 from zscaler.constants import RETRYABLE_STATUS_CODES
+from zscaler.lazy import lazy_attributes
+from zscaler.profiling import BOX, CONVERT
+
+# asyncio, box, pytz and dateutil are imported by the functions using them, which a script may never call,
+# and Iterator, the only user of restfly, by the modules listing ZCON resources: importing the SDK is then
+# a fraction of the runtime of short-lived scripts.
+__getattr__, __dir__ = lazy_attributes(__name__, {"Iterator": "zscaler.iterators"})
 
 logger = logging.getLogger("zscaler-sdk-python")
 
 
-# Recursive function to convert all keys and nested keys from camel case
-# to snake case.
-def convert_keys_to_snake(data):
-    if isinstance(data, (list, BoxList)):
-        return [convert_keys_to_snake(inner_dict) for inner_dict in data]
-    elif isinstance(data, (dict, Box)):
-        new_dict = {}
-        for k in data.keys():
-            v = data[k]
-            new_key = camel_to_snake(k)
-            new_dict[new_key] = convert_keys_to_snake(v) if isinstance(v, (dict, list)) else v
-        return new_dict
+# Edge-cases where camelCase is breaking
+CAMEL_TO_SNAKE_EDGE_CASES = {
+    "routableIP": "routable_ip",
+    "isNameL10nTag": "is_name_l10n_tag",
+    "nameL10nTag": "name_l10n_tag",
+    "surrogateIP": "surrogate_ip",
+    "surrogateIPEnforcedForKnownBrowsers": "surrogate_ip_enforced_for_known_browsers",
+    "startIPAddress": "start_ip_address",
+    "endIPAddress": "end_ip_address",
+    "isIncompleteDRConfig": "is_incomplete_dr_config",
+}
+
+SNAKE_TO_CAMEL_EDGE_CASES = {
+    "routable_ip": "routableIP",
+    "is_name_l10n_tag": "isNameL10nTag",
+    "name_l10n_tag": "nameL10nTag",
+    "surrogate_ip": "surrogateIP",
+    "surrogate_ip_enforced_for_known_browsers": "surrogateIPEnforcedForKnownBrowsers",
+    "ec_vms": "ecVMs",
+    "is_incomplete_dr_config": "isIncompleteDRConfig",
+    "ipv6_enabled": "ipV6Enabled",
+    "valid_ssl_certificate": "validSSLCertificate",
+    "email_ids": "emailIds",
+    "page_size": "pageSize",
+}
+
+# Key names converted so far, by direction. The APIs use a few hundred distinct field names, so the memo
+# is bounded only to protect against payloads keyed by data, e.g. IDs or hostnames.
+KEY_CASE_MEMO_SIZE = 4096
+
+_CAMEL_CASE_BOUNDARY = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+def _convert_keys(data, converter):
+    """
+    Returns a copy of ``data`` with the keys of all its dicts, nested ones included, converted by
+    ``converter``. Lists and dicts are copied, Box and BoxList into plain lists and dicts, other values
+    are shared. The payload is walked with an explicit stack, so its depth is not limited by recursion.
+    """
+    if isinstance(data, (SnakeCaseView, SnakeCaseListView)):
+        # Converted from the decoded payload the view wraps
+        data = data._data
+    if isinstance(data, dict):
+        root = {}
+    elif isinstance(data, list):
+        root = []
     else:
         return data
+    stack = [(data, root)]
+    while stack:
+        source, target = stack.pop()
+        if isinstance(source, dict):
+            for key, value in source.items():
+                if isinstance(value, (dict, list)):
+                    child = {} if isinstance(value, dict) else []
+                    stack.append((value, child))
+                    value = child
+                target[converter(key)] = value
+        else:
+            for value in source:
+                if isinstance(value, (dict, list)):
+                    child = {} if isinstance(value, dict) else []
+                    stack.append((value, child))
+                    value = child
+                target.append(value)
+    return root
+
+
+def convert_keys_to_snake(data):
+    """Converts all keys and nested keys of ``data`` from camel case to snake case."""
+    with profiling.phase(CONVERT):
+        return _convert_keys(data, camel_to_snake)
 
 
+@functools.lru_cache(maxsize=KEY_CASE_MEMO_SIZE)
 def camel_to_snake(name: str):
     """Converts Python camelCase to Zscaler's lower snake_case."""
-    # Edge-cases where camelCase is breaking
-    edge_cases = {
-        "routableIP": "routable_ip",
-        "isNameL10nTag": "is_name_l10n_tag",
-        "nameL10nTag": "name_l10n_tag",
-        "surrogateIP": "surrogate_ip",
-        "surrogateIPEnforcedForKnownBrowsers": "surrogate_ip_enforced_for_known_browsers",
-        "startIPAddress": "start_ip_address",
-        "endIPAddress": "end_ip_address",
-        "isIncompleteDRConfig": "is_incomplete_dr_config",
-    }
-    return edge_cases.get(name, re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower())
+    edge_case = CAMEL_TO_SNAKE_EDGE_CASES.get(name)
+    if edge_case is not None:
+        return edge_case
+    return _CAMEL_CASE_BOUNDARY.sub("_", name).lower()
 
 
+@functools.lru_cache(maxsize=KEY_CASE_MEMO_SIZE)
 def snake_to_camel(name: str):
     """Converts Python Snake Case to Zscaler's lower camelCase."""
     if "_" not in name:
         return name
-    # Edge-cases where camelCase is breaking
-    edge_cases = {
-        "routable_ip": "routableIP",
-        "is_name_l10n_tag": "isNameL10nTag",
-        "name_l10n_tag": "nameL10nTag",
-        "surrogate_ip": "surrogateIP",
-        "surrogate_ip_enforced_for_known_browsers": "surrogateIPEnforcedForKnownBrowsers",
-        "ec_vms": "ecVMs",
-        "is_incomplete_dr_config": "isIncompleteDRConfig",
-        "ipv6_enabled": "ipV6Enabled",
-        "valid_ssl_certificate": "validSSLCertificate",
-        "email_ids": "emailIds",
-        "page_size": "pageSize",
-    }
-    return edge_cases.get(name, name[0].lower() + name.title()[1:].replace("_", ""))
+    edge_case = SNAKE_TO_CAMEL_EDGE_CASES.get(name)
+    if edge_case is not None:
+        return edge_case
+    return name[0].lower() + name.title()[1:].replace("_", "")
 
 
 def recursive_snake_to_camel(data):
     """Recursively convert dictionary keys from snake_case to camelCase."""
-    if isinstance(data, dict):
-        return {snake_to_camel(key): recursive_snake_to_camel(value) for key, value in data.items()}
-    elif isinstance(data, list):
-        return [recursive_snake_to_camel(item) for item in data]
-    else:
-        return data
+    return _convert_keys(data, snake_to_camel)
 
 
 def convert_keys(data, direction="to_camel"):
-    converter = camel_to_snake if direction == "to_snake" else snake_to_camel
-
-    if isinstance(data, (list, BoxList)):
-        return [convert_keys(inner_dict, direction=direction) for inner_dict in data]
-    elif isinstance(data, (dict, Box)):
-        new_dict = {}
-        for k in data.keys():
-            v = data[k]
-            new_key = converter(k)
-            new_dict[new_key] = convert_keys(v, direction=direction) if isinstance(v, (dict, list)) else v
-        return new_dict
-    else:
-        return data
+    """
+    Converts all keys and nested keys of ``data`` from snake case to camel case, or from camel case to
+    snake case if ``direction`` is ``"to_snake"``.
+    """
+    return _convert_keys(data, camel_to_snake if direction == "to_snake" else snake_to_camel)
 
 
 def chunker(lst, n):
@@ -122,24 +156,6 @@ def chunker(lst, n):
         yield lst[i : i + n]
 
 
-# Recursive function to convert all keys and nested keys from snake case
-# to camel case.
-
-
-def convert_keys(data):
-    if isinstance(data, (list, BoxList)):
-        return [convert_keys(inner_dict) for inner_dict in data]
-    elif isinstance(data, (dict, Box)):
-        new_dict = {}
-        for k in data.keys():
-            v = data[k]
-            new_key = snake_to_camel(k)
-            new_dict[new_key] = convert_keys(v) if isinstance(v, (dict, list)) else v
-        return new_dict
-    else:
-        return data
-
-
 def keys_exists(element: dict, *keys):
     """
     Check if *keys (nested) exists in `element` (dict).
@@ -238,11 +254,190 @@ def obfuscate_api_key(seed: list):
     return {"timestamp": now, "key": key}
 
 
+# Output modes of the data returned by the clients:
+# - box: Box and BoxList objects with snake_case keys, the default
+# - dict: plain dicts and lists with snake_case keys
+# - raw: the decoded JSON, with the keys as sent by the API
+# - lazy: read-only views of the decoded JSON, translating snake_case keys on access
+OUTPUT_MODES = ("box", "dict", "raw", "lazy")
+
+_output_override = contextvars.ContextVar("zscaler_output_override", default=None)
+
+
+def validate_output(output):
+    """Returns ``output`` if it is a supported output mode, raising a ValueError otherwise."""
+    if output not in OUTPUT_MODES:
+        raise ValueError(f"Unsupported output mode '{output}'. Please use one of the following: {', '.join(OUTPUT_MODES)}")
+    return output
+
+
+@contextlib.contextmanager
+def output_mode(output):
+    """
+    Sets the output mode of the calls made by any client in the block, overriding the mode the client was
+    created with. It applies to the current thread or asyncio task only.
+
+    Examples:
+        >>> with output_mode("raw"):
+        ...     segments, _ = zpa.app_segments.list_segments()
+    """
+    token = _output_override.set(validate_output(output))
+    try:
+        yield
+    finally:
+        _output_override.reset(token)
+
+
+def resolve_output(output=None, default=None):
+    """
+    Returns the output mode of a call: ``output`` if given, else the mode set by :func:`output_mode`, else
+    ``default``, the mode of the client, else ``"box"``.
+    """
+    return validate_output(output or _output_override.get() or default or "box")
+
+
+class SnakeCaseView(Mapping):
+    """
+    Read-only view of a decoded JSON object under snake_case keys, as returned in the ``lazy`` output mode.
+
+    Keys are translated the first time the view is read, and nested objects and lists are wrapped in views
+    as they are read, so the decoded payload is never copied. Fields can also be read as attributes, as on
+    a :class:`Box`. Use :meth:`to_dict` to get a mutable copy.
+    """
+
+    __slots__ = ("_data", "_keys")
+
+    def __init__(self, data):
+        self._data = data
+        self._keys = None
+
+    def _key_map(self):
+        if self._keys is None:
+            self._keys = {camel_to_snake(key): key for key in self._data}
+        return self._keys
+
+    def __getitem__(self, key):
+        return _view(self._data[self._key_map()[key]])
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self):
+        return iter(self._key_map())
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self):
+        """Returns the object as a dict with snake_case keys, nested objects and lists included."""
+        return convert_keys_to_snake(self._data)
+
+
+class SnakeCaseListView(Sequence):
+    """
+    Read-only view of a decoded JSON list, as returned in the ``lazy`` output mode: the objects and lists
+    it holds are wrapped in views as they are read. Use :meth:`to_list` to get a mutable copy.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self)(self._data[index])
+        return _view(self._data[index])
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, SnakeCaseListView)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_list()!r})"
+
+    def to_list(self):
+        """Returns the list with the keys of its objects in snake_case, nested objects and lists included."""
+        return convert_keys_to_snake(self._data)
+
+
+def _view(value):
+    if isinstance(value, dict):
+        return SnakeCaseView(value)
+    if isinstance(value, list):
+        return SnakeCaseListView(value)
+    return value
+
+
+def format_payload(data, output="box", box_attrs: Optional[Dict] = None):
+    """
+    Returns decoded JSON data in the given output mode.
+
+    Args:
+        data: The decoded JSON data, with the keys as sent by the API. It is not modified, but the ``raw``
+            and ``lazy`` modes share it with the returned value.
+        output: One of :data:`OUTPUT_MODES`.
+        box_attrs: The optional box attributes to pass as part of instantiation, in the ``box`` mode.
+    """
+    if output == "raw":
+        return data
+    if output == "lazy":
+        return _view(data)
+    data = convert_keys_to_snake(data)
+    if output == "box":
+        from box import Box, BoxList
+
+        with profiling.phase(BOX):
+            if isinstance(data, list):
+                return BoxList(data, **(box_attrs or {}))
+            if isinstance(data, dict):
+                return Box(data, **(box_attrs or {}))
+    return data
+
+
+def collect_items(items, output=None):
+    """
+    Collects the items returned by an iterator over a listing, which are already in the output mode of the
+    call, into a :class:`BoxList` in the ``box`` mode or a list otherwise.
+    """
+    if resolve_output(default=output) == "box":
+        from box import BoxList
+
+        with profiling.phase(BOX):
+            return BoxList(items)
+    return list(items)
+
+
+def get_field(data, name, default=None):
+    """
+    Reads a field of a payload returned in any output mode by its snake_case name, e.g. for API methods
+    returning a single field of a resource.
+    """
+    if name in data:
+        return data[name]
+    return data.get(snake_to_camel(name), default)
+
+
 def format_json_response(
     response: Response,
     box_attrs: Optional[Dict] = None,
     conv_json: bool = True,
     conv_box: bool = True,
+    output: Optional[str] = None,
 ):
     """
     A simple utility to handle formatting the response object into either a
@@ -262,6 +457,10 @@ def format_json_response(
             native datatypes.
         conv_box:
             A flaghandling if we should convert the data to a Box object.
+        output:
+            The output mode of the client, one of :data:`OUTPUT_MODES`. It
+            is overridden by :func:`output_mode`, and takes precedence over
+            conv_box when set.
 
     Returns:
         box.Box:
@@ -279,19 +478,20 @@ def format_json_response(
         requests.Response:
             If neither flag is True, or if the response isn't JSON data, then
             a response object is returned (pass-through).
+
+        The ``dict``, ``raw`` and ``lazy`` output modes return the data as
+        described by :func:`format_payload` instead of a Box.
     """
     if response.status_code > 299:
         return response
     content_type = response.headers.get("content-type", "application/json")
-    if (conv_json or conv_box) and "application/json" in content_type.lower() and len(response.text) > 0:  # noqa: E124
-        if conv_box:
-            data = convert_keys_to_snake(response.json())
-            if isinstance(data, list):
-                return BoxList(data, **box_attrs)
-            elif isinstance(data, dict):
-                return Box(data, **box_attrs)
-        elif conv_json:
-            return convert_keys_to_snake(response.json())
+    if (conv_json or conv_box) and "application/json" in content_type.lower() and len(response.content) > 0:  # noqa: E124
+        output = resolve_output(default=output or ("box" if conv_box else "dict"))
+        profiling.set_endpoint(response.url)
+        if isinstance(response, CachedResponse):
+            # Decoded and converted once per cache entry, copied on every hit
+            return response.format(output, box_attrs)
+        return format_payload(codec.decode_response(response), output, box_attrs)
     return response
 
 
@@ -312,44 +512,6 @@ def pick_version_profile(kwargs: list, payload: list):
             payload["versionProfileId"] = 2
 
 
-class Iterator(APIIterator):
-    """Iterator class."""
-
-    page_size = 100
-
-    def __init__(self, api, path: str = "", **kw):
-        """Initialize Iterator class."""
-        super().__init__(api, **kw)
-
-        self.path = path
-        self.max_items = kw.pop("max_items", 0)
-        self.max_pages = kw.pop("max_pages", 0)
-        self.payload = {}
-        if kw:
-            self.payload = {snake_to_camel(key): value for key, value in kw.items()}
-
-    def _get_page(self) -> None:
-        """Iterator function to get the page."""
-        resp = self._api.get(
-            self.path,
-            params={**self.payload, "page": self.num_pages + 1},
-        )
-        try:
-            # If we are using ZPA then the API will return records under the
-            # 'list' key.
-            self.page = resp.get("list") or []
-        except AttributeError:
-            # If the list key doesn't exist then we're likely using ZIA so just
-            # return the full response.
-            self.page = resp
-        finally:
-            # If we use the default retry-after logic in Restfly then we are
-            # going to keep seeing 429 messages in stdout. ZIA and ZPA have a
-            # standard 1 sec rate limit on the API endpoints with pagination so
-            # we are going to include it here.
-            time.sleep(1)
-
-
 def calculate_epoch(hours: int):
     current_time = int(time.time())
     past_time = int(current_time - (hours * 3600))
@@ -466,20 +628,26 @@ class ZDXIterator:
         self.page_count += 1
         return item
 
+    def _page_params(self):
+        return {**self.filters, "offset": self.next_offset} if self.next_offset else self.filters
+
     def _get_page(self):
-        params = {**self.filters, "offset": self.next_offset} if self.next_offset else self.filters
-        response = self.client.get(self.endpoint, params=params)
+        response = self.client.get(self.endpoint, params=self._page_params())
+        if not self._consume(response):
+            raise StopIteration
 
+    def _consume(self, response):
+        """Loads a page from an API response, returning ``False`` when the response is unusable."""
         self.logger.debug(f"API response: {response}")
 
         if response is None:
             self.logger.error(f"Invalid response: {response}")
-            raise StopIteration
+            return False
 
-        if isinstance(response, list):
+        if isinstance(response, (list, SnakeCaseListView)):
             self.page = response
             self.next_offset = None
-        elif isinstance(response, dict):
+        elif isinstance(response, Mapping):
             self.next_offset = response.get("next_offset")
             self.page = (
                 response.get("alerts", [])
@@ -490,13 +658,68 @@ class ZDXIterator:
             )
         else:
             self.logger.error(f"Unexpected response type: {type(response)}")
-            raise StopIteration
+            return False
 
         if not self.page:
             self.next_offset = None
 
         self.total += len(self.page)
         self.page_count = 0
+        return True
+
+
+class AsyncZDXIterator(ZDXIterator):
+    """
+    Asynchronous counterpart of :class:`ZDXIterator` for the asyncio ZDX client. Pages are fetched lazily,
+    on the first iteration rather than on construction.
+
+    Examples:
+        >>> async for device in AsyncZDXIterator(client, "devices"):
+        ...     print(device)
+    """
+
+    def __init__(self, client, endpoint, filters=None):
+        self.client = client
+        self.endpoint = endpoint
+        self.filters = {k: v for k, v in (filters or {}).items() if v is not None}
+        self.next_offset = None
+        self.previous_offset = None
+        self.page = []
+        self.page_count = 0
+        self.total = 0
+        self.started = False
+        self.logger = logging.getLogger("zscaler-sdk-python")
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.started:
+            self.started = True
+            if not await self._get_page():
+                raise StopAsyncIteration
+        if self.page_count >= len(self.page):
+            if self.next_offset is None:
+                raise StopAsyncIteration
+            if self.next_offset == self.previous_offset:
+                self.logger.warning(
+                    f"Detected repeated next_offset: {self.next_offset}, stopping iteration to avoid infinite loop."
+                )
+                raise StopAsyncIteration
+            self.previous_offset = self.next_offset
+            if not await self._get_page() or not self.page:
+                raise StopAsyncIteration
+        item = self.page[self.page_count]
+        self.page_count += 1
+        return item
+
+    async def _get_page(self):
+        response = await self.client.get(self.endpoint, params=self._page_params())
+        return self._consume(response)
+
+    async def to_list(self):
+        """Collects all remaining items into a :class:`BoxList`, or a list outside of the ``box`` output mode."""
+        return collect_items([item async for item in self], self.client.output)
 
 
 # class ZDXIterator:
@@ -615,6 +838,43 @@ def retry_with_backoff(method_type="GET", retries=5, backoff_in_seconds=0.5):
     return decorator
 
 
+def async_retry_with_backoff(method_type="GET", retries=5, backoff_in_seconds=0.5):
+    """
+    Asynchronous counterpart of :func:`retry_with_backoff`, for coroutine functions returning a response.
+    Waits between attempts with ``asyncio.sleep`` so that the event loop is not blocked.
+    """
+
+    if method_type != "GET":
+        retries = min(retries, 3)  # more conservative retry count for non-GET
+
+    def decorator(f):
+        @functools.wraps(f)
+        async def wrapper(*args, **kwargs):
+            import asyncio
+
+            x = 0
+            while True:
+                resp = await f(*args, **kwargs)
+
+                if 299 >= resp.status_code >= 200 or resp.status_code == 400 or not should_retry(resp.status_code):
+                    return resp
+
+                if x == retries:
+                    try:
+                        error_msg = resp.json()
+                    except Exception as e:
+                        error_msg = str(e)
+                    raise Exception(f"Reached max retries. Response: {error_msg}")
+                sleep = backoff_in_seconds * 2**x + random.uniform(0, 1)
+                logger.info("Args: %s, retrying after %d seconds...", str(args), sleep)
+                await asyncio.sleep(sleep)
+                x += 1
+
+        return wrapper
+
+    return decorator
+
+
 def is_token_expired(token_string):
     # If token string is None or empty, consider it expired
     if not token_string:
@@ -653,6 +913,8 @@ def str2bool(v):
     elif v.lower() in ("no", "false", "f", "n", "0"):
         return False
     else:
+        import argparse
+
         raise argparse.ArgumentTypeError("Boolean value expected.")
 
 
@@ -686,6 +948,9 @@ def validate_and_convert_times(start_time_str, end_time_str, time_zone_str):
     Raises:
         ValueError: If any validation fails.
     """
+    import pytz
+    from dateutil import parser
+
     # Validate time zone
     if time_zone_str not in pytz.all_timezones:
         raise ValueError(f"Invalid time zone: {time_zone_str}")
@@ -746,27 +1011,12 @@ zcc_param_map = {
 
 
 def dump_request(logger, url: str, method: str, json, params, headers, request_uuid: str, body=True):
-    request_headers_filtered = {key: value for key, value in headers.items() if key != "Authorization"}
-    # Log the request details before sending the request
-    request_data = {
-        "url": url,
-        "method": method,
-        "params": jsonp.dumps(params),
-        "uuid": str(request_uuid),
-        "request_headers": jsonp.dumps(request_headers_filtered),
-    }
-    log_lines = []
-    request_body = ""
-    if body:
-        request_body = jsonp.dumps(json)
-    log_lines.append(f"\n---[ ZSCALER SDK REQUEST | ID:{request_uuid} ]-------------------------------")
-    log_lines.append(f"{method} {url}")
-    for key, value in headers.items():
-        log_lines.append(f"{key}: {value}")
-    if body and request_body != "" and request_body != "null":
-        log_lines.append(f"\n{request_body}")
-    log_lines.append("--------------------------------------------------------------------")
-    logger.info("\n".join(log_lines))
+    """
+    Traces a request, see :func:`zscaler.tracing.trace_request`. ``json`` is the body as encoded by
+    :func:`zscaler.codec.encode_request`, so that the bytes sent are logged as is, or the body to encode.
+    Does nothing but check the log level when INFO is disabled.
+    """
+    tracing.trace_request(logger, url, method, json, headers, request_uuid, log_body=body)
 
 
 def dump_response(
@@ -779,31 +1029,8 @@ def dump_response(
     start_time,
     from_cache: bool = None,
 ):
-    # Calculate the duration in seconds
-    end_time = time.time()
-    duration_seconds = end_time - start_time
-    # Convert the duration to milliseconds
-    duration_ms = duration_seconds * 1000
-    # Convert the headers to a regular dictionary
-    response_headers_dict = dict(resp.headers)
-    full_url = url
-    if params:
-        full_url += "?" + urlencode(params)
-    log_lines = []
-    response_body = ""
-    if resp.text:
-        response_body = resp.text
-
-    if from_cache:
-        log_lines.append(
-            f"\n---[ ZSCALER SDK RESPONSE | ID:{request_uuid} | " f"FROM CACHE | DURATION:{duration_ms}ms ]" + "-" * 31
-        )
-    else:
-        log_lines.append(f"\n---[ ZSCALER SDK RESPONSE | ID:{request_uuid} | " f"DURATION:{duration_ms}ms ]" + "-" * 46)
-    log_lines.append(f"{method} {full_url}")
-    for key, value in response_headers_dict.items():
-        log_lines.append(f"{key}: {value}")
-    if response_body and response_body != "" and response_body != "null":
-        log_lines.append(f"\n{response_body}")
-    log_lines.append("-" * 68)
-    logger.info("\n".join(log_lines))
+    """
+    Traces a response, see :func:`zscaler.tracing.trace_response`. Does nothing but check the log level
+    when INFO is disabled.
+    """
+    tracing.trace_response(logger, url, method, resp, params, request_uuid, start_time, from_cache)
@@ -4,27 +4,49 @@ import urllib.parse
 import uuid
 import time
 import requests
-from datetime import datetime, timedelta
-
-from zscaler import __version__
+from datetime import timedelta
+from functools import cached_property
+
+from zscaler import __version__, codec, profiling
+from zscaler.hooks import (
+    RATE_LIMIT_WAIT,
+    RATE_LIMITED,
+    REQUEST_END,
+    REQUEST_START,
+    RETRY,
+    TOKEN_REFRESH,
+    Hooks,
+)
+from zscaler.lazy import lazy_attributes
+from zscaler.logger import ensure_logging
+from zscaler.metrics import build_metrics
+from zscaler.profiling import AUTH, NETWORK, Profiler
+from zscaler.ratelimiter.ratelimiter import build_rate_limiter, rate_limit_key
+from zscaler.transport.backends import build_transport
+from zscaler.transport.session import build_session
+from zscaler.transport.tokens import TokenRefresher
 from zscaler.user_agent import UserAgent
 from zscaler.utils import (
     dump_request,
     dump_response,
     format_json_response,
-    is_token_expired,
     retry_with_backoff,
+    validate_output,
 )
-from zscaler.logger import setup_logging
-from .devices import DevicesAPI
-from .secrets import SecretsAPI
 
 from zscaler.zcc.client import ZCCClient
 
-# Setup the logger
-setup_logging(logger_name="zscaler-sdk-python")
 logger = logging.getLogger("zscaler-sdk-python")
 
+# The API modules are imported by the accessors of the clients, on first use
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "DevicesAPI": "zscaler.zcc.devices",
+        "SecretsAPI": "zscaler.zcc.secrets",
+    },
+)
+
 
 class ZCCClientHelper(ZCCClient):
     """
@@ -49,6 +71,29 @@ class ZCCClientHelper(ZCCClient):
             (e.g. internal test instance etc). When using this attribute, there is no need to supply the `cloud`
             attribute. The override URL will be prepended to the API endpoint suffixes. The protocol must be included
             i.e. http:// or https://.
+        session (requests.Session):
+            An optional pre-configured session. When omitted, a pooled keep-alive session is built from the
+            `pool_connections`, `pool_maxsize`, `keep_alive` and `socket_options` keyword arguments.
+        rate_limit_store (str):
+            Path of a SQLite file through which the clients of all processes on this host share the rate limit
+            budget of the tenant. Defaults to the `ZSCALER_RATE_LIMIT_STORE` environment variable; each client
+            keeps its own budget when unset.
+        output (str):
+            The form of the data returned by the API methods, one of `box` (the default), `dict`, `raw` and
+            `lazy`. See :func:`zscaler.utils.format_payload`. It can be overridden for some calls with
+            :func:`zscaler.utils.output_mode`.
+        hooks (:obj:`zscaler.hooks.Hooks`):
+            Callbacks notified of the lifecycle events of the requests, e.g. retries and rate limit waits. See
+            :class:`zscaler.hooks.Hooks`. The client has its own, as `client.hooks`, when not given.
+        metrics (:obj:`zscaler.metrics.MetricsRegistry`):
+            Registry aggregating the latency, retries, 429s and cache hits of the requests, or `True` for a
+            registry of the client, available as `client.metrics`. Defaults to the
+            `ZSCALER_CLIENT_METRICS_ENABLED` environment variable.
+        transport (:obj:`zscaler.transport.backends.HTTPTransport`):
+            How the requests are sent: over the network by default, or recorded to, or replayed from, a
+            cassette with :class:`zscaler.transport.backends.RecordingTransport` and
+            :class:`zscaler.transport.backends.ReplayTransport`. Defaults to the `ZSCALER_CLIENT_TRANSPORT`
+            environment variable.
 
     """
 
@@ -65,26 +110,53 @@ class ZCCClientHelper(ZCCClient):
     DOWNLOAD_DEVICES_RESET_TIME = timedelta(days=1)
 
     def __init__(self, **kw):
+        ensure_logging()
         self._apikey = kw.get("apikey", os.getenv(f"{self._env_base}_CLIENT_ID"))
         self._secret_key = kw.get("secret_key", os.getenv(f"{self._env_base}_CLIENT_SECRET"))
         self._env_cloud = (
             os.getenv(f"{self._env_base}_CLOUD") if os.getenv(f"{self._env_base}_CLOUD") is not None else kw.get("cloud")
         )
-        self.login_url = f"https://api-mobile.{self._env_cloud}.net/papi/auth/v1/login"
-        self.url = f"https://api-mobile.{self._env_cloud}.net/papi/public/v1"
+        base_url = (
+            kw.get("override_url")
+            or os.getenv(f"{self._env_base}_OVERRIDE_URL")
+            or f"https://api-mobile.{self._env_cloud}.net"
+        )
+        self.login_url = f"{base_url}/papi/auth/v1/login"
+        self.url = f"{base_url}/papi/public/v1"
+        self.output = validate_output(kw.get("output", "box"))
 
         self.user_agent = UserAgent().get_user_agent_string()  # Ensure this returns a string
-        self.auth_token = None
-        self.headers = {}
+        self.transport = build_transport(kw.get("transport"))
+        # Pooled keep-alive session shared by login and all API calls
+        session = kw.get("session") or build_session(
+            pool_connections=kw.get("pool_connections"),
+            pool_maxsize=kw.get("pool_maxsize"),
+            keep_alive=kw.get("keep_alive", True),
+            socket_options=kw.get("socket_options"),
+        )
+        self.session = self.transport.install(session)
+        # Never modified once built, so that threads can copy it while others send requests; the token is
+        # added to each request instead
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "*/*",
+            "User-Agent": self.user_agent,
+        }
+        self.tokens = TokenRefresher(self._obtain_token)
+        self.hooks = (kw.get("hooks") or Hooks()).bind("zcc")
+        self.metrics = build_metrics(kw.get("metrics"), self.hooks)
         self.refreshToken()
 
-        # Initialize rate limit tracking
-        self.last_request_time = datetime.utcnow()
-        self.request_count = 0
-
-        # Track specific download devices endpoint usage
-        self.download_devices_count = 0
-        self.download_devices_last_reset = datetime.utcnow()
+        # Every call counts against the same hourly budget whatever its method, so all requests are
+        # acquired as GETs. /downloadDevices has its own daily budget.
+        store = kw.get("rate_limit_store")
+        key = rate_limit_key("zcc", self.url, self._apikey)
+        hour = self.RATE_LIMIT_RESET_TIME.total_seconds()
+        self.rate_limiter = build_rate_limiter(self.RATE_LIMIT, self.RATE_LIMIT, hour, hour, key=key, store=store)
+        day = self.DOWNLOAD_DEVICES_RESET_TIME.total_seconds()
+        self.download_devices_rate_limiter = build_rate_limiter(
+            self.DOWNLOAD_DEVICES_LIMIT, self.DOWNLOAD_DEVICES_LIMIT, day, day, key=f"{key}/downloadDevices", store=store
+        )
 
     def __enter__(self):
         self.refreshToken()
@@ -93,19 +165,33 @@ class ZCCClientHelper(ZCCClient):
     def __exit__(self, exc_type, exc_val, exc_tb):
         logger.debug("Deauthenticating...")
 
+    @property
+    def auth_token(self):
+        """The current token. Set it to ``None`` to have the next request log in again."""
+        return self.tokens.token
+
+    @auth_token.setter
+    def auth_token(self, token):
+        self.tokens.set(token)
+
     def refreshToken(self):
-        if not self.auth_token or is_token_expired(self.auth_token):
+        """
+        Returns a valid token. Logs in when there is none, once for all the threads needing it, and obtains the
+        next one in the background ahead of its expiry. See :class:`~zscaler.transport.tokens.TokenRefresher`.
+        """
+        return self.tokens.get()
+
+    def _obtain_token(self):
+        start_time = time.time()
+        with profiling.phase(AUTH):
             response = self.login()
-            if response is None or response.status_code > 299 or not response.json():
-                logger.error("Failed to login using provided credentials, response: %s", response)
-                raise Exception("Failed to login using provided credentials.")
-            self.auth_token = response.json().get("jwtToken")
-            self.headers = {
-                "Content-Type": "application/json",
-                "Accept": "*/*",
-                "auth-token": f"{self.auth_token}",
-                "User-Agent": self.user_agent,
-            }
+        self.hooks.emit(
+            TOKEN_REFRESH, status_code=response.status_code if response is not None else None, start=start_time
+        )
+        if response is None or response.status_code > 299 or not response.json():
+            logger.error("Failed to login using provided credentials, response: %s", response)
+            raise Exception("Failed to login using provided credentials.")
+        return response.json().get("jwtToken")
 
     @retry_with_backoff(retries=5)
     def login(self):
@@ -117,43 +203,40 @@ class ZCCClientHelper(ZCCClient):
         }
         try:
             url = self.login_url
-            resp = requests.post(url, json=data, headers=headers)
+            resp = self.session.post(url, json=data, headers=headers)
             logger.info("Login attempt with status: %d", resp.status_code)
             return resp
         except Exception as e:
             logger.error("Login failed due to an exception: %s", str(e))
             return None
 
-    def check_rate_limit(self, path):
+    def _rate_limiter_for(self, path):
+        return self.download_devices_rate_limiter if "/downloadDevices" in path else self.rate_limiter
+
+    def check_rate_limit(self, path, method=None, url=None):
         """
         Checks the rate limit and adjusts the request timing accordingly.
         """
-        current_time = datetime.utcnow()
-        time_since_last_request = current_time - self.last_request_time
-
-        # Reset the rate limit counter if the reset time has passed
-        if time_since_last_request >= self.RATE_LIMIT_RESET_TIME:
-            self.request_count = 0
-            self.last_request_time = current_time
-
-        if "/downloadDevices" in path:
-            time_since_last_reset = current_time - self.download_devices_last_reset
-            if time_since_last_reset >= self.DOWNLOAD_DEVICES_RESET_TIME:
-                self.download_devices_count = 0
-                self.download_devices_last_reset = current_time
-            if self.download_devices_count >= self.DOWNLOAD_DEVICES_LIMIT:
-                logger.warning("Rate limit exceeded for /downloadDevices endpoint. Backing off...")
-                time.sleep(24 * 60 * 60)  # Back off for a day
-                self.download_devices_count = 0
-                self.download_devices_last_reset = datetime.utcnow()
-            self.download_devices_count += 1
-        else:
-            if self.request_count >= self.RATE_LIMIT:
-                logger.warning("Rate limit exceeded. Backing off...")
-                time.sleep(3600)  # Back off for an hour
-                self.request_count = 0
-                self.last_request_time = datetime.utcnow()
-            self.request_count += 1
+        waited = self._rate_limiter_for(path).acquire("GET")
+        if waited:
+            logger.warning(f"Rate limit exceeded. Waited {waited} seconds.")
+            self.hooks.emit(RATE_LIMIT_WAIT, method=method, url=url, duration=waited)
+
+    def profile(self, cprofile=False):
+        """
+        Returns a :class:`~zscaler.profiling.Profiler` timing the phases of the calls made in its ``with``
+        block per endpoint: logins, rate limiter waits, requests, JSON decoding, key conversion and Box
+        construction.
+
+        Args:
+            cprofile (bool): Whether to also record a :mod:`cProfile` function profile of the block.
+
+        Examples:
+            >>> with zcc.profile() as prof:
+            ...     zcc.devices.list_devices()
+            >>> print(prof.report())
+        """
+        return Profiler(cprofile=cprofile)
 
     def send(self, method, path, json=None, params=None, stream=False):
         api = self.url
@@ -162,28 +245,34 @@ class ZCCClientHelper(ZCCClient):
         url = f"{api}/{path.lstrip('/')}"
         if params:
             url = f"{url}?{urllib.parse.urlencode(params)}"
+        profiling.set_endpoint(url)
 
         start_time = time.time()
         headers_with_user_agent = self.headers.copy()
         headers_with_user_agent["User-Agent"] = self.user_agent
         request_uuid = str(uuid.uuid4())
-        dump_request(logger, url, method, json, None, headers_with_user_agent, request_uuid)
+        body, headers_with_user_agent = codec.encode_request(json, headers_with_user_agent)
+        dump_request(logger, url, method, body, None, headers_with_user_agent, request_uuid)
 
+        self.hooks.emit(REQUEST_START, method=method, url=url)
         # Check rate limits
-        self.check_rate_limit(path)
+        self.check_rate_limit(path, method, url)
 
         attempts = 0
         while attempts < 5:
+            if attempts:
+                self.hooks.emit(RETRY, method=method, url=url, attempt=attempts + 1)
             try:
-                self.refreshToken()
-                resp = requests.request(
-                    method,
-                    url,
-                    json=json,
-                    params=None,
-                    headers=headers_with_user_agent,
-                    stream=stream,
-                )
+                headers_with_user_agent["auth-token"] = self.refreshToken()
+                with profiling.phase(NETWORK):
+                    resp = self.session.request(
+                        method,
+                        url,
+                        data=body,
+                        params=None,
+                        headers=headers_with_user_agent,
+                        stream=stream,
+                    )
                 dump_response(
                     logger=logger,
                     url=url,
@@ -193,7 +282,10 @@ class ZCCClientHelper(ZCCClient):
                     request_uuid=request_uuid,
                     start_time=start_time,
                 )
+                limiter = self._rate_limiter_for(path)
+                limiter.update_limits(resp.headers, "GET")
                 if resp.status_code == 429:
+                    self.hooks.emit(RATE_LIMITED, method=method, url=url, status_code=429, attempt=attempts + 1)
                     retry_after = resp.headers.get("Retry-After")
                     if retry_after:
                         try:
@@ -201,22 +293,28 @@ class ZCCClientHelper(ZCCClient):
                         except ValueError:
                             sleep_time = int(retry_after[:-1])
                         logger.warning(f"Rate limit exceeded. Retrying in {sleep_time} seconds.")
-                        time.sleep(sleep_time)
+                        limiter.block("GET", sleep_time)
                     else:
-                        time.sleep(60)
+                        limiter.block("GET", 60)
                     attempts += 1
+                    self.check_rate_limit(path, method, url)
                     continue
                 else:
                     break
             except requests.RequestException as e:
                 if attempts == 4:
                     logger.error(f"Failed to send {method} request to {url} after 5 attempts. Error: {str(e)}")
+                    self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
                     raise e
                 else:
                     logger.warning(f"Failed to send {method} request to {url}. Retrying... Error: {str(e)}")
                     attempts += 1
                     time.sleep(5)
+            except BaseException as e:
+                self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
+                raise
 
+        self.hooks.emit(REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time)
         return resp
 
     def get(self, path, json=None, params=None, stream=False):
@@ -235,7 +333,7 @@ class ZCCClientHelper(ZCCClient):
         resp = self.send("GET", path, json, params, stream=stream)
         if stream:
             return resp
-        formatted_resp = format_json_response(resp, box_attrs=dict())
+        formatted_resp = format_json_response(resp, box_attrs=dict(), output=self.output)
         return formatted_resp
 
     def post(self, path, json=None, params=None):
@@ -251,15 +349,19 @@ class ZCCClientHelper(ZCCClient):
         dict: Formatted JSON response from the API.
         """
         resp = self.send("POST", path, json, params)
-        formatted_resp = format_json_response(resp, box_attrs=dict())
+        formatted_resp = format_json_response(resp, box_attrs=dict(), output=self.output)
         return formatted_resp
 
-    @property
+    @cached_property
     def devices(self):
         """The interface object for the :ref:`ZCC Devices interface <zcc-devices>`."""
+        from zscaler.zcc.devices import DevicesAPI
+
         return DevicesAPI(self)
 
-    @property
+    @cached_property
     def secrets(self):
         """The interface object for the :ref:`ZCC Secrets interface <zcc-secrets>`."""
+        from zscaler.zcc.secrets import SecretsAPI
+
         return SecretsAPI(self)
@@ -17,41 +17,73 @@ import datetime
 import logging
 import os
 import re
+import threading
 import time
 import uuid
+from functools import cached_property
 from time import sleep
+from typing import TYPE_CHECKING
 
 import requests
-from box import Box, BoxList
 
-from zscaler import __version__
+from zscaler import __version__, codec, profiling
+from zscaler.cache.cached_response import CachedResponse
 from zscaler.cache.no_op_cache import NoOpCache
-from zscaler.cache.zscaler_cache import ZscalerCache
+from zscaler.cache.refresh import BackgroundRefresher
+from zscaler.cache.zscaler_cache import build_cache
+from zscaler.constants import ZCON_CACHE_DEPENDENCIES
+from zscaler.hooks import (
+    CACHE_HIT,
+    CACHE_MISS,
+    RATE_LIMIT_WAIT,
+    RATE_LIMITED,
+    REQUEST_END,
+    REQUEST_START,
+    RETRY,
+    TOKEN_REFRESH,
+    Hooks,
+)
 from zscaler.errors.http_error import HTTPError, ZscalerAPIError
 from zscaler.exceptions.exceptions import HTTPException, ZscalerAPIException
-from zscaler.logger import setup_logging
-from zscaler.ratelimiter.ratelimiter import RateLimiter
+from zscaler.lazy import lazy_attributes
+from zscaler.logger import ensure_logging
+from zscaler.metrics import build_metrics
+from zscaler.profiling import AUTH, NETWORK, Profiler
+from zscaler.ratelimiter.ratelimiter import build_rate_limiter, rate_limit_key
+from zscaler.transport.backends import build_transport
+from zscaler.transport.session import build_session, build_session_store
+from zscaler.transport.single_flight import SingleFlight
 from zscaler.user_agent import UserAgent
 from zscaler.utils import (
-    convert_keys_to_snake,
     dump_request,
     dump_response,
     format_json_response,
+    format_payload,
     obfuscate_api_key,
+    resolve_output,
     retry_with_backoff,
+    validate_output,
 )
 
 from zscaler.zcon.client import ZCONClient
-from zscaler.zcon.activation import ActivationAPI
-from zscaler.zcon.admin_and_role_management import AdminAndRoleManagementAPI
-from zscaler.zcon.provisioning import ProvisioningAPI
-from zscaler.zcon.ecgroups import EcGroupAPI
-from zscaler.zcon.locations import LocationAPI
-
-# Setup the logger
-setup_logging(logger_name="zscaler-sdk-python")
+
+if TYPE_CHECKING:
+    from box import Box
+
 logger = logging.getLogger("zscaler-sdk-python")
 
+# The API modules are imported by the accessors of the clients, on first use
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "ActivationAPI": "zscaler.zcon.activation",
+        "AdminAndRoleManagementAPI": "zscaler.zcon.admin_and_role_management",
+        "EcGroupAPI": "zscaler.zcon.ecgroups",
+        "LocationAPI": "zscaler.zcon.locations",
+        "ProvisioningAPI": "zscaler.zcon.provisioning",
+    },
+)
+
 
 class ZCONClientHelper(ZCONClient):
     """
@@ -64,6 +96,38 @@ class ZCONClientHelper(ZCONClient):
         username (str): The ZCON administrator username.
         password (str): The ZCON administrator password.
         cloud (str): The ZCON cloud for your tenancy, accepted values are:
+        override_url (str):
+            If supplied, this attribute can be used to override the production URL that is derived
+            from supplying the `cloud` attribute. Use this attribute if you have a non-standard tenant URL
+            (e.g. internal test instance etc). The override URL will be prepended to the API endpoint suffixes.
+            The protocol must be included i.e. http:// or https://.
+        session (requests.Session):
+            An optional pre-configured session. When omitted, a pooled keep-alive session is built from the
+            `pool_connections`, `pool_maxsize`, `keep_alive` and `socket_options` keyword arguments.
+        rate_limit_store (str):
+            Path of a SQLite file through which the clients of all processes on this host share the rate limit
+            budget of the tenant. Defaults to the `ZSCALER_RATE_LIMIT_STORE` environment variable; each client
+            keeps its own budget when unset.
+        session_store (str):
+            Path of a SQLite file through which the clients of all processes on this host share the login
+            session of the tenant, instead of each logging in. Defaults to the `ZSCALER_SESSION_STORE`
+            environment variable; each client has its own session when unset.
+        output (str):
+            The form of the data returned by the API methods, one of `box` (the default), `dict`, `raw` and
+            `lazy`. See :func:`zscaler.utils.format_payload`. It can be overridden for some calls with
+            :func:`zscaler.utils.output_mode`.
+        hooks (:obj:`zscaler.hooks.Hooks`):
+            Callbacks notified of the lifecycle events of the requests, e.g. retries and rate limit waits. See
+            :class:`zscaler.hooks.Hooks`. The client has its own, as `client.hooks`, when not given.
+        metrics (:obj:`zscaler.metrics.MetricsRegistry`):
+            Registry aggregating the latency, retries, 429s and cache hits of the requests, or `True` for a
+            registry of the client, available as `client.metrics`. Defaults to the
+            `ZSCALER_CLIENT_METRICS_ENABLED` environment variable.
+        transport (:obj:`zscaler.transport.backends.HTTPTransport`):
+            How the requests are sent: over the network by default, or recorded to, or replayed from, a
+            cassette with :class:`zscaler.transport.backends.RecordingTransport` and
+            :class:`zscaler.transport.backends.ReplayTransport`. Defaults to the `ZSCALER_CLIENT_TRANSPORT`
+            environment variable.
     """
 
     _vendor = "Zscaler"
@@ -73,6 +137,7 @@ class ZCONClientHelper(ZCONClient):
     env_cloud = "zscaler"
 
     def __init__(self, cloud=None, timeout=240, cache=None, fail_safe=False, **kw):
+        ensure_logging()
         self.api_key = kw.get("api_key", os.getenv(f"{self._env_base}_API_KEY"))
         self.username = kw.get("username", os.getenv(f"{self._env_base}_USERNAME"))
         self.password = kw.get("password", os.getenv(f"{self._env_base}_PASSWORD"))
@@ -83,9 +148,14 @@ class ZCONClientHelper(ZCONClient):
                 f"Cloud environment must be set via the 'cloud' argument or the {self._env_base}_CLOUD environment variable."
             )
 
-        # URL construction
-        self.url = f"https://connector.{self.env_cloud}.net/api/v1"
+        # URL construction, unless an override URL is provided
+        self.url = (
+            kw.get("override_url")
+            or os.getenv(f"{self._env_base}_OVERRIDE_URL")
+            or f"https://connector.{self.env_cloud}.net/api/v1"
+        )
         self.conv_box = True
+        self.output = validate_output(kw.get("output", "box"))
         self.sandbox_token = kw.get("sandbox_token") or os.getenv(f"{self._env_base}_SANDBOX_TOKEN")
         self.timeout = timeout
         self.fail_safe = fail_safe
@@ -94,21 +164,36 @@ class ZCONClientHelper(ZCONClient):
             if cache_enabled:
                 ttl = int(os.environ.get("ZSCALER_CLIENT_CACHE_DEFAULT_TTL", 3600))
                 tti = int(os.environ.get("ZSCALER_CLIENT_CACHE_DEFAULT_TTI", 1800))
-                self.cache = ZscalerCache(ttl=ttl, tti=tti)
+                self.cache = build_cache(ttl=ttl, tti=tti)
             else:
                 self.cache = NoOpCache()
         else:
             self.cache = cache
+        self.single_flight = SingleFlight()
+        self.hooks = (kw.get("hooks") or Hooks()).bind("zcon")
+        self.metrics = build_metrics(kw.get("metrics"), self.hooks)
+        self.refresher = BackgroundRefresher()
+        self.transport = build_transport(kw.get("transport"))
+        # Pooled keep-alive session shared by authentication, pagination and all API calls
+        session = kw.get("session") or build_session(
+            pool_connections=kw.get("pool_connections"),
+            pool_maxsize=kw.get("pool_maxsize"),
+            keep_alive=kw.get("keep_alive", True),
+            socket_options=kw.get("socket_options"),
+        )
+        self.session = self.transport.install(session)
         # Initialize user-agent
         ua = UserAgent()
         self.user_agent = ua.get_user_agent_string()
         # Initialize rate limiter
         # You may want to adjust these parameters as per your rate limit configuration
-        self.rate_limiter = RateLimiter(
+        self.rate_limiter = build_rate_limiter(
             get_limit=2,  # Adjust as per actual limit
             post_put_delete_limit=2,  # Adjust as per actual limit
             get_freq=2,  # Adjust as per actual frequency (in seconds)
             post_put_delete_freq=2,  # Adjust as per actual frequency (in seconds)
+            key=rate_limit_key("zcon", self.url, self.api_key),
+            store=kw.get("rate_limit_store"),
         )
         self.headers = {
             "Content-Type": "application/json",
@@ -119,6 +204,11 @@ class ZCONClientHelper(ZCONClient):
         self.session_refreshed = None
         self.auth_details = None
         self.session_id = None
+        self.session_store = build_session_store(kw.get("session_store"))
+        self._session_key = rate_limit_key("zcon", self.url, self.api_key, self.username)
+        self._session_holder = uuid.uuid4().hex
+        # Held while the session is replaced, so that the threads sharing the client log in once
+        self._auth_lock = threading.RLock()
         self.authenticate()
 
     def extractJSessionIDFromHeaders(self, header):
@@ -136,20 +226,51 @@ class ZCONClientHelper(ZCONClient):
         return result.group(1)
 
     def is_session_expired(self):
-        if self.auth_details is None:
+        # Read once, as another thread may end or replace the session meanwhile
+        auth_details = self.auth_details
+        if auth_details is None:
             return True
         now = datetime.datetime.now()
-        if self.auth_details["passwordExpiryTime"] > 0 and (
+        if auth_details["passwordExpiryTime"] > 0 and (
             self.session_refreshed + datetime.timedelta(seconds=-self.session_timeout_offset) < now
         ):
             return True
         return False
 
-    @retry_with_backoff(retries=5)
-    def authenticate(self) -> Box:
+    def authenticate(self) -> "Box":
         """
-        Creates a ZCON authentication session.
+        Creates a ZCON authentication session. With a session store, the session stored by the other clients of
+        the tenant is used while it is valid, and a single one of them logs in when it is not.
         """
+        with self._auth_lock:
+            if self.session_store is None:
+                return self._login()
+            session = self.session_store.acquire(
+                self._session_key, self._session_holder, self._stored_login, self.session_id
+            )
+            self.session_refreshed = datetime.datetime.fromtimestamp(session.refreshed_at)
+            self.session_id = session.session_id
+            self.auth_details = session.auth_details
+            return session
+
+    def _ensure_authenticated(self):
+        """Logs in again when the session expired, once for all the threads finding it expired."""
+        if not self.is_session_expired():
+            return
+        with self._auth_lock:
+            # Replaced by the thread which held the lock meanwhile
+            if self.is_session_expired():
+                logger.warning("The provided sesion expired. Refreshing...")
+                self.authenticate()
+
+    def _stored_login(self):
+        resp = self._login()
+        if resp.status_code > 299:
+            raise ZscalerAPIException(self.url + "/auth", resp, resp.text)
+        return self.session_id, self.auth_details
+
+    @retry_with_backoff(retries=5)
+    def _login(self):
         api_key_chars = list(self.api_key)
         api_obf = obfuscate_api_key(api_key_chars)
 
@@ -159,13 +280,16 @@ class ZCONClientHelper(ZCONClient):
             "password": self.password,
             "timestamp": api_obf["timestamp"],
         }
-        resp = requests.request(
-            "POST",
-            self.url + "/auth",
-            json=payload,
-            headers=self.headers,
-            timeout=self.timeout,
-        )
+        start_time = time.time()
+        with profiling.phase(AUTH):
+            resp = self.session.request(
+                "POST",
+                self.url + "/auth",
+                json=payload,
+                headers=self.headers,
+                timeout=self.timeout,
+            )
+        self.hooks.emit(TOKEN_REFRESH, status_code=resp.status_code, start=start_time)
         if resp.status_code > 299:
             return resp
         self.session_refreshed = datetime.datetime.now()
@@ -175,18 +299,32 @@ class ZCONClientHelper(ZCONClient):
 
     def deauthenticate(self):
         """
-        Ends the ZCON authentication session.
+        Ends the ZCON authentication session. With a session store, the session is only ended once the last
+        client using it releases it.
+
+        Returns:
+            bool: Whether the session was ended.
         """
+        with self._auth_lock:
+            if self.session_store is None:
+                return self._logout(self.session_id)
+            ended = self.session_store.release(self._session_key, self._session_holder, self._logout)
+            self.auth_details = None
+            self.session_id = None
+            return ended
+
+    def _logout(self, session_id):
         logout_url = self.url + "/auth"
 
         headers = self.headers.copy()
-        headers.update({"Cookie": f"JSESSIONID={self.session_id}"})
+        headers.update({"Cookie": f"JSESSIONID={session_id}"})
 
         try:
-            response = requests.delete(logout_url, headers=headers, timeout=self.timeout)
+            response = self.session.delete(logout_url, headers=headers, timeout=self.timeout)
             if response.status_code == 204:
-                self.session_id = None
+                # Cleared first, so that threads finding the session valid never send a cleared session id
                 self.auth_details = None
+                self.session_id = None
                 return True
             else:
                 return False
@@ -196,7 +334,7 @@ class ZCONClientHelper(ZCONClient):
     def __enter__(self):
         if self.is_session_expired():
             resp = self.authenticate()
-            if resp.status_code > 299:
+            if self.session_store is None and resp.status_code > 299:
                 raise Exception(f"Error auth:{resp.json()}")
         return self
 
@@ -204,7 +342,33 @@ class ZCONClientHelper(ZCONClient):
         logger.debug("deauthenticating...")
         self.deauthenticate()
 
+    def profile(self, cprofile=False):
+        """
+        Returns a :class:`~zscaler.profiling.Profiler` timing the phases of the calls made in its ``with``
+        block per endpoint: logins, rate limiter waits, requests, JSON decoding, key conversion and Box
+        construction.
+
+        Args:
+            cprofile (bool): Whether to also record a :mod:`cProfile` function profile of the block.
+
+        Examples:
+            >>> with zcon.profile() as prof:
+            ...     zcon.admin_and_role_management.list_admins()
+            >>> print(prof.report())
+        """
+        return Profiler(cprofile=cprofile)
+
     def send(self, method, path, json=None, params=None, data=None, headers=None):
+        """
+        Sends a request, sharing the response of a GET request already in flight for the same resource
+        instead of sending it again. See :class:`~zscaler.transport.single_flight.SingleFlight`.
+        """
+        if method != "GET" or json is not None or data is not None or headers is not None:
+            return self._send(method, path, json, params, data=data, headers=headers)
+        key = self.cache.create_key(f"{self.url}/{path.lstrip('/')}", params)
+        return self.single_flight.do(key, lambda: self._send(method, path, json, params, data=data, headers=headers))
+
+    def _send(self, method, path, json=None, params=None, data=None, headers=None, use_cache=True):
         """
         Send a request to the ZCON API.
 
@@ -217,6 +381,7 @@ class ZCONClientHelper(ZCONClient):
         """
         api = self.url
         url = f"{api}/{path.lstrip('/')}"
+        profiling.set_endpoint(url)
         start_time = time.time()
         # Update headers to include the user agent
         headers_with_user_agent = self.headers.copy()
@@ -225,20 +390,31 @@ class ZCONClientHelper(ZCONClient):
         request_uuid = uuid.uuid4()
         if headers is not None:
             headers_with_user_agent.update(headers)
+        body, headers_with_user_agent = codec.encode_request(json, headers_with_user_agent)
         dump_request(
             logger,
             url,
             method,
-            json,
+            body,
             params,
             headers_with_user_agent,
             request_uuid,
             body=True,
         )
+        self.hooks.emit(REQUEST_START, method=method, url=url)
         # Check cache before sending request
         cache_key = self.cache.create_key(url, params)
-        if method == "GET" and self.cache.contains(cache_key):
-            resp = self.cache.get(cache_key)
+        cached = method == "GET" and use_cache and self.cache.contains(cache_key)
+        # None if another thread evicted or invalidated the entry since it was found
+        resp = self.cache.get(cache_key) if cached else None
+        if resp is not None:
+            self.hooks.emit(CACHE_HIT, method=method, url=url)
+            self.refresher.refresh_stale(
+                self.cache,
+                cache_key,
+                lambda params: self._send(method, path, json, params, data=data, headers=headers, use_cache=False),
+                params,
+            )
             dump_response(
                 logger=logger,
                 url=url,
@@ -249,25 +425,34 @@ class ZCONClientHelper(ZCONClient):
                 start_time=start_time,
                 from_cache=True,
             )
+            self.hooks.emit(
+                REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time, from_cache=True
+            )
             return resp
+        if method == "GET" and use_cache and self.cache.enabled:
+            self.hooks.emit(CACHE_MISS, method=method, url=url)
 
         attempts = 0
         while attempts < 5:  # Trying a maximum of 5 times
+            if attempts:
+                self.hooks.emit(RETRY, method=method, url=url, attempt=attempts + 1)
             try:
                 # If the token is None or expired, fetch a new token
-                if self.is_session_expired():
-                    logger.warning("The provided sesion expired. Refreshing...")
-                    self.authenticate()
-                resp = requests.request(
-                    method=method,
-                    url=url,
-                    json=json,
-                    data=data,
-                    params=params,
-                    headers=headers_with_user_agent,
-                    timeout=self.timeout,
-                    cookies={"JSESSIONID": self.session_id},
-                )
+                self._ensure_authenticated()
+                waited = self.rate_limiter.acquire(method)
+                if waited:
+                    logger.warning(f"Rate limit exceeded. Waited {waited} seconds.")
+                    self.hooks.emit(RATE_LIMIT_WAIT, method=method, url=url, duration=waited)
+                with profiling.phase(NETWORK):
+                    resp = self.session.request(
+                        method=method,
+                        url=url,
+                        data=body if body is not None else data,
+                        params=params,
+                        headers=headers_with_user_agent,
+                        timeout=self.timeout,
+                        cookies={"JSESSIONID": self.session_id},
+                    )
                 dump_response(
                     logger=logger,
                     url=url,
@@ -277,12 +462,14 @@ class ZCONClientHelper(ZCONClient):
                     request_uuid=request_uuid,
                     start_time=start_time,
                 )
+                self.rate_limiter.update_limits(resp.headers, method)
                 if resp.status_code == 429:  # HTTP Status code 429 indicates "Too Many Requests"
+                    self.hooks.emit(RATE_LIMITED, method=method, url=url, status_code=429, attempt=attempts + 1)
                     sleep_time = int(
                         resp.headers.get("Retry-After", 2)
-                    )  # Default to 60 seconds if 'Retry-After' header is missing
+                    )  # Default to 2 seconds if 'Retry-After' header is missing
                     logger.warning(f"Rate limit exceeded. Retrying in {sleep_time} seconds.")
-                    sleep(sleep_time)
+                    self.rate_limiter.block(method, sleep_time)
                     attempts += 1
                     continue
                 else:
@@ -290,23 +477,27 @@ class ZCONClientHelper(ZCONClient):
             except requests.RequestException as e:
                 if attempts == 4:  # If it's the last attempt, raise the exception
                     logger.error(f"Failed to send {method} request to {url} after 5 attempts. Error: {str(e)}")
+                    self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
                     raise e
                 else:
                     logger.warning(f"Failed to send {method} request to {url}. Retrying... Error: {str(e)}")
                     attempts += 1
                     sleep(5)  # Sleep for 5 seconds before retrying
+            except BaseException as e:
+                self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
+                raise
 
-        # If Non-GET call, clear the
+        self.hooks.emit(REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time)
+        # Drop the cached reads made stale by a write
         if method != "GET":
-            self.cache.delete(cache_key)
+            self.cache.invalidate(cache_key, ZCON_CACHE_DEPENDENCIES)
 
-        # Detailed logging for request and response
-        try:
-            response_data = resp.json()
-        except ValueError:  # Using ValueError for JSON decoding errors
-            response_data = resp.text
-        # check if call was succesful
+        # check if call was succesful, decoding the body of errors only
         if 200 > resp.status_code or resp.status_code > 299:
+            try:
+                response_data = codec.decode_response(resp)
+            except ValueError:  # Using ValueError for JSON decoding errors
+                response_data = resp.text
             # create errors
             try:
                 error = ZscalerAPIError(url, resp, response_data)
@@ -322,6 +513,7 @@ class ZCONClientHelper(ZCONClient):
             logger.error(error)
         # Cache the response if it's a successful GET request
         if method == "GET" and resp.status_code == 200:
+            resp = CachedResponse.from_response(resp)
             self.cache.add(cache_key, resp)
         return resp
 
@@ -336,27 +528,18 @@ class ZCONClientHelper(ZCONClient):
         - Response: Response object from the request.
         """
 
-        should_wait, delay = self.rate_limiter.wait("GET")
-        if should_wait:
-            time.sleep(delay)
         response = self.send("GET", path, json, params)
         if not response.ok:
             raise Exception(f"GET request failed with status {response.status_code}: {response.json()}")
-        return format_json_response(response, box_attrs=dict())
+        return format_json_response(response, box_attrs=dict(), output=self.output)
 
     def post(self, path, json=None, params=None, data=None, headers=None):
-        should_wait, delay = self.rate_limiter.wait("POST")
-        if should_wait:
-            time.sleep(delay)
         response = self.send("POST", path, json, params, data=data, headers=headers)
         if not response.ok:
             raise Exception(f"POST request failed with status {response.status_code}: {response.json()}")
-        return format_json_response(response, box_attrs=dict())
+        return format_json_response(response, box_attrs=dict(), output=self.output)
 
     def put(self, path, json=None, params=None):
-        should_wait, delay = self.rate_limiter.wait("PUT")
-        if should_wait:
-            time.sleep(delay)
         response = self.send("PUT", path, json, params)
 
         # Handle 204 No Content separately
@@ -365,7 +548,7 @@ class ZCONClientHelper(ZCONClient):
 
         # Handle 200 OK with content
         if response.status_code == 200 and response.headers.get("content-type", "").startswith("application/json"):
-            return format_json_response(response, box_attrs=dict())
+            return format_json_response(response, box_attrs=dict(), output=self.output)
 
         # Raise an exception for any other unexpected status codes
         if not response.ok:
@@ -374,9 +557,6 @@ class ZCONClientHelper(ZCONClient):
         return response
 
     def delete(self, path, json=None, params=None):
-        should_wait, delay = self.rate_limiter.wait("DELETE")
-        if should_wait:
-            time.sleep(delay)
         response = self.send("DELETE", path, json, params)
         if not response.ok:
             raise Exception(f"DELETE request failed with status {response.status_code}: {response.json()}")
@@ -389,27 +569,41 @@ class ZCONClientHelper(ZCONClient):
         "EMPTY_RESULTS": "No results found for page {page}.",
     }
 
-    def get_paginated_data(self, path=None, data_key_name=None, data_per_page=5, expected_status_code=200):
+    def get_paginated_data(self, path=None, data_key_name=None, data_per_page=5, expected_status_code=200, output=None):
         """
         Fetch paginated data from the ZCON API.
         ...
 
         Returns:
-        - list: List of fetched items.
+        - list: List of fetched items, in the output mode of the client unless ``output`` is given.
         - str: Error message, if any occurred.
         """
 
-        page = 1
+        output = resolve_output(output, self.output)
         ret_data = []
         error_message = None
+        try:
+            for data in self._iter_pages(path, data_key_name, data_per_page, expected_status_code):
+                ret_data.extend(data)
+        except ValueError as e:
+            error_message = str(e)
+            logger.error(error_message)
+
+        return format_payload(ret_data, output), error_message
+
+    def _iter_pages(self, path, data_key_name=None, data_per_page=5, expected_status_code=200):
+        """
+        Fetches the pages of a paginated listing one at a time.
+
+        Yields:
+            list: The items of each page, as decoded.
 
+        Raises:
+            ValueError: If a page is returned with an unexpected status code or without ``data_key_name``.
+        """
+        page = 1
         while True:
             required_url = f"{path}"
-            should_wait, delay = self.rate_limiter.wait("GET")
-            if should_wait:
-                time.sleep(delay)
-
-            # Now proceed with sending the request
             response = self.send(
                 method="GET",
                 path=required_url,
@@ -417,70 +611,102 @@ class ZCONClientHelper(ZCONClient):
             )
 
             if response.status_code != expected_status_code:
-                error_message = self.ERROR_MESSAGES["UNEXPECTED_STATUS"].format(status_code=response.status_code, page=page)
-                logger.error(error_message)
-                break
-            data_json = response.json()
+                raise ValueError(self.ERROR_MESSAGES["UNEXPECTED_STATUS"].format(status_code=response.status_code, page=page))
+            data_json = codec.decode_response(response)
             if isinstance(data_json, list):
                 data = data_json
             else:
                 data = data_json.get(data_key_name)
 
             if data is None:
-                error_message = self.ERROR_MESSAGES["MISSING_DATA_KEY"].format(data_key_name=data_key_name, page=page)
-                logger.error(error_message)
-                break
+                raise ValueError(self.ERROR_MESSAGES["MISSING_DATA_KEY"].format(data_key_name=data_key_name, page=page))
 
             if not data:  # Checks for empty data
                 logger.info(self.ERROR_MESSAGES["EMPTY_RESULTS"].format(page=page))
-                break
+                return
 
-            ret_data.extend(convert_keys_to_snake(data))
+            yield data
 
             # Check for more pages
-            if len(data) == 0 or isinstance(data_json, dict) and int(response.json().get("totalPages")) <= page + 1:
-                break
+            if len(data) == 0 or isinstance(data_json, dict) and int(data_json.get("totalPages")) <= page + 1:
+                return
 
             page += 1
 
-        return BoxList(ret_data), error_message
+    def iter_paginated(
+        self, path=None, data_key_name=None, data_per_page=5, expected_status_code=200, max_items=None, output=None
+    ):
+        """
+        Lazily iterates over the items of a paginated ZCON listing. Pages are requested as the iteration
+        reaches them, so only one page is held in memory and breaking out of the loop stops further requests.
+
+        Accepts the same arguments as :meth:`get_paginated_data`.
+
+        Yields:
+            :obj:`Box`: Each item, with its keys converted to snake case, or in the given output mode.
+
+        Raises:
+            ValueError: If a page is returned with an unexpected status code or without ``data_key_name``.
 
-    @property
+        Examples:
+            >>> for location in zcon.iter_paginated("location", data_per_page=100):
+            ...     print(location.name)
+        """
+        output = resolve_output(output, self.output)
+        collected = 0
+        for data in self._iter_pages(path, data_key_name, data_per_page, expected_status_code):
+            for item in data:
+                if max_items is not None and collected >= max_items:
+                    return
+                collected += 1
+                yield format_payload(item, output)
+
+    @cached_property
     def activation(self):
         """
         The interface object for the :ref:`ZCON Activation Service <zcon-activation>`.
 
         """
+        from zscaler.zcon.activation import ActivationAPI
+
         return ActivationAPI(self)
 
-    @property
+    @cached_property
     def admin_and_role_management(self):
         """
         The interface object for the :ref:`ZCON Admin and Role Management interface <zcon-admin_and_role_management>`.
 
         """
+        from zscaler.zcon.admin_and_role_management import AdminAndRoleManagementAPI
+
         return AdminAndRoleManagementAPI(self)
 
-    @property
+    @cached_property
     def ecgroups(self):
         """
         The interface object for the :ref:`ZCON EC Group Service <zcon-ecgroups>`.
 
         """
+        from zscaler.zcon.ecgroups import EcGroupAPI
+
         return EcGroupAPI(self)
 
-    @property
+    @cached_property
     def locations(self):
         """
         The interface object for the :ref:`ZCON Location Service <zcon-locations>`.
 
         """
+        from zscaler.zcon.locations import LocationAPI
+
         return LocationAPI(self)
 
-    @property
+    @cached_property
     def provisioning(self):
         """
         The interface object for the :ref:`ZCON API Key Provisioning Service <zcon-provisioning>`.
 
         """
+        from zscaler.zcon.provisioning import ProvisioningAPI
+
         return ProvisioningAPI(self)
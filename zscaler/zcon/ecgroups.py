@@ -14,7 +14,8 @@
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
 from box import Box, BoxList
-from zscaler.utils import Iterator
+from zscaler.iterators import Iterator
+from zscaler.utils import collect_items
 
 from zscaler.zcon import ZCONClient
 
@@ -88,7 +89,7 @@ class EcGroupAPI:
             ...    print(group)
 
         """
-        return BoxList(Iterator(self.rest, "ecgroup/lite", **kwargs))
+        return collect_items(Iterator(self.rest, "ecgroup/lite", **kwargs), self.rest.output)
 
     def list_ec_instance_lite(self, **kwargs) -> BoxList:
         """
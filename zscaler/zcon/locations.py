@@ -15,7 +15,8 @@
 
 from box import Box, BoxList
 
-from zscaler.utils import Iterator, convert_keys
+from zscaler.iterators import Iterator
+from zscaler.utils import convert_keys, collect_items
 from zscaler.zcon import ZCONClient
 
 
@@ -261,7 +262,7 @@ class LocationAPI:
             ...    print(location)
 
         """
-        return BoxList(Iterator(self.rest, "location", **kwargs))
+        return collect_items(Iterator(self.rest, "location", **kwargs), self.rest.output)
 
     def get_location(self, location_id: str) -> Box:
         """
@@ -319,4 +320,4 @@ class LocationAPI:
             ...    print(location)
 
         """
-        return BoxList(Iterator(self.rest, "location/lite", **kwargs))
+        return collect_items(Iterator(self.rest, "location/lite", **kwargs), self.rest.output)
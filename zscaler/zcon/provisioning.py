@@ -14,7 +14,8 @@
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
 from box import Box, BoxList
-from zscaler.utils import Iterator
+from zscaler.iterators import Iterator
+from zscaler.utils import collect_items
 from zscaler.zcon.client import ZCONClient
 
 
@@ -88,7 +89,7 @@ class ProvisioningAPI:
                 for role in roles:
                     print(role)
         """
-        return BoxList(Iterator(self.rest, "provUrl", **kwargs))
+        return collect_items(Iterator(self.rest, "provUrl", **kwargs), self.rest.output)
 
     def get_provisioning_url(self, provision_id: str) -> Box:
         """
@@ -1,21 +1,27 @@
 import logging
+from functools import cached_property
 
 from zscaler import __version__
-from zscaler.zdx.admin import AdminAPI
-from zscaler.zdx.alerts import AlertsAPI
-from zscaler.zdx.apps import AppsAPI
-from zscaler.zdx.devices import DevicesAPI
-from zscaler.zdx.inventory import InventoryAPI
-from zscaler.zdx.troubleshooting import TroubleshootingAPI
-from zscaler.zdx.users import UsersAPI
-
-from zscaler.logger import setup_logging
+from zscaler.lazy import lazy_attributes
+
 from .zdx_client import ZDXClientHelper  # Import ZDXClientHelper from zdx_client.py
 
-# Setup the logger
-setup_logging(logger_name="zscaler-sdk-python")
 logger = logging.getLogger("zscaler-sdk-python")
 
+# The API modules are imported by the accessors of the clients, on first use
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "AdminAPI": "zscaler.zdx.admin",
+        "AlertsAPI": "zscaler.zdx.alerts",
+        "AppsAPI": "zscaler.zdx.apps",
+        "DevicesAPI": "zscaler.zdx.devices",
+        "InventoryAPI": "zscaler.zdx.inventory",
+        "TroubleshootingAPI": "zscaler.zdx.troubleshooting",
+        "UsersAPI": "zscaler.zdx.users",
+    },
+)
+
 
 class ZDX:
     """
@@ -37,42 +43,79 @@ class ZDX:
             (e.g. internal test instance etc). When using this attribute, there is no need to supply the `cloud`
             attribute. The override URL will be prepended to the API endpoint suffixes. The protocol must be included
             i.e. http:// or https://.
+        output (str):
+            The form of the data returned by the API methods, one of `box` (the default), `dict`, `raw` and
+            `lazy`. See :func:`zscaler.utils.format_payload`. It can be overridden for some calls with
+            :func:`zscaler.utils.output_mode`.
+        hooks (:obj:`zscaler.hooks.Hooks`):
+            Callbacks notified of the lifecycle events of the requests, e.g. retries and rate limit waits. See
+            :class:`zscaler.hooks.Hooks`. The client has its own, as `client.hooks`, when not given.
+        metrics (:obj:`zscaler.metrics.MetricsRegistry`):
+            Registry aggregating the latency, retries, 429s and cache hits of the requests, or `True` for a
+            registry of the client, available as `client.metrics`. Defaults to the
+            `ZSCALER_CLIENT_METRICS_ENABLED` environment variable.
+        transport (:obj:`zscaler.transport.backends.HTTPTransport`):
+            How the requests are sent: over the network by default, or recorded to, or replayed from, a
+            cassette with :class:`zscaler.transport.backends.RecordingTransport` and
+            :class:`zscaler.transport.backends.ReplayTransport`. Defaults to the `ZSCALER_CLIENT_TRANSPORT`
+            environment variable.
     """
 
     def __init__(self, **kw):
         self.client = ZDXClientHelper(**kw)
 
-    @property
+    def profile(self, cprofile=False):
+        """
+        Returns a :class:`~zscaler.profiling.Profiler` timing the phases of the calls made in its ``with``
+        block per endpoint. See :meth:`ZDXClientHelper.profile`.
+        """
+        return self.client.profile(cprofile=cprofile)
+
+    @cached_property
     def admin(self):
         """The interface object for the :ref:`ZDX Admin interface <zdx-admin>`."""
+        from zscaler.zdx.admin import AdminAPI
+
         return AdminAPI(self.client)
 
-    @property
+    @cached_property
     def alerts(self):
         """The interface object for the :ref:`ZDX Alerts interface <zdx-alerts>`."""
+        from zscaler.zdx.alerts import AlertsAPI
+
         return AlertsAPI(self.client)
 
-    @property
+    @cached_property
     def apps(self):
         """The interface object for the :ref:`ZDX Apps interface <zdx-apps>`."""
+        from zscaler.zdx.apps import AppsAPI
+
         return AppsAPI(self.client)
 
-    @property
+    @cached_property
     def devices(self):
         """The interface object for the :ref:`ZDX Devices interface <zdx-devices>`."""
+        from zscaler.zdx.devices import DevicesAPI
+
         return DevicesAPI(self.client)
 
-    @property
+    @cached_property
     def inventory(self):
         """The interface object for the :ref:`ZDX Inventory interface <zdx-inventory>`."""
+        from zscaler.zdx.inventory import InventoryAPI
+
         return InventoryAPI(self.client)
 
-    @property
+    @cached_property
     def troubleshooting(self):
         """The interface object for the :ref:`ZDX Troubleshooting interface <zdx-troubleshooting>`."""
+        from zscaler.zdx.troubleshooting import TroubleshootingAPI
+
         return TroubleshootingAPI(self.client)
 
-    @property
+    @cached_property
     def users(self):
         """The interface object for the :ref:`ZDX Users interface <zdx-users>`."""
+        from zscaler.zdx.users import UsersAPI
+
         return UsersAPI(self.client)
@@ -1,6 +1,6 @@
 from box import BoxList
 from zscaler.utils import zdx_params
-from zscaler.utils import ZDXIterator, CommonFilters
+from zscaler.utils import ZDXIterator, CommonFilters, collect_items
 from zscaler.zdx.zdx_client import ZDXClientHelper
 
 
@@ -55,4 +55,4 @@ class AdminAPI:
             filters.update(kwargs)
 
         iterator = ZDXIterator(self.rest, "administration/locations", filters)
-        return BoxList(iterator)
+        return collect_items(iterator, self.rest.output)
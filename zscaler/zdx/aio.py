@@ -0,0 +1,309 @@
+import asyncio
+import time
+import uuid
+from functools import cached_property
+
+import aiohttp
+import requests
+
+from zscaler import codec, profiling
+from zscaler.cache.cached_response import CachedResponse
+from zscaler.cache.refresh import AsyncBackgroundRefresher
+from zscaler.hooks import (
+    CACHE_HIT,
+    CACHE_MISS,
+    RATE_LIMIT_WAIT,
+    RATE_LIMITED,
+    REQUEST_END,
+    REQUEST_START,
+    RETRY,
+    TOKEN_REFRESH,
+)
+from zscaler.profiling import AUTH, NETWORK
+from zscaler.ratelimiter.ratelimiter import AsyncRateLimiter
+from zscaler.transport import aio
+from zscaler.transport.single_flight import AsyncSingleFlight
+from zscaler.utils import dump_request, dump_response, format_json_response
+from zscaler.zdx.devices import AsyncDevicesAPI
+from zscaler.zdx.zdx_client import ZDXClientHelper
+
+
+class AsyncZDXClientHelper(ZDXClientHelper):
+    """
+    An asyncio Controller to access Endpoints in the Zscaler Digital Experience (ZDX) API.
+
+    Accepts the same arguments as :class:`zscaler.zdx.zdx_client.ZDXClientHelper`. Requests are sent through a
+    pooled :class:`aiohttp.ClientSession`, created on first use, and the bearer token is requested lazily.
+    """
+
+    def __init__(self, **kw):
+        self._configure(**kw)
+        self.async_rate_limiter = AsyncRateLimiter(self.rate_limiter)
+        self.single_flight = AsyncSingleFlight()
+        self.refresher = AsyncBackgroundRefresher()
+        self.session = kw.get("session")
+        self._session_options = dict(
+            pool_connections=kw.get("pool_connections"),
+            pool_maxsize=kw.get("pool_maxsize"),
+            keep_alive=kw.get("keep_alive", True),
+        )
+        self.token = None
+        self._token_lock = None
+
+    async def aclose(self):
+        """Closes the underlying session and its pooled connections."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    def _ensure_session(self):
+        if self.session is None or self.session.closed:
+            self.session = aio.build_async_session(
+                headers={"User-Agent": self.user_agent, "Content-Type": "application/json"}, **self._session_options
+            )
+        return self.session
+
+    async def create_token(self, session=None):
+        """Creates a ZDX authentication token."""
+        payload = self._token_payload()
+        token_url = f"{self.url}/oauth/token"
+        self.logger.debug(f"Token request URL: {token_url}")
+
+        start_time = time.time()
+        headers = {"Content-Type": "application/json"}
+        with profiling.phase(AUTH):
+            response = await self.transport.request(
+                session or self._ensure_session(), "POST", token_url, json=payload, headers=headers
+            )
+        self.hooks.emit(TOKEN_REFRESH, status_code=response.status_code, start=start_time)
+
+        self.logger.debug(f"Token request response status: {response.status_code}")
+
+        response.raise_for_status()  # Raise an error for bad status codes
+        return response.json().get("token")
+
+    async def _auth_headers(self):
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        async with self._token_lock:
+            if self.token is None:
+                self.token = await self.create_token()
+        return {"Authorization": f"Bearer {self.token}"}
+
+    async def validate_token(self):
+        """
+        Validates the current ZDX JWT token.
+
+        Returns:
+            :obj:`Box`: The validated session information.
+        """
+        headers = await self._auth_headers()
+        resp = await self.transport.request(self._ensure_session(), "GET", f"{self.url}/oauth/validate", headers=headers)
+        resp.raise_for_status()
+        return format_json_response(resp, box_attrs=dict(), output=self.output)
+
+    async def get_jwks(self):
+        """
+        Returns a JSON Web Key Set (JWKS) that contains the public keys that can be used to verify the JWT tokens.
+
+        Returns:
+            :obj:`Box`: The JSON Web Key Set (JWKS).
+        """
+        headers = await self._auth_headers()
+        resp = await self.transport.request(self._ensure_session(), "GET", f"{self.url}/oauth/jwks", headers=headers)
+        resp.raise_for_status()
+        return format_json_response(resp, box_attrs=dict(), output=self.output)
+
+    async def send(self, method, path, json=None, params=None, data=None, headers=None):
+        """
+        Sends a request, sharing the response of a GET request already in flight for the same resource
+        instead of sending it again. See :class:`~zscaler.transport.single_flight.SingleFlight`.
+        """
+        if method != "GET" or json is not None or data is not None or headers is not None:
+            return await self._send(method, path, json, params, data=data, headers=headers)
+        key = self.cache.create_key(f"{self.url}/{path.lstrip('/')}", params)
+        return await self.single_flight.do(key, lambda: self._send(method, path, json, params, data=data, headers=headers))
+
+    async def _send(self, method, path, json=None, params=None, data=None, headers=None, use_cache=True):
+        """
+        Send a request to the ZDX API.
+
+        Returns:
+            :obj:`requests.Response`: The response, built from the aiohttp response.
+        """
+        url = f"{self.url}/{path.lstrip('/')}"
+        profiling.set_endpoint(url)
+        start_time = time.time()
+        headers = dict(headers or {})
+        headers["User-Agent"] = self.user_agent
+
+        request_uuid = uuid.uuid4()
+        self.logger.info("Sending %s request to %s with UUID %s", method, url, request_uuid)
+        self.hooks.emit(REQUEST_START, method=method, url=url)
+
+        cache_key = self.cache.create_key(url, params)
+        cached = method == "GET" and use_cache and self.cache.contains(cache_key)
+        # None if another thread evicted or invalidated the entry since it was found
+        resp = self.cache.get(cache_key) if cached else None
+        if resp is not None:
+            self.hooks.emit(CACHE_HIT, method=method, url=url)
+            self.refresher.refresh_stale(
+                self.cache,
+                cache_key,
+                lambda params: self._send(method, path, json, params, data=data, headers=headers, use_cache=False),
+                params,
+            )
+            self.logger.info("Cache hit for key %s", cache_key)
+            dump_response(
+                logger=self.logger,
+                url=url,
+                method=method,
+                params=params,
+                resp=resp,
+                request_uuid=request_uuid,
+                start_time=start_time,
+                from_cache=True,
+            )
+            self.hooks.emit(
+                REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time, from_cache=True
+            )
+            return resp
+        if method == "GET" and use_cache and self.cache.enabled:
+            self.hooks.emit(CACHE_MISS, method=method, url=url)
+
+        attempts = 0
+        max_attempts = 5
+        backoff_factor = 1  # Initial backoff factor
+
+        body, headers = codec.encode_request(json, headers)
+        while attempts < max_attempts:
+            if attempts:
+                self.hooks.emit(RETRY, method=method, url=url, attempt=attempts + 1)
+            try:
+                headers.update(await self._auth_headers())
+                waited = await self.async_rate_limiter.acquire(method)
+                if waited:
+                    self.hooks.emit(RATE_LIMIT_WAIT, method=method, url=url, duration=waited)
+                dump_request(
+                    logger=self.logger,
+                    url=url,
+                    method=method,
+                    json=body,
+                    params=params,
+                    headers=headers,
+                    request_uuid=request_uuid,
+                    body=True,
+                )
+                with profiling.phase(NETWORK):
+                    resp = await self.transport.request(
+                        self._ensure_session(),
+                        method,
+                        url,
+                        data=body if body is not None else data,
+                        params=params,
+                        headers=headers,
+                    )
+
+                rate_limit_reset = resp.headers.get("RateLimit-Reset")
+                rate_limit_reset_time = int(rate_limit_reset) if rate_limit_reset else None
+                self.async_rate_limiter.update_limits(resp.headers, method)
+
+                if resp.status_code == 429:  # HTTP Status code 429 indicates "Too Many Requests"
+                    self.hooks.emit(RATE_LIMITED, method=method, url=url, status_code=429, attempt=attempts + 1)
+                    if rate_limit_reset_time:
+                        sleep_time = rate_limit_reset_time - int(time.time())
+                    else:
+                        sleep_time = min(2**backoff_factor, 60)  # Exponential backoff with a max limit
+                    self.logger.warning(f"Rate limit exceeded. Retrying in {sleep_time} seconds.")
+                    self.async_rate_limiter.block(method, max(sleep_time, 0))
+                    attempts += 1
+                    backoff_factor += 1
+                    continue
+
+                dump_response(
+                    logger=self.logger,
+                    url=url,
+                    method=method,
+                    params=params,
+                    resp=resp,
+                    request_uuid=request_uuid,
+                    start_time=start_time,
+                )
+                self.hooks.emit(REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time)
+                if method == "GET" and resp.status_code == 200:
+                    resp = CachedResponse.from_response(resp)
+                    self.cache.add(cache_key, resp)
+                elif method != "GET":
+                    self.cache.invalidate(cache_key)
+                return resp
+
+            except aiohttp.ClientError as e:
+                self.logger.error(f"Request failed: {e}")
+                if attempts == max_attempts - 1:  # If it's the last attempt, raise the exception
+                    self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
+                    raise e
+                attempts += 1
+                backoff_factor += 1
+                self.logger.warning(f"Failed to send {method} request to {url}. Retrying... Error: {e}")
+                await asyncio.sleep(min(2**backoff_factor, 60))
+            except BaseException as e:
+                self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
+                raise
+
+        self.hooks.emit(REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time)
+        return None
+
+    def _format(self, resp):
+        if not isinstance(resp, requests.Response):
+            self.logger.error(f"Unexpected response type: {type(resp)}")
+            return None
+
+        if resp.status_code != 200:
+            self.logger.error(f"Request failed with status code {resp.status_code}: {resp.text}")
+            return None
+
+        return format_json_response(resp, box_attrs=dict(), output=self.output)
+
+    async def get(self, path, json=None, params=None):
+        return self._format(await self.send("GET", path, json, params))
+
+    async def post(self, path, json=None, params=None, data=None, headers=None):
+        return self._format(await self.send("POST", path, json, params, data=data, headers=headers))
+
+    async def delete(self, path, json=None, params=None):
+        return self._format(await self.send("DELETE", path, json, params))
+
+
+class AsyncZDX:
+    """
+    An asyncio Controller to access Endpoints in the Zscaler Digital Experience (ZDX) API.
+
+    Accepts the same arguments as :class:`zscaler.zdx.ZDX`.
+
+    Examples:
+        >>> async with AsyncZDX(client_id=client_id, client_secret=client_secret) as zdx:
+        ...     devices = await zdx.devices.list_devices()
+    """
+
+    def __init__(self, **kw):
+        self.client = AsyncZDXClientHelper(**kw)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    def profile(self, cprofile=False):
+        """
+        Returns a :class:`~zscaler.profiling.Profiler` timing the phases of the calls made in its ``with``
+        block per endpoint. See :meth:`ZDXClientHelper.profile`.
+        """
+        return self.client.profile(cprofile=cprofile)
+
+    @cached_property
+    def devices(self):
+        """The asyncio interface object for the :ref:`ZDX Devices interface <zdx-devices>`."""
+        return AsyncDevicesAPI(self.client)
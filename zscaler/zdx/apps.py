@@ -1,6 +1,6 @@
 from box import BoxList
 from zscaler.zdx.zdx_client import ZDXClientHelper
-from zscaler.utils import zdx_params, ZDXIterator, CommonFilters
+from zscaler.utils import zdx_params, ZDXIterator, CommonFilters, collect_items
 
 
 class AppsAPI:
@@ -152,7 +152,7 @@ class AppsAPI:
         users = []
         for user in ZDXIterator(self.rest, f"apps/{app_id}/users", filters=filters):
             users.append(user)
-        return BoxList(users)
+        return collect_items(users, self.rest.output)
 
     @zdx_params
     def get_app_user(self, app_id: str, user_id: str, **kwargs):
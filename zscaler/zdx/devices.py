@@ -1,6 +1,6 @@
 from box import BoxList
 
-from zscaler.utils import ZDXIterator, CommonFilters
+from zscaler.utils import AsyncZDXIterator, ZDXIterator, CommonFilters, collect_items
 from zscaler.zdx.filters import GeoLocationFilter, GetDevicesFilters
 from zscaler.zdx.zdx_client import ZDXClientHelper
 from zscaler.utils import zdx_params
@@ -42,7 +42,7 @@ class DevicesAPI:
         devices = []
         for device in ZDXIterator(self.rest, "devices", filters=filters):
             devices.append(device)
-        return BoxList(devices)
+        return collect_items(devices, self.rest.output)
 
     @zdx_params
     def get_device(self, device_id: str, **kwargs):
@@ -185,7 +185,8 @@ class DevicesAPI:
 
         """
         filters = CommonFilters(**kwargs).to_dict()
-        return BoxList(ZDXIterator(self.rest, f"devices/{device_id}/apps/{app_id}/cloudpath-probes", filters=filters))
+        iterator = ZDXIterator(self.rest, f"devices/{device_id}/apps/{app_id}/cloudpath-probes", filters=filters)
+        return collect_items(iterator, self.rest.output)
 
     @zdx_params
     def get_cloudpath_probe(self, device_id: str, app_id: str, probe_id: str, **kwargs):
@@ -445,4 +446,35 @@ class DevicesAPI:
 
         """
         filters = GeoLocationFilter(**kwargs).to_dict()
-        return BoxList(ZDXIterator(self.rest, "active_geo", filters=filters))
+        return collect_items(ZDXIterator(self.rest, "active_geo", filters=filters), self.rest.output)
+
+
+class AsyncDevicesAPI(DevicesAPI):
+    """
+    asyncio counterpart of :class:`DevicesAPI`, returned by :attr:`zscaler.zdx.aio.AsyncZDX.devices`.
+    Every method is a coroutine, except :meth:`get_web_probes` which returns an :class:`AsyncZDXIterator`.
+
+    Examples:
+        >>> devices = await zdx.devices.list_devices(since=24)
+    """
+
+    @zdx_params
+    async def list_devices(self, **kwargs) -> BoxList:
+        filters = GetDevicesFilters(**kwargs).to_dict()
+        return await AsyncZDXIterator(self.rest, "devices", filters=filters).to_list()
+
+    def get_web_probes(self, device_id: str, app_id: str, **kwargs):
+        filters = CommonFilters(**kwargs).to_dict()
+        return AsyncZDXIterator(self.rest, f"devices/{device_id}/apps/{app_id}/web-probes", filters=filters)
+
+    @zdx_params
+    async def list_cloudpath_probes(self, device_id: str, app_id: str, **kwargs) -> BoxList:
+        filters = CommonFilters(**kwargs).to_dict()
+        return await AsyncZDXIterator(
+            self.rest, f"devices/{device_id}/apps/{app_id}/cloudpath-probes", filters=filters
+        ).to_list()
+
+    @zdx_params
+    async def list_geolocations(self, **kwargs) -> BoxList:
+        filters = GeoLocationFilter(**kwargs).to_dict()
+        return await AsyncZDXIterator(self.rest, "active_geo", filters=filters).to_list()
@@ -1,6 +1,6 @@
 from box import BoxList
 
-from zscaler.utils import ZDXIterator
+from zscaler.utils import ZDXIterator, collect_items
 from zscaler.zdx.filters import GetSoftwareFilters
 from zscaler.zdx.zdx_client import ZDXClientHelper
 from zscaler.utils import zdx_params
@@ -38,7 +38,7 @@ class InventoryAPI:
 
         """
         filters = GetSoftwareFilters(**kwargs).to_dict()
-        return BoxList(ZDXIterator(self.rest, "inventory/software", filters=filters))
+        return collect_items(ZDXIterator(self.rest, "inventory/software", filters=filters), self.rest.output)
 
     @zdx_params
     def list_software_keys(self, software_key: str, **kwargs) -> BoxList:
@@ -68,4 +68,4 @@ class InventoryAPI:
 
         """
         filters = GetSoftwareFilters(**kwargs).to_dict()
-        return BoxList(ZDXIterator(self.rest, f"inventory/software/{software_key}", filters=filters))
+        return collect_items(ZDXIterator(self.rest, f"inventory/software/{software_key}", filters=filters), self.rest.output)
@@ -1,6 +1,4 @@
-from box import BoxList
-
-from zscaler.utils import ZDXIterator, CommonFilters
+from zscaler.utils import ZDXIterator, CommonFilters, collect_items
 from zscaler.zdx.zdx_client import ZDXClientHelper
 
 
@@ -29,7 +27,7 @@ class TroubleshootingAPI:
         devices = []
         for device in ZDXIterator(self.rest, f"devices/{device_id}/deeptraces", filters=filters):
             devices.append(device)
-        return BoxList(devices)
+        return collect_items(devices, self.rest.output)
 
     def start_deeptrace(self, device_id: str, app_id: str, session_name: str, **kwargs):
         """
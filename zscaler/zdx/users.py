@@ -1,5 +1,5 @@
 from box import BoxList
-from zscaler.utils import ZDXIterator, CommonFilters, zdx_params
+from zscaler.utils import ZDXIterator, CommonFilters, zdx_params, collect_items
 from zscaler.zdx.zdx_client import ZDXClientHelper
 
 
@@ -32,7 +32,7 @@ class UsersAPI:
         devices = []
         for device in ZDXIterator(self.rest, "users", filters=filters):
             devices.append(device)
-        return BoxList(devices)
+        return collect_items(devices, self.rest.output)
 
     @zdx_params
     def get_user(self, user_id: str, **kwargs):
@@ -9,16 +9,33 @@ from zscaler.utils import (
     format_json_response,
     dump_request,
     dump_response,
+    validate_output,
 )
-from zscaler import __version__
+from zscaler import __version__, codec, profiling
 from zscaler.logger import setup_logging
+from zscaler.hooks import (
+    CACHE_HIT,
+    CACHE_MISS,
+    RATE_LIMIT_WAIT,
+    RATE_LIMITED,
+    REQUEST_END,
+    REQUEST_START,
+    RETRY,
+    TOKEN_REFRESH,
+    Hooks,
+)
+from zscaler.metrics import build_metrics
+from zscaler.profiling import AUTH, NETWORK, Profiler
 from zscaler.user_agent import UserAgent
-from zscaler.ratelimiter.ratelimiter import RateLimiter
+from zscaler.ratelimiter.ratelimiter import build_rate_limiter, rate_limit_key
+from zscaler.transport.backends import build_transport
+from zscaler.transport.session import build_session
+from zscaler.transport.single_flight import SingleFlight
+from zscaler.cache.cached_response import CachedResponse
 from zscaler.cache.no_op_cache import NoOpCache
-from zscaler.cache.zscaler_cache import ZscalerCache
+from zscaler.cache.refresh import BackgroundRefresher
+from zscaler.cache.zscaler_cache import build_cache
 
-# Setup the logger
-setup_logging(logger_name="zscaler-sdk-python")
 logger = logging.getLogger("zscaler-sdk-python")
 
 
@@ -42,6 +59,29 @@ class ZDXClientHelper:
             (e.g. internal test instance etc). When using this attribute, there is no need to supply the `cloud`
             attribute. The override URL will be prepended to the API endpoint suffixes. The protocol must be included
             i.e. http:// or https://.
+        session (requests.Session):
+            An optional pre-configured session. When omitted, a pooled keep-alive session is built from the
+            `pool_connections`, `pool_maxsize`, `keep_alive` and `socket_options` keyword arguments.
+        rate_limit_store (str):
+            Path of a SQLite file through which the clients of all processes on this host share the rate limit
+            budget of the tenant. Defaults to the `ZSCALER_RATE_LIMIT_STORE` environment variable; each client
+            keeps its own budget when unset.
+        output (str):
+            The form of the data returned by the API methods, one of `box` (the default), `dict`, `raw` and
+            `lazy`. See :func:`zscaler.utils.format_payload`. It can be overridden for some calls with
+            :func:`zscaler.utils.output_mode`.
+        hooks (:obj:`zscaler.hooks.Hooks`):
+            Callbacks notified of the lifecycle events of the requests, e.g. retries and rate limit waits. See
+            :class:`zscaler.hooks.Hooks`. The client has its own, as `client.hooks`, when not given.
+        metrics (:obj:`zscaler.metrics.MetricsRegistry`):
+            Registry aggregating the latency, retries, 429s and cache hits of the requests, or `True` for a
+            registry of the client, available as `client.metrics`. Defaults to the
+            `ZSCALER_CLIENT_METRICS_ENABLED` environment variable.
+        transport (:obj:`zscaler.transport.backends.HTTPTransport`):
+            How the requests are sent: over the network by default, or recorded to, or replayed from, a
+            cassette with :class:`zscaler.transport.backends.RecordingTransport` and
+            :class:`zscaler.transport.backends.ReplayTransport`. Defaults to the `ZSCALER_CLIENT_TRANSPORT`
+            environment variable.
     """
 
     _vendor = "Zscaler"
@@ -52,6 +92,11 @@ class ZDXClientHelper:
     url = "https://api.zdxcloud.net/v1"
 
     def __init__(self, **kw):
+        self._configure(**kw)
+        self.session = self._build_session(**kw)
+
+    def _configure(self, **kw):
+        """Sets up the credentials, API URL, rate limiter and cache. Shared by the synchronous and asyncio clients."""
         setup_logging()
         self.logger = logging.getLogger("zscaler-sdk-python")
 
@@ -59,8 +104,16 @@ class ZDXClientHelper:
         self.client_secret = kw.get("client_secret", os.getenv(f"{self._env_base}_CLIENT_SECRET"))
         self.cloud = kw.get("cloud", os.getenv(f"{self._env_base}_CLOUD", self.env_cloud))
         self.url = kw.get("override_url", os.getenv(f"{self._env_base}_OVERRIDE_URL")) or f"https://api.{self.cloud}.net/v1"
-
-        self.rate_limiter = RateLimiter(get_limit=5, post_put_delete_limit=5, get_freq=60, post_put_delete_freq=60)
+        self.output = validate_output(kw.get("output", "box"))
+
+        self.rate_limiter = build_rate_limiter(
+            get_limit=5,
+            post_put_delete_limit=5,
+            get_freq=60,
+            post_put_delete_freq=60,
+            key=rate_limit_key("zdx", self.url, self.client_id),
+            store=kw.get("rate_limit_store"),
+        )
 
         ua = UserAgent()
         self.user_agent = ua.get_user_agent_string()
@@ -68,24 +121,37 @@ class ZDXClientHelper:
         if cache_enabled:
             ttl = int(os.getenv("ZSCALER_CLIENT_CACHE_DEFAULT_TTL", 3600))
             tti = int(os.getenv("ZSCALER_CLIENT_CACHE_DEFAULT_TTI", 1800))
-            self.cache = ZscalerCache(ttl=ttl, tti=tti)
+            self.cache = build_cache(ttl=ttl, tti=tti)
         else:
             self.cache = NoOpCache()
-
-        self.session = self._build_session()
-
-    def _build_session(self):
-        """Creates a ZDX API session using the requests library."""
-        session = requests.Session()
+        self.single_flight = SingleFlight()
+        self.hooks = (kw.get("hooks") or Hooks()).bind("zdx")
+        self.metrics = build_metrics(kw.get("metrics"), self.hooks)
+        self.refresher = BackgroundRefresher()
+        self.transport = build_transport(kw.get("transport"))
+
+    def _build_session(self, **kw):
+        """Creates a pooled ZDX API session using the requests library."""
+        session = kw.get("session") or build_session(
+            pool_connections=kw.get("pool_connections"),
+            pool_maxsize=kw.get("pool_maxsize"),
+            keep_alive=kw.get("keep_alive", True),
+            socket_options=kw.get("socket_options"),
+        )
+        session = self.transport.install(session)
         session.headers.update(
             {"User-Agent": self.user_agent, "Content-Type": "application/json"}  # Ensure content type is set
         )
-        token = self.create_token()
+        # The token request re-uses the pooled connection before the bearer token is attached
+        token = self.create_token(session)
         session.headers.update({"Authorization": f"Bearer {token}"})
         return session
 
-    def create_token(self):
-        """Creates a ZDX authentication token."""
+    def _token_payload(self):
+        """
+        Builds the body of the ``/oauth/token`` request, hashing the client secret with the current epoch.
+        Shared by the synchronous and asyncio clients.
+        """
         epoch_time = int(time.time())
         api_secret_format = f"{self.client_secret}:{epoch_time}"
         api_secret_hash = sha256(api_secret_format.encode("utf-8")).hexdigest()
@@ -106,13 +172,21 @@ class ZDXClientHelper:
             masked_key_secret,
             epoch_time,
         )
+        return payload
+
+    def create_token(self, session=None):
+        """Creates a ZDX authentication token."""
+        payload = self._token_payload()
         token_url = f"{self.url}/oauth/token"
         self.logger.debug(f"Token request URL: {token_url}")
 
-        response = requests.post(token_url, json=payload, headers={"Content-Type": "application/json"})
+        http = session or self.session
+        start_time = time.time()
+        with profiling.phase(AUTH):
+            response = http.post(token_url, json=payload, headers={"Content-Type": "application/json"})
+        self.hooks.emit(TOKEN_REFRESH, status_code=response.status_code, start=start_time)
 
         self.logger.debug(f"Token request response status: {response.status_code}")
-        self.logger.debug(f"Token request response content: {response.text}")
 
         response.raise_for_status()  # Raise an error for bad status codes
         return response.json().get("token")
@@ -129,7 +203,7 @@ class ZDXClientHelper:
         """
         resp = self.session.get(f"{self.url}/oauth/validate")
         resp.raise_for_status()
-        return format_json_response(resp, box_attrs=dict())
+        return format_json_response(resp, box_attrs=dict(), output=self.output)
 
     def get_jwks(self):
         """
@@ -143,9 +217,35 @@ class ZDXClientHelper:
         """
         resp = self.session.get(f"{self.url}/oauth/jwks")
         resp.raise_for_status()
-        return format_json_response(resp, box_attrs=dict())
+        return format_json_response(resp, box_attrs=dict(), output=self.output)
+
+    def profile(self, cprofile=False):
+        """
+        Returns a :class:`~zscaler.profiling.Profiler` timing the phases of the calls made in its ``with``
+        block per endpoint: logins, rate limiter waits, requests, JSON decoding, key conversion and Box
+        construction.
+
+        Args:
+            cprofile (bool): Whether to also record a :mod:`cProfile` function profile of the block.
+
+        Examples:
+            >>> with zdx.profile() as prof:
+            ...     zdx.devices.list_devices()
+            >>> print(prof.report())
+        """
+        return Profiler(cprofile=cprofile)
 
     def send(self, method, path, json=None, params=None, data=None, headers=None):
+        """
+        Sends a request, sharing the response of a GET request already in flight for the same resource
+        instead of sending it again. See :class:`~zscaler.transport.single_flight.SingleFlight`.
+        """
+        if method != "GET" or json is not None or data is not None or headers is not None:
+            return self._send(method, path, json, params, data=data, headers=headers)
+        key = self.cache.create_key(f"{self.url}/{path.lstrip('/')}", params)
+        return self.single_flight.do(key, lambda: self._send(method, path, json, params, data=data, headers=headers))
+
+    def _send(self, method, path, json=None, params=None, data=None, headers=None, use_cache=True):
         """
         Send a request to the ZDX API.
 
@@ -161,33 +261,34 @@ class ZDXClientHelper:
         - Response: Response object from the request.
         """
         url = f"{self.url}/{path.lstrip('/')}"
+        profiling.set_endpoint(url)
         start_time = time.time()
 
         if headers is None:
             headers = {}
 
-        # Use rate limiter before making a request
-        should_wait, delay = self.rate_limiter.wait(method)
-        if should_wait:
-            self.logger.info(f"Rate limit exceeded. Waiting for {delay} seconds.")
-            time.sleep(delay)
-
-        # Add a constant delay before making the request
-        additional_delay = 5  # Extra 5 seconds delay
-        time.sleep(additional_delay)
-
         # Update headers to include the user agent
         headers["User-Agent"] = self.user_agent
 
         # Generate a unique UUID for this request
         request_uuid = uuid.uuid4()
-        self.logger.info(f"Sending {method} request to {url} with UUID {request_uuid}")
+        self.logger.info("Sending %s request to %s with UUID %s", method, url, request_uuid)
+        self.hooks.emit(REQUEST_START, method=method, url=url)
 
         # Check cache before sending request
         cache_key = self.cache.create_key(url, params)
-        if method == "GET" and self.cache.contains(cache_key):
-            resp = self.cache.get(cache_key)
-            self.logger.info(f"Cache hit for key {cache_key}")
+        cached = method == "GET" and use_cache and self.cache.contains(cache_key)
+        # None if another thread evicted or invalidated the entry since it was found
+        resp = self.cache.get(cache_key) if cached else None
+        if resp is not None:
+            self.hooks.emit(CACHE_HIT, method=method, url=url)
+            self.refresher.refresh_stale(
+                self.cache,
+                cache_key,
+                lambda params: self._send(method, path, json, params, data=data, headers=headers, use_cache=False),
+                params,
+            )
+            self.logger.info("Cache hit for key %s", cache_key)
             dump_response(
                 logger=self.logger,
                 url=url,
@@ -198,26 +299,42 @@ class ZDXClientHelper:
                 start_time=start_time,
                 from_cache=True,
             )
+            self.hooks.emit(
+                REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time, from_cache=True
+            )
             return resp
+        if method == "GET" and use_cache and self.cache.enabled:
+            self.hooks.emit(CACHE_MISS, method=method, url=url)
 
         attempts = 0
         max_attempts = 5
         backoff_factor = 1  # Initial backoff factor
 
+        body, headers = codec.encode_request(json, headers)
         while attempts < max_attempts:
+            if attempts:
+                self.hooks.emit(RETRY, method=method, url=url, attempt=attempts + 1)
             try:
+                # Only waits once the tracked request budget is exhausted
+                waited = self.rate_limiter.acquire(method)
+                if waited:
+                    self.logger.info(f"Rate limit exceeded. Waited {waited} seconds.")
+                    self.hooks.emit(RATE_LIMIT_WAIT, method=method, url=url, duration=waited)
                 dump_request(
                     logger=self.logger,
                     url=url,
                     method=method,
-                    json=json,
+                    json=body,
                     params=params,
                     headers=headers,
                     request_uuid=request_uuid,
                     body=True,
                 )
 
-                resp = self.session.request(method=method, url=url, json=json, data=data, params=params, headers=headers)
+                with profiling.phase(NETWORK):
+                    resp = self.session.request(
+                        method=method, url=url, data=body if body is not None else data, params=params, headers=headers
+                    )
 
                 # Log rate limit headers
                 rate_limit_limit = resp.headers.get("RateLimit-Limit")
@@ -226,28 +343,27 @@ class ZDXClientHelper:
                 rate_limit_reset_time = int(rate_limit_reset) if rate_limit_reset else None
 
                 if rate_limit_limit and rate_limit_remaining and rate_limit_reset:
-                    self.logger.info(f"RateLimit-Limit: {rate_limit_limit}")
-                    self.logger.info(f"RateLimit-Remaining: {rate_limit_remaining}")
-                    self.logger.info(f"RateLimit-Reset: {rate_limit_reset}")
+                    self.logger.info("RateLimit-Limit: %s", rate_limit_limit)
+                    self.logger.info("RateLimit-Remaining: %s", rate_limit_remaining)
+                    self.logger.info("RateLimit-Reset: %s", rate_limit_reset)
 
-                    # Update rate limits based on headers
-                    self.rate_limiter.update_limits(resp.headers)
+                # Update rate limits based on headers
+                self.rate_limiter.update_limits(resp.headers, method)
 
                 if resp.status_code == 429:  # HTTP Status code 429 indicates "Too Many Requests"
+                    self.hooks.emit(RATE_LIMITED, method=method, url=url, status_code=429, attempt=attempts + 1)
                     if rate_limit_reset_time:
                         sleep_time = rate_limit_reset_time - int(time.time())
                     else:
                         sleep_time = min(2**backoff_factor, 60)  # Exponential backoff with a max limit
                     self.logger.warning(f"Rate limit exceeded. Retrying in {sleep_time} seconds.")
-                    time.sleep(sleep_time + additional_delay)  # Adding additional delay here too
+                    self.rate_limiter.block(method, max(sleep_time, 0))
                     attempts += 1
                     backoff_factor += 1  # Increment backoff factor
                     continue
 
                 # Log response
-                self.logger.info(f"Received response for {method} request to {url} with UUID {request_uuid}")
-                self.logger.debug(f"Response status code: {resp.status_code}")
-                self.logger.debug(f"Response content: {resp.text}")
+                self.logger.info("Received response for %s request to %s with UUID %s", method, url, request_uuid)
 
                 dump_response(
                     logger=self.logger,
@@ -258,23 +374,32 @@ class ZDXClientHelper:
                     request_uuid=request_uuid,
                     start_time=start_time,
                 )
+                self.hooks.emit(REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time)
 
                 # Cache the response if it's a successful GET request
                 if method == "GET" and resp.status_code == 200:
+                    resp = CachedResponse.from_response(resp)
                     self.cache.add(cache_key, resp)
-                    self.logger.info(f"Cache updated for key {cache_key}")
+                    self.logger.info("Cache updated for key %s", cache_key)
+                elif method != "GET":
+                    self.cache.invalidate(cache_key)
 
                 return resp
 
             except requests.RequestException as e:
                 self.logger.error(f"Request failed: {e}")
                 if attempts == max_attempts - 1:  # If it's the last attempt, raise the exception
+                    self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
                     raise e
                 attempts += 1
                 backoff_factor += 1  # Increment backoff factor
                 self.logger.warning(f"Failed to send {method} request to {url}. Retrying... Error: {e}")
-                time.sleep(min(2**backoff_factor, 60) + additional_delay)  # Adding additional delay here too
+                time.sleep(min(2**backoff_factor, 60))
+            except BaseException as e:
+                self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
+                raise
 
+        self.hooks.emit(REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time)
         return None
 
     def get(self, path, json=None, params=None):
@@ -289,13 +414,6 @@ class ZDXClientHelper:
         Returns:
         - Response: Response object from the request.
         """
-
-        # Use rate limiter before making a request
-        should_wait, delay = self.rate_limiter.wait("GET")
-        if should_wait:
-            time.sleep(delay + 5)
-
-        # Now proceed with sending the request
         resp = self.send("GET", path, json, params)
 
         if not isinstance(resp, requests.Response):
@@ -306,7 +424,7 @@ class ZDXClientHelper:
             self.logger.error(f"Request failed with status code {resp.status_code}: {resp.text}")
             return None
 
-        formatted_resp = format_json_response(resp, box_attrs=dict())
+        formatted_resp = format_json_response(resp, box_attrs=dict(), output=self.output)
         return formatted_resp
 
     def post(self, path, json=None, params=None, data=None, headers=None):
@@ -323,12 +441,6 @@ class ZDXClientHelper:
         Returns:
         - Response: Response object from the request.
         """
-
-        should_wait, delay = self.rate_limiter.wait("POST")
-        if should_wait:
-            time.sleep(delay)
-
-        # Now proceed with sending the request
         resp = self.send("POST", path, json, params, data=data, headers=headers)
 
         if not isinstance(resp, requests.Response):
@@ -339,7 +451,7 @@ class ZDXClientHelper:
             self.logger.error(f"Request failed with status code {resp.status_code}: {resp.text}")
             return None
 
-        formatted_resp = format_json_response(resp, box_attrs=dict())
+        formatted_resp = format_json_response(resp, box_attrs=dict(), output=self.output)
         return formatted_resp
 
     def delete(self, path, json=None, params=None):
@@ -354,12 +466,6 @@ class ZDXClientHelper:
         Returns:
         - Response: Response object from the request.
         """
-
-        should_wait, delay = self.rate_limiter.wait("DELETE")
-        if should_wait:
-            time.sleep(delay)
-
-        # Now proceed with sending the request
         resp = self.send("DELETE", path, json, params)
 
         if not isinstance(resp, requests.Response):
@@ -370,5 +476,5 @@ class ZDXClientHelper:
             self.logger.error(f"Request failed with status code {resp.status_code}: {resp.text}")
             return None
 
-        formatted_resp = format_json_response(resp, box_attrs=dict())
+        formatted_resp = format_json_response(resp, box_attrs=dict(), output=self.output)
         return formatted_resp
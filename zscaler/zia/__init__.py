@@ -1,61 +1,78 @@
 import datetime
 import logging
-import os
-import re
+import threading
 import time
 import uuid
+from functools import cached_property
 from time import sleep
+from typing import TYPE_CHECKING
 
 import requests
-from box import Box, BoxList
-
-from zscaler import __version__
-from zscaler.cache.no_op_cache import NoOpCache
-from zscaler.cache.zscaler_cache import ZscalerCache
-from zscaler.constants import MAX_RETRIES
-from zscaler.errors.http_error import HTTPError, ZscalerAPIError
-from zscaler.exceptions.exceptions import HTTPException, ZscalerAPIException
-from zscaler.logger import setup_logging
-from zscaler.ratelimiter.ratelimiter import RateLimiter
-from zscaler.user_agent import UserAgent
+
+from zscaler import __version__, codec, profiling
+from zscaler.cache.cached_response import CachedResponse
+from zscaler.constants import MAX_RETRIES, ZIA_CACHE_DEPENDENCIES
+from zscaler.exceptions.exceptions import ZscalerAPIException
+from zscaler.lazy import lazy_attributes
+from zscaler.hooks import (
+    CACHE_HIT,
+    CACHE_MISS,
+    RATE_LIMIT_WAIT,
+    RATE_LIMITED,
+    REQUEST_END,
+    REQUEST_START,
+    RETRY,
+    TOKEN_REFRESH,
+)
+from zscaler.profiling import AUTH, NETWORK
+from zscaler.ratelimiter.ratelimiter import rate_limit_key
+from zscaler.transport.session import build_session, build_session_store
 from zscaler.utils import (
-    convert_keys_to_snake,
     dump_request,
     dump_response,
     format_json_response,
-    obfuscate_api_key,
+    format_payload,
+    resolve_output,
     retry_with_backoff,
 )
 from zscaler.zia.client import ZIAClient
-from zscaler.zia.activate import ActivationAPI
-from zscaler.zia.admin_and_role_management import AdminAndRoleManagementAPI
-from zscaler.zia.apptotal import AppTotalAPI
-from zscaler.zia.audit_logs import AuditLogsAPI
-from zscaler.zia.authentication_settings import AuthenticationSettingsAPI
-from zscaler.zia.device_management import DeviceManagementAPI
-from zscaler.zia.dlp import DLPAPI
-from zscaler.zia.firewall import FirewallPolicyAPI
-from zscaler.zia.forwarding_control import ForwardingControlAPI
-from zscaler.zia.cloudappcontrol import CloudAppControlAPI
-from zscaler.zia.isolation_profile import IsolationProfileAPI
-from zscaler.zia.labels import RuleLabelsAPI
-from zscaler.zia.pac_files import PacFilesAPI
-from zscaler.zia.locations import LocationsAPI
-from zscaler.zia.sandbox import CloudSandboxAPI
-from zscaler.zia.security import SecurityPolicyAPI
-from zscaler.zia.ssl_inspection import SSLInspectionAPI
-from zscaler.zia.traffic import TrafficForwardingAPI
-from zscaler.zia.url_categories import URLCategoriesAPI
-from zscaler.zia.url_filtering import URLFilteringAPI
-from zscaler.zia.users import UserManagementAPI
-from zscaler.zia.web_dlp import WebDLPAPI
-from zscaler.zia.workload_groups import WorkloadGroupsAPI
-from zscaler.zia.zpa_gateway import ZPAGatewayAPI
-
-# Setup the logger
-setup_logging(logger_name="zscaler-sdk-python")
+
+if TYPE_CHECKING:
+    from box import Box
+
 logger = logging.getLogger("zscaler-sdk-python")
 
+# The API modules are imported by the accessors of the clients, on first use
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "AdminAndRoleManagementAPI": "zscaler.zia.admin_and_role_management",
+        "AppTotalAPI": "zscaler.zia.apptotal",
+        "AuditLogsAPI": "zscaler.zia.audit_logs",
+        "ActivationAPI": "zscaler.zia.activate",
+        "DLPAPI": "zscaler.zia.dlp",
+        "FirewallPolicyAPI": "zscaler.zia.firewall",
+        "ForwardingControlAPI": "zscaler.zia.forwarding_control",
+        "RuleLabelsAPI": "zscaler.zia.labels",
+        "DeviceManagementAPI": "zscaler.zia.device_management",
+        "LocationsAPI": "zscaler.zia.locations",
+        "CloudSandboxAPI": "zscaler.zia.sandbox",
+        "SecurityPolicyAPI": "zscaler.zia.security",
+        "AuthenticationSettingsAPI": "zscaler.zia.authentication_settings",
+        "SSLInspectionAPI": "zscaler.zia.ssl_inspection",
+        "TrafficForwardingAPI": "zscaler.zia.traffic",
+        "URLCategoriesAPI": "zscaler.zia.url_categories",
+        "URLFilteringAPI": "zscaler.zia.url_filtering",
+        "CloudAppControlAPI": "zscaler.zia.cloudappcontrol",
+        "UserManagementAPI": "zscaler.zia.users",
+        "WebDLPAPI": "zscaler.zia.web_dlp",
+        "ZPAGatewayAPI": "zscaler.zia.zpa_gateway",
+        "IsolationProfileAPI": "zscaler.zia.isolation_profile",
+        "WorkloadGroupsAPI": "zscaler.zia.workload_groups",
+        "PacFilesAPI": "zscaler.zia.pac_files",
+    },
+)
+
 
 class ZIAClientHelper(ZIAClient):
     """
@@ -85,6 +102,33 @@ class ZIAClientHelper(ZIAClient):
             (e.g. internal test instance etc). When using this attribute, there is no need to supply the `cloud`
             attribute. The override URL will be prepended to the API endpoint suffixes. The protocol must be included
             i.e. http:// or https://.
+        session (requests.Session):
+            An optional pre-configured session. When omitted, a pooled keep-alive session is built from the
+            `pool_connections`, `pool_maxsize`, `keep_alive` and `socket_options` keyword arguments.
+        rate_limit_store (str):
+            Path of a SQLite file through which the clients of all processes on this host share the rate limit
+            budget of the tenant. Defaults to the `ZSCALER_RATE_LIMIT_STORE` environment variable; each client
+            keeps its own budget when unset.
+        session_store (str):
+            Path of a SQLite file through which the clients of all processes on this host share the login
+            session of the tenant, instead of each logging in. Defaults to the `ZSCALER_SESSION_STORE`
+            environment variable; each client has its own session when unset.
+        output (str):
+            The form of the data returned by the API methods, one of `box` (the default), `dict`, `raw` and
+            `lazy`. See :func:`zscaler.utils.format_payload`. It can be overridden for some calls with
+            :func:`zscaler.utils.output_mode`.
+        hooks (:obj:`zscaler.hooks.Hooks`):
+            Callbacks notified of the lifecycle events of the requests, e.g. retries and rate limit waits. See
+            :class:`zscaler.hooks.Hooks`. The client has its own, as `client.hooks`, when not given.
+        metrics (:obj:`zscaler.metrics.MetricsRegistry`):
+            Registry aggregating the latency, retries, 429s and cache hits of the requests, or `True` for a
+            registry of the client, available as `client.metrics`. Defaults to the
+            `ZSCALER_CLIENT_METRICS_ENABLED` environment variable.
+        transport (:obj:`zscaler.transport.backends.HTTPTransport`):
+            How the requests are sent: over the network by default, or recorded to, or replayed from, a
+            cassette with :class:`zscaler.transport.backends.RecordingTransport` and
+            :class:`zscaler.transport.backends.ReplayTransport`. Defaults to the `ZSCALER_CLIENT_TRANSPORT`
+            environment variable.
 
     """
 
@@ -95,107 +139,73 @@ class ZIAClientHelper(ZIAClient):
     url = "https://zsapi.zscaler.net/api/v1"
     env_cloud = "zscaler"
 
-    def __init__(self, cloud, timeout=240, cache=None, fail_safe=False, **kw):
-        self.api_key = kw.get("api_key", os.getenv(f"{self._env_base}_API_KEY"))
-        self.username = kw.get("username", os.getenv(f"{self._env_base}_USERNAME"))
-        self.password = kw.get("password", os.getenv(f"{self._env_base}_PASSWORD"))
-        # The 'cloud' parameter should have precedence over environment variables
-        self.env_cloud = cloud or kw.get("cloud") or os.getenv(f"{self._env_base}_CLOUD")
-        if not self.env_cloud:
-            raise ValueError(
-                f"Cloud environment must be set via the 'cloud' argument or the {self._env_base}_CLOUD environment variable."
-            )
-
-        # URL construction
-        if cloud == "zspreview":
-            self.url = f"https://admin.{self.env_cloud}.net/api/v1"
-        else:
-            # Use override URL if provided, else construct the URL
-            self.url = (
-                kw.get("override_url")
-                or os.getenv(f"{self._env_base}_OVERRIDE_URL")
-                or f"https://zsapi.{self.env_cloud}.net/api/v1"
-            )
+    ERROR_MESSAGES = {
+        "UNEXPECTED_STATUS": "Unexpected status code {status_code} received for page {page}.",
+        "EMPTY_RESULTS": "No results found for page {page}.",
+    }
 
-        self.conv_box = True
-        self.sandbox_token = kw.get("sandbox_token") or os.getenv(f"{self._env_base}_SANDBOX_TOKEN")
-        self.timeout = timeout
-        self.fail_safe = fail_safe
-        cache_enabled = os.environ.get("ZSCALER_CLIENT_CACHE_ENABLED", "false").lower() == "true"
-        if cache is None:
-            if cache_enabled:
-                ttl = int(os.environ.get("ZSCALER_CLIENT_CACHE_DEFAULT_TTL", 3600))
-                tti = int(os.environ.get("ZSCALER_CLIENT_CACHE_DEFAULT_TTI", 1800))
-                self.cache = ZscalerCache(ttl=ttl, tti=tti)
-            else:
-                self.cache = NoOpCache()
-        else:
-            self.cache = cache
-        # Initialize user-agent
-        ua = UserAgent()
-        self.user_agent = ua.get_user_agent_string()
-        # Initialize rate limiter
-        # You may want to adjust these parameters as per your rate limit configuration
-        self.rate_limiter = RateLimiter(
-            get_limit=2,  # Adjust as per actual limit
-            post_put_delete_limit=2,  # Adjust as per actual limit
-            get_freq=2,  # Adjust as per actual frequency (in seconds)
-            post_put_delete_freq=2,  # Adjust as per actual frequency (in seconds)
+    def __init__(self, cloud, timeout=240, cache=None, fail_safe=False, **kw):
+        self._configure(cloud, timeout, cache, fail_safe, **kw)
+        # Pooled keep-alive session shared by authentication, pagination and all API calls
+        session = kw.get("session") or build_session(
+            pool_connections=kw.get("pool_connections"),
+            pool_maxsize=kw.get("pool_maxsize"),
+            keep_alive=kw.get("keep_alive", True),
+            socket_options=kw.get("socket_options"),
         )
-        self.headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "User-Agent": self.user_agent,
-        }
-        self.session_timeout_offset = datetime.timedelta(minutes=5)
-        self.session_refreshed = None
-        self.auth_details = None
-        self.session_id = None
+        self.session = self.transport.install(session)
+        self.session_store = build_session_store(kw.get("session_store"))
+        self._session_key = rate_limit_key("zia", self.url, self.api_key, self.username)
+        self._session_holder = uuid.uuid4().hex
+        # Held while the session is replaced, so that the threads sharing the client log in once
+        self._auth_lock = threading.RLock()
         self.authenticate()
 
-    def extractJSessionIDFromHeaders(self, header):
-        session_id_str = header.get("Set-Cookie", "")
-
-        if not session_id_str:
-            raise ValueError("no Set-Cookie header received")
-
-        regex = re.compile(r"JSESSIONID=(.*?);")
-        result = regex.search(session_id_str)
-
-        if not result:
-            raise ValueError("couldn't find JSESSIONID in header value")
-
-        return result.group(1)
-
-    def is_session_expired(self):
-        if self.auth_details is None:
-            return True
-        now = datetime.datetime.now()
-        if self.auth_details["passwordExpiryTime"] > 0 and (self.session_refreshed - self.session_timeout_offset < now):
-            return True
-        return False
+    def authenticate(self) -> "Box":
+        """
+        Creates a ZIA authentication session. With a session store, the session stored by the other clients of
+        the tenant is used while it is valid, and a single one of them logs in when it is not.
+        """
+        with self._auth_lock:
+            if self.session_store is None:
+                return self._login()
+            session = self.session_store.acquire(
+                self._session_key, self._session_holder, self._stored_login, self.session_id
+            )
+            self.session_refreshed = datetime.datetime.fromtimestamp(session.refreshed_at)
+            self.session_id = session.session_id
+            self.auth_details = session.auth_details
+            return session
+
+    def _ensure_authenticated(self):
+        """Logs in again when the session expired, once for all the threads finding it expired."""
+        if not self.is_session_expired():
+            return
+        with self._auth_lock:
+            # Replaced by the thread which held the lock meanwhile
+            if self.is_session_expired():
+                logger.warning("The provided sesion expired. Refreshing...")
+                self.authenticate()
+
+    def _stored_login(self):
+        resp = self._login()
+        if resp.status_code > 299:
+            raise ZscalerAPIException(self.url + "/authenticatedSession", resp, resp.text)
+        return self.session_id, self.auth_details
 
     @retry_with_backoff(MAX_RETRIES)
-    def authenticate(self) -> Box:
-        """
-        Creates a ZIA authentication session.
-        """
-        api_key_chars = list(self.api_key)
-        api_obf = obfuscate_api_key(api_key_chars)
-
-        payload = {
-            "apiKey": api_obf["key"],
-            "username": self.username,
-            "password": self.password,
-            "timestamp": api_obf["timestamp"],
-        }
-        resp = requests.request(
-            "POST",
-            self.url + "/authenticatedSession",
-            json=payload,
-            headers=self.headers,
-            timeout=self.timeout,
-        )
+    def _login(self):
+        payload = self._auth_payload()
+        start_time = time.time()
+        with profiling.phase(AUTH):
+            resp = self.session.request(
+                "POST",
+                self.url + "/authenticatedSession",
+                json=payload,
+                headers=self.headers,
+                timeout=self.timeout,
+            )
+        self.hooks.emit(TOKEN_REFRESH, status_code=resp.status_code, start=start_time)
         if resp.status_code > 299:
             return resp
         self.session_refreshed = datetime.datetime.now()
@@ -212,18 +222,32 @@ class ZIAClientHelper(ZIAClient):
 
     def deauthenticate(self):
         """
-        Ends the ZIA authentication session.
+        Ends the ZIA authentication session. With a session store, the session is only ended once the last
+        client using it releases it.
+
+        Returns:
+            bool: Whether the session was ended.
         """
+        with self._auth_lock:
+            if self.session_store is None:
+                return self._logout(self.session_id)
+            ended = self.session_store.release(self._session_key, self._session_holder, self._logout)
+            self.auth_details = None
+            self.session_id = None
+            return ended
+
+    def _logout(self, session_id):
         logout_url = self.url + "/authenticatedSession"
 
         headers = self.headers.copy()
-        headers.update({"Cookie": f"JSESSIONID={self.session_id}"})
+        headers.update({"Cookie": f"JSESSIONID={session_id}"})
 
         try:
-            response = requests.delete(logout_url, headers=headers, timeout=self.timeout)
+            response = self.session.delete(logout_url, headers=headers, timeout=self.timeout)
             if response.status_code == 204:
-                self.session_id = None
+                # Cleared first, so that threads finding the session valid never send a cleared session id
                 self.auth_details = None
+                self.session_id = None
                 return True
             else:
                 return False
@@ -231,6 +255,16 @@ class ZIAClientHelper(ZIAClient):
             return False
 
     def send(self, method, path, json=None, params=None, data=None, headers=None):
+        """
+        Sends a request, sharing the response of a GET request already in flight for the same resource
+        instead of sending it again. See :class:`~zscaler.transport.single_flight.SingleFlight`.
+        """
+        if method != "GET" or json is not None or data is not None or headers is not None:
+            return self._send(method, path, json, params, data=data, headers=headers)
+        key = self.cache.create_key(self._resolve_url(path), params)
+        return self.single_flight.do(key, lambda: self._send(method, path, json, params, data=data, headers=headers))
+
+    def _send(self, method, path, json=None, params=None, data=None, headers=None, use_cache=True):
         """
         Send a request to the ZIA API.
 
@@ -242,10 +276,8 @@ class ZIAClientHelper(ZIAClient):
         - Response: Response object from the request.
         """
         is_sandbox = "zscsb" in path
-        api = self.url
-        if is_sandbox:
-            api = f"https://csbapi.{self.env_cloud}.net"
-        url = f"{api}/{path.lstrip('/')}"
+        url = self._resolve_url(path)
+        profiling.set_endpoint(url)
         start_time = time.time()
         # Update headers to include the user agent
         headers_with_user_agent = self.headers.copy()
@@ -254,20 +286,31 @@ class ZIAClientHelper(ZIAClient):
         request_uuid = uuid.uuid4()
         if headers is not None:
             headers_with_user_agent.update(headers)
+        body, headers_with_user_agent = codec.encode_request(json, headers_with_user_agent)
         dump_request(
             logger,
             url,
             method,
-            json,
+            body,
             params,
             headers_with_user_agent,
             request_uuid,
             body=not is_sandbox,
         )
+        self.hooks.emit(REQUEST_START, method=method, url=url)
         # Check cache before sending request
         cache_key = self.cache.create_key(url, params)
-        if method == "GET" and self.cache.contains(cache_key):
-            resp = self.cache.get(cache_key)
+        cached = method == "GET" and use_cache and self.cache.contains(cache_key)
+        # None if another thread evicted or invalidated the entry since it was found
+        resp = self.cache.get(cache_key) if cached else None
+        if resp is not None:
+            self.hooks.emit(CACHE_HIT, method=method, url=url)
+            self.refresher.refresh_stale(
+                self.cache,
+                cache_key,
+                lambda params: self._send(method, path, json, params, data=data, headers=headers, use_cache=False),
+                params,
+            )
             dump_response(
                 logger=logger,
                 url=url,
@@ -278,25 +321,34 @@ class ZIAClientHelper(ZIAClient):
                 start_time=start_time,
                 from_cache=True,
             )
+            self.hooks.emit(
+                REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time, from_cache=True
+            )
             return resp
+        if method == "GET" and use_cache and self.cache.enabled:
+            self.hooks.emit(CACHE_MISS, method=method, url=url)
 
         attempts = 0
         while attempts < 5:  # Trying a maximum of 5 times
+            if attempts:
+                self.hooks.emit(RETRY, method=method, url=url, attempt=attempts + 1)
             try:
                 # If the token is None or expired, fetch a new token
-                if self.is_session_expired():
-                    logger.warning("The provided sesion expired. Refreshing...")
-                    self.authenticate()
-                resp = requests.request(
-                    method=method,
-                    url=url,
-                    json=json,
-                    data=data,
-                    params=params,
-                    headers=headers_with_user_agent,
-                    timeout=self.timeout,
-                    cookies={"JSESSIONID": self.session_id},
-                )
+                self._ensure_authenticated()
+                waited = self.rate_limiter.acquire(method)
+                if waited:
+                    logger.warning(f"Rate limit exceeded. Waited {waited} seconds.")
+                    self.hooks.emit(RATE_LIMIT_WAIT, method=method, url=url, duration=waited)
+                with profiling.phase(NETWORK):
+                    resp = self.session.request(
+                        method=method,
+                        url=url,
+                        data=body if body is not None else data,
+                        params=params,
+                        headers=headers_with_user_agent,
+                        timeout=self.timeout,
+                        cookies={"JSESSIONID": self.session_id},
+                    )
                 dump_response(
                     logger=logger,
                     url=url,
@@ -306,12 +358,14 @@ class ZIAClientHelper(ZIAClient):
                     request_uuid=request_uuid,
                     start_time=start_time,
                 )
+                self.rate_limiter.update_limits(resp.headers, method)
                 if resp.status_code == 429:  # HTTP Status code 429 indicates "Too Many Requests"
+                    self.hooks.emit(RATE_LIMITED, method=method, url=url, status_code=429, attempt=attempts + 1)
                     sleep_time = int(
                         resp.headers.get("Retry-After", 2)
-                    )  # Default to 60 seconds if 'Retry-After' header is missing
+                    )  # Default to 2 seconds if 'Retry-After' header is missing
                     logger.warning(f"Rate limit exceeded. Retrying in {sleep_time} seconds.")
-                    sleep(sleep_time)
+                    self.rate_limiter.block(method, sleep_time)
                     attempts += 1
                     continue
                 else:
@@ -319,38 +373,25 @@ class ZIAClientHelper(ZIAClient):
             except requests.RequestException as e:
                 if attempts == 4:  # If it's the last attempt, raise the exception
                     logger.error(f"Failed to send {method} request to {url} after 5 attempts. Error: {str(e)}")
+                    self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
                     raise e
                 else:
                     logger.warning(f"Failed to send {method} request to {url}. Retrying... Error: {str(e)}")
                     attempts += 1
                     sleep(5)  # Sleep for 5 seconds before retrying
+            except BaseException as e:
+                self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
+                raise
 
-        # If Non-GET call, clear the
+        self.hooks.emit(REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time)
+        # Drop the cached reads made stale by a write
         if method != "GET":
-            self.cache.delete(cache_key)
+            self.cache.invalidate(cache_key, ZIA_CACHE_DEPENDENCIES)
 
-        # Detailed logging for request and response
-        try:
-            response_data = resp.json()
-        except ValueError:  # Using ValueError for JSON decoding errors
-            response_data = resp.text
-        # check if call was succesful
-        if 200 > resp.status_code or resp.status_code > 299:
-            # create errors
-            try:
-                error = ZscalerAPIError(url, resp, response_data)
-                if self.fail_safe:
-                    raise ZscalerAPIException(url, resp, response_data)
-            except ZscalerAPIException:
-                raise
-            except Exception:
-                error = HTTPError(url, resp, response_data)
-                if self.fail_safe:
-                    logger.error(response_data)
-                    raise HTTPException(url, resp, response_data)
-            logger.error(error)
+        self._check_response(url, resp)
         # Cache the response if it's a successful GET request
         if method == "GET" and resp.status_code == 200:
+            resp = CachedResponse.from_response(resp)
             self.cache.add(cache_key, resp)
         return resp
 
@@ -365,39 +406,24 @@ class ZIAClientHelper(ZIAClient):
         - Response: Response object from the request.
         """
 
-        # Use rate limiter before making a request
-        should_wait, delay = self.rate_limiter.wait("GET")
-        if should_wait:
-            time.sleep(delay)
-
-        # Now proceed with sending the request
         resp = self.send("GET", path, json, params)
-        formatted_resp = format_json_response(resp, box_attrs=dict())
+        formatted_resp = format_json_response(resp, box_attrs=dict(), output=self.output)
         return formatted_resp
 
     def put(self, path, json=None, params=None):
-        should_wait, delay = self.rate_limiter.wait("PUT")
-        if should_wait:
-            time.sleep(delay)
         resp = self.send("PUT", path, json, params)
-        formatted_resp = format_json_response(resp, box_attrs=dict())
+        formatted_resp = format_json_response(resp, box_attrs=dict(), output=self.output)
         return formatted_resp
 
     def post(self, path, json=None, params=None, data=None, headers=None, parse_json=True):
-        should_wait, delay = self.rate_limiter.wait("POST")
-        if should_wait:
-            time.sleep(delay)
         resp = self.send("POST", path, json, params, data=data, headers=headers)
         if parse_json:
-            formatted_resp = format_json_response(resp, box_attrs=dict())
+            formatted_resp = format_json_response(resp, box_attrs=dict(), output=self.output)
             return formatted_resp
         else:
             return resp
 
     def delete(self, path, json=None, params=None):
-        should_wait, delay = self.rate_limiter.wait("DELETE")
-        if should_wait:
-            time.sleep(delay)
         return self.send("DELETE", path, json, params)
 
     def get_paginated_data(
@@ -415,6 +441,7 @@ class ZIAClientHelper(ZIAClient):
         location_id=None,  # VPN credentials for a specific location ID
         managed_by=None,  # VPN credentials managed by a given partner
         prefix=None,  # VPN credentials managed by a given partner
+        output=None,  # Output mode of the items, overriding the one of the client
     ):
         """
         Fetches paginated data from the API based on specified parameters and handles pagination.
@@ -432,294 +459,358 @@ class ZIAClientHelper(ZIAClient):
             location_id (int, optional): Retrieve VPN credentials for the specified location ID.
             managed_by (int, optional): Retrieve VPN credentials managed by the specified partner.
             prefix (int, optional): Retrieve VPN credentials managed by the specified partner.
+            output (str, optional): The output mode of the items, overriding the one of the client. See
+                :func:`zscaler.utils.format_payload`.
 
         Returns:
             tuple: A tuple containing:
-                - BoxList: A list of fetched items wrapped in a BoxList for easy access.
+                - BoxList: A list of fetched items wrapped in a BoxList for easy access, or a list in the
+                  `dict`, `raw` and `lazy` output modes.
                 - str: An error message if any occurred during the data fetching process.
         """
         logger = logging.getLogger(__name__)
 
-        ERROR_MESSAGES = {
-            "UNEXPECTED_STATUS": "Unexpected status code {status_code} received for page {page}.",
-            "EMPTY_RESULTS": "No results found for page {page}.",
-        }
-
-        # Initialize pagination parameters
-        params = {
-            "page": page if page is not None else 1,  # Start at page 1 if not specified
-            "pagesize": min(pagesize if pagesize is not None else 100, max_page_size),  # Apply max_page_size limit
-        }
-
-        # Add optional filters to the params if provided
-        if search:
-            params["search"] = search
-        if type:
-            params["type"] = type
-        if include_only_without_location is not None:
-            params["includeOnlyWithoutLocation"] = include_only_without_location
-        if location_id:
-            params["locationId"] = location_id
-        if managed_by:
-            params["managedBy"] = managed_by
-        if prefix:
-            params["prefix"] = prefix
+        params = self._pagination_params(
+            page=page,
+            pagesize=pagesize,
+            search=search,
+            max_page_size=max_page_size,
+            type=type,
+            include_only_without_location=include_only_without_location,
+            location_id=location_id,
+            managed_by=managed_by,
+            prefix=prefix,
+        )
 
+        output = resolve_output(output, self.output)
         ret_data = []
-        total_collected = 0
 
         try:
-            while True:
-                # Apply rate-limiting if necessary
-                should_wait, delay = self.rate_limiter.wait("GET")
-                if should_wait:
-                    time.sleep(delay)
-
-                # Send the request to the API
-                response = self.send("GET", path=path, params=params)
-
-                # Check for unexpected status code
-                if response.status_code != expected_status_code:
-                    error_msg = ERROR_MESSAGES["UNEXPECTED_STATUS"].format(
-                        status_code=response.status_code, page=params["page"]
-                    )
-                    logger.error(error_msg)
-                    return BoxList([]), error_msg
-
-                # Parse the response as a flat list of items
-                response_data = response.json()
-                if not isinstance(response_data, list):
-                    error_msg = ERROR_MESSAGES["EMPTY_RESULTS"].format(page=params["page"])
-                    logger.warn(error_msg)
-                    return BoxList([]), error_msg
-
-                data = convert_keys_to_snake(response_data)
-
+            for data in self._iter_pages(path, params, max_pages, expected_status_code):
                 # If searching for a specific item, stop if we find a match
                 if search:
                     for item in data:
                         if item.get("name") == search:
                             ret_data.append(item)
-                            return BoxList(ret_data), None
+                            return format_payload(ret_data, output), None
 
                 # Limit data collection based on max_items
                 if max_items is not None:
-                    data = data[: max_items - total_collected]  # Limit items on the current page
+                    data = data[: max_items - len(ret_data)]  # Limit items on the current page
                 ret_data.extend(data)
-                total_collected += len(data)
 
-                # Check if we've reached max_items or max_pages limits
-                if (max_items is not None and total_collected >= max_items) or (
-                    max_pages is not None and params["page"] >= max_pages
-                ):
+                # Check if we've reached max_items
+                if max_items is not None and len(ret_data) >= max_items:
                     break
+        except ValueError as e:
+            logger.error(str(e))
+            return format_payload([], output), str(e)
 
-                # Stop if we've processed all available pages (i.e., less than requested page size)
-                if len(data) < params["pagesize"]:
-                    break
+        if not ret_data:
+            error_msg = self.ERROR_MESSAGES["EMPTY_RESULTS"].format(page=params["page"])
+            logger.warn(error_msg)
+            return format_payload([], output), error_msg
 
-                # Move to the next page
-                params["page"] += 1
+        return format_payload(ret_data, output), None
 
-        finally:
-            time.sleep(2)  # Ensure a delay between requests regardless of outcome
+    def _iter_pages(self, path, params, max_pages=None, expected_status_code=200):
+        """
+        Fetches the pages of a paginated listing one at a time, until a page is shorter than ``pagesize``.
 
-        if not ret_data:
-            error_msg = ERROR_MESSAGES["EMPTY_RESULTS"].format(page=params["page"])
-            logger.warn(error_msg)
-            return BoxList([]), error_msg
+        Yields:
+            list: The items of each page, as decoded.
+
+        Raises:
+            ValueError: If a page is returned with an unexpected status code or is not a list.
+        """
+        while True:
+            # Send the request to the API
+            response = self.send("GET", path=path, params=params)
+
+            # Check for unexpected status code
+            if response.status_code != expected_status_code:
+                raise ValueError(
+                    self.ERROR_MESSAGES["UNEXPECTED_STATUS"].format(status_code=response.status_code, page=params["page"])
+                )
+
+            # Parse the response as a flat list of items
+            response_data = codec.decode_response(response)
+            if not isinstance(response_data, list):
+                raise ValueError(self.ERROR_MESSAGES["EMPTY_RESULTS"].format(page=params["page"]))
+
+            yield response_data
+
+            # Check if we've reached max_pages, or processed all available pages (i.e., less than requested page size)
+            if (max_pages is not None and params["page"] >= max_pages) or len(response_data) < params["pagesize"]:
+                break
+
+            # Move to the next page
+            params["page"] += 1
+
+    def iter_paginated(self, path=None, expected_status_code=200, max_items=None, max_pages=None, output=None, **kwargs):
+        """
+        Lazily iterates over the items of a paginated ZIA listing. Pages are requested as the iteration
+        reaches them, so only one page is held in memory and breaking out of the loop stops further requests.
+
+        Accepts the same arguments as :meth:`get_paginated_data`.
+
+        Yields:
+            :obj:`Box`: Each item, with its keys converted to snake case, or in the given output mode.
 
-        return BoxList(ret_data), None
+        Raises:
+            ValueError: If a page is returned with an unexpected status code or is not a list.
 
-    @property
+        Examples:
+            >>> for user in zia.iter_paginated("/users", pagesize=1000):
+            ...     print(user.email)
+        """
+        params = self._pagination_params(**kwargs)
+        output = resolve_output(output, self.output)
+        collected = 0
+        for data in self._iter_pages(path, params, max_pages, expected_status_code):
+            for item in data:
+                if max_items is not None and collected >= max_items:
+                    return
+                collected += 1
+                yield format_payload(item, output)
+
+    @cached_property
     def admin_and_role_management(self):
         """
         The interface object for the :ref:`ZIA Admin and Role Management interface <zia-admin_and_role_management>`.
 
         """
+        from zscaler.zia.admin_and_role_management import AdminAndRoleManagementAPI
+
         return AdminAndRoleManagementAPI(self)
 
-    @property
+    @cached_property
     def apptotal(self):
         """
         The interface object for the :ref:`ZIA AppTotal interface <zia-apptotal>`.
 
         """
+        from zscaler.zia.apptotal import AppTotalAPI
+
         return AppTotalAPI(self)
 
-    @property
+    @cached_property
     def audit_logs(self):
         """
         The interface object for the :ref:`ZIA Admin Audit Logs interface <zia-audit_logs>`.
 
         """
+        from zscaler.zia.audit_logs import AuditLogsAPI
+
         return AuditLogsAPI(self)
 
-    @property
+    @cached_property
     def activate(self):
         """
         The interface object for the :ref:`ZIA Activation interface <zia-activate>`.
 
         """
+        from zscaler.zia.activate import ActivationAPI
+
         return ActivationAPI(self)
 
-    @property
+    @cached_property
     def dlp(self):
         """
         The interface object for the :ref:`ZIA DLP Dictionaries interface <zia-dlp>`.
 
 
         """
+        from zscaler.zia.dlp import DLPAPI
+
         return DLPAPI(self)
 
-    @property
+    @cached_property
     def firewall(self):
         """
         The interface object for the :ref:`ZIA Firewall Policies interface <zia-firewall>`.
 
         """
+        from zscaler.zia.firewall import FirewallPolicyAPI
+
         return FirewallPolicyAPI(self)
 
-    @property
+    @cached_property
     def forwarding_control(self):
         """
         The interface object for the :ref:`ZIA Forwarding Control Policies interface <zia-forwarding_control>`.
 
         """
+        from zscaler.zia.forwarding_control import ForwardingControlAPI
+
         return ForwardingControlAPI(self)
 
-    @property
+    @cached_property
     def labels(self):
         """
         The interface object for the :ref:`ZIA Rule Labels interface <zia-labels>`.
 
         """
+        from zscaler.zia.labels import RuleLabelsAPI
+
         return RuleLabelsAPI(self)
 
-    @property
+    @cached_property
     def device_management(self):
         """
         The interface object for the :ref:`ZIA device interface <zia-device_management>`.
 
         """
+        from zscaler.zia.device_management import DeviceManagementAPI
+
         return DeviceManagementAPI(self)
 
-    @property
+    @cached_property
     def locations(self):
         """
         The interface object for the :ref:`ZIA Locations interface <zia-locations>`.
 
         """
+        from zscaler.zia.locations import LocationsAPI
+
         return LocationsAPI(self)
 
-    @property
+    @cached_property
     def sandbox(self):
         """
         The interface object for the :ref:`ZIA Cloud Sandbox interface <zia-sandbox>`.
 
         """
+        from zscaler.zia.sandbox import CloudSandboxAPI
+
         return CloudSandboxAPI(self)
 
-    @property
+    @cached_property
     def security(self):
         """
         The interface object for the :ref:`ZIA Security Policy Settings interface <zia-security>`.
 
         """
+        from zscaler.zia.security import SecurityPolicyAPI
+
         return SecurityPolicyAPI(self)
 
-    @property
+    @cached_property
     def authentication_settings(self):
         """
         The interface object for the :ref:`ZIA Authentication Security Settings interface <zia-authentication_settings>`.
 
         """
+        from zscaler.zia.authentication_settings import AuthenticationSettingsAPI
+
         return AuthenticationSettingsAPI(self)
 
-    @property
+    @cached_property
     def ssl(self):
         """
         The interface object for the :ref:`ZIA SSL Inspection interface <zia-ssl_inspection>`.
 
         """
+        from zscaler.zia.ssl_inspection import SSLInspectionAPI
+
         return SSLInspectionAPI(self)
 
-    @property
+    @cached_property
     def traffic(self):
         """
         The interface object for the :ref:`ZIA Traffic Forwarding interface <zia-traffic>`.
 
         """
+        from zscaler.zia.traffic import TrafficForwardingAPI
+
         return TrafficForwardingAPI(self)
 
-    @property
+    @cached_property
     def url_categories(self):
         """
         The interface object for the :ref:`ZIA URL Categories interface <zia-url_categories>`.
 
         """
+        from zscaler.zia.url_categories import URLCategoriesAPI
+
         return URLCategoriesAPI(self)
 
-    @property
+    @cached_property
     def url_filtering(self):
         """
         The interface object for the :ref:`ZIA URL Filtering interface <zia-url_filtering>`.
 
         """
+        from zscaler.zia.url_filtering import URLFilteringAPI
+
         return URLFilteringAPI(self)
 
-    @property
+    @cached_property
     def cloudappcontrol(self):
         """
         The interface object for the :ref:`ZIA Cloud App Control <zia-cloudappcontrol>`.
 
         """
+        from zscaler.zia.cloudappcontrol import CloudAppControlAPI
+
         return CloudAppControlAPI(self)
 
-    @property
+    @cached_property
     def users(self):
         """
         The interface object for the :ref:`ZIA User Management interface <zia-users>`.
 
         """
+        from zscaler.zia.users import UserManagementAPI
+
         return UserManagementAPI(self)
 
-    @property
+    @cached_property
     def web_dlp(self):
         """
         The interface object for the :ref:`ZIA Web DLP interface <zia-web_dlp>`.
 
         """
+        from zscaler.zia.web_dlp import WebDLPAPI
+
         return WebDLPAPI(self)
 
-    @property
+    @cached_property
     def zpa_gateway(self):
         """
         The interface object for the :ref:`ZPA Gateway <zia-zpa_gateway>`.
 
         """
+        from zscaler.zia.zpa_gateway import ZPAGatewayAPI
+
         return ZPAGatewayAPI(self)
 
-    @property
+    @cached_property
     def isolation_profile(self):
         """
         The interface object for the :ref:`ZIA Cloud Browser Isolation Profile <zia-isolation_profile>`.
 
         """
+        from zscaler.zia.isolation_profile import IsolationProfileAPI
+
         return IsolationProfileAPI(self)
 
-    @property
+    @cached_property
     def workload_groups(self):
         """
         The interface object for the :ref:`ZIA Workload Groups <zia-workload_groups>`.
 
         """
+        from zscaler.zia.workload_groups import WorkloadGroupsAPI
+
         return WorkloadGroupsAPI(self)
 
-    @property
+    @cached_property
     def pac_files(self):
         """
         The interface object for the :ref:`ZIA Pac Files interface <zia-pac_files>`.
 
         """
+        from zscaler.zia.pac_files import PacFilesAPI
+
         return PacFilesAPI(self)
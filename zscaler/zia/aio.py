@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import asyncio
+import datetime
+import logging
+import time
+import uuid
+from functools import cached_property
+
+import aiohttp
+
+from zscaler import __version__, codec, profiling
+from zscaler.cache.cached_response import CachedResponse
+from zscaler.cache.refresh import AsyncBackgroundRefresher
+from zscaler.constants import MAX_RETRIES, ZIA_CACHE_DEPENDENCIES
+from zscaler.hooks import (
+    CACHE_HIT,
+    CACHE_MISS,
+    RATE_LIMIT_WAIT,
+    RATE_LIMITED,
+    REQUEST_END,
+    REQUEST_START,
+    RETRY,
+    TOKEN_REFRESH,
+)
+from zscaler.profiling import AUTH, NETWORK
+from zscaler.ratelimiter.ratelimiter import AsyncRateLimiter
+from zscaler.transport import aio
+from zscaler.transport.single_flight import AsyncSingleFlight
+from zscaler.utils import (
+    async_retry_with_backoff,
+    dump_request,
+    dump_response,
+    format_json_response,
+    format_payload,
+    resolve_output,
+)
+from zscaler.zia.client import ZIAClient
+from zscaler.zia.users import AsyncUserManagementAPI
+
+logger = logging.getLogger("zscaler-sdk-python")
+
+
+class AsyncZIAClientHelper(ZIAClient):
+    """
+    An asyncio Controller to access Endpoints in the Zscaler Internet Access (ZIA) API.
+
+    Accepts the same arguments as :class:`zscaler.zia.ZIAClientHelper`. Requests are sent through a pooled
+    :class:`aiohttp.ClientSession`, created on first use, and the authentication session is created lazily.
+    Use the client as an async context manager, or call :meth:`deauthenticate` and :meth:`aclose` when done.
+
+    Examples:
+        >>> async with AsyncZIAClientHelper(cloud="zscaler", api_key=key, username=user, password=pw) as zia:
+        ...     users = await zia.users.list_users()
+    """
+
+    _vendor = "Zscaler"
+    _product = "Zscaler Internet Access"
+    _build = __version__
+    _env_base = "ZIA"
+    url = "https://zsapi.zscaler.net/api/v1"
+    env_cloud = "zscaler"
+
+    def __init__(self, cloud, timeout=240, cache=None, fail_safe=False, **kw):
+        self._configure(cloud, timeout, cache, fail_safe, **kw)
+        self.async_rate_limiter = AsyncRateLimiter(self.rate_limiter)
+        self.single_flight = AsyncSingleFlight()
+        self.refresher = AsyncBackgroundRefresher()
+        self.session = kw.get("session")
+        self._session_options = dict(
+            pool_connections=kw.get("pool_connections"),
+            pool_maxsize=kw.get("pool_maxsize"),
+            keep_alive=kw.get("keep_alive", True),
+        )
+        self._auth_lock = None
+
+    async def __aenter__(self):
+        await self.authenticate()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        logger.debug("deauthenticating...")
+        await self.deauthenticate()
+        await self.aclose()
+
+    async def aclose(self):
+        """Closes the underlying session and its pooled connections."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    def _ensure_session(self):
+        if self.session is None or self.session.closed:
+            self.session = aio.build_async_session(timeout=self.timeout, **self._session_options)
+        return self.session
+
+    @async_retry_with_backoff(MAX_RETRIES)
+    async def authenticate(self):
+        """
+        Creates a ZIA authentication session.
+        """
+        start_time = time.time()
+        with profiling.phase(AUTH):
+            resp = await self.transport.request(
+                self._ensure_session(),
+                "POST",
+                self.url + "/authenticatedSession",
+                json=self._auth_payload(),
+                headers=self.headers,
+            )
+        self.hooks.emit(TOKEN_REFRESH, status_code=resp.status_code, start=start_time)
+        if resp.status_code > 299:
+            return resp
+        self.session_refreshed = datetime.datetime.now()
+        self.session_id = self.extractJSessionIDFromHeaders(resp.headers)
+        self.auth_details = resp.json()
+        return resp
+
+    async def _ensure_authenticated(self):
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        async with self._auth_lock:
+            if self.is_session_expired():
+                logger.warning("The provided sesion expired. Refreshing...")
+                await self.authenticate()
+
+    async def deauthenticate(self):
+        """
+        Ends the ZIA authentication session.
+        """
+        if self.session_id is None:
+            return False
+        headers = self.headers.copy()
+        headers.update({"Cookie": f"JSESSIONID={self.session_id}"})
+        try:
+            response = await self.transport.request(
+                self._ensure_session(), "DELETE", self.url + "/authenticatedSession", headers=headers
+            )
+        except aiohttp.ClientError:
+            return False
+        if response.status_code == 204:
+            self.session_id = None
+            self.auth_details = None
+            return True
+        return False
+
+    async def send(self, method, path, json=None, params=None, data=None, headers=None):
+        """
+        Sends a request, sharing the response of a GET request already in flight for the same resource
+        instead of sending it again. See :class:`~zscaler.transport.single_flight.SingleFlight`.
+        """
+        if method != "GET" or json is not None or data is not None or headers is not None:
+            return await self._send(method, path, json, params, data=data, headers=headers)
+        key = self.cache.create_key(self._resolve_url(path), params)
+        return await self.single_flight.do(key, lambda: self._send(method, path, json, params, data=data, headers=headers))
+
+    async def _send(self, method, path, json=None, params=None, data=None, headers=None, use_cache=True):
+        """
+        Send a request to the ZIA API.
+
+        Returns:
+            :obj:`requests.Response`: The response, built from the aiohttp response.
+        """
+        is_sandbox = "zscsb" in path
+        url = self._resolve_url(path)
+        profiling.set_endpoint(url)
+        start_time = time.time()
+        request_uuid = uuid.uuid4()
+        request_headers = self.headers.copy()
+        if headers is not None:
+            request_headers.update(headers)
+        body, request_headers = codec.encode_request(json, request_headers)
+        dump_request(logger, url, method, body, params, request_headers, request_uuid, body=not is_sandbox)
+
+        self.hooks.emit(REQUEST_START, method=method, url=url)
+        cache_key = self.cache.create_key(url, params)
+        cached = method == "GET" and use_cache and self.cache.contains(cache_key)
+        # None if another thread evicted or invalidated the entry since it was found
+        resp = self.cache.get(cache_key) if cached else None
+        if resp is not None:
+            self.hooks.emit(CACHE_HIT, method=method, url=url)
+            self.refresher.refresh_stale(
+                self.cache,
+                cache_key,
+                lambda params: self._send(method, path, json, params, data=data, headers=headers, use_cache=False),
+                params,
+            )
+            dump_response(
+                logger=logger,
+                url=url,
+                method=method,
+                params=params,
+                resp=resp,
+                request_uuid=request_uuid,
+                start_time=start_time,
+                from_cache=True,
+            )
+            self.hooks.emit(
+                REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time, from_cache=True
+            )
+            return resp
+        if method == "GET" and use_cache and self.cache.enabled:
+            self.hooks.emit(CACHE_MISS, method=method, url=url)
+
+        attempts = 0
+        while attempts < 5:
+            if attempts:
+                self.hooks.emit(RETRY, method=method, url=url, attempt=attempts + 1)
+            try:
+                await self._ensure_authenticated()
+                waited = await self.async_rate_limiter.acquire(method)
+                if waited:
+                    self.hooks.emit(RATE_LIMIT_WAIT, method=method, url=url, duration=waited)
+                request_headers["Cookie"] = f"JSESSIONID={self.session_id}"
+                with profiling.phase(NETWORK):
+                    resp = await self.transport.request(
+                        self._ensure_session(),
+                        method,
+                        url,
+                        data=body if body is not None else data,
+                        params=params,
+                        headers=request_headers,
+                    )
+                dump_response(
+                    logger=logger,
+                    url=url,
+                    params=params,
+                    method=method,
+                    resp=resp,
+                    request_uuid=request_uuid,
+                    start_time=start_time,
+                )
+                self.async_rate_limiter.update_limits(resp.headers, method)
+                if resp.status_code == 429:
+                    self.hooks.emit(RATE_LIMITED, method=method, url=url, status_code=429, attempt=attempts + 1)
+                    sleep_time = int(resp.headers.get("Retry-After", 2))
+                    logger.warning(f"Rate limit exceeded. Retrying in {sleep_time} seconds.")
+                    self.async_rate_limiter.block(method, sleep_time)
+                    attempts += 1
+                    continue
+                else:
+                    break
+            except aiohttp.ClientError as e:
+                if attempts == 4:
+                    logger.error(f"Failed to send {method} request to {url} after 5 attempts. Error: {str(e)}")
+                    self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
+                    raise e
+                else:
+                    logger.warning(f"Failed to send {method} request to {url}. Retrying... Error: {str(e)}")
+                    attempts += 1
+                    await asyncio.sleep(5)
+            except BaseException as e:
+                self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
+                raise
+
+        self.hooks.emit(REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time)
+        if method != "GET":
+            self.cache.invalidate(cache_key, ZIA_CACHE_DEPENDENCIES)
+
+        self._check_response(url, resp)
+        if method == "GET" and resp.status_code == 200:
+            resp = CachedResponse.from_response(resp)
+            self.cache.add(cache_key, resp)
+        return resp
+
+    async def get(self, path, json=None, params=None):
+        resp = await self.send("GET", path, json, params)
+        return format_json_response(resp, box_attrs=dict(), output=self.output)
+
+    async def put(self, path, json=None, params=None):
+        resp = await self.send("PUT", path, json, params)
+        return format_json_response(resp, box_attrs=dict(), output=self.output)
+
+    async def post(self, path, json=None, params=None, data=None, headers=None, parse_json=True):
+        resp = await self.send("POST", path, json, params, data=data, headers=headers)
+        if parse_json:
+            return format_json_response(resp, box_attrs=dict(), output=self.output)
+        return resp
+
+    async def delete(self, path, json=None, params=None):
+        return await self.send("DELETE", path, json, params)
+
+    async def _pages(self, path, params, max_pages=None, expected_status_code=200):
+        """
+        Yields the items of each page of a paginated listing, raising ``ValueError`` on an unexpected response.
+        """
+        while True:
+            response = await self.send("GET", path=path, params=dict(params))
+            if response.status_code != expected_status_code:
+                raise ValueError(f"Unexpected status code {response.status_code} received for page {params['page']}.")
+
+            response_data = codec.decode_response(response)
+            if not isinstance(response_data, list):
+                raise ValueError(f"No results found for page {params['page']}.")
+
+            yield response_data
+
+            if (max_pages is not None and params["page"] >= max_pages) or len(response_data) < params["pagesize"]:
+                break
+            params["page"] += 1
+
+    async def iter_paginated(self, path=None, max_items=None, max_pages=None, output=None, **kwargs):
+        """
+        Asynchronously iterates over the items of a paginated ZIA listing, fetching pages as they are consumed.
+
+        Accepts the same filters as :meth:`get_paginated_data`.
+
+        Examples:
+            >>> async for user in zia.iter_paginated("users"):
+            ...     print(user.name)
+        """
+        kwargs.pop("expected_status_code", None)
+        params = self._pagination_params(**kwargs)
+        output = resolve_output(output, self.output)
+        collected = 0
+        async for data in self._pages(path, params, max_pages=max_pages):
+            for item in data:
+                if max_items is not None and collected >= max_items:
+                    return
+                collected += 1
+                yield format_payload(item, output)
+
+    async def get_paginated_data(
+        self, path=None, expected_status_code=200, max_items=None, max_pages=None, output=None, **kwargs
+    ):
+        """
+        Fetches all pages of a ZIA listing. Accepts the same arguments as
+        :meth:`zscaler.zia.ZIAClientHelper.get_paginated_data`.
+
+        Returns:
+            tuple: A tuple containing the fetched items as a :obj:`BoxList`, or a list in the ``dict``, ``raw``
+            and ``lazy`` output modes, and an error message, if any.
+        """
+        params = self._pagination_params(**kwargs)
+        search = kwargs.get("search")
+        output = resolve_output(output, self.output)
+        ret_data = []
+        try:
+            async for data in self._pages(path, params, max_pages, expected_status_code):
+                if search:
+                    match = next((item for item in data if item.get("name") == search), None)
+                    if match is not None:
+                        return format_payload([match], output), None
+                ret_data.extend(data[: max_items - len(ret_data)] if max_items is not None else data)
+                if max_items is not None and len(ret_data) >= max_items:
+                    break
+        except ValueError as e:
+            logger.error(str(e))
+            return format_payload([], output), str(e)
+
+        if not ret_data:
+            error_msg = f"No results found for page {params['page']}."
+            logger.warning(error_msg)
+            return format_payload([], output), error_msg
+        return format_payload(ret_data, output), None
+
+    @cached_property
+    def users(self):
+        """
+        The asyncio interface object for the :ref:`ZIA User Management interface <zia-users>`.
+
+        """
+        return AsyncUserManagementAPI(self)
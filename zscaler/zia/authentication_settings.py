@@ -39,7 +39,7 @@ class AuthenticationSettingsAPI:
 
         # Ensure the correct attribute key is used in the response check.
         if "urls" in response:
-            return response.urls
+            return response["urls"]
         else:
             return BoxList()
 
@@ -67,7 +67,7 @@ class AuthenticationSettingsAPI:
         else:
             # Handle case where resp is a Box object
             if "urls" in resp:
-                return resp.urls
+                return resp["urls"]
             else:
                 return BoxList()  # Return empty list if no URLs are present
 
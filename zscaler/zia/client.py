@@ -14,11 +14,234 @@
 # ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
+import datetime
+import logging
+import os
+import re
+
+from zscaler import codec
+from zscaler.cache.no_op_cache import NoOpCache
+from zscaler.cache.refresh import BackgroundRefresher
+from zscaler.cache.zscaler_cache import build_cache
+from zscaler.errors.http_error import HTTPError, ZscalerAPIError
+from zscaler.exceptions.exceptions import HTTPException, ZscalerAPIException
+from zscaler.hooks import Hooks
+from zscaler.logger import ensure_logging
+from zscaler.metrics import build_metrics
+from zscaler.profiling import Profiler
+from zscaler.ratelimiter.ratelimiter import build_rate_limiter, rate_limit_key
+from zscaler.transport.backends import build_transport
+from zscaler.transport.single_flight import SingleFlight
+from zscaler.user_agent import UserAgent
+from zscaler.utils import obfuscate_api_key, validate_output
+
+logger = logging.getLogger("zscaler-sdk-python")
+
 
 class ZIAClient:
     def __init__():
         pass
 
+    def _configure(self, cloud, timeout, cache, fail_safe, **kw):
+        """
+        Sets up the credentials, API URL, rate limiter, cache and session state of a client. Shared by the
+        synchronous and asyncio clients.
+        """
+        ensure_logging()
+        self.api_key = kw.get("api_key", os.getenv(f"{self._env_base}_API_KEY"))
+        self.username = kw.get("username", os.getenv(f"{self._env_base}_USERNAME"))
+        self.password = kw.get("password", os.getenv(f"{self._env_base}_PASSWORD"))
+        # The 'cloud' parameter should have precedence over environment variables
+        self.env_cloud = cloud or kw.get("cloud") or os.getenv(f"{self._env_base}_CLOUD")
+        if not self.env_cloud:
+            raise ValueError(
+                f"Cloud environment must be set via the 'cloud' argument or the {self._env_base}_CLOUD environment variable."
+            )
+
+        # URL construction
+        if cloud == "zspreview":
+            self.url = f"https://admin.{self.env_cloud}.net/api/v1"
+        else:
+            # Use override URL if provided, else construct the URL
+            self.url = (
+                kw.get("override_url")
+                or os.getenv(f"{self._env_base}_OVERRIDE_URL")
+                or f"https://zsapi.{self.env_cloud}.net/api/v1"
+            )
+
+        self.conv_box = True
+        self.output = validate_output(kw.get("output", "box"))
+        self.sandbox_token = kw.get("sandbox_token") or os.getenv(f"{self._env_base}_SANDBOX_TOKEN")
+        self.timeout = timeout
+        self.fail_safe = fail_safe
+        cache_enabled = os.environ.get("ZSCALER_CLIENT_CACHE_ENABLED", "false").lower() == "true"
+        if cache is None:
+            if cache_enabled:
+                ttl = int(os.environ.get("ZSCALER_CLIENT_CACHE_DEFAULT_TTL", 3600))
+                tti = int(os.environ.get("ZSCALER_CLIENT_CACHE_DEFAULT_TTI", 1800))
+                self.cache = build_cache(ttl=ttl, tti=tti)
+            else:
+                self.cache = NoOpCache()
+        else:
+            self.cache = cache
+        self.single_flight = SingleFlight()
+        self.hooks = (kw.get("hooks") or Hooks()).bind("zia")
+        self.metrics = build_metrics(kw.get("metrics"), self.hooks)
+        self.refresher = BackgroundRefresher()
+        self.transport = build_transport(kw.get("transport"))
+        # Initialize user-agent
+        ua = UserAgent()
+        self.user_agent = ua.get_user_agent_string()
+        # Initialize rate limiter
+        # You may want to adjust these parameters as per your rate limit configuration
+        self.rate_limiter = build_rate_limiter(
+            get_limit=2,  # Adjust as per actual limit
+            post_put_delete_limit=2,  # Adjust as per actual limit
+            get_freq=2,  # Adjust as per actual frequency (in seconds)
+            post_put_delete_freq=2,  # Adjust as per actual frequency (in seconds)
+            key=rate_limit_key("zia", self.url, self.api_key),
+            store=kw.get("rate_limit_store"),
+        )
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "User-Agent": self.user_agent,
+        }
+        self.session_timeout_offset = datetime.timedelta(minutes=5)
+        self.session_refreshed = None
+        self.auth_details = None
+        self.session_id = None
+
+    def extractJSessionIDFromHeaders(self, header):
+        session_id_str = header.get("Set-Cookie", "")
+
+        if not session_id_str:
+            raise ValueError("no Set-Cookie header received")
+
+        regex = re.compile(r"JSESSIONID=(.*?);")
+        result = regex.search(session_id_str)
+
+        if not result:
+            raise ValueError("couldn't find JSESSIONID in header value")
+
+        return result.group(1)
+
+    def is_session_expired(self):
+        # Read once, as another thread may end or replace the session meanwhile
+        auth_details = self.auth_details
+        if auth_details is None:
+            return True
+        now = datetime.datetime.now()
+        if auth_details["passwordExpiryTime"] > 0 and (self.session_refreshed - self.session_timeout_offset < now):
+            return True
+        return False
+
+    def profile(self, cprofile=False):
+        """
+        Returns a :class:`~zscaler.profiling.Profiler` timing the phases of the calls made in its ``with``
+        block per endpoint: logins, rate limiter waits, requests, JSON decoding, key conversion and Box
+        construction.
+
+        Args:
+            cprofile (bool): Whether to also record a :mod:`cProfile` function profile of the block.
+
+        Examples:
+            >>> with zia.profile() as prof:
+            ...     zia.users.list_users()
+            >>> print(prof.report())
+        """
+        return Profiler(cprofile=cprofile)
+
+    def _resolve_url(self, path: str):
+        """
+        Builds the full request URL for a ZIA API path. Sandbox (``zscsb``) paths are sent to the
+        Cloud Sandbox API host. Shared by the synchronous and asyncio clients.
+        """
+        api = self.url
+        if "zscsb" in path:
+            api = f"https://csbapi.{self.env_cloud}.net"
+        return f"{api}/{path.lstrip('/')}"
+
+    def _auth_payload(self):
+        """
+        Builds the body of the ``/authenticatedSession`` request, obfuscating the API key.
+        """
+        api_obf = obfuscate_api_key(list(self.api_key))
+        return {
+            "apiKey": api_obf["key"],
+            "username": self.username,
+            "password": self.password,
+            "timestamp": api_obf["timestamp"],
+        }
+
+    def _check_response(self, url: str, resp):
+        """
+        Logs and, when ``fail_safe`` is enabled, raises the error of a non-2xx response. Successful
+        responses are left undecoded: their body is decoded once, when it is formatted.
+
+        Returns:
+            The decoded body of an error response, or its raw text if it is not JSON. None on success.
+        """
+        # check if call was succesful
+        if 200 <= resp.status_code <= 299:
+            return None
+        try:
+            response_data = codec.decode_response(resp)
+        except ValueError:  # Using ValueError for JSON decoding errors
+            response_data = resp.text
+        # create errors
+        try:
+            error = ZscalerAPIError(url, resp, response_data)
+            if self.fail_safe:
+                raise ZscalerAPIException(url, resp, response_data)
+        except ZscalerAPIException:
+            raise
+        except Exception:
+            error = HTTPError(url, resp, response_data)
+            if self.fail_safe:
+                logger.error(response_data)
+                raise HTTPException(url, resp, response_data)
+        logger.error(error)
+        return response_data
+
+    def _pagination_params(
+        self,
+        page=None,
+        pagesize=None,
+        search=None,
+        max_page_size=1000,
+        type=None,
+        include_only_without_location=None,
+        location_id=None,
+        managed_by=None,
+        prefix=None,
+    ):
+        """
+        Builds the query parameters of a paginated ZIA listing. Shared by the synchronous and asyncio clients.
+
+        Returns:
+            dict: The query parameters, starting at ``page`` (default 1) with 100 items per page unless specified.
+        """
+        params = {
+            "page": page if page is not None else 1,  # Start at page 1 if not specified
+            "pagesize": min(pagesize if pagesize is not None else 100, max_page_size),  # Apply max_page_size limit
+        }
+
+        # Add optional filters to the params if provided
+        if search:
+            params["search"] = search
+        if type:
+            params["type"] = type
+        if include_only_without_location is not None:
+            params["includeOnlyWithoutLocation"] = include_only_without_location
+        if location_id:
+            params["locationId"] = location_id
+        if managed_by:
+            params["managedBy"] = managed_by
+        if prefix:
+            params["prefix"] = prefix
+        return params
+
     def get(self, path: str, json=None, params=None, fail_safe: bool = False):
         """
         Send a GET request to the ZIA API.
@@ -28,7 +251,6 @@ class ZIAClient:
         - params (dict): the query params
         """
         pass
-        pass
 
     def get_paginated_data(
         self,
@@ -17,6 +17,7 @@
 
 from box import BoxList
 
+from zscaler.utils import get_field
 from zscaler.zia import ZIAClient
 
 
@@ -39,10 +40,8 @@ class SecurityPolicyAPI:
         response = self.rest.get("security")
 
         # ZIA removes the whitelistUrls key from the JSON response when it's empty.
-        if "whitelist_urls" in self.rest.get("security"):
-            return response.whitelist_urls
-        else:
-            return BoxList()  # Return empty list so other methods in this class don't break
+        # Return empty list so other methods in this class don't break
+        return get_field(response, "whitelist_urls", BoxList())
 
     def get_blacklist(self) -> BoxList:
         """
@@ -57,7 +56,7 @@ class SecurityPolicyAPI:
 
         """
 
-        return self.rest.get("security/advanced").blacklist_urls
+        return get_field(self.rest.get("security/advanced"), "blacklist_urls")
 
     def erase_whitelist(self) -> int:
         """
@@ -92,7 +91,7 @@ class SecurityPolicyAPI:
 
         payload = {"whitelistUrls": url_list}
 
-        return self.rest.put("security", json=payload).whitelist_urls
+        return get_field(self.rest.put("security", json=payload), "whitelist_urls")
 
     def add_urls_to_whitelist(self, url_list: list) -> BoxList:
         """
@@ -118,7 +117,7 @@ class SecurityPolicyAPI:
 
         payload = {"whitelistUrls": whitelist}
 
-        return self.rest.put("security", json=payload).whitelist_urls
+        return get_field(self.rest.put("security", json=payload), "whitelist_urls")
 
     def delete_urls_from_whitelist(self, url_list: list) -> BoxList:
         """
@@ -143,7 +142,7 @@ class SecurityPolicyAPI:
 
         payload = {"whitelistUrls": whitelist}
 
-        return self.rest.put("security", json=payload).whitelist_urls
+        return get_field(self.rest.put("security", json=payload), "whitelist_urls")
 
     def add_urls_to_blacklist(self, url_list: list) -> BoxList:
         """
@@ -199,7 +198,7 @@ class SecurityPolicyAPI:
 
         payload = {"blacklistUrls": url_list}
 
-        return self.rest.put("security/advanced", json=payload).blacklist_urls
+        return get_field(self.rest.put("security/advanced", json=payload), "blacklist_urls")
 
     def erase_blacklist(self) -> int:
         """
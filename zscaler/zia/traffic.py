@@ -18,7 +18,7 @@
 from box import Box, BoxList
 from requests import Response
 
-from zscaler.utils import Iterator, convert_keys, snake_to_camel
+from zscaler.utils import Iterator, convert_keys, snake_to_camel, collect_items
 from zscaler.zia import ZIAClient
 
 
@@ -58,7 +58,7 @@ class TrafficForwardingAPI:
             ...    print(tunnel)
 
         """
-        return BoxList(Iterator(self.rest, "greTunnels", **kwargs))
+        return collect_items(Iterator(self.rest, "greTunnels", **kwargs), self.rest.output)
 
     def get_gre_tunnel(self, tunnel_id: str) -> Box:
         """
@@ -259,7 +259,7 @@ class TrafficForwardingAPI:
             ...    print(vip)
 
         """
-        return BoxList(Iterator(self.rest, "vips", **kwargs))
+        return collect_items(Iterator(self.rest, "vips", **kwargs), self.rest.output)
 
     def add_gre_tunnel(
         self,
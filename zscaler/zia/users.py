@@ -15,6 +15,8 @@
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
 
+from typing import Iterator
+
 from box import Box, BoxList
 
 from zscaler.utils import convert_keys, snake_to_camel
@@ -72,6 +74,22 @@ class UserManagementAPI:
         list, _ = self.rest.get_paginated_data(path="/departments", **kwargs)
         return list
 
+    def iter_departments(self, **kwargs) -> Iterator[Box]:
+        """
+        Lazily iterates over all departments, requesting one page at a time.
+
+        Accepts the same arguments as :meth:`list_departments`. Breaking out of the loop stops further requests.
+
+        Yields:
+            :obj:`Box`: The resource record for each department.
+
+        Examples:
+            >>> for dept in zia.users.iter_departments(pagesize=1000):
+            ...    print(dept.name)
+
+        """
+        return self.rest.iter_paginated(path="/departments", **kwargs)
+
     def get_department(self, department_id: str) -> Box:
         """
         Returns the department details for a given department.
@@ -89,8 +107,7 @@ class UserManagementAPI:
         return self.rest.get(f"departments/{department_id}")
 
     def get_dept_by_name(self, name):
-        depts = self.list_departments()
-        for dept in depts:
+        for dept in self.iter_departments():
             if dept.get("name") == name:
                 return dept
         return None
@@ -131,6 +148,22 @@ class UserManagementAPI:
         list, _ = self.rest.get_paginated_data(path="/groups", **kwargs)
         return list
 
+    def iter_groups(self, **kwargs) -> Iterator[Box]:
+        """
+        Lazily iterates over all user groups, requesting one page at a time.
+
+        Accepts the same arguments as :meth:`list_groups`. Breaking out of the loop stops further requests.
+
+        Yields:
+            :obj:`Box`: The resource record for each group.
+
+        Examples:
+            >>> for group in zia.users.iter_groups(pagesize=1000):
+            ...    print(group.name)
+
+        """
+        return self.rest.iter_paginated(path="/groups", **kwargs)
+
     def get_group(self, group_id: str) -> Box:
         """
         Returns the user group details for a given user group.
@@ -148,8 +181,7 @@ class UserManagementAPI:
         return self.rest.get(f"groups/{group_id}")
 
     def get_group_by_name(self, name):
-        groups = self.list_groups()
-        for group in groups:
+        for group in self.iter_groups():
             if group.get("name") == name:
                 return group
         return None
@@ -199,6 +231,22 @@ class UserManagementAPI:
         list, _ = self.rest.get_paginated_data(path="/users", **kwargs)
         return list
 
+    def iter_users(self, **kwargs) -> Iterator[Box]:
+        """
+        Lazily iterates over all users, requesting one page at a time.
+
+        Accepts the same arguments as :meth:`list_users`. Breaking out of the loop stops further requests.
+
+        Yields:
+            :obj:`Box`: The resource record for each user.
+
+        Examples:
+            >>> for user in zia.users.iter_users(pagesize=1000):
+            ...    print(user.name)
+
+        """
+        return self.rest.iter_paginated(path="/users", **kwargs)
+
     def add_user(self, name: str, email: str, groups: list, department: dict, **kwargs) -> Box:
         """
         Creates a new ZIA user.
@@ -356,13 +404,17 @@ class UserManagementAPI:
             ...      comment='External auditor.')
 
         """
-        payload = convert_keys(self.get_user(user_id))
+        payload = self._update_user_payload(self.get_user(user_id), kwargs)
+        return self.rest.put(f"users/{user_id}", json=payload)
+
+    @staticmethod
+    def _update_user_payload(current, kwargs):
+        payload = convert_keys(current)
 
         # Add optional parameters to payload
         for key, value in kwargs.items():
             payload[snake_to_camel(key)] = value
-
-        return self.rest.put(f"users/{user_id}", json=payload)
+        return payload
 
     def delete_user(self, user_id: str) -> int:
         """
@@ -379,3 +431,56 @@ class UserManagementAPI:
         """
         response = self.rest.delete(f"users/{user_id}")
         return response.status_code
+
+
+class AsyncUserManagementAPI(UserManagementAPI):
+    """
+    asyncio counterpart of :class:`UserManagementAPI`, returned by :attr:`zscaler.zia.aio.AsyncZIAClientHelper.users`.
+    Every method is a coroutine; methods issuing a single request, such as :meth:`get_group`, are inherited and
+    return awaitables.
+
+    Examples:
+        >>> users = await zia.users.list_users()
+    """
+
+    async def list_departments(self, **kwargs) -> BoxList:
+        list, _ = await self.rest.get_paginated_data(path="/departments", **kwargs)
+        return list
+
+    async def get_dept_by_name(self, name):
+        async for dept in self.rest.iter_paginated(path="/departments"):
+            if dept.get("name") == name:
+                return dept
+        return None
+
+    async def list_groups(self, **kwargs) -> BoxList:
+        list, _ = await self.rest.get_paginated_data(path="/groups", **kwargs)
+        return list
+
+    async def get_group_by_name(self, name):
+        async for group in self.rest.iter_paginated(path="/groups"):
+            if group.get("name") == name:
+                return group
+        return None
+
+    async def list_users(self, **kwargs) -> BoxList:
+        list, _ = await self.rest.get_paginated_data(path="/users", **kwargs)
+        return list
+
+    async def get_user(self, user_id: str = None, email: str = None) -> Box:
+        if user_id and email:
+            raise ValueError("TOO MANY ARGUMENTS: Expected either a user_id or an email. Both were provided.")
+
+        elif email:
+            user = (record for record in await self.list_users(search=email) if record.email == email)
+            return next(user, None)
+
+        return await self.rest.get(f"users/{user_id}")
+
+    async def update_user(self, user_id: str, **kwargs) -> Box:
+        payload = self._update_user_payload(await self.get_user(user_id), kwargs)
+        return await self.rest.put(f"users/{user_id}", json=payload)
+
+    async def delete_user(self, user_id: str) -> int:
+        response = await self.rest.delete(f"users/{user_id}")
+        return response.status_code
@@ -1,63 +1,78 @@
+import contextvars
 import logging
-import os
+import math
 import time
 import urllib.parse
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from time import sleep
 
 import requests
-from box import BoxList
-
-from zscaler import __version__
-from zscaler.cache.no_op_cache import NoOpCache
-from zscaler.cache.zscaler_cache import ZscalerCache
-from zscaler.constants import ZPA_BASE_URLS, DEV_AUTH_URL, MAX_RETRIES
-from zscaler.errors.http_error import HTTPError, ZscalerAPIError
-from zscaler.exceptions.exceptions import HTTPException, ZscalerAPIException
-from zscaler.logger import setup_logging
-from zscaler.ratelimiter.ratelimiter import RateLimiter
+
+from zscaler import __version__, codec, profiling
+from zscaler.cache.cached_response import CachedResponse
+from zscaler.constants import DEV_AUTH_URL, MAX_RETRIES, ZPA_CACHE_DEPENDENCIES
+from zscaler.lazy import lazy_attributes
+from zscaler.hooks import (
+    CACHE_HIT,
+    CACHE_MISS,
+    RATE_LIMIT_WAIT,
+    RATE_LIMITED,
+    REQUEST_END,
+    REQUEST_START,
+    RETRY,
+    TOKEN_REFRESH,
+)
+from zscaler.profiling import AUTH, NETWORK
+from zscaler.transport.session import build_session
+from zscaler.transport.tokens import TokenRefresher
 from zscaler.user_agent import UserAgent
 from zscaler.utils import (
-    convert_keys_to_snake,
     dump_request,
     dump_response,
     format_json_response,
-    is_token_expired,
+    format_payload,
+    resolve_output,
     retry_with_backoff,
-    snake_to_camel,
 )
-from zscaler.zpa.authdomains import AuthDomainsAPI
-from zscaler.zpa.app_segments import ApplicationSegmentAPI
-from zscaler.zpa.app_segments_inspection import AppSegmentsInspectionAPI
-from zscaler.zpa.app_segments_pra import AppSegmentsPRAAPI
-from zscaler.zpa.certificates import CertificatesAPI
 from zscaler.zpa.client import ZPAClient
-from zscaler.zpa.cloud_connector_groups import CloudConnectorGroupsAPI
-from zscaler.zpa.connectors import AppConnectorControllerAPI
-from zscaler.zpa.emergency_access import EmergencyAccessAPI
-from zscaler.zpa.idp import IDPControllerAPI
-from zscaler.zpa.inspection import InspectionControllerAPI
-from zscaler.zpa.isolation import IsolationAPI
-from zscaler.zpa.lss import LSSConfigControllerAPI
-from zscaler.zpa.machine_groups import MachineGroupsAPI
-from zscaler.zpa.microtenants import MicrotenantsAPI
-from zscaler.zpa.policies import PolicySetsAPI
-from zscaler.zpa.posture_profiles import PostureProfilesAPI
-from zscaler.zpa.privileged_remote_access import PrivilegedRemoteAccessAPI
-from zscaler.zpa.provisioning import ProvisioningKeyAPI
-from zscaler.zpa.saml_attributes import SAMLAttributesAPI
-from zscaler.zpa.scim_attributes import ScimAttributeHeaderAPI
-from zscaler.zpa.scim_groups import SCIMGroupsAPI
-from zscaler.zpa.segment_groups import SegmentGroupsAPI
-from zscaler.zpa.server_groups import ServerGroupsAPI
-from zscaler.zpa.servers import AppServersAPI
-from zscaler.zpa.service_edges import ServiceEdgesAPI
-from zscaler.zpa.trusted_networks import TrustedNetworksAPI
-
-# Setup the logger
-setup_logging(logger_name="zscaler-sdk-python")
+
 logger = logging.getLogger("zscaler-sdk-python")
 
+# The API modules are imported by the accessors of the clients, on first use
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "AuthDomainsAPI": "zscaler.zpa.authdomains",
+        "ApplicationSegmentAPI": "zscaler.zpa.app_segments",
+        "AppSegmentsPRAAPI": "zscaler.zpa.app_segments_pra",
+        "AppSegmentsInspectionAPI": "zscaler.zpa.app_segments_inspection",
+        "CertificatesAPI": "zscaler.zpa.certificates",
+        "IsolationAPI": "zscaler.zpa.isolation",
+        "CloudConnectorGroupsAPI": "zscaler.zpa.cloud_connector_groups",
+        "AppConnectorControllerAPI": "zscaler.zpa.connectors",
+        "EmergencyAccessAPI": "zscaler.zpa.emergency_access",
+        "IDPControllerAPI": "zscaler.zpa.idp",
+        "InspectionControllerAPI": "zscaler.zpa.inspection",
+        "LSSConfigControllerAPI": "zscaler.zpa.lss",
+        "MachineGroupsAPI": "zscaler.zpa.machine_groups",
+        "MicrotenantsAPI": "zscaler.zpa.microtenants",
+        "PolicySetsAPI": "zscaler.zpa.policies",
+        "PostureProfilesAPI": "zscaler.zpa.posture_profiles",
+        "PrivilegedRemoteAccessAPI": "zscaler.zpa.privileged_remote_access",
+        "ProvisioningKeyAPI": "zscaler.zpa.provisioning",
+        "SAMLAttributesAPI": "zscaler.zpa.saml_attributes",
+        "ScimAttributeHeaderAPI": "zscaler.zpa.scim_attributes",
+        "SCIMGroupsAPI": "zscaler.zpa.scim_groups",
+        "SegmentGroupsAPI": "zscaler.zpa.segment_groups",
+        "ServerGroupsAPI": "zscaler.zpa.server_groups",
+        "AppServersAPI": "zscaler.zpa.servers",
+        "ServiceEdgesAPI": "zscaler.zpa.service_edges",
+        "TrustedNetworksAPI": "zscaler.zpa.trusted_networks",
+    },
+)
+
 
 class ZPAClientHelper(ZPAClient):
     """A Controller to access Endpoints in the Zscaler Private Access (ZPA) API.
@@ -75,8 +90,36 @@ class ZPAClientHelper(ZPAClient):
             * ``gov``
             * ``govus``
             * ``zpatwo``
+
+        session (requests.Session): An optional pre-configured session. A pooled keep-alive session is
+            built from ``pool_connections``, ``pool_maxsize``, ``keep_alive`` and ``socket_options`` otherwise.
+        pagination_workers (int): Default number of concurrent page requests used by ``get_paginated_data``.
+            Pages are fetched one after another when not set.
+        rate_limit_store (str): Path of a SQLite file through which the clients of all processes on this host
+            share the rate limit budget of the tenant. Defaults to the ``ZSCALER_RATE_LIMIT_STORE`` environment
+            variable; each client keeps its own budget when unset.
+        output (str): The form of the data returned by the API methods, one of ``box`` (the default), ``dict``,
+            ``raw`` and ``lazy``. See :func:`zscaler.utils.format_payload`. It can be overridden for some calls
+            with :func:`zscaler.utils.output_mode`.
+        hooks (:obj:`zscaler.hooks.Hooks`): Callbacks notified of the lifecycle events of the requests, e.g.
+            retries and rate limit waits. See :class:`zscaler.hooks.Hooks`. The client has its own, as
+            ``client.hooks``, when not given.
+        metrics (:obj:`zscaler.metrics.MetricsRegistry`): Registry aggregating the latency, retries, 429s and
+            cache hits of the requests, or ``True`` for a registry of the client, available as
+            ``client.metrics``. Defaults to the ``ZSCALER_CLIENT_METRICS_ENABLED`` environment variable.
+        transport (:obj:`zscaler.transport.backends.HTTPTransport`): How the requests are sent: over the network
+            by default, or recorded to, or replayed from, a cassette with
+            :class:`zscaler.transport.backends.RecordingTransport` and
+            :class:`zscaler.transport.backends.ReplayTransport`. Defaults to the ``ZSCALER_CLIENT_TRANSPORT``
+            environment variable.
     """
 
+    ERROR_MESSAGES = {
+        "UNEXPECTED_STATUS": "Unexpected status code {status_code} received for page {page}.",
+        "MISSING_DATA_KEY": "The key 'list' was not found in the response for page {page}.",
+        "EMPTY_RESULTS": "No results found for all requested pages.",
+    }
+
     def __init__(
         self,
         client_id,
@@ -87,66 +130,82 @@ class ZPAClientHelper(ZPAClient):
         timeout=240,
         cache=None,
         fail_safe=False,
+        session=None,
+        pool_connections=None,
+        pool_maxsize=None,
+        keep_alive=True,
+        socket_options=None,
+        pagination_workers=None,
+        rate_limit_store=None,
+        output="box",
+        hooks=None,
+        metrics=None,
+        transport=None,
     ):
-        # Initialize rate limiter
-        self.rate_limiter = RateLimiter(
-            get_limit=20,  # Adjusted to allow 20 GET requests per 10 seconds
-            post_put_delete_limit=10,  # Adjusted to allow 10 POST/PUT/DELETE requests per 10 seconds
-            get_freq=10,  # Adjust frequency to 10 seconds
-            post_put_delete_freq=10,  # Adjust frequency to 10 seconds
+        self._configure(
+            client_id,
+            client_secret,
+            customer_id,
+            cloud,
+            microtenant_id,
+            timeout,
+            cache,
+            fail_safe,
+            rate_limit_store,
+            output,
+            hooks,
+            metrics,
+            transport,
         )
+        self.pagination_workers = pagination_workers
 
-        if cloud not in ZPA_BASE_URLS:
-            valid_clouds = ", ".join(ZPA_BASE_URLS.keys())
-            raise ValueError(
-                f"The provided ZPA_CLOUD value '{cloud}' is not supported. "
-                f"Please use one of the following supported values: {valid_clouds}"
-            )
-
-        self.baseurl = ZPA_BASE_URLS.get(cloud, ZPA_BASE_URLS["PRODUCTION"])
-        self.timeout = timeout
-        self.client_id = client_id
-        self.client_secret = client_secret
-        self.customer_id = customer_id
-        self.cloud = cloud
-        self.microtenant_id = microtenant_id or os.getenv("ZPA_MICROTENANT_ID")
-        self.url = f"{self.baseurl}/mgmtconfig/v1/admin/customers/{customer_id}"
-        self.user_config_url = f"{self.baseurl}/userconfig/v1/customers/{customer_id}"
-        self.v2_url = f"{self.baseurl}/mgmtconfig/v2/admin/customers/{customer_id}"
-        self.v2_lss_url = f"{self.baseurl}/mgmtconfig/v2/admin/lssConfig/customers/{customer_id}"
-        self.cbi_url = f"{self.baseurl}/cbiconfig/cbi/api/customers/{customer_id}"
-        self.fail_safe = fail_safe
-
-        cache_enabled = os.environ.get("ZSCALER_CLIENT_CACHE_ENABLED", "true").lower() == "true"
-        if cache is None:
-            if cache_enabled:
-                ttl = int(os.environ.get("ZSCALER_CLIENT_CACHE_DEFAULT_TTL", 3600))
-                tti = int(os.environ.get("ZSCALER_CLIENT_CACHE_DEFAULT_TTI", 1800))
-                self.cache = ZscalerCache(ttl=ttl, tti=tti)
-            else:
-                self.cache = NoOpCache()
-        else:
-            self.cache = cache
+        session = session or build_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            keep_alive=keep_alive,
+            socket_options=socket_options,
+        )
+        self.session = self.transport.install(session)
 
         ua = UserAgent()
         self.user_agent = ua.get_user_agent_string()
-        self.access_token = None
-        self.headers = {}
+        # Never modified once built, so that threads can copy it while others send requests; the bearer token
+        # is added to each request instead
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "User-Agent": self.user_agent,
+        }
+        self.tokens = TokenRefresher(self._obtain_token)
         self.refreshToken()
 
+    @property
+    def access_token(self):
+        """The current bearer token. Set it to ``None`` to have the next request log in again."""
+        return self.tokens.token
+
+    @access_token.setter
+    def access_token(self, token):
+        self.tokens.set(token)
+
     def refreshToken(self):
-        if not self.access_token or is_token_expired(self.access_token):
+        """
+        Returns a valid bearer token. Logs in when there is none, once for all the threads needing it, and
+        obtains the next one in the background ahead of its expiry. See :class:`~zscaler.transport.tokens.TokenRefresher`.
+        """
+        return self.tokens.get()
+
+    def _obtain_token(self):
+        start_time = time.time()
+        with profiling.phase(AUTH):
             response = self.login()
-            if response is None or response.status_code > 299 or not response.json():
-                logger.error("Failed to login using provided credentials, response: %s", response)
-                raise Exception("Failed to login using provided credentials.")
-            self.access_token = response.json().get("access_token")
-            self.headers = {
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-                "Authorization": f"Bearer {self.access_token}",
-                "User-Agent": self.user_agent,
-            }
+        self.hooks.emit(
+            TOKEN_REFRESH, status_code=response.status_code if response is not None else None, start=start_time
+        )
+        if response is None or response.status_code > 299 or not response.json():
+            logger.error("Failed to login using provided credentials, response: %s", response)
+            raise Exception("Failed to login using provided credentials.")
+        return response.json().get("access_token")
 
     @retry_with_backoff(MAX_RETRIES)
     def login(self):
@@ -161,7 +220,7 @@ class ZPAClientHelper(ZPAClient):
             if self.cloud == "DEV":
                 url = DEV_AUTH_URL + "?grant_type=CLIENT_CREDENTIALS"
             data = urllib.parse.urlencode(params)
-            resp = requests.post(url, data=data, headers=headers, timeout=self.timeout)
+            resp = self.session.post(url, data=data, headers=headers, timeout=self.timeout)
             logger.info("Login attempt with status: %d", resp.status_code)
             return resp
         except Exception as e:
@@ -169,41 +228,38 @@ class ZPAClientHelper(ZPAClient):
             return None
 
     def send(self, method, path, json=None, params=None, api_version: str = None):
-        api = self.url
-        if api_version is None:
-            api = self.url
-        elif api_version == "v2":
-            api = self.v2_url
-        elif api_version == "v2_lss":
-            api = self.v2_lss_url
-        elif api_version == "userconfig_v1":
-            api = self.user_config_url
-        elif api_version == "cbiconfig_v1":
-            api = self.cbi_url
-
-        if params is None:
-            params = {}
-
-        if json and "microtenant_id" in json:
-            microtenant_id = json.pop("microtenant_id")
-        else:
-            microtenant_id = self.microtenant_id
-
-        if microtenant_id:
-            params["microtenantId"] = microtenant_id
-
-        url = f"{api}/{path.lstrip('/')}"
-        if params:
-            url = f"{url}?{urllib.parse.urlencode(params)}"
+        """
+        Sends a request, sharing the response of a GET request already in flight for the same resource
+        instead of sending it again. See :class:`~zscaler.transport.single_flight.SingleFlight`.
+        """
+        if method != "GET" or json is not None:
+            return self._send(method, path, json, params, api_version=api_version)
+        key = self.cache.create_key(self._resolve_url(path, params=params, json=json, api_version=api_version), None)
+        return self.single_flight.do(key, lambda: self._send(method, path, json, params, api_version=api_version))
+
+    def _send(self, method, path, json=None, params=None, api_version: str = None, use_cache=True):
+        url = self._resolve_url(path, params=params, json=json, api_version=api_version)
+        profiling.set_endpoint(url)
 
         start_time = time.time()
         headers_with_user_agent = self.headers.copy()
         headers_with_user_agent["User-Agent"] = self.user_agent
         request_uuid = uuid.uuid4()
-        dump_request(logger, url, method, json, None, headers_with_user_agent, request_uuid)
+        body, headers_with_user_agent = codec.encode_request(json, headers_with_user_agent)
+        dump_request(logger, url, method, body, None, headers_with_user_agent, request_uuid)
+        self.hooks.emit(REQUEST_START, method=method, url=url)
         cache_key = self.cache.create_key(url, None)
-        if method == "GET" and self.cache.contains(cache_key):
-            resp = self.cache.get(cache_key)
+        cached = method == "GET" and use_cache and self.cache.contains(cache_key)
+        # None if another thread evicted or invalidated the entry since it was found
+        resp = self.cache.get(cache_key) if cached else None
+        if resp is not None:
+            self.hooks.emit(CACHE_HIT, method=method, url=url)
+            self.refresher.refresh_stale(
+                self.cache,
+                cache_key,
+                lambda params: self._send(method, path, json, params, api_version=api_version, use_cache=False),
+                params,
+            )
             dump_response(
                 logger=logger,
                 url=url,
@@ -214,24 +270,32 @@ class ZPAClientHelper(ZPAClient):
                 start_time=start_time,
                 from_cache=True,
             )
+            self.hooks.emit(
+                REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time, from_cache=True
+            )
             return resp
+        if method == "GET" and use_cache and self.cache.enabled:
+            self.hooks.emit(CACHE_MISS, method=method, url=url)
 
         attempts = 0
         while attempts < 5:
+            if attempts:
+                self.hooks.emit(RETRY, method=method, url=url, attempt=attempts + 1)
             try:
-                self.refreshToken()
-                should_wait, delay = self.rate_limiter.wait(method)
-                if should_wait:
-                    logger.warning(f"Rate limit exceeded. Retrying in {delay} seconds.")
-                    time.sleep(delay)
-                resp = requests.request(
-                    method,
-                    url,
-                    json=json,
-                    params=None,
-                    headers=headers_with_user_agent,
-                    timeout=self.timeout,
-                )
+                headers_with_user_agent["Authorization"] = f"Bearer {self.refreshToken()}"
+                waited = self.rate_limiter.acquire(method)
+                if waited:
+                    logger.warning(f"Rate limit exceeded. Waited {waited} seconds.")
+                    self.hooks.emit(RATE_LIMIT_WAIT, method=method, url=url, duration=waited)
+                with profiling.phase(NETWORK):
+                    resp = self.session.request(
+                        method,
+                        url,
+                        data=body,
+                        params=None,
+                        headers=headers_with_user_agent,
+                        timeout=self.timeout,
+                    )
                 dump_response(
                     logger=logger,
                     url=url,
@@ -241,7 +305,9 @@ class ZPAClientHelper(ZPAClient):
                     request_uuid=request_uuid,
                     start_time=start_time,
                 )
+                self.rate_limiter.update_limits(resp.headers, method)
                 if resp.status_code == 429:
+                    self.hooks.emit(RATE_LIMITED, method=method, url=url, status_code=429, attempt=attempts + 1)
                     retry_after = resp.headers.get("Retry-After")
                     if retry_after:
                         try:
@@ -249,9 +315,9 @@ class ZPAClientHelper(ZPAClient):
                         except ValueError:
                             sleep_time = int(retry_after[:-1])
                         logger.warning(f"Rate limit exceeded. Retrying in {sleep_time} seconds.")
-                        time.sleep(sleep_time)
+                        self.rate_limiter.block(method, sleep_time)
                     else:
-                        time.sleep(60)
+                        self.rate_limiter.block(method, 60)
                     attempts += 1
                     continue
                 else:
@@ -259,34 +325,23 @@ class ZPAClientHelper(ZPAClient):
             except requests.RequestException as e:
                 if attempts == 4:
                     logger.error(f"Failed to send {method} request to {url} after 5 attempts. Error: {str(e)}")
+                    self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
                     raise e
                 else:
                     logger.warning(f"Failed to send {method} request to {url}. Retrying... Error: {str(e)}")
                     attempts += 1
                     time.sleep(5)
+            except BaseException as e:
+                self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
+                raise
 
+        self.hooks.emit(REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time)
         if method != "GET":
-            logger.info(f"Clearing cache for non-GET request: {method} {url}")
-            self.cache.clear()
+            self.cache.invalidate(cache_key, ZPA_CACHE_DEPENDENCIES)
 
-        try:
-            response_data = resp.json()
-        except ValueError:
-            response_data = resp.text
-        if 200 > resp.status_code or resp.status_code > 299:
-            try:
-                error = ZscalerAPIError(url, resp, response_data)
-                if self.fail_safe:
-                    raise ZscalerAPIException(response_data)
-            except ZscalerAPIException:
-                raise
-            except Exception:
-                error = HTTPError(url, resp, response_data)
-                if self.fail_safe:
-                    logger.error(response_data)
-                    raise HTTPException(response_data)
-            logger.error(error)
+        self._check_response(url, resp)
         if method == "GET" and resp.status_code == 200:
+            resp = CachedResponse.from_response(resp)
             self.cache.add(cache_key, resp)
         return resp
 
@@ -303,11 +358,8 @@ class ZPAClientHelper(ZPAClient):
         Returns:
         dict: Formatted JSON response from the API.
         """
-        should_wait, delay = self.rate_limiter.wait("GET")
-        if should_wait:
-            time.sleep(delay)
         resp = self.send("GET", path, json, params, api_version=api_version)
-        formatted_resp = format_json_response(resp, box_attrs=dict())
+        formatted_resp = format_json_response(resp, box_attrs=dict(), output=self.output)
         return formatted_resp
 
     def put(self, path, json=None, params=None, api_version: str = None):
@@ -323,11 +375,8 @@ class ZPAClientHelper(ZPAClient):
         Returns:
         dict: Formatted JSON response from the API.
         """
-        should_wait, delay = self.rate_limiter.wait("PUT")
-        if should_wait:
-            time.sleep(delay)
         resp = self.send("PUT", path, json, params, api_version=api_version)
-        formatted_resp = format_json_response(resp, box_attrs=dict())
+        formatted_resp = format_json_response(resp, box_attrs=dict(), output=self.output)
         return formatted_resp
 
     def post(self, path, json=None, params=None, api_version: str = None):
@@ -343,11 +392,8 @@ class ZPAClientHelper(ZPAClient):
         Returns:
         dict: Formatted JSON response from the API.
         """
-        should_wait, delay = self.rate_limiter.wait("POST")
-        if should_wait:
-            time.sleep(delay)
         resp = self.send("POST", path, json, params, api_version=api_version)
-        formatted_resp = format_json_response(resp, box_attrs=dict())
+        formatted_resp = format_json_response(resp, box_attrs=dict(), output=self.output)
         return formatted_resp
 
     def delete(self, path, json=None, params=None, api_version: str = None):
@@ -363,9 +409,6 @@ class ZPAClientHelper(ZPAClient):
         Returns:
         Response: Response object from the DELETE request.
         """
-        should_wait, delay = self.rate_limiter.wait("DELETE")
-        if should_wait:
-            time.sleep(delay)
         return self.send("DELETE", path, json, params, api_version=api_version)
 
     def get_paginated_data(
@@ -390,6 +433,8 @@ class ZPAClientHelper(ZPAClient):
         page=None,
         pagesize=None,
         microtenant_id=None,
+        max_workers=None,
+        output=None,
     ):
         """
         Fetches paginated data from the ZPA API based on specified parameters and handles various types of API pagination.
@@ -412,10 +457,15 @@ class ZPAClientHelper(ZPAClient):
             scim_user_id (str): Identifier for a specific SCIM user, used for fetching data related to that user.
             page (int): Specific page number to fetch. Overrides automatic pagination.
             pagesize (int): Number of items per page, default is 20 as per API specification, maximum is 500.
+            max_workers (int): Fetch the remaining pages concurrently with up to this many workers, once the first
+                page has reported ``totalPages``. Bounded by the GET rate limit; defaults to ``pagination_workers``.
+            output (str): The output mode of the items, overriding the one of the client. See
+                :func:`zscaler.utils.format_payload`.
 
         Returns:
             tuple: A tuple containing:
-                - BoxList: A list of fetched items wrapped in a BoxList for easy access.
+                - BoxList: A list of fetched items wrapped in a BoxList for easy access, or a list in the
+                  ``dict``, ``raw`` and ``lazy`` output modes.
                 - str: An error message if any occurred during the data fetching process.
 
         Raises:
@@ -423,305 +473,415 @@ class ZPAClientHelper(ZPAClient):
         """
         logger = logging.getLogger(__name__)
 
-        ERROR_MESSAGES = {
-            "UNEXPECTED_STATUS": "Unexpected status code {status_code} received for page {page}.",
-            "MISSING_DATA_KEY": "The key 'list' was not found in the response for page {page}.",
-            "EMPTY_RESULTS": "No results found for all requested pages.",
-        }
-
-        if params is None:
-            params = {}
-
-        # Set initial pagination params
-        params["page"] = page or 1
-        params["pagesize"] = min(pagesize, 500) if pagesize else 500
-
-        if microtenant_id:
-            params["microtenantId"] = microtenant_id
-        elif self.microtenant_id and "microtenantId" not in params:
-            params["microtenantId"] = self.microtenant_id
-
-        if search:
-            api_search_field = snake_to_camel(search_field)
-            params["search"] = f"{api_search_field} EQ {search}"
-        if sort_order:
-            params["sortOrder"] = sort_order
-        if sort_by:
-            params["sortBy"] = sort_by
-        if sort_dir:
-            params["sortdir"] = sort_dir
-        if start_time and end_time:
-            params["startTime"] = start_time
-            params["endTime"] = end_time
-        if idp_group_id:
-            params["idpGroupId"] = idp_group_id
-        if scim_user_id:
-            params["scimUserId"] = scim_user_id
-        if scim_username:
-            params["scimUserName"] = scim_username
-        if all_entries:
-            params["allEntries"] = all_entries
+        params = self._pagination_params(
+            params=params,
+            search=search,
+            search_field=search_field,
+            all_entries=all_entries,
+            sort_order=sort_order,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            start_time=start_time,
+            end_time=end_time,
+            idp_group_id=idp_group_id,
+            scim_user_id=scim_user_id,
+            scim_username=scim_username,
+            page=page,
+            pagesize=pagesize,
+            microtenant_id=microtenant_id,
+        )
 
-        total_collected = 0
+        output = resolve_output(output, self.output)
         ret_data = []
+        workers = min(max_workers or self.pagination_workers or 1, self.rate_limiter.get_limit)
 
         try:
-            while True:
-                # Stop if max_pages reached
-                if max_pages is not None and params["page"] > max_pages:
+            for page_number, data in self._iter_pages(
+                path, params, api_version, max_pages, max_items, expected_status_code, workers
+            ):
+                if not data and page_number == 1:
                     break
 
-                should_wait, delay = self.rate_limiter.wait("GET")
-                if should_wait:
-                    time.sleep(delay)
+                ret_data.extend(data[: max_items - len(ret_data)] if max_items is not None else data)
 
-                response = self.send("GET", path=path, params=params, api_version=api_version)
+                # Check if we’ve collected the max_items
+                if max_items is not None and len(ret_data) >= max_items:
+                    break
+        except ValueError as e:
+            logger.error(str(e))
+            return format_payload([], output), str(e)
 
-                if response.status_code != expected_status_code:
-                    error_msg = ERROR_MESSAGES["UNEXPECTED_STATUS"].format(
-                        status_code=response.status_code, page=params["page"]
-                    )
-                    logger.error(error_msg)
-                    return BoxList([]), error_msg
+        if not ret_data:
+            error_msg = self.ERROR_MESSAGES["EMPTY_RESULTS"]
+            logger.warn(error_msg)
+            return format_payload([], output), error_msg
 
-                response_data = response.json()
-                data = response_data.get("list", [])
-                if not data and params["page"] == 1:
-                    error_msg = ERROR_MESSAGES["EMPTY_RESULTS"]
-                    logger.warn(error_msg)
-                    return BoxList([]), error_msg
+        return format_payload(ret_data, output), None
 
-                # Convert and extend the collected data
-                data = convert_keys_to_snake(data)
-                ret_data.extend(data[: max_items - total_collected] if max_items is not None else data)
-                total_collected += len(data)
+    def _iter_pages(self, path, params, api_version, max_pages, max_items, expected_status_code, workers=1):
+        """
+        Fetches the pages of a paginated listing one at a time, or the pages after the first one concurrently
+        when ``workers`` is greater than 1.
 
-                # Check if we’ve collected the max_items
-                if max_items is not None and total_collected >= max_items:
-                    break
+        Yields:
+            tuple: The page number and its items, as decoded.
 
-                # Determine if there is a next page based on totalPages, converting totalPages to an integer if present
-                total_pages = int(response_data.get("totalPages", 0))  # Default to 0 if not provided
-                if not total_pages or params["page"] >= total_pages:
-                    break
+        Raises:
+            ValueError: If a page is returned with an unexpected status code.
+        """
+        total_collected = 0
+        while True:
+            # Stop if max_pages reached
+            if max_pages is not None and params["page"] > max_pages:
+                return
 
-                # Move to the next page
-                params["page"] += 1
+            response = self.send("GET", path=path, params=params, api_version=api_version)
 
-        finally:
-            time.sleep(2)  # Ensure a delay between requests regardless of outcome
+            if response.status_code != expected_status_code:
+                raise ValueError(
+                    self.ERROR_MESSAGES["UNEXPECTED_STATUS"].format(status_code=response.status_code, page=params["page"])
+                )
 
-        if not ret_data:
-            error_msg = ERROR_MESSAGES["EMPTY_RESULTS"]
-            logger.warn(error_msg)
-            return BoxList([]), error_msg
+            response_data = codec.decode_response(response)
+            data = response_data.get("list", [])
+            total_collected += len(data)
+            yield params["page"], data
+
+            if max_items is not None and total_collected >= max_items:
+                return
+
+            # Determine if there is a next page based on totalPages, converting totalPages to an integer if present
+            total_pages = int(response_data.get("totalPages", 0))  # Default to 0 if not provided
+            if not total_pages or params["page"] >= total_pages:
+                return
+
+            if workers > 1:
+                # Schedule the remaining pages at once, without requesting pages beyond max_pages or max_items
+                last_page = total_pages if max_pages is None else min(total_pages, max_pages)
+                if max_items is not None:
+                    remaining_pages = math.ceil((max_items - total_collected) / params["pagesize"])
+                    last_page = min(last_page, params["page"] + remaining_pages)
+                pages = range(params["page"] + 1, last_page + 1)
+                for page_number, response in self._fetch_pages(path, params, pages, api_version, workers):
+                    if response.status_code != expected_status_code:
+                        raise ValueError(
+                            self.ERROR_MESSAGES["UNEXPECTED_STATUS"].format(status_code=response.status_code, page=page_number)
+                        )
+                    yield page_number, codec.decode_response(response).get("list", [])
+                return
+
+            # Move to the next page
+            params["page"] += 1
+
+    def iter_paginated(
+        self, path=None, params=None, api_version: str = None, max_pages=None, max_items=None, output=None, **kwargs
+    ):
+        """
+        Lazily iterates over the items of a paginated ZPA listing. Pages are requested as the iteration
+        reaches them, so only one page is held in memory and breaking out of the loop stops further requests.
 
-        return BoxList(ret_data), None
+        Accepts the same arguments as :meth:`get_paginated_data`, except ``max_workers``.
 
-    @property
+        Yields:
+            :obj:`Box`: Each item, with its keys converted to snake case, or in the given output mode.
+
+        Raises:
+            ValueError: If a page is returned with an unexpected status code.
+
+        Examples:
+            >>> for server in zpa.iter_paginated("/server", pagesize=500):
+            ...     print(server.name)
+        """
+        expected_status_code = kwargs.pop("expected_status_code", 200)
+        params = self._pagination_params(params=params, **kwargs)
+        output = resolve_output(output, self.output)
+        collected = 0
+        for _, data in self._iter_pages(path, params, api_version, max_pages, max_items, expected_status_code):
+            for item in data:
+                if max_items is not None and collected >= max_items:
+                    return
+                collected += 1
+                yield format_payload(item, output)
+
+    def _fetch_pages(self, path, params, pages, api_version, max_workers):
+        """
+        Fetches the given page numbers on a bounded pool of worker threads. Every request goes through
+        :meth:`send`, and therefore through the rate limiter shared by all workers.
+
+        Yields:
+            tuple: The page number and its response, in page order.
+        """
+        if not pages:
+            return
+
+        def fetch(page):
+            return self.send("GET", path=path, params={**params, "page": page}, api_version=api_version)
+
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(pages)), thread_name_prefix="zpa-pagination")
+        try:
+            # Each page runs in a copy of the caller's context, e.g. to be included in its profile
+            futures = [executor.submit(contextvars.copy_context().run, fetch, page) for page in pages]
+            for page, future in zip(pages, futures):
+                yield page, future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @cached_property
     def authdomains(self):
         """
         The interface object for the :ref:`ZPA Auth Domains interface <zpa-authdomains>`.
 
         """
+        from zscaler.zpa.authdomains import AuthDomainsAPI
+
         return AuthDomainsAPI(self)
 
-    @property
+    @cached_property
     def app_segments(self):
         """
         The interface object for the :ref:`ZPA Application Segments interface <zpa-app_segments>`.
 
         """
+        from zscaler.zpa.app_segments import ApplicationSegmentAPI
+
         return ApplicationSegmentAPI(self)
 
-    @property
+    @cached_property
     def app_segments_pra(self):
         """
         The interface object for the :ref:`ZPA Application Segments PRA interface <zpa-app_segments_pra>`.
 
         """
+        from zscaler.zpa.app_segments_pra import AppSegmentsPRAAPI
+
         return AppSegmentsPRAAPI(self)
 
-    @property
+    @cached_property
     def app_segments_inspection(self):
         """
         The interface object for the :ref:`ZPA Application Segments PRA interface <zpa-app_segments_inspection>`.
 
         """
+        from zscaler.zpa.app_segments_inspection import AppSegmentsInspectionAPI
+
         return AppSegmentsInspectionAPI(self)
 
-    @property
+    @cached_property
     def certificates(self):
         """
         The interface object for the :ref:`ZPA Browser Access Certificates interface <zpa-certificates>`.
 
         """
+        from zscaler.zpa.certificates import CertificatesAPI
+
         return CertificatesAPI(self)
 
-    @property
+    @cached_property
     def isolation(self):
         """
         The interface object for the :ref:`ZPA Isolation <zpa-isolation>`.
 
         """
+        from zscaler.zpa.isolation import IsolationAPI
+
         return IsolationAPI(self)
 
-    @property
+    @cached_property
     def cloud_connector_groups(self):
         """
         The interface object for the :ref:`ZPA Cloud Connector Groups interface <zpa-cloud_connector_groups>`.
 
         """
+        from zscaler.zpa.cloud_connector_groups import CloudConnectorGroupsAPI
+
         return CloudConnectorGroupsAPI(self)
 
-    @property
+    @cached_property
     def connectors(self):
         """
         The interface object for the :ref:`ZPA Connectors interface <zpa-connectors>`.
 
         """
+        from zscaler.zpa.connectors import AppConnectorControllerAPI
+
         return AppConnectorControllerAPI(self)
 
-    @property
+    @cached_property
     def emergency_access(self):
         """
         The interface object for the :ref:`ZPA Emergency Access interface <zpa-emergency_access>`.
 
         """
+        from zscaler.zpa.emergency_access import EmergencyAccessAPI
+
         return EmergencyAccessAPI(self)
 
-    @property
+    @cached_property
     def idp(self):
         """
         The interface object for the :ref:`ZPA IDP interface <zpa-idp>`.
 
         """
+        from zscaler.zpa.idp import IDPControllerAPI
+
         return IDPControllerAPI(self)
 
-    @property
+    @cached_property
     def inspection(self):
         """
         The interface object for the :ref:`ZPA Inspection interface <zpa-inspection>`.
 
         """
+        from zscaler.zpa.inspection import InspectionControllerAPI
+
         return InspectionControllerAPI(self)
 
-    @property
+    @cached_property
     def lss(self):
         """
         The interface object for the :ref:`ZIA Log Streaming Service Config interface <zpa-lss>`.
 
         """
+        from zscaler.zpa.lss import LSSConfigControllerAPI
+
         return LSSConfigControllerAPI(self)
 
-    @property
+    @cached_property
     def machine_groups(self):
         """
         The interface object for the :ref:`ZPA Machine Groups interface <zpa-machine_groups>`.
 
         """
+        from zscaler.zpa.machine_groups import MachineGroupsAPI
+
         return MachineGroupsAPI(self)
 
-    @property
+    @cached_property
     def microtenants(self):
         """
         The interface object for the :ref:`ZPA Microtenants interface <zpa-microtenants>`.
 
         """
+        from zscaler.zpa.microtenants import MicrotenantsAPI
+
         return MicrotenantsAPI(self)
 
-    @property
+    @cached_property
     def policies(self):
         """
         The interface object for the :ref:`ZPA Policy Sets interface <zpa-policies>`.
 
         """
+        from zscaler.zpa.policies import PolicySetsAPI
+
         return PolicySetsAPI(self)
 
-    @property
+    @cached_property
     def posture_profiles(self):
         """
         The interface object for the :ref:`ZPA Posture Profiles interface <zpa-posture_profiles>`.
 
         """
+        from zscaler.zpa.posture_profiles import PostureProfilesAPI
+
         return PostureProfilesAPI(self)
 
-    @property
+    @cached_property
     def privileged_remote_access(self):
         """
         The interface object for the :ref:`ZPA Privileged Remote Access interface <zpa-privileged_remote_access>`.
 
         """
+        from zscaler.zpa.privileged_remote_access import PrivilegedRemoteAccessAPI
+
         return PrivilegedRemoteAccessAPI(self)
 
-    @property
+    @cached_property
     def provisioning(self):
         """
         The interface object for the :ref:`ZPA Provisioning interface <zpa-provisioning>`.
 
         """
+        from zscaler.zpa.provisioning import ProvisioningKeyAPI
+
         return ProvisioningKeyAPI(self)
 
-    @property
+    @cached_property
     def saml_attributes(self):
         """
         The interface object for the :ref:`ZPA SAML Attributes interface <zpa-saml_attributes>`.
 
         """
+        from zscaler.zpa.saml_attributes import SAMLAttributesAPI
+
         return SAMLAttributesAPI(self)
 
-    @property
+    @cached_property
     def scim_attributes(self):
         """
         The interface object for the :ref:`ZPA SCIM Attributes interface <zpa-scim_attributes>`.
 
         """
+        from zscaler.zpa.scim_attributes import ScimAttributeHeaderAPI
+
         return ScimAttributeHeaderAPI(self)
 
-    @property
+    @cached_property
     def scim_groups(self):
         """
         The interface object for the :ref:`ZPA SCIM Groups interface <zpa-scim_groups>`.
 
         """
+        from zscaler.zpa.scim_groups import SCIMGroupsAPI
+
         return SCIMGroupsAPI(self)
 
-    @property
+    @cached_property
     def segment_groups(self):
         """
         The interface object for the :ref:`ZPA Segment Groups interface <zpa-segment_groups>`.
 
         """
+        from zscaler.zpa.segment_groups import SegmentGroupsAPI
+
         return SegmentGroupsAPI(self)
 
-    @property
+    @cached_property
     def server_groups(self):
         """
         The interface object for the :ref:`ZPA Server Groups interface <zpa-server_groups>`.
 
         """
+        from zscaler.zpa.server_groups import ServerGroupsAPI
+
         return ServerGroupsAPI(self)
 
-    @property
+    @cached_property
     def servers(self):
         """
         The interface object for the :ref:`ZPA Application Servers interface <zpa-app_servers>`.
 
         """
+        from zscaler.zpa.servers import AppServersAPI
+
         return AppServersAPI(self)
 
-    @property
+    @cached_property
     def service_edges(self):
         """
         The interface object for the :ref:`ZPA Service Edges interface <zpa-service_edges>`.
 
         """
+        from zscaler.zpa.service_edges import ServiceEdgesAPI
+
         return ServiceEdgesAPI(self)
 
-    @property
+    @cached_property
     def trusted_networks(self):
         """
         The interface object for the :ref:`ZPA Trusted Networks interface <zpa-trusted_networks>`.
 
         """
+        from zscaler.zpa.trusted_networks import TrustedNetworksAPI
+
         return TrustedNetworksAPI(self)
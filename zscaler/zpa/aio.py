@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2023, Zscaler Inc.
+#
+# Permission to use, copy, modify, and/or distribute this software for any
+# purpose with or without fee is hereby granted, provided that the above
+# copyright notice and this permission notice appear in all copies.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" AND THE AUTHOR DISCLAIMS ALL WARRANTIES
+# WITH REGARD TO THIS SOFTWARE INCLUDING ALL IMPLIED WARRANTIES OF
+# MERCHANTABILITY AND FITNESS. IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR
+# ANY SPECIAL, DIRECT, INDIRECT, OR CONSEQUENTIAL DAMAGES OR ANY DAMAGES
+# WHATSOEVER RESULTING FROM LOSS OF USE, DATA OR PROFITS, WHETHER IN AN
+# ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
+# OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
+
+import asyncio
+import logging
+import time
+import urllib.parse
+import uuid
+from functools import cached_property
+
+import aiohttp
+
+from zscaler import codec, profiling
+from zscaler.cache.cached_response import CachedResponse
+from zscaler.cache.refresh import AsyncBackgroundRefresher
+from zscaler.constants import DEV_AUTH_URL, MAX_RETRIES, ZPA_CACHE_DEPENDENCIES
+from zscaler.hooks import (
+    CACHE_HIT,
+    CACHE_MISS,
+    RATE_LIMIT_WAIT,
+    RATE_LIMITED,
+    REQUEST_END,
+    REQUEST_START,
+    RETRY,
+    TOKEN_REFRESH,
+)
+from zscaler.profiling import AUTH, NETWORK
+from zscaler.ratelimiter.ratelimiter import AsyncRateLimiter
+from zscaler.transport import aio
+from zscaler.transport.single_flight import AsyncSingleFlight
+from zscaler.transport.tokens import AsyncTokenRefresher
+from zscaler.user_agent import UserAgent
+from zscaler.utils import (
+    async_retry_with_backoff,
+    dump_request,
+    dump_response,
+    format_json_response,
+    format_payload,
+    resolve_output,
+)
+from zscaler.zpa.app_segments import AsyncApplicationSegmentAPI
+from zscaler.zpa.client import ZPAClient
+
+logger = logging.getLogger("zscaler-sdk-python")
+
+
+class AsyncZPAClientHelper(ZPAClient):
+    """
+    An asyncio Controller to access Endpoints in the Zscaler Private Access (ZPA) API.
+
+    Accepts the same arguments as :class:`zscaler.zpa.ZPAClientHelper`. Requests are sent through a pooled
+    :class:`aiohttp.ClientSession`, created on first use, and the access token is requested lazily.
+    Use the client as an async context manager, or call :meth:`aclose` when done.
+
+    Attributes:
+        session (aiohttp.ClientSession): An optional pre-configured session. A pooled keep-alive session is
+            built from ``pool_connections``, ``pool_maxsize`` and ``keep_alive`` otherwise.
+
+    Examples:
+        >>> async with AsyncZPAClientHelper(client_id, client_secret, customer_id, "PRODUCTION") as zpa:
+        ...     segments = await zpa.app_segments.list_segments()
+    """
+
+    def __init__(
+        self,
+        client_id,
+        client_secret,
+        customer_id,
+        cloud,
+        microtenant_id=None,
+        timeout=240,
+        cache=None,
+        fail_safe=False,
+        session=None,
+        pool_connections=None,
+        pool_maxsize=None,
+        keep_alive=True,
+        rate_limit_store=None,
+        output="box",
+        hooks=None,
+        metrics=None,
+        transport=None,
+    ):
+        self._configure(
+            client_id,
+            client_secret,
+            customer_id,
+            cloud,
+            microtenant_id,
+            timeout,
+            cache,
+            fail_safe,
+            rate_limit_store,
+            output,
+            hooks,
+            metrics,
+            transport,
+        )
+        self.async_rate_limiter = AsyncRateLimiter(self.rate_limiter)
+        self.single_flight = AsyncSingleFlight()
+        self.refresher = AsyncBackgroundRefresher()
+        self.session = session
+        self._session_options = dict(pool_connections=pool_connections, pool_maxsize=pool_maxsize, keep_alive=keep_alive)
+        self.user_agent = UserAgent().get_user_agent_string()
+        # The bearer token is added to each request
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "User-Agent": self.user_agent,
+        }
+        self.tokens = AsyncTokenRefresher(self._obtain_token)
+
+    async def __aenter__(self):
+        await self.refreshToken()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Closes the underlying session and its pooled connections."""
+        await self.tokens.join()
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    def _ensure_session(self):
+        if self.session is None or self.session.closed:
+            self.session = aio.build_async_session(timeout=self.timeout, **self._session_options)
+        return self.session
+
+    @property
+    def access_token(self):
+        """The current bearer token. Set it to ``None`` to have the next request log in again."""
+        return self.tokens.token
+
+    @access_token.setter
+    def access_token(self, token):
+        self.tokens.set(token)
+
+    async def refreshToken(self):
+        """
+        Returns a valid bearer token. Logs in when there is none, once for all the coroutines needing it, and
+        obtains the next one in a task ahead of its expiry. See :class:`~zscaler.transport.tokens.AsyncTokenRefresher`.
+        """
+        return await self.tokens.get()
+
+    async def _obtain_token(self):
+        start_time = time.time()
+        with profiling.phase(AUTH):
+            response = await self.login()
+        self.hooks.emit(
+            TOKEN_REFRESH, status_code=response.status_code if response is not None else None, start=start_time
+        )
+        if response is None or response.status_code > 299 or not response.json():
+            logger.error("Failed to login using provided credentials, response: %s", response)
+            raise Exception("Failed to login using provided credentials.")
+        return response.json().get("access_token")
+
+    @async_retry_with_backoff(MAX_RETRIES)
+    async def login(self):
+        params = {"client_id": self.client_id, "client_secret": self.client_secret}
+        headers = {
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Accept": "application/json",
+            "User-Agent": self.user_agent,
+        }
+        try:
+            url = f"{self.baseurl}/signin"
+            if self.cloud == "DEV":
+                url = DEV_AUTH_URL + "?grant_type=CLIENT_CREDENTIALS"
+            data = urllib.parse.urlencode(params)
+            resp = await self.transport.request(self._ensure_session(), "POST", url, data=data, headers=headers)
+            logger.info("Login attempt with status: %d", resp.status_code)
+            return resp
+        except aiohttp.ClientError as e:
+            logger.error("Login failed due to an exception: %s", str(e))
+            return None
+
+    async def send(self, method, path, json=None, params=None, api_version: str = None):
+        """
+        Sends a request, sharing the response of a GET request already in flight for the same resource
+        instead of sending it again. See :class:`~zscaler.transport.single_flight.SingleFlight`.
+        """
+        if method != "GET" or json is not None:
+            return await self._send(method, path, json, params, api_version=api_version)
+        key = self.cache.create_key(self._resolve_url(path, params=params, json=json, api_version=api_version), None)
+        return await self.single_flight.do(key, lambda: self._send(method, path, json, params, api_version=api_version))
+
+    async def _send(self, method, path, json=None, params=None, api_version: str = None, use_cache=True):
+        url = self._resolve_url(path, params=params, json=json, api_version=api_version)
+        profiling.set_endpoint(url)
+
+        start_time = time.time()
+        request_uuid = uuid.uuid4()
+        body, headers = codec.encode_request(json, self.headers)
+        dump_request(logger, url, method, body, None, headers, request_uuid)
+        self.hooks.emit(REQUEST_START, method=method, url=url)
+        cache_key = self.cache.create_key(url, None)
+        cached = method == "GET" and use_cache and self.cache.contains(cache_key)
+        # None if another thread evicted or invalidated the entry since it was found
+        resp = self.cache.get(cache_key) if cached else None
+        if resp is not None:
+            self.hooks.emit(CACHE_HIT, method=method, url=url)
+            self.refresher.refresh_stale(
+                self.cache,
+                cache_key,
+                lambda params: self._send(method, path, json, params, api_version=api_version, use_cache=False),
+                params,
+            )
+            dump_response(
+                logger=logger,
+                url=url,
+                method=method,
+                params=None,
+                resp=resp,
+                request_uuid=request_uuid,
+                start_time=start_time,
+                from_cache=True,
+            )
+            self.hooks.emit(
+                REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time, from_cache=True
+            )
+            return resp
+        if method == "GET" and use_cache and self.cache.enabled:
+            self.hooks.emit(CACHE_MISS, method=method, url=url)
+
+        attempts = 0
+        while attempts < 5:
+            if attempts:
+                self.hooks.emit(RETRY, method=method, url=url, attempt=attempts + 1)
+            try:
+                headers = {**headers, "Authorization": f"Bearer {await self.refreshToken()}"}
+                waited = await self.async_rate_limiter.acquire(method)
+                if waited:
+                    self.hooks.emit(RATE_LIMIT_WAIT, method=method, url=url, duration=waited)
+                with profiling.phase(NETWORK):
+                    resp = await self.transport.request(self._ensure_session(), method, url, data=body, headers=headers)
+                dump_response(
+                    logger=logger,
+                    url=url,
+                    params=None,
+                    method=method,
+                    resp=resp,
+                    request_uuid=request_uuid,
+                    start_time=start_time,
+                )
+                self.async_rate_limiter.update_limits(resp.headers, method)
+                if resp.status_code == 429:
+                    self.hooks.emit(RATE_LIMITED, method=method, url=url, status_code=429, attempt=attempts + 1)
+                    retry_after = resp.headers.get("Retry-After")
+                    if retry_after:
+                        try:
+                            sleep_time = int(retry_after)
+                        except ValueError:
+                            sleep_time = int(retry_after[:-1])
+                        logger.warning(f"Rate limit exceeded. Retrying in {sleep_time} seconds.")
+                        self.async_rate_limiter.block(method, sleep_time)
+                    else:
+                        self.async_rate_limiter.block(method, 60)
+                    attempts += 1
+                    continue
+                else:
+                    break
+            except aiohttp.ClientError as e:
+                if attempts == 4:
+                    logger.error(f"Failed to send {method} request to {url} after 5 attempts. Error: {str(e)}")
+                    self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
+                    raise e
+                else:
+                    logger.warning(f"Failed to send {method} request to {url}. Retrying... Error: {str(e)}")
+                    attempts += 1
+                    await asyncio.sleep(5)
+            except BaseException as e:
+                self.hooks.emit(REQUEST_END, method=method, url=url, error=e, start=start_time)
+                raise
+
+        self.hooks.emit(REQUEST_END, method=method, url=url, status_code=resp.status_code, start=start_time)
+        if method != "GET":
+            self.cache.invalidate(cache_key, ZPA_CACHE_DEPENDENCIES)
+
+        self._check_response(url, resp)
+        if method == "GET" and resp.status_code == 200:
+            resp = CachedResponse.from_response(resp)
+            self.cache.add(cache_key, resp)
+        return resp
+
+    async def get(self, path, json=None, params=None, api_version: str = None):
+        resp = await self.send("GET", path, json, params, api_version=api_version)
+        return format_json_response(resp, box_attrs=dict(), output=self.output)
+
+    async def put(self, path, json=None, params=None, api_version: str = None):
+        resp = await self.send("PUT", path, json, params, api_version=api_version)
+        return format_json_response(resp, box_attrs=dict(), output=self.output)
+
+    async def post(self, path, json=None, params=None, api_version: str = None):
+        resp = await self.send("POST", path, json, params, api_version=api_version)
+        return format_json_response(resp, box_attrs=dict(), output=self.output)
+
+    async def delete(self, path, json=None, params=None, api_version: str = None):
+        return await self.send("DELETE", path, json, params, api_version=api_version)
+
+    async def _pages(self, path, params, api_version=None, max_pages=None, expected_status_code=200):
+        """
+        Yields the ``(page_number, items)`` of a paginated listing, raising ``ValueError`` on an unexpected status.
+        """
+        while max_pages is None or params["page"] <= max_pages:
+            response = await self.send("GET", path=path, params=dict(params), api_version=api_version)
+            if response.status_code != expected_status_code:
+                raise ValueError(f"Unexpected status code {response.status_code} received for page {params['page']}.")
+
+            response_data = codec.decode_response(response)
+            yield params["page"], response_data.get("list", [])
+
+            total_pages = int(response_data.get("totalPages", 0))
+            if not total_pages or params["page"] >= total_pages:
+                break
+            params["page"] += 1
+
+    async def iter_paginated(
+        self, path=None, params=None, api_version: str = None, max_pages=None, max_items=None, output=None, **kwargs
+    ):
+        """
+        Asynchronously iterates over the items of a paginated ZPA listing, fetching pages as they are consumed.
+
+        Accepts the same filters as :meth:`get_paginated_data`.
+
+        Examples:
+            >>> async for server in zpa.iter_paginated("server"):
+            ...     print(server.name)
+        """
+        kwargs.pop("expected_status_code", None)
+        params = self._pagination_params(params=params, **kwargs)
+        output = resolve_output(output, self.output)
+        collected = 0
+        async for _, data in self._pages(path, params, api_version=api_version, max_pages=max_pages):
+            for item in data:
+                if max_items is not None and collected >= max_items:
+                    return
+                collected += 1
+                yield format_payload(item, output)
+
+    async def get_paginated_data(
+        self,
+        path=None,
+        params=None,
+        expected_status_code=200,
+        api_version: str = None,
+        max_pages=None,
+        max_items=None,
+        output=None,
+        **kwargs,
+    ):
+        """
+        Fetches all pages of a ZPA listing. Accepts the same arguments as
+        :meth:`zscaler.zpa.ZPAClientHelper.get_paginated_data`.
+
+        Returns:
+            tuple: A tuple containing the fetched items as a :obj:`BoxList`, or a list in the ``dict``, ``raw``
+            and ``lazy`` output modes, and an error message, if any.
+        """
+        params = self._pagination_params(params=params, **kwargs)
+        output = resolve_output(output, self.output)
+        ret_data = []
+        try:
+            async for page, data in self._pages(path, params, api_version, max_pages, expected_status_code):
+                if not data and page == 1:
+                    break
+                ret_data.extend(data[: max_items - len(ret_data)] if max_items is not None else data)
+                if max_items is not None and len(ret_data) >= max_items:
+                    break
+        except ValueError as e:
+            logger.error(str(e))
+            return format_payload([], output), str(e)
+
+        if not ret_data:
+            error_msg = "No results found for all requested pages."
+            logger.warning(error_msg)
+            return format_payload([], output), error_msg
+        return format_payload(ret_data, output), None
+
+    @cached_property
+    def app_segments(self):
+        """
+        The asyncio interface object for the :ref:`ZPA Application Segments interface <zpa-app_segments>`.
+
+        """
+        return AsyncApplicationSegmentAPI(self)
@@ -14,6 +14,8 @@
 # ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
+from typing import Iterator
+
 from box import Box, BoxList
 from requests import Response
 
@@ -62,6 +64,22 @@ class ApplicationSegmentAPI:
         list, _ = self.rest.get_paginated_data(path="/application", **kwargs, api_version="v1")
         return list
 
+    def iter_segments(self, **kwargs) -> Iterator[Box]:
+        """
+        Lazily iterates over all configured application segments, requesting one page at a time.
+
+        Accepts the same arguments as :meth:`list_segments`. Breaking out of the loop stops further requests.
+
+        Yields:
+            :obj:`Box`: The resource record for each application segment.
+
+        Examples:
+            >>> for segment in zpa.app_segments.iter_segments(pagesize=500):
+            ...    print(segment.name)
+
+        """
+        return self.rest.iter_paginated(path="/application", **kwargs, api_version="v1")
+
     def get_segment(self, segment_id: str, **kwargs) -> Box:
         """
         Get information for an application segment.
@@ -100,8 +118,7 @@ class ApplicationSegmentAPI:
             ...     print("Application segment not found")
 
         """
-        apps = self.list_segments(**kwargs)
-        for app in apps:
+        for app in self.iter_segments(**kwargs):
             if app.get("name") == name:
                 return app
         return None
@@ -189,6 +206,15 @@ class ApplicationSegmentAPI:
             ...    tcp_port_ranges=['8080', '8085'],
             ...    server_group_ids=['99999', '88888'])
         """
+        payload, params = self._add_segment_payload(
+            name, domain_names, segment_group_id, server_group_ids, tcp_port_ranges, udp_port_ranges, kwargs
+        )
+        response = self.rest.post("application", json=payload, params=params)
+        return self._check_created(response)
+
+    def _add_segment_payload(
+        self, name, domain_names, segment_group_id, server_group_ids, tcp_port_ranges, udp_port_ranges, kwargs
+    ):
         payload = {
             "name": name,
             "domainNames": domain_names,
@@ -213,8 +239,10 @@ class ApplicationSegmentAPI:
 
         microtenant_id = kwargs.pop("microtenant_id", None)
         params = {"microtenantId": microtenant_id} if microtenant_id else {}
+        return payload, params
 
-        response = self.rest.post("application", json=payload, params=params)
+    @staticmethod
+    def _check_created(response):
         if isinstance(response, Response):
             status_code = response.status_code
             raise Exception(f"API call failed with status {status_code}: {response.json()}")
@@ -283,7 +311,13 @@ class ApplicationSegmentAPI:
             ...    name='new_app_name',
 
         """
-        payload = convert_keys(self.get_segment(segment_id))
+        payload, params = self._update_segment_payload(self.get_segment(segment_id), kwargs)
+        resp = self.rest.put(f"application/{segment_id}", json=payload, params=params).status_code
+        if not isinstance(resp, Response):
+            return self.get_segment(segment_id)
+
+    def _update_segment_payload(self, current, kwargs):
+        payload = convert_keys(current)
 
         if kwargs.get("tcp_port_ranges"):
             payload["tcpPortRange"] = [{"from": ports[0], "to": ports[1]} for ports in kwargs.pop("tcp_port_ranges")]
@@ -302,10 +336,7 @@ class ApplicationSegmentAPI:
 
         microtenant_id = kwargs.pop("microtenant_id", None)
         params = {"microtenantId": microtenant_id} if microtenant_id else {}
-
-        resp = self.rest.put(f"application/{segment_id}", json=payload, params=params).status_code
-        if not isinstance(resp, Response):
-            return self.get_segment(segment_id)
+        return payload, params
 
     def delete_segment(self, segment_id: str, force_delete: bool = False, **kwargs) -> int:
         """
@@ -369,6 +400,12 @@ class ApplicationSegmentAPI:
             ... )
 
         """
+        payload, params = self._move_payload(kwargs)
+        response = self.rest.post(f"application/{application_id}/move", json=payload, params=params)
+        return self._check_moved(response)
+
+    @staticmethod
+    def _move_payload(kwargs):
         payload = {
             "targetSegmentGroupId": kwargs.pop("target_segment_group_id", None),
             "targetMicrotenantId": kwargs.pop("target_microtenant_id", None),
@@ -379,8 +416,10 @@ class ApplicationSegmentAPI:
 
         microtenant_id = kwargs.pop("microtenant_id", None)
         params = {"microtenantId": microtenant_id} if microtenant_id else {}
+        return payload, params
 
-        response = self.rest.post(f"application/{application_id}/move", json=payload, params=params)
+    @staticmethod
+    def _check_moved(response):
         if response.status_code == 204:
             return Box({})
         elif isinstance(response, Response):
@@ -415,6 +454,12 @@ class ApplicationSegmentAPI:
             ... )
 
         """
+        payload, params = self._share_payload(kwargs)
+        response = self.rest.put(f"application/{application_id}/share", json=payload, params=params)
+        return self._check_moved(response)
+
+    @staticmethod
+    def _share_payload(kwargs):
         payload = {
             "shareToMicrotenants": kwargs.pop("share_to_microtenants", None),
         }
@@ -423,11 +468,74 @@ class ApplicationSegmentAPI:
 
         microtenant_id = kwargs.pop("microtenant_id", None)
         params = {"microtenantId": microtenant_id} if microtenant_id else {}
+        return payload, params
 
-        response = self.rest.put(f"application/{application_id}/share", json=payload, params=params)
-        if response.status_code == 204:
-            return Box({})
-        elif isinstance(response, Response):
-            status_code = response.status_code
-            raise Exception(f"API call failed with status {status_code}: {response.json()}")
-        return response
+
+class AsyncApplicationSegmentAPI(ApplicationSegmentAPI):
+    """
+    asyncio counterpart of :class:`ApplicationSegmentAPI`, returned by
+    :attr:`zscaler.zpa.aio.AsyncZPAClientHelper.app_segments`. Every method is a coroutine; methods
+    issuing a single request, such as :meth:`get_segment`, are inherited and return awaitables.
+
+    Examples:
+        >>> segments = await zpa.app_segments.list_segments()
+    """
+
+    async def list_segments(self, **kwargs) -> BoxList:
+        list, _ = await self.rest.get_paginated_data(path="/application", **kwargs, api_version="v1")
+        return list
+
+    async def get_segment_by_name(self, name: str, **kwargs):
+        async for app in self.rest.iter_paginated(path="/application", **kwargs, api_version="v1"):
+            if app.get("name") == name:
+                return app
+        return None
+
+    async def get_segments_by_type(self, application_type: str, expand_all: bool = False, **kwargs) -> Box:
+        params = {"applicationType": application_type, "expandAll": "true" if expand_all else "false"}
+        if "search" in kwargs:
+            params["search"] = kwargs["search"]
+        result, error = await self.rest.get_paginated_data(path="/application/getAppsByType", params=params, **kwargs)
+        if error:
+            return BoxList([])
+        return result
+
+    async def add_segment(
+        self,
+        name: str,
+        domain_names: list,
+        segment_group_id: str,
+        server_group_ids: list,
+        tcp_port_ranges: list = None,
+        udp_port_ranges: list = None,
+        **kwargs,
+    ) -> Box:
+        payload, params = self._add_segment_payload(
+            name, domain_names, segment_group_id, server_group_ids, tcp_port_ranges, udp_port_ranges, kwargs
+        )
+        response = await self.rest.post("application", json=payload, params=params)
+        return self._check_created(response)
+
+    async def update_segment(self, segment_id: str, **kwargs) -> Box:
+        payload, params = self._update_segment_payload(await self.get_segment(segment_id), kwargs)
+        resp = (await self.rest.put(f"application/{segment_id}", json=payload, params=params)).status_code
+        if not isinstance(resp, Response):
+            return await self.get_segment(segment_id)
+
+    async def delete_segment(self, segment_id: str, force_delete: bool = False, **kwargs) -> int:
+        params = {}
+        if "microtenant_id" in kwargs:
+            params["microtenantId"] = kwargs.pop("microtenant_id")
+        query = "forceDelete=true" if force_delete else ""
+        response = await self.rest.delete(f"/application/{segment_id}?{query}", params=params)
+        return response.status_code
+
+    async def app_segment_move(self, application_id: str, **kwargs) -> Box:
+        payload, params = self._move_payload(kwargs)
+        response = await self.rest.post(f"application/{application_id}/move", json=payload, params=params)
+        return self._check_moved(response)
+
+    async def app_segment_share(self, application_id: str, **kwargs) -> Box:
+        payload, params = self._share_payload(kwargs)
+        response = await self.rest.put(f"application/{application_id}/share", json=payload, params=params)
+        return self._check_moved(response)
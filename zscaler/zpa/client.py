@@ -14,11 +14,236 @@
 # ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
+import logging
+import os
+import urllib.parse
+
+from zscaler import codec
+from zscaler.cache.no_op_cache import NoOpCache
+from zscaler.cache.zscaler_cache import build_cache
+from zscaler.cache.refresh import BackgroundRefresher
+from zscaler.constants import ZPA_BASE_URLS
+from zscaler.errors.http_error import HTTPError, ZscalerAPIError
+from zscaler.exceptions.exceptions import HTTPException, ZscalerAPIException
+from zscaler.hooks import Hooks
+from zscaler.logger import ensure_logging
+from zscaler.metrics import build_metrics
+from zscaler.profiling import Profiler
+from zscaler.ratelimiter.ratelimiter import build_rate_limiter, rate_limit_key
+from zscaler.transport.backends import build_transport
+from zscaler.transport.single_flight import SingleFlight
+from zscaler.utils import snake_to_camel, validate_output
+
+logger = logging.getLogger("zscaler-sdk-python")
+
 
 class ZPAClient:
     def __init__():
         pass
 
+    def _configure(
+        self,
+        client_id,
+        client_secret,
+        customer_id,
+        cloud,
+        microtenant_id,
+        timeout,
+        cache,
+        fail_safe,
+        rate_limit_store=None,
+        output="box",
+        hooks=None,
+        metrics=None,
+        transport=None,
+    ):
+        """
+        Sets up the credentials, API URLs, rate limiter and cache of a client. Shared by the synchronous
+        and asyncio clients.
+        """
+        ensure_logging()
+        # Initialize rate limiter
+        self.rate_limiter = build_rate_limiter(
+            get_limit=20,  # Adjusted to allow 20 GET requests per 10 seconds
+            post_put_delete_limit=10,  # Adjusted to allow 10 POST/PUT/DELETE requests per 10 seconds
+            get_freq=10,  # Adjust frequency to 10 seconds
+            post_put_delete_freq=10,  # Adjust frequency to 10 seconds
+            key=rate_limit_key("zpa", cloud, customer_id),
+            store=rate_limit_store,
+        )
+
+        if cloud not in ZPA_BASE_URLS:
+            valid_clouds = ", ".join(ZPA_BASE_URLS.keys())
+            raise ValueError(
+                f"The provided ZPA_CLOUD value '{cloud}' is not supported. "
+                f"Please use one of the following supported values: {valid_clouds}"
+            )
+
+        self.baseurl = ZPA_BASE_URLS.get(cloud, ZPA_BASE_URLS["PRODUCTION"])
+        self.timeout = timeout
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.customer_id = customer_id
+        self.cloud = cloud
+        self.microtenant_id = microtenant_id or os.getenv("ZPA_MICROTENANT_ID")
+        self.url = f"{self.baseurl}/mgmtconfig/v1/admin/customers/{customer_id}"
+        self.user_config_url = f"{self.baseurl}/userconfig/v1/customers/{customer_id}"
+        self.v2_url = f"{self.baseurl}/mgmtconfig/v2/admin/customers/{customer_id}"
+        self.v2_lss_url = f"{self.baseurl}/mgmtconfig/v2/admin/lssConfig/customers/{customer_id}"
+        self.cbi_url = f"{self.baseurl}/cbiconfig/cbi/api/customers/{customer_id}"
+        self.fail_safe = fail_safe
+        self.output = validate_output(output)
+
+        cache_enabled = os.environ.get("ZSCALER_CLIENT_CACHE_ENABLED", "true").lower() == "true"
+        if cache is None:
+            if cache_enabled:
+                ttl = int(os.environ.get("ZSCALER_CLIENT_CACHE_DEFAULT_TTL", 3600))
+                tti = int(os.environ.get("ZSCALER_CLIENT_CACHE_DEFAULT_TTI", 1800))
+                self.cache = build_cache(ttl=ttl, tti=tti)
+            else:
+                self.cache = NoOpCache()
+        else:
+            self.cache = cache
+        self.single_flight = SingleFlight()
+        self.hooks = (hooks or Hooks()).bind("zpa")
+        self.metrics = build_metrics(metrics, self.hooks)
+        self.refresher = BackgroundRefresher()
+        self.transport = build_transport(transport)
+
+    def profile(self, cprofile=False):
+        """
+        Returns a :class:`~zscaler.profiling.Profiler` timing the phases of the calls made in its ``with``
+        block per endpoint: logins, rate limiter waits, requests, JSON decoding, key conversion and Box
+        construction.
+
+        Args:
+            cprofile (bool): Whether to also record a :mod:`cProfile` function profile of the block.
+
+        Examples:
+            >>> with zpa.profile() as prof:
+            ...     zpa.app_segments.list_segments()
+            >>> print(prof.report())
+        """
+        return Profiler(cprofile=cprofile)
+
+    def _resolve_url(self, path: str, params=None, json=None, api_version: str = None):
+        """
+        Builds the full request URL for a ZPA API path. Shared by the synchronous and asyncio clients.
+
+        The ``microtenant_id`` of the payload, or the one configured on the client, is moved to the
+        ``microtenantId`` query parameter.
+
+        Returns:
+            str: The request URL including the encoded query string.
+        """
+        api = {
+            "v2": self.v2_url,
+            "v2_lss": self.v2_lss_url,
+            "userconfig_v1": self.user_config_url,
+            "cbiconfig_v1": self.cbi_url,
+        }.get(api_version, self.url)
+
+        if params is None:
+            params = {}
+
+        if json and "microtenant_id" in json:
+            microtenant_id = json.pop("microtenant_id")
+        else:
+            microtenant_id = self.microtenant_id
+
+        if microtenant_id:
+            params["microtenantId"] = microtenant_id
+
+        url = f"{api}/{path.lstrip('/')}"
+        if params:
+            url = f"{url}?{urllib.parse.urlencode(params)}"
+        return url
+
+    def _check_response(self, url: str, resp):
+        """
+        Logs and, when ``fail_safe`` is enabled, raises the error of a non-2xx response. Successful
+        responses are left undecoded: their body is decoded once, when it is formatted.
+
+        Returns:
+            The decoded body of an error response, or its raw text if it is not JSON. None on success.
+        """
+        if 200 <= resp.status_code <= 299:
+            return None
+        try:
+            response_data = codec.decode_response(resp)
+        except ValueError:
+            response_data = resp.text
+        try:
+            error = ZscalerAPIError(url, resp, response_data)
+            if self.fail_safe:
+                raise ZscalerAPIException(response_data)
+        except ZscalerAPIException:
+            raise
+        except Exception:
+            error = HTTPError(url, resp, response_data)
+            if self.fail_safe:
+                logger.error(response_data)
+                raise HTTPException(response_data)
+        logger.error(error)
+        return response_data
+
+    def _pagination_params(
+        self,
+        params=None,
+        search=None,
+        search_field="name",
+        all_entries=False,
+        sort_order=None,
+        sort_by=None,
+        sort_dir=None,
+        start_time=None,
+        end_time=None,
+        idp_group_id=None,
+        scim_user_id=None,
+        scim_username=None,
+        page=None,
+        pagesize=None,
+        microtenant_id=None,
+    ):
+        """
+        Builds the query parameters of a paginated ZPA listing. Shared by the synchronous and asyncio clients.
+
+        Returns:
+            dict: The query parameters, starting at ``page`` (default 1) with at most 500 items per page.
+        """
+        if params is None:
+            params = {}
+
+        params["page"] = page or 1
+        params["pagesize"] = min(pagesize, 500) if pagesize else 500
+
+        if microtenant_id:
+            params["microtenantId"] = microtenant_id
+        elif self.microtenant_id and "microtenantId" not in params:
+            params["microtenantId"] = self.microtenant_id
+
+        if search:
+            api_search_field = snake_to_camel(search_field)
+            params["search"] = f"{api_search_field} EQ {search}"
+        if sort_order:
+            params["sortOrder"] = sort_order
+        if sort_by:
+            params["sortBy"] = sort_by
+        if sort_dir:
+            params["sortdir"] = sort_dir
+        if start_time and end_time:
+            params["startTime"] = start_time
+            params["endTime"] = end_time
+        if idp_group_id:
+            params["idpGroupId"] = idp_group_id
+        if scim_user_id:
+            params["scimUserId"] = scim_user_id
+        if scim_username:
+            params["scimUserName"] = scim_username
+        if all_entries:
+            params["allEntries"] = all_entries
+        return params
+
     def get(
         self,
         path: str,
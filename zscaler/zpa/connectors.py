@@ -15,6 +15,8 @@
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
 
+from typing import Iterator
+
 from box import Box, BoxList
 from requests import Response
 import os
@@ -61,6 +63,22 @@ class AppConnectorControllerAPI:
         list, _ = self.rest.get_paginated_data(path="/connector", **kwargs, api_version="v1")
         return list
 
+    def iter_connectors(self, **kwargs) -> Iterator[Box]:
+        """
+        Lazily iterates over all configured App Connectors, requesting one page at a time.
+
+        Accepts the same arguments as :meth:`list_connectors`. Breaking out of the loop stops further requests.
+
+        Yields:
+            :obj:`Box`: The resource record for each App Connector.
+
+        Examples:
+            >>> for connector in zpa.connectors.iter_connectors():
+            ...    print(connector.name)
+
+        """
+        return self.rest.iter_paginated(path="/connector", **kwargs, api_version="v1")
+
     def get_connector(self, connector_id: str, **kwargs) -> Box:
         """
         Returns information on the specified App Connector.
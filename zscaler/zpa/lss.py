@@ -15,7 +15,6 @@
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
 
-import requests
 from box import Box, BoxList
 from requests import Response
 
@@ -233,7 +232,7 @@ class LSSConfigControllerAPI:
 
         """
         full_url = f"{self.v2_admin_url}/statusCodes"
-        response = requests.get(full_url, headers=self.rest.headers)
+        response = self.rest.session.get(full_url, headers=self.rest.headers, timeout=self.rest.timeout)
         response.raise_for_status()
         all_status_codes = response.json()
 
@@ -20,7 +20,8 @@ import functools
 from box import Box, BoxList
 from requests import Response
 
-from zscaler.utils import add_id_groups, convert_keys, snake_to_camel
+from zscaler.cache.cached_response import CachedResponse
+from zscaler.utils import add_id_groups, convert_keys, format_json_response, snake_to_camel
 from zscaler.zpa.client import ZPAClient
 
 
@@ -220,6 +221,12 @@ class PolicySetsAPI:
             >>> pprint(zpa.policies.get_policy('access'))
 
         """
+        params = {}
+        if "microtenant_id" in kwargs:
+            params["microtenantId"] = kwargs.pop("microtenant_id")
+        return self.rest.get(self._policy_set_path(policy_type), params=params)
+
+    def _policy_set_path(self, policy_type: str) -> str:
         # Map the simplified policy_type name to the name expected by the Zscaler API
         mapped_policy_type = self.POLICY_MAP.get(policy_type, None)
 
@@ -229,10 +236,22 @@ class PolicySetsAPI:
                 f"Incorrect policy type provided: {policy_type}\n "
                 f"Policy type must be 'access', 'timeout', 'client_forwarding' or 'siem'."
             )
+        return f"policySet/policyType/{mapped_policy_type}"
+
+    def _get_policy_id(self, policy_type: str, **kwargs) -> str:
+        """
+        Returns the ID of the policy set for the given policy type.
+
+        The ID is read from the read-only view of the cached policy set, so the rules of the set are not
+        decoded and copied into a new Box every time a rule is looked up, added or updated.
+        """
         params = {}
         if "microtenant_id" in kwargs:
             params["microtenantId"] = kwargs.pop("microtenant_id")
-        return self.rest.get(f"policySet/policyType/{mapped_policy_type}", params=params)
+        resp = self.rest.send("GET", self._policy_set_path(policy_type), params=params)
+        if isinstance(resp, CachedResponse):
+            return resp.view().id
+        return format_json_response(resp, box_attrs=dict()).id
 
     def get_rule(self, policy_type: str, rule_id: str, **kwargs) -> Box:
         """
@@ -262,12 +281,12 @@ class PolicySetsAPI:
             ...    rule_id='88888')
 
         """
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
 
         policy_params = {}
         if "microtenant_id" in kwargs:
             policy_params["microtenantId"] = kwargs.pop("microtenant_id")
-        policy_id = self.get_policy(policy_type, **policy_params).id
+        policy_id = self._get_policy_id(policy_type, **policy_params)
 
         params = {}
         if "microtenant_id" in kwargs:
@@ -292,7 +311,7 @@ class PolicySetsAPI:
         """
         all_rules = self.list_rules(policy_type)
         for rule in all_rules:
-            if rule.name == rule_name:
+            if rule.get("name") == rule_name:
                 return rule
         return None
 
@@ -409,7 +428,7 @@ class PolicySetsAPI:
             payload["appServerGroups"] = [{"id": group_id} for group_id in app_server_group_ids]
 
         add_id_groups(self.reformat_params, kwargs, payload)
-        policy_id = self.get_policy("access").id
+        policy_id = self._get_policy_id("access")
 
         for key, value in kwargs.items():
             payload[snake_to_camel(key)] = value
@@ -489,7 +508,7 @@ class PolicySetsAPI:
         if "conditions" not in kwargs:
             payload["conditions"] = []
 
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
         response = self.rest.put(f"policySet/{policy_id}/rule/{rule_id}", json=payload, params=params, api_version="v1")
         if response.status_code == 204:
             updated_rule = self.get_rule(policy_type, rule_id)
@@ -544,7 +563,7 @@ class PolicySetsAPI:
             "action": "RE_AUTH",
             "conditions": self._create_conditions_v1(kwargs.pop("conditions", [])),
         }
-        policy_id = self.get_policy("timeout").id
+        policy_id = self._get_policy_id("timeout")
         payload["reauthTimeout"] = kwargs.get("re_auth_timeout", 172800)
         payload["reauthIdleTimeout"] = kwargs.get("re_auth_idle_timeout", 600)
 
@@ -644,7 +663,7 @@ class PolicySetsAPI:
         payload["reauthTimeout"] = kwargs.get("re_auth_timeout", 172800)
         payload["reauthIdleTimeout"] = kwargs.get("re_auth_idle_timeout", 600)
 
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
 
         response = self.rest.put(f"policySet/{policy_id}/rule/{rule_id}", json=payload, params=params, api_version="v1")
         if response.status_code == 204:
@@ -724,7 +743,7 @@ class PolicySetsAPI:
         else:
             payload["conditions"] = []
 
-        policy_id = self.get_policy("client_forwarding").id
+        policy_id = self._get_policy_id("client_forwarding")
         for key, value in kwargs.items():
             payload[snake_to_camel(key)] = value
 
@@ -819,7 +838,7 @@ class PolicySetsAPI:
             payload["conditions"] = []
 
         payload["action"] = action
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
 
         response = self.rest.put(f"policySet/{policy_id}/rule/{rule_id}", json=payload, params=params, api_version="v1")
         if response.status_code == 204:
@@ -890,7 +909,7 @@ class PolicySetsAPI:
                 {"operator": "OR", "operands": [{"objectType": "CLIENT_TYPE", "lhs": "id", "rhs": "zpn_client_type_exporter"}]}
             )
 
-        policy_id = self.get_policy("isolation").id
+        policy_id = self._get_policy_id("isolation")
 
         for key, value in kwargs.items():
             payload[snake_to_camel(key)] = value
@@ -989,7 +1008,7 @@ class PolicySetsAPI:
                 {"operator": "OR", "operands": [{"objectType": "CLIENT_TYPE", "lhs": "id", "rhs": "zpn_client_type_exporter"}]}
             )
         payload["action"] = action
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
 
         response = self.rest.put(f"policySet/{policy_id}/rule/{rule_id}", json=payload, params=params, api_version="v1")
         if response.status_code == 204:
@@ -1053,7 +1072,7 @@ class PolicySetsAPI:
         else:
             payload["conditions"] = []
 
-        policy_id = self.get_policy("inspection").id
+        policy_id = self._get_policy_id("inspection")
         for key, value in kwargs.items():
             payload[snake_to_camel(key)] = value
 
@@ -1146,7 +1165,7 @@ class PolicySetsAPI:
         params = {"microtenantId": microtenant_id} if microtenant_id else {}
 
         payload["action"] = action
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
 
         response = self.rest.put(f"policySet/{policy_id}/rule/{rule_id}", json=payload, params=params, api_version="v1")
         if response.status_code == 204:
@@ -1224,7 +1243,7 @@ class PolicySetsAPI:
 
         add_id_groups(self.reformat_params, kwargs, payload)
 
-        policy_id = self.get_policy("access").id
+        policy_id = self._get_policy_id("access")
         for key, value in kwargs.items():
             payload[snake_to_camel(key)] = value
 
@@ -1313,7 +1332,7 @@ class PolicySetsAPI:
 
         add_id_groups(self.reformat_params, kwargs, payload)
         payload = {k: v for k, v in payload.items() if k != "conditions" or v}
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
 
         response = self.rest.put(f"policySet/{policy_id}/rule/{rule_id}", json=payload, params=params, api_version="v2")
         if response.status_code == 204:
@@ -1370,7 +1389,7 @@ class PolicySetsAPI:
             "conditions": self._create_conditions_v2(kwargs.pop("conditions", [])),
         }
 
-        policy_id = self.get_policy("timeout").id
+        policy_id = self._get_policy_id("timeout")
         payload["reauthTimeout"] = kwargs.get("re_auth_timeout", 172800)
         payload["reauthIdleTimeout"] = kwargs.get("re_auth_idle_timeout", 600)
 
@@ -1455,7 +1474,7 @@ class PolicySetsAPI:
         params = {"microtenantId": microtenant_id} if microtenant_id else {}
 
         payload = {k: v for k, v in payload.items() if k != "conditions" or v}
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
         response = self.rest.put(f"policySet/{policy_id}/rule/{rule_id}", json=payload, params=params, api_version="v2")
 
         if response.status_code == 204:
@@ -1515,7 +1534,7 @@ class PolicySetsAPI:
             "conditions": self._create_conditions_v2(kwargs.pop("conditions", [])),
         }
 
-        policy_id = self.get_policy("client_forwarding").id
+        policy_id = self._get_policy_id("client_forwarding")
         for key, value in kwargs.items():
             payload[snake_to_camel(key)] = value
 
@@ -1610,7 +1629,7 @@ class PolicySetsAPI:
         params = {"microtenantId": microtenant_id} if microtenant_id else {}
 
         payload = {k: v for k, v in payload.items() if k != "conditions" or v}
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
 
         response = self.rest.put(f"policySet/{policy_id}/rule/{rule_id}", json=payload, params=params, api_version="v2")
         if response.status_code == 204:
@@ -1670,7 +1689,7 @@ class PolicySetsAPI:
         }
 
         payload["conditions"].append({"operands": [{"objectType": "CLIENT_TYPE", "values": ["zpn_client_type_exporter"]}]})
-        policy_id = self.get_policy("isolation").id
+        policy_id = self._get_policy_id("isolation")
 
         for key, value in kwargs.items():
             payload[snake_to_camel(key)] = value
@@ -1763,7 +1782,7 @@ class PolicySetsAPI:
         payload["conditions"].append({"operands": [{"objectType": "CLIENT_TYPE", "values": ["zpn_client_type_exporter"]}]})
         payload["action"] = action
 
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
 
         response = self.rest.put(f"policySet/{policy_id}/rule/{rule_id}", json=payload, params=params, api_version="v2")
         if response.status_code == 204:
@@ -1821,7 +1840,7 @@ class PolicySetsAPI:
             "zpnInspectionProfileId": zpn_inspection_profile_id,
             "conditions": self._create_conditions_v2(kwargs.pop("conditions", [])),
         }
-        policy_id = self.get_policy("inspection").id
+        policy_id = self._get_policy_id("inspection")
         for key, value in kwargs.items():
             payload[snake_to_camel(key)] = value
 
@@ -1919,7 +1938,7 @@ class PolicySetsAPI:
         payload = {k: v for k, v in payload.items() if k != "conditions" or v}
 
         payload["action"] = action
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
 
         response = self.rest.put(f"policySet/{policy_id}/rule/{rule_id}", json=payload, params=params, api_version="v2")
         if response.status_code == 204:
@@ -1988,7 +2007,7 @@ class PolicySetsAPI:
             "conditions": self._create_conditions_v2(kwargs.pop("conditions", [])),
         }
 
-        policy_id = self.get_policy("credential").id
+        policy_id = self._get_policy_id("credential")
 
         for key, value in kwargs.items():
             payload[snake_to_camel(key)] = value
@@ -2068,7 +2087,7 @@ class PolicySetsAPI:
 
         payload["action"] = "INJECT_CREDENTIALS"
         payload = {k: v for k, v in payload.items() if k != "conditions" or v}
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
 
         response = self.rest.put(f"policySet/{policy_id}/rule/{rule_id}", json=payload, params=params, api_version="v2")
         if response.status_code == 204:
@@ -2196,7 +2215,7 @@ class PolicySetsAPI:
         microtenant_id = kwargs.pop("microtenant_id", None)
         params = {"microtenantId": microtenant_id} if microtenant_id else {}
 
-        policy_id = self.get_policy("capabilities").id
+        policy_id = self._get_policy_id("capabilities")
 
         response = self.rest.post(f"policySet/{policy_id}/rule", json=payload, params=params, api_version="v2")
         if isinstance(response, Response):
@@ -2320,7 +2339,7 @@ class PolicySetsAPI:
         payload["action"] = "CHECK_CAPABILITIES"
 
         payload = {k: v for k, v in payload.items() if k != "conditions" or v}
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
 
         response = self.rest.put(f"policySet/{policy_id}/rule/{rule_id}", json=payload, params=params, api_version="v2")
         if response.status_code == 204:
@@ -2416,7 +2435,7 @@ class PolicySetsAPI:
                 if operand["objectType"] == "CLIENT_TYPE" and operand["values"][0] not in valid_client_types:
                     raise ValueError(f"Invalid client_type value: {operand['values'][0]}. Must be one of {valid_client_types}")
 
-        policy_id = self.get_policy("redirection").id
+        policy_id = self._get_policy_id("redirection")
 
         for key, value in kwargs.items():
             payload[snake_to_camel(key)] = value
@@ -2516,7 +2535,7 @@ class PolicySetsAPI:
 
         payload["action"] = action
         payload = {k: v for k, v in payload.items() if k != "conditions" or v}
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
 
         response = self.rest.put(f"policySet/{policy_id}/rule/{rule_id}", json=payload, params=params, api_version="v2")
         if response.status_code == 204:
@@ -2573,7 +2592,7 @@ class PolicySetsAPI:
             ...     microtenant_id='1234567890'
             ... )
         """
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
 
         microtenant_id = kwargs.pop("microtenant_id", None)
         params = {"microtenantId": microtenant_id} if microtenant_id else {}
@@ -2647,7 +2666,7 @@ class PolicySetsAPI:
             ...     microtenant_id='1234567890'
             ... )
         """
-        policy_set = self.get_policy(policy_type).id
+        policy_set = self._get_policy_id(policy_type)
         path = f"policySet/{policy_set}/reorder"
 
         microtenant_id = kwargs.pop("microtenant_id", None)
@@ -2690,7 +2709,7 @@ class PolicySetsAPI:
             ...    rule_id='88888')
 
         """
-        policy_id = self.get_policy(policy_type).id
+        policy_id = self._get_policy_id(policy_type)
         params = {}
         if "microtenant_id" in kwargs:
             params["microtenantId"] = kwargs.pop("microtenant_id")
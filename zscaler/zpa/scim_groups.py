@@ -15,6 +15,8 @@
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
 
+from typing import Iterator
+
 from box import Box, BoxList
 import time
 from zscaler.zpa.client import ZPAClient
@@ -75,6 +77,22 @@ class SCIMGroupsAPI:
         )
         return list
 
+    def iter_groups(self, idp_id: str, **kwargs) -> Iterator[Box]:
+        """
+        Lazily iterates over all configured SCIM groups for the specified IdP, requesting one page at a time.
+
+        Accepts the same arguments as :meth:`list_groups`. Breaking out of the loop stops further requests.
+
+        Yields:
+            :obj:`Box`: The resource record for each SCIM group.
+
+        Examples:
+            >>> for scim_group in zpa.scim_groups.iter_groups("999999"):
+            ...    print(scim_group.name)
+
+        """
+        return self.rest.iter_paginated(path=f"/scimgroup/idpId/{idp_id}", **kwargs, api_version="userconfig_v1")
+
     def get_group(self, group_id: str, **kwargs) -> Box:
         """
         Returns information on the specified SCIM group.
@@ -14,6 +14,8 @@
 # ACTION OF CONTRACT, NEGLIGENCE OR OTHER TORTIOUS ACTION, ARISING OUT OF
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
+from typing import Iterator
+
 from box import Box, BoxList
 from requests import Response
 
@@ -56,6 +58,22 @@ class ServerGroupsAPI:
         list, _ = self.rest.get_paginated_data(path="/serverGroup", **kwargs, api_version="v1")
         return list
 
+    def iter_groups(self, **kwargs) -> Iterator[Box]:
+        """
+        Lazily iterates over all configured server groups, requesting one page at a time.
+
+        Accepts the same arguments as :meth:`list_groups`. Breaking out of the loop stops further requests.
+
+        Yields:
+            :obj:`Box`: The resource record for each server group.
+
+        Examples:
+            >>> for group in zpa.server_groups.iter_groups():
+            ...    print(group.name)
+
+        """
+        return self.rest.iter_paginated(path="/serverGroup", **kwargs, api_version="v1")
+
     def get_group(self, group_id: str, **kwargs) -> Box:
         """
         Provides information on the specified server group.
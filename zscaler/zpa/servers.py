@@ -15,6 +15,8 @@
 # OR IN CONNECTION WITH THE USE OR PERFORMANCE OF THIS SOFTWARE.
 
 
+from typing import Iterator
+
 from box import Box, BoxList
 from requests import Response
 
@@ -49,6 +51,22 @@ class AppServersAPI:
         list, _ = self.rest.get_paginated_data(path="/server", **kwargs, api_version="v1")
         return list
 
+    def iter_servers(self, **kwargs) -> Iterator[Box]:
+        """
+        Lazily iterates over all configured servers, requesting one page at a time.
+
+        Accepts the same arguments as :meth:`list_servers`. Breaking out of the loop stops further requests.
+
+        Yields:
+            :obj:`Box`: The resource record for each server.
+
+        Examples:
+            >>> for server in zpa.servers.iter_servers(pagesize=500):
+            ...    print(server.name)
+
+        """
+        return self.rest.iter_paginated(path="/server", **kwargs, api_version="v1")
+
     def get_server(self, server_id: str, **kwargs) -> Box:
         """
         Gets information on the specified server.
@@ -86,8 +104,7 @@ class AppServersAPI:
             ... else:
             ...     print("Application server not found")
         """
-        servers = self.list_servers(**kwargs)
-        for server in servers:
+        for server in self.iter_servers(**kwargs):
             if server.get("name") == name:
                 return server
         return None